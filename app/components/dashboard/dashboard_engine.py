@@ -0,0 +1,298 @@
+"""
+YMV ERP 시스템 - 대시보드 집계 엔진
+Dashboard aggregation engine for YMV ERP System
+
+대시보드 한 번 렌더링에 필요한 원본 테이블(expenses, purchases, quotations)을
+각각 한 번만 읽고, KPI/상태별 건수/월별 동향/최근 활동을 pandas 벡터 연산으로
+한 번에 계산한다. 결과는 세션에 짧은 TTL 스냅샷으로 보관하여 위젯들이 공유한다.
+"""
+
+import calendar
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+# 대시보드 원본 테이블
+DASHBOARD_SOURCES = ('expenses', 'purchases', 'quotations')
+
+# 위젯에서 사용하는 컬럼만 조회 (없는 컬럼이 있으면 load_data가 '*'로 다시 조회)
+DASHBOARD_COLUMNS = {
+    'expenses': "id,approval_status,status,created_at,request_date,expense_date,"
+                "employee_id,requester,user_id,amount,expense_details,description,content",
+    'purchases': "id,status,created_at,request_date,requester,item_name,quantity,unit_price,currency",
+    'quotations': "id,created_at,quote_date,total_amount",
+}
+
+# 등록일로 사용할 컬럼 (앞에서부터 값이 있는 첫 컬럼)
+DATE_FIELDS = {
+    'expenses': ('created_at', 'request_date', 'expense_date'),
+    'purchases': ('created_at', 'request_date'),
+    'quotations': ('created_at', 'quote_date'),
+}
+
+# 최근 활동 정렬 기준 컬럼
+RECENT_SORT_FIELDS = ('created_at', 'request_date')
+
+# 상태값 정규화
+EXPENSE_STATUS_LABELS = {'pending': '대기중', 'approved': '승인됨', 'rejected': '거부됨'}
+PURCHASE_STATUS_LABELS = {
+    'requested': '요청됨', 'ordered': '주문됨', 'received': '입고됨', 'cancelled': '취소됨'
+}
+
+# 세션 스냅샷 유지 시간 (초)
+SNAPSHOT_TTL_SECONDS = 30
+
+_SNAPSHOT_STATE_KEY = 'dashboard_snapshot'
+
+
+def _column(df: pd.DataFrame, column: str) -> pd.Series:
+    """컬럼 Series (없으면 None으로 채운 Series)"""
+    if column in df.columns:
+        return df[column]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _first_present(df: pd.DataFrame, columns) -> pd.Series:
+    """여러 컬럼 중 값이 있는(None/빈 문자열 아님) 첫 값"""
+    result = pd.Series(None, index=df.index, dtype=object)
+    for column in reversed(columns):
+        values = _column(df, column)
+        present = values.notna() & (values.astype(str) != '')
+        result = values.where(present, result)
+    return result
+
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """ISO 날짜/일시 문자열 → 날짜 (시간대 표기와 무관하게 기록된 날짜 부분 기준)"""
+    return pd.to_datetime(values.astype(str).str[:10], format='%Y-%m-%d', errors='coerce')
+
+
+def _date_labels(values: pd.Series) -> pd.Series:
+    """최근 활동 표시용 MM/DD"""
+    return _parse_dates(values).dt.strftime('%m/%d').fillna('날짜불명')
+
+
+def _count_by(values: pd.Series) -> Dict[str, int]:
+    """값별 건수 (처음 등장한 순서 유지)"""
+    counts = values.value_counts(sort=False)
+    return {str(k): int(v) for k, v in counts.items()}
+
+
+class DashboardSnapshot:
+    """
+    대시보드 집계 결과
+    summary/상태별 건수/월별 동향/최근 활동과 위젯별 처리 시간(ms)을 담는다.
+    """
+
+    def __init__(self):
+        self.summary: Dict[str, Dict[str, Any]] = {
+            'expenses': {'total': 0, 'pending': 0, 'approved': 0},
+            'purchases': {'total': 0, 'pending': 0, 'completed': 0},
+            'quotations': {'total': 0, 'total_amount': 0},
+        }
+        self.expense_status: Dict[str, int] = {}
+        self.purchase_status: Dict[str, int] = {}
+        self.monthly: Optional[pd.DataFrame] = None
+        self.year = datetime.now().year
+        self.recent_activities: List[Dict[str, Any]] = []
+        self.timings: Dict[str, float] = {}
+        self.built_at = time.monotonic()
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.timings.values())
+
+    def timing_frame(self) -> pd.DataFrame:
+        """위젯별 처리 시간 표"""
+        return pd.DataFrame(
+            [{'단계': name, 'ms': round(ms, 1)} for name, ms in self.timings.items()]
+        )
+
+
+class _Timer:
+    """with 블록 처리 시간을 snapshot.timings에 기록"""
+
+    def __init__(self, snapshot: DashboardSnapshot, name: str):
+        self.snapshot = snapshot
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.snapshot.timings[self.name] = (time.perf_counter() - self.start) * 1000
+        return False
+
+
+def load_dashboard_sources(load_data_func: Callable, snapshot: DashboardSnapshot) -> Dict[str, pd.DataFrame]:
+    """원본 테이블을 각각 한 번씩 조회"""
+    frames = {}
+    for source in DASHBOARD_SOURCES:
+        with _Timer(snapshot, f'load:{source}'):
+            try:
+                rows = load_data_func(source, columns=DASHBOARD_COLUMNS[source])
+            except TypeError:
+                # columns 인자를 받지 않는 조회 함수
+                rows = load_data_func(source)
+            frames[source] = pd.DataFrame(rows or [])
+    return frames
+
+
+def _compute_kpis(frames: Dict[str, pd.DataFrame], snapshot: DashboardSnapshot):
+    expenses = frames['expenses']
+    approval = _column(expenses, 'approval_status')
+    status = _column(expenses, 'status')
+    snapshot.summary['expenses'] = {
+        'total': len(expenses),
+        'pending': int(((approval == '대기중') | (status == 'pending')).sum()),
+        'approved': int(((approval == '승인됨') | (status == 'approved')).sum()),
+    }
+
+    purchases = frames['purchases']
+    purchase_status = _column(purchases, 'status')
+    snapshot.summary['purchases'] = {
+        'total': len(purchases),
+        'pending': int(purchase_status.isin(['대기중', 'requested']).sum()),
+        'completed': int(purchase_status.isin(['완료됨', 'received']).sum()),
+    }
+
+    quotations = frames['quotations']
+    amounts = pd.to_numeric(_column(quotations, 'total_amount'), errors='coerce')
+    snapshot.summary['quotations'] = {
+        'total': len(quotations),
+        'total_amount': float(amounts.sum()),
+    }
+
+
+def _expense_status_labels(expenses: pd.DataFrame) -> pd.Series:
+    status = _first_present(expenses, ('approval_status', 'status')).fillna('미분류')
+    return status.replace(EXPENSE_STATUS_LABELS)
+
+
+def _purchase_status_labels(purchases: pd.DataFrame) -> pd.Series:
+    return _column(purchases, 'status').fillna('미분류').replace(PURCHASE_STATUS_LABELS)
+
+
+def _compute_monthly(frames: Dict[str, pd.DataFrame], snapshot: DashboardSnapshot, now: datetime):
+    """올해 1월~이번 달 월별 등록 건수"""
+    months = list(range(1, now.month + 1))
+    data = {'월': [calendar.month_name[m][:3] for m in months]}
+    labels = {'expenses': '지출요청서', 'purchases': '구매요청', 'quotations': '견적서'}
+    for source, label in labels.items():
+        frame = frames[source]
+        dates = _parse_dates(_first_present(frame, DATE_FIELDS[source]))
+        this_year = dates[dates.dt.year == now.year]
+        counts = this_year.dt.month.value_counts().reindex(months, fill_value=0)
+        data[label] = counts.astype(int).tolist()
+    snapshot.monthly = pd.DataFrame(data)
+    snapshot.year = now.year
+
+
+def _latest(frame: pd.DataFrame, mask: pd.Series, limit: int) -> pd.DataFrame:
+    """조건에 맞는 행 중 최신순 limit건"""
+    if frame.empty:
+        return frame
+    selected = frame[mask]
+    sort_key = _first_present(selected, RECENT_SORT_FIELDS).fillna('').astype(str)
+    order = sort_key.sort_values(ascending=False, kind='stable').index[:limit]
+    return selected.loc[order]
+
+
+def _compute_recent(frames: Dict[str, pd.DataFrame], snapshot: DashboardSnapshot,
+                    current_user: Optional[Dict[str, Any]]):
+    """현재 사용자의 최근 지출요청서 3건 + 구매요청 2건"""
+    activities = []
+    if not current_user:
+        snapshot.recent_activities = activities
+        return
+    user_id = current_user.get('id')
+
+    expenses = frames['expenses']
+    if not expenses.empty:
+        mine = ((_column(expenses, 'employee_id') == user_id) |
+                (_column(expenses, 'requester') == user_id) |
+                (_column(expenses, 'user_id') == user_id))
+        latest = _latest(expenses, mine, 3)
+        dates = _date_labels(_first_present(latest, DATE_FIELDS['expenses']))
+        statuses = _expense_status_labels(latest)
+        contents = _first_present(latest, ('expense_details', 'description', 'content')).fillna('내용없음')
+        amounts = _column(latest, 'amount').fillna(0)
+        for idx in latest.index:
+            content = str(contents[idx])
+            activities.append({
+                'date': dates[idx],
+                'type': '지출요청서',
+                'content': content[:20] + ('...' if len(content) > 20 else ''),
+                'amount': f"{amounts[idx]:,}원",
+                'status': statuses[idx]
+            })
+
+    purchases = frames['purchases']
+    if not purchases.empty:
+        if current_user.get('role') == 'manager':
+            mine = pd.Series(True, index=purchases.index)
+        else:
+            mine = _column(purchases, 'requester') == user_id
+        latest = _latest(purchases, mine, 2)
+        dates = _date_labels(_first_present(latest, DATE_FIELDS['purchases']))
+        statuses = _purchase_status_labels(latest)
+        records = latest.astype(object).where(latest.notna(), None).to_dict('records')
+        for idx, purchase in zip(latest.index, records):
+            activities.append({
+                'date': dates[idx],
+                'type': '구매요청',
+                'content': f"{purchase.get('item_name') or '품목불명'} {purchase.get('quantity') or 0}개",
+                'amount': f"{purchase.get('unit_price') or 0:,}{purchase.get('currency') or 'KRW'}",
+                'status': statuses[idx]
+            })
+
+    snapshot.recent_activities = activities
+
+
+def build_dashboard_snapshot(load_data_func: Callable, current_user: Optional[Dict[str, Any]] = None,
+                             now: Optional[datetime] = None) -> DashboardSnapshot:
+    """
+    대시보드 전체 집계
+    원본 테이블을 한 번씩 읽은 뒤 모든 위젯 데이터를 계산한다.
+    """
+    now = now or datetime.now()
+    snapshot = DashboardSnapshot()
+    frames = load_dashboard_sources(load_data_func, snapshot)
+
+    with _Timer(snapshot, 'kpis'):
+        _compute_kpis(frames, snapshot)
+    with _Timer(snapshot, 'expense_status'):
+        snapshot.expense_status = _count_by(_expense_status_labels(frames['expenses']))
+    with _Timer(snapshot, 'purchase_status'):
+        snapshot.purchase_status = _count_by(_purchase_status_labels(frames['purchases']))
+    with _Timer(snapshot, 'monthly_trends'):
+        _compute_monthly(frames, snapshot, now)
+    with _Timer(snapshot, 'recent_activities'):
+        _compute_recent(frames, snapshot, current_user)
+    return snapshot
+
+
+def get_dashboard_snapshot(load_data_func: Callable, current_user: Optional[Dict[str, Any]] = None,
+                           ttl: float = SNAPSHOT_TTL_SECONDS, refresh: bool = False) -> DashboardSnapshot:
+    """
+    세션 스냅샷 반환 (TTL 이내면 재사용, 사용자가 바뀌거나 만료되면 다시 집계)
+    """
+    user_id = current_user.get('id') if current_user else None
+    cached = st.session_state.get(_SNAPSHOT_STATE_KEY)
+    if not refresh and cached:
+        cached_user, snapshot = cached
+        if cached_user == user_id and time.monotonic() - snapshot.built_at < ttl:
+            return snapshot
+
+    snapshot = build_dashboard_snapshot(load_data_func, current_user)
+    st.session_state[_SNAPSHOT_STATE_KEY] = (user_id, snapshot)
+    return snapshot
+
+
+def clear_dashboard_snapshot():
+    """세션 스냅샷 삭제"""
+    st.session_state.pop(_SNAPSHOT_STATE_KEY, None)
@@ -6,12 +6,20 @@ import io
 import plotly.graph_objects as go
 from collections import defaultdict
 
+from utils.helpers import (
+    PaginationHelper, get_page_args, render_pagination_controls,
+    apply_batch_updates, queue_batch_result, show_batch_result
+)
+from utils.filter_engine import filter_rows, month_bounds
+from utils.query_builder import QueryFilter, Condition, and_
+from utils.sequence_service import SequenceUnavailableError, next_document_number
+
 
 def show_expense_management(load_data_func, save_data_func, update_data_func, delete_data_func, 
                            get_current_user_func, get_approval_status_info_func, 
                            calculate_expense_statistics_func, create_csv_download_func, 
-                           render_print_form_func, current_user):
-    """지출 요청서 관리 컴포넌트 메인 함수"""
+                           render_print_form_func, current_user, bulk_update_func=None):
+    """지출 요청서 관리 컴포넌트 메인 함수 (bulk_update_func: 여러 건 승인/반려 일괄 수정 함수)"""
     
     st.header("💰 지출 요청서 관리")
     
@@ -71,28 +79,20 @@ def show_expense_management(load_data_func, save_data_func, update_data_func, de
     
     with tab4:
         render_approval_management(load_data_func, update_data_func, get_current_user_func, 
-                                  get_approval_status_info_func, expense_table)
+                                  get_approval_status_info_func, expense_table, bulk_update_func)
     
     # 화던 (Hóa đơn) 발행 확인 탭 (권한 있는 사용자만)
     if user_role in ['Admin', 'CEO', 'Master']:
         with tab5:
-            render_invoice_check_tab(load_data_func, update_data_func, get_current_user_func, expense_table)
+            render_invoice_check_tab(load_data_func, update_data_func, get_current_user_func, expense_table,
+                                     bulk_update_func)
 
 
 def generate_document_number(load_data_func, expense_table):
-    """문서번호 자동 생성: EXP-YYMMDD-Count"""
-    today = date.today()
-    date_str = today.strftime('%y%m%d')
-    
-    all_expenses = load_data_func(expense_table)
-    if all_expenses:
-        today_expenses = [exp for exp in all_expenses 
-                         if exp.get('document_number', '').startswith(f"EXP-{date_str}")]
-        count = len(today_expenses) + 1
-    else:
-        count = 1
-    
-    return f"EXP-{date_str}-{count:03d}"
+    """문서번호 자동 생성: EXP-YYMMDD-Count (시퀀스 서비스 사용)"""
+    date_str = date.today().strftime('%y%m%d')
+    return next_document_number('EXP', period=date_str,
+                                table_name=expense_table, column='document_number')
 
 def render_expense_form(load_data_func, save_data_func, current_user, expense_table):
     """지출 요청 폼 렌더링"""
@@ -210,6 +210,12 @@ def render_expense_form(load_data_func, save_data_func, current_user, expense_ta
             else:
                 initial_reimbursement_status = None  # 화던 확인 후 pending으로 변경
 
+            try:
+                document_number = generate_document_number(load_data_func, expense_table)
+            except SequenceUnavailableError as e:
+                st.error(f"❌ 문서번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+                return
+
             # 지출 데이터 생성
             expense_data = {
                 "requester": selected_employee_id,
@@ -222,7 +228,7 @@ def render_expense_form(load_data_func, save_data_func, current_user, expense_ta
                 # ... 기타 필드
                 "status": "pending",
                 "reimbursement_status": initial_reimbursement_status,  # ← 추가
-                "document_number": generate_document_number(load_data_func, expense_table),
+                "document_number": document_number,
                 "created_at": datetime.now().isoformat(),
                 "updated_at": datetime.now().isoformat()
             }
@@ -255,14 +261,8 @@ def render_expense_list(load_data_func, update_data_func, delete_data_func,
             st.rerun()
         return
     
-    # 법인별 테이블에서 데이터 로드
-    expenses = load_data_func(expense_table)
     employees = load_data_func("employees")
     
-    if not expenses:
-        st.info("등록된 지출요청서가 없습니다.")
-        return
-    
     # 직원 딕셔너리 생성
     employee_dict = {}
     if employees:
@@ -277,13 +277,24 @@ def render_expense_list(load_data_func, update_data_func, delete_data_func,
     current_user_id = current_user.get('id') if current_user else None
     
     # 검색 필터 렌더링
-    render_search_filters_expense(expenses, employees, user_role)
-    
-    # 필터링된 지출요청서 가져오기
-    filtered_expenses = get_filtered_expenses(expenses, user_role, current_user_id, employee_dict)
+    render_search_filters_expense(employees or [], user_role)
+    
+    # 검색 조건은 DB 쿼리로 처리하고 현재 페이지만 조회
+    expense_query = get_filtered_expenses_query(user_role, current_user_id, employee_dict)
+    page_args = get_page_args("expense_list", expense_query.cache_key(),
+                              keyset=(expense_query.order_by == 'created_at'))
+    page_result = load_data_func(expense_table, filters=expense_query, **page_args)
+    filtered_expenses = list(page_result or [])
+    if not filtered_expenses and PaginationHelper.get_total("expense_list", page_result) == 0 \
+            and len(expense_query.conditions) == (1 if user_role == 'Staff' else 0):
+        st.info("등록된 지출요청서가 없습니다.")
+        return
     
     # 테이블 렌더링
-    render_expense_table_view(filtered_expenses, employee_dict, get_approval_status_info_func)
+    total_count = PaginationHelper.get_total("expense_list", page_result)
+    render_expense_table_view(filtered_expenses, employee_dict, get_approval_status_info_func, total_count)
+    if page_result:
+        render_pagination_controls("expense_list", page_result)
     
     st.markdown("---")
     
@@ -294,7 +305,7 @@ def render_expense_list(load_data_func, update_data_func, delete_data_func,
                                 load_data_func, expense_table)
 
 
-def render_search_filters_expense(expenses, employees, user_role):
+def render_search_filters_expense(employees, user_role):
     """검색 필터 영역"""
     
     st.markdown("### 🔍 지출요청서 검색")
@@ -363,81 +374,75 @@ def render_search_filters_expense(expenses, employees, user_role):
     
     st.markdown("---")
 
-def get_filtered_expenses(expenses, user_role, current_user_id, employee_dict):
-    """필터 적용"""
-    
-    filtered = expenses.copy()
+# 정렬 옵션 → (정렬 컬럼, 내림차순 여부)
+EXPENSE_SORT_ORDERS = {
+    '최신순': ('created_at', True),
+    '오래된순': ('created_at', False),
+    '금액높은순': ('amount', True),
+    '금액낮은순': ('amount', False),
+}
+
+# 상태 필터 → 서버 필터 조건
+EXPENSE_STATUS_FILTERS = {
+    '대기': {'status': 'pending'},
+    '승인': {'status': 'approved'},
+    '반려': {'status': 'rejected'},
+    '화던 (Hóa đơn)확인완료': {'accounting_confirmed': True},
+}
+
+def requester_condition(employee_ids):
+    """요청자(requester, 없으면 employee_id)가 employee_ids 중 하나인 조건"""
+    employee_ids = tuple(employee_ids)
+    return (Condition('requester', 'in', employee_ids),
+            and_(Condition('requester', 'is', None), Condition('employee_id', 'in', employee_ids)))
+
+def get_filtered_expenses_query(user_role, current_user_id, employee_dict):
+    """필터 조건을 DB 쿼리 조건(QueryFilter)으로 변환"""
     
-    # 텍스트 검색
-    search_term = st.session_state.get('expense_search_term', '')
-    if search_term:
-        filtered = [
-            exp for exp in filtered
-            if search_term.lower() in str(exp.get('document_number', '')).lower()
-            or search_term.lower() in str(exp.get('description', '')).lower()
-        ]
+    query = QueryFilter()
     
     # 권한별 필터링
     if user_role == 'Staff':
         # 일반 직원은 본인 요청서만
-        filtered = [exp for exp in filtered if (exp.get('requester') or exp.get('employee_id')) == current_user_id]
+        query.or_(*requester_condition([current_user_id]))
+    
+    # 텍스트 검색 (문서번호/내역)
+    query.search(st.session_state.get('expense_search_term', ''), 'document_number', 'description')
     
     # 상태 필터
     status_filter = st.session_state.get('expense_status_filter', '전체')
-    if status_filter != '전체':
-        if status_filter == '대기':
-            filtered = [exp for exp in filtered if exp.get('status') == 'pending']
-        elif status_filter == '승인':
-            filtered = [exp for exp in filtered if exp.get('status') == 'approved']
-        elif status_filter == '반려':
-            filtered = [exp for exp in filtered if exp.get('status') == 'rejected']
-        elif status_filter == '화던 (Hóa đơn)확인완료':
-            filtered = [exp for exp in filtered if exp.get('accounting_confirmed', False)]
+    for column, value in EXPENSE_STATUS_FILTERS.get(status_filter, {}).items():
+        query.eq(column, value)
     
     # 지출 유형 필터
     type_filter = st.session_state.get('expense_type_filter', '전체')
     if type_filter != '전체':
-        filtered = [exp for exp in filtered if exp.get('expense_type') == type_filter]
+        query.eq('expense_type', type_filter)
     
     # 결제 방법 필터
     payment_filter = st.session_state.get('expense_payment_filter', '전체')
     if payment_filter != '전체':
-        filtered = [exp for exp in filtered if exp.get('payment_method') == payment_filter]
+        query.eq('payment_method', payment_filter)
     
     # 직원 필터 (권한자만)
     if user_role in ['Master', 'CEO', 'Admin']:
         employee_filter = st.session_state.get('expense_employee_filter', '전체')
         if employee_filter and employee_filter != '전체':
             employee_name = employee_filter.split(" (")[0]
-            filtered = [
-                exp for exp in filtered
-                if employee_dict.get(exp.get('requester') or exp.get('employee_id'), {}).get('name') == employee_name
-            ]
+            employee_ids = [emp_id for emp_id, emp in employee_dict.items() if emp.get('name') == employee_name]
+            query.or_(*requester_condition(employee_ids or [0]))
     
     # 기간 필터
-    date_from = st.session_state.get('expense_date_from')
-    date_to = st.session_state.get('expense_date_to')
-    
-    if date_from:
-        filtered = [exp for exp in filtered if exp.get('expense_date', '') >= str(date_from)]
-    if date_to:
-        filtered = [exp for exp in filtered if exp.get('expense_date', '') <= str(date_to)]
+    query.date_range('expense_date',
+                     st.session_state.get('expense_date_from'),
+                     st.session_state.get('expense_date_to'))
     
     # 정렬
-    sort_order = st.session_state.get('expense_sort_order', '최신순')
-    if sort_order == '최신순':
-        filtered.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    elif sort_order == '오래된순':
-        filtered.sort(key=lambda x: x.get('created_at', ''))
-    elif sort_order == '금액높은순':
-        filtered.sort(key=lambda x: x.get('amount', 0), reverse=True)
-    elif sort_order == '금액낮은순':
-        filtered.sort(key=lambda x: x.get('amount', 0))
-    
-    return filtered
+    order_by, desc = EXPENSE_SORT_ORDERS[st.session_state.get('expense_sort_order', '최신순')]
+    return query.order(order_by, desc=desc)
 
-def render_expense_table_view(filtered_expenses, employee_dict, get_approval_status_info_func):
-    """지출요청서 테이블 뷰"""
+def render_expense_table_view(filtered_expenses, employee_dict, get_approval_status_info_func, total_count=None):
+    """지출요청서 테이블 뷰 (total_count: 페이지 조회 시 전체 건수)"""
     
     table_data = []
     for exp in filtered_expenses:
@@ -475,7 +480,7 @@ def render_expense_table_view(filtered_expenses, employee_dict, get_approval_sta
     df = pd.DataFrame(table_data)
     
     st.dataframe(df, use_container_width=True, hide_index=True)
-    st.caption(f"📊 총 **{len(filtered_expenses)}건** 지출요청서")
+    st.caption(f"📊 총 **{total_count if total_count is not None else len(filtered_expenses)}건** 지출요청서")
 
 def render_id_selection_expense(filtered_expenses, employee_dict, current_user, user_role,
                                update_data_func, delete_data_func, 
@@ -865,10 +870,12 @@ def confirm_invoice_expense(expense_id, user_id, update_data_func, load_data_fun
         st.error(f"화던 (Hóa đơn) 발행 확인 처리 중 오류: {str(e)}")
         return False
 
-def render_invoice_check_tab(load_data_func, update_data_func, get_current_user_func, expense_table):
+def render_invoice_check_tab(load_data_func, update_data_func, get_current_user_func, expense_table,
+                             bulk_update_func=None):
     """화던 (Hóa đơn) 발행 확인 탭 - ID 입력 방식"""
     
     st.subheader("🧾 화던 (Hóa đơn) 발행 확인 관리")
+    show_batch_result("invoice_check")
     
     # 법인별 테이블에서 데이터 로드
     expenses = load_data_func(expense_table)
@@ -953,8 +960,9 @@ def render_invoice_check_tab(load_data_func, update_data_func, get_current_user_
                         st.info(f"선택된 항목: {len(selected_expenses)}건 - {total_str}")
                         
                         if st.button(f"✅ 화던 확인 ({len(selected_expenses)}건)", type="primary", use_container_width=True):
-                            success_count = 0
-                            
+                            # 같은 시각/같은 변경 내용끼리 묶어 한 번에 수정
+                            now = datetime.now().isoformat()
+                            updates = {}
                             for exp in selected_expenses:
                                 # 환급 상태 결정
                                 payment_method = exp.get('payment_method', '')
@@ -963,29 +971,18 @@ def render_invoice_check_tab(load_data_func, update_data_func, get_current_user_
                                 else:
                                     # 현금, 개인신용카드, 개인 계좌 이체 등 → 환급 필요
                                     reimbursement_status = 'pending'
-                                update_data = {
-                                    'id': exp.get('id'),
+                                updates[exp.get('id')] = {
                                     'accounting_confirmed': True,
                                     'accounting_confirmed_by': current_user.get('id'),
-                                    'accounting_confirmed_at': datetime.now().isoformat(),
+                                    'accounting_confirmed_at': now,
                                     'reimbursement_status': reimbursement_status,
                                     'reimbursement_amount': exp.get('amount') if reimbursement_status == 'pending' else None,
-                                    'updated_at': datetime.now().isoformat()
+                                    'updated_at': now
                                 }
-                                
-                                if update_data_func(expense_table, update_data, "id"):
-                                    success_count += 1
                             
-                            if success_count == len(selected_expenses):
-                                st.success(f"✅ {len(selected_expenses)}건 화던 (Hóa đơn) 확인 완료!")
-                                import time
-                                time.sleep(2)
-                                st.rerun()
-                            else:
-                                st.warning(f"⚠️ {success_count}/{len(selected_expenses)}건만 처리되었습니다.")
-                                import time
-                                time.sleep(2)
-                                st.rerun()
+                            results = apply_batch_updates(expense_table, updates, update_data_func, bulk_update_func)
+                            queue_batch_result("invoice_check", results, "화던 (Hóa đơn) 확인")
+                            st.rerun()
                     else:
                         st.warning("⚠️ 선택한 ID가 확인 대기 목록에 없습니다.")
                 except ValueError:
@@ -1057,36 +1054,20 @@ def render_expense_statistics_new(load_data_func, expense_table):
         expense_types = ["전체"] + sorted(list(set([exp.get('expense_type', '기타') for exp in expenses])))
         selected_type = st.selectbox("지출유형", expense_types, key="exp_stat_type")
     
-    # 데이터 필터링
-    filtered_expenses = []
-    for exp in expenses:
-        if not exp.get('expense_date'):
-            continue
-        
-        try:
-            exp_date = datetime.fromisoformat(exp['expense_date'])
-            
-            # 년도 필터
-            if exp_date.year != selected_year:
-                continue
-            
-            # 월 필터
-            if selected_month != "전체":
-                month_num = int(selected_month.replace("월", ""))
-                if exp_date.month != month_num:
-                    continue
-            
-            # 통화 필터
-            if selected_currency != "전체" and exp.get('currency') != selected_currency:
-                continue
-            
-            # 지출유형 필터
-            if selected_type != "전체" and exp.get('expense_type') != selected_type:
-                continue
-            
-            filtered_expenses.append(exp)
-        except:
-            continue
+    # 데이터 필터링 (조건을 하나의 판정 함수로 컴파일해 한 번만 순회)
+    query = QueryFilter()
+    if selected_month != "전체":
+        query.date_range('expense_date', *month_bounds(selected_year, int(selected_month.replace("월", ""))))
+    else:
+        query.date_range('expense_date', date(selected_year, 1, 1), date(selected_year, 12, 31))
+    
+    if selected_currency != "전체":
+        query.eq('currency', selected_currency)
+    
+    if selected_type != "전체":
+        query.eq('expense_type', selected_type)
+    
+    filtered_expenses = filter_rows(expenses, query)
     
     if not filtered_expenses:
         st.warning("선택한 조건에 해당하는 데이터가 없습니다.")
@@ -1392,7 +1373,7 @@ def render_expense_statistics_new(load_data_func, expense_table):
 
 
 def render_approval_management(load_data_func, update_data_func, get_current_user_func, 
-                              get_approval_status_info_func, expense_table):
+                              get_approval_status_info_func, expense_table, bulk_update_func=None):
     """승인 관리 (CEO/Master 전용) - 테이블 + ID 입력 방식"""
     
     current_user = get_current_user_func()
@@ -1400,6 +1381,8 @@ def render_approval_management(load_data_func, update_data_func, get_current_use
         st.warning("⚠️ 승인 권한이 없습니다.")
         return
     
+    show_batch_result("expense_approval")
+    
     # 법인별 테이블에서 데이터 로드
     expenses = load_data_func(expense_table)
     employees = load_data_func("employees")
@@ -1489,30 +1472,18 @@ def render_approval_management(load_data_func, update_data_func, get_current_use
                         st.info(f"선택된 항목: {len(selected_expenses)}건 - {total_str}")
                         
                         if st.button(f"✅ 승인 처리 ({len(selected_expenses)}건)", type="primary", use_container_width=True):
-                            success_count = 0
-                            
-                            for exp in selected_expenses:
-                                update_data = {
-                                    'id': exp.get('id'),
-                                    'status': 'approved',
-                                    'approved_by': current_user.get('id'),
-                                    'approved_at': datetime.now().isoformat(),
-                                    'updated_at': datetime.now().isoformat()
-                                }
-                                
-                                if update_data_func(expense_table, update_data, "id"):
-                                    success_count += 1
+                            now = datetime.now().isoformat()
+                            patch = {
+                                'status': 'approved',
+                                'approved_by': current_user.get('id'),
+                                'approved_at': now,
+                                'updated_at': now
+                            }
+                            updates = {exp.get('id'): patch for exp in selected_expenses}
                             
-                            if success_count == len(selected_expenses):
-                                st.success(f"✅ {len(selected_expenses)}건 승인 완료!")
-                                import time
-                                time.sleep(2)
-                                st.rerun()
-                            else:
-                                st.warning(f"⚠️ {success_count}/{len(selected_expenses)}건만 승인되었습니다.")
-                                import time
-                                time.sleep(2)
-                                st.rerun()
+                            results = apply_batch_updates(expense_table, updates, update_data_func, bulk_update_func)
+                            queue_batch_result("expense_approval", results, "승인")
+                            st.rerun()
                     else:
                         st.warning("⚠️ 선택한 ID가 승인 대기 목록에 없습니다.")
                 except ValueError:
@@ -1540,31 +1511,19 @@ def render_approval_management(load_data_func, update_data_func, get_current_use
                             if not reject_reason.strip():
                                 st.error("반려 사유를 입력해주세요.")
                             else:
-                                success_count = 0
-                                
-                                for exp in selected_expenses:
-                                    update_data = {
-                                        'id': exp.get('id'),
-                                        'status': 'rejected',
-                                        'approved_by': current_user.get('id'),
-                                        'approved_at': datetime.now().isoformat(),
-                                        'approval_comment': reject_reason,
-                                        'updated_at': datetime.now().isoformat()
-                                    }
-                                    
-                                    if update_data_func(expense_table, update_data, "id"):
-                                        success_count += 1
+                                now = datetime.now().isoformat()
+                                patch = {
+                                    'status': 'rejected',
+                                    'approved_by': current_user.get('id'),
+                                    'approved_at': now,
+                                    'approval_comment': reject_reason,
+                                    'updated_at': now
+                                }
+                                updates = {exp.get('id'): patch for exp in selected_expenses}
                                 
-                                if success_count == len(selected_expenses):
-                                    st.success(f"✅ {len(selected_expenses)}건 반려 완료!")
-                                    import time
-                                    time.sleep(2)
-                                    st.rerun()
-                                else:
-                                    st.warning(f"⚠️ {success_count}/{len(selected_expenses)}건만 반려되었습니다.")
-                                    import time
-                                    time.sleep(2)
-                                    st.rerun()
+                                results = apply_batch_updates(expense_table, updates, update_data_func, bulk_update_func)
+                                queue_batch_result("expense_approval", results, "반려")
+                                st.rerun()
                     else:
                         st.warning("⚠️ 선택한 ID가 승인 대기 목록에 없습니다.")
                 except ValueError:
@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 
+from utils.database import Projection
+from utils.exchange_rates import load_exchange_rates
+
 def show_profit_analysis(load_func):
     """수익 분석 및 통계"""
     st.header("💰 수익 분석")
@@ -16,7 +19,7 @@ def show_profit_analysis(load_func):
             analysis_data = calculate_profit_from_base_tables(load_func)
         
         if analysis_data:
-            render_profit_dashboard(analysis_data)
+            render_profit_dashboard(analysis_data, load_func)
         else:
             render_empty_dashboard()
             
@@ -24,59 +27,102 @@ def show_profit_analysis(load_func):
         st.error(f"데이터 로드 중 오류가 발생했습니다: {str(e)}")
         render_empty_dashboard()
 
-def calculate_profit_from_base_tables(load_func):
-    """기본 테이블에서 수익 분석 데이터 계산"""
+# 수익 분석에 필요한 컬럼
+PROCESS_COLUMNS = Projection(
+    "id", "process_number", "customer_name", "total_amount", "process_status",
+    "created_at", "updated_at"
+)
+SUPPLIER_ORDER_COLUMNS = Projection("id", "sales_process_id", "total_cost", "created_at", "updated_at")
+
+# 고객 매출 통화 / 분석 기준 통화
+REVENUE_CURRENCY = 'VND'
+REPORT_CURRENCY = 'USD'
+
+_PROFIT_CACHE_KEY = 'profit_analysis_cache'
+
+
+def _table_version(rows):
+    """원본 테이블 버전 (건수 + 최근 수정 시각)"""
+    latest = max((str(r.get('updated_at') or r.get('created_at') or '') for r in rows), default='')
+    return (len(rows), latest)
+
+
+def compute_profit_analysis(processes, supplier_orders, rates):
+    """
+    프로세스별 수익 계산
+    발주 비용은 sales_process_id 기준으로 한 번 집계한 뒤 프로세스와 해시 조인하고,
+    매출은 프로세스 생성일에 유효한 환율로 변환한다.
+    """
+    columns = [
+        'process_number', 'customer_name', 'customer_amount_vnd', 'customer_amount_usd',
+        'supplier_cost_usd', 'profit_usd', 'profit_margin_percent', 'process_status'
+    ]
+    process_df = pd.DataFrame(processes)
+    if process_df.empty:
+        return pd.DataFrame(columns=columns)
+    
+    for column, default in (('id', None), ('process_number', 'N/A'), ('customer_name', 'N/A'),
+                            ('process_status', 'N/A'), ('total_amount', 0), ('created_at', None)):
+        if column not in process_df.columns:
+            process_df[column] = default
+    
+    # 발주 비용 집계 (USD)
+    order_df = pd.DataFrame(supplier_orders)
+    if order_df.empty or 'sales_process_id' not in order_df.columns:
+        supplier_cost = pd.Series(dtype=float)
+    else:
+        costs = pd.to_numeric(order_df.get('total_cost', pd.Series(0, index=order_df.index)),
+                              errors='coerce').fillna(0)
+        supplier_cost = costs.groupby(order_df['sales_process_id']).sum()
+    
+    result = pd.DataFrame({
+        'process_number': process_df['process_number'].fillna('N/A'),
+        'customer_name': process_df['customer_name'].fillna('N/A'),
+        'customer_amount_vnd': pd.to_numeric(process_df['total_amount'], errors='coerce').fillna(0.0),
+        'process_status': process_df['process_status'].fillna('N/A'),
+    })
+    result['supplier_cost_usd'] = process_df['id'].map(supplier_cost).fillna(0.0).astype(float)
+    
+    # 환율 적용 (VND → USD, 프로세스 생성일 기준)
+    amount = result['customer_amount_vnd']
+    converted = rates.convert(amount, REVENUE_CURRENCY, REPORT_CURRENCY, process_df['created_at'])
+    result['customer_amount_usd'] = converted.where(amount > 0, 0.0)
+    result['profit_usd'] = result['customer_amount_usd'] - result['supplier_cost_usd']
+    
+    # 수익률 계산
+    revenue = result['customer_amount_usd']
+    margin = (result['profit_usd'] / revenue.where(revenue > 0)) * 100
+    result['profit_margin_percent'] = margin.fillna(0.0)
+    
+    return result[columns]
+
+
+def calculate_profit_from_base_tables(load_func, rates=None):
+    """
+    기본 테이블에서 수익 분석 데이터 계산
+    원본 테이블/환율표 버전이 같으면 이전 계산 결과를 재사용한다.
+    """
     try:
         # 영업 프로세스 데이터
-        processes = load_func('sales_process') or []
+        processes = load_func('sales_process', columns=PROCESS_COLUMNS) or []
         # 고객 주문 발주 데이터
-        customer_orders = load_func('purchase_orders_to_supplier') or []
+        supplier_orders = load_func('purchase_orders_to_supplier', columns=SUPPLIER_ORDER_COLUMNS) or []
+        rates = rates or load_exchange_rates(load_func)
         
-        analysis_data = []
-        
-        for process in processes:
-            # 해당 프로세스의 발주 비용 찾기
-            related_orders = [
-                order for order in customer_orders 
-                if order.get('sales_process_id') == process.get('id')
-            ]
-            
-            # 총 발주 비용 계산 (USD)
-            total_supplier_cost = sum(
-                float(order.get('total_cost', 0)) for order in related_orders
-            )
-            
-            # 고객 매출 (VND)
-            customer_amount_vnd = float(process.get('total_amount', 0))
-            
-            # 환율 적용 (VND → USD, 임시 환율 24,000)
-            exchange_rate = 24000
-            customer_amount_usd = customer_amount_vnd / exchange_rate if customer_amount_vnd > 0 else 0
-            
-            # 수익률 계산
-            if customer_amount_usd > 0:
-                profit_margin = ((customer_amount_usd - total_supplier_cost) / customer_amount_usd) * 100
-            else:
-                profit_margin = 0
-            
-            analysis_data.append({
-                'process_number': process.get('process_number', 'N/A'),
-                'customer_name': process.get('customer_name', 'N/A'),
-                'customer_amount_vnd': customer_amount_vnd,
-                'customer_amount_usd': customer_amount_usd,
-                'supplier_cost_usd': total_supplier_cost,
-                'profit_usd': customer_amount_usd - total_supplier_cost,
-                'profit_margin_percent': profit_margin,
-                'process_status': process.get('process_status', 'N/A')
-            })
+        key = (_table_version(processes), _table_version(supplier_orders), rates.version)
+        cached = st.session_state.get(_PROFIT_CACHE_KEY)
+        if cached and cached[0] == key:
+            return cached[1]
         
+        analysis_data = compute_profit_analysis(processes, supplier_orders, rates).to_dict('records')
+        st.session_state[_PROFIT_CACHE_KEY] = (key, analysis_data)
         return analysis_data
         
     except Exception as e:
         st.error(f"수익 분석 계산 중 오류: {str(e)}")
         return []
 
-def render_profit_dashboard(analysis_data):
+def render_profit_dashboard(analysis_data, load_func=None):
     """수익 분석 대시보드 렌더링"""
     df = pd.DataFrame(analysis_data)
     
@@ -102,7 +148,8 @@ def render_profit_dashboard(analysis_data):
         st.metric("평균 수익률", f"{avg_margin:.1f}%")
     
     # 환율 정보
-    st.info("💱 적용 환율: 1 USD = 24,000 VND (고정값, 실제 환율과 다를 수 있음)")
+    usd_to_vnd, effective_date = load_exchange_rates(load_func).latest(REPORT_CURRENCY, REVENUE_CURRENCY)
+    st.info(f"💱 최신 환율: 1 USD = {usd_to_vnd:,.0f} VND ({effective_date}부터 적용, 매출은 생성일 기준 환율로 변환)")
     
     # 수익률 분포 차트
     if len(df) > 0:
@@ -256,22 +303,20 @@ def categorize_profit_margin(margin):
         return "손실 (음수)"
 
 # 환율 관련 유틸리티 함수들
-def get_exchange_rate():
-    """환율 정보 반환 (향후 실시간 API 연동 가능)"""
-    # 임시 고정 환율
+def get_exchange_rate(load_func=None, on_date=None):
+    """환율 정보 반환 (exchange_rates 테이블의 on_date 기준 유효 환율)"""
+    rates = load_exchange_rates(load_func)
+    usd_to_vnd = rates.rate('USD', 'VND', on_date)
+    _, last_updated = rates.latest('USD', 'VND')
     return {
-        'USD_to_VND': 24000,
-        'VND_to_USD': 1/24000,
-        'last_updated': '2025-09-28'
+        'USD_to_VND': usd_to_vnd,
+        'VND_to_USD': 1 / usd_to_vnd,
+        'last_updated': last_updated
     }
 
-def convert_currency(amount, from_currency, to_currency):
-    """통화 변환"""
-    rates = get_exchange_rate()
-    
-    if from_currency == 'VND' and to_currency == 'USD':
-        return amount * rates['VND_to_USD']
-    elif from_currency == 'USD' and to_currency == 'VND':
-        return amount * rates['USD_to_VND']
-    else:
-        return amount  # 같은 통화인 경우
\ No newline at end of file
+def convert_currency(amount, from_currency, to_currency, on_date=None, rates=None):
+    """통화 변환 (on_date에 유효한 환율 적용)"""
+    rates = rates or load_exchange_rates()
+    if not rates.has_pair(from_currency, to_currency):
+        return amount  # 환율 정보가 없는 통화쌍은 변환하지 않음
+    return amount * rates.rate(from_currency, to_currency, on_date)
@@ -1,8 +1,38 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 from collections import defaultdict
 
+from utils.filter_engine import month_bounds, row_set
+from utils.query_builder import Condition, QueryFilter, and_
+
+# 환급 대상: 회계 확인 완료 + 개인돈 사용 + 환급 대기중
+REIMBURSEMENT_PENDING_FILTER = (
+    QueryFilter()
+    .eq('accounting_confirmed', True)
+    .or_(Condition('payment_method', 'is', None),
+         and_(Condition('payment_method', 'neq', '법인카드'),
+              Condition('payment_method', 'neq', '법인계좌')))
+    .or_(Condition('reimbursement_status', 'is', None),
+         Condition('reimbursement_status', 'eq', 'pending'))
+)
+
+# 정렬 옵션 → (정렬 컬럼, 내림차순)
+PRINTED_SORT_ORDERS = {
+    "최신순": ('updated_at', True),
+    "오래된순": ('updated_at', False),
+    "금액높은순": ('amount', True),
+}
+
+COMPLETED_SORT_ORDERS = {
+    "최신순": ('reimbursed_at', True),
+    "오래된순": ('reimbursed_at', False),
+    "금액높은순": ('amount', True),
+}
+
+# 기간 옵션 → 일수
+WEEK_FILTER_DAYS = {"최근 1주": 7, "최근 2주": 14, "최근 4주": 28}
+
 
 def show_reimbursement_management(load_data_func, update_data_func, get_current_user_func):
     """환급 관리 메인 함수"""
@@ -47,24 +77,17 @@ def render_reimbursement_pending(load_data_func, update_data_func, get_current_u
     
     st.subheader("📋 환급 대상 목록")
     
-    # 법인별 테이블에서 데이터 로드
-    all_expenses = load_data_func(expense_table)
+    # 법인별 테이블에서 환급 대상만 로드 (DB 필터)
+    pending_expenses = load_data_func(expense_table, filters=REIMBURSEMENT_PENDING_FILTER) or []
     employees = load_data_func("employees")
     
-    if not all_expenses or not employees:
+    if not employees:
         st.info("데이터를 불러올 수 없습니다.")
         return
     
     # 직원 딕셔너리
     employee_dict = {emp.get('id'): emp for emp in employees if emp.get('id')}
     
-      # 환급 대상: 화던 확인 완료 + 개인돈 사용 + 환급 대기중
-    pending_expenses = [exp for exp in all_expenses 
-                    if exp.get('accounting_confirmed', False) == True
-                    and exp.get('payment_method') not in ['법인카드', '법인계좌']
-                    and (exp.get('reimbursement_status') is None 
-                            or exp.get('reimbursement_status') == 'pending')]
-    
     if not pending_expenses:
         st.info("환급 대상 지출요청서가 없습니다.")
         return
@@ -171,9 +194,9 @@ def render_reimbursement_pending(load_data_func, update_data_func, get_current_u
                     
                     with col_btn1:
                         if st.button(f"🖨️ 환급 프린트 ({len(selected_expenses)}건)", type="secondary", use_container_width=True):
-                            # 문서번호 생성 (상태 변경 없이)
-                            from components.system.document_number import generate_document_number
-                            document_number = generate_document_number('PAY', load_func=load_data_func)
+                            # 미리보기 번호 (번호를 소비하지 않음, 환급 완료 처리 시 확정)
+                            from components.system.document_number import preview_document_number
+                            document_number = f"{preview_document_number('PAY')} (미리보기)"
                             
                             # 통화별 그룹핑
                             grouped_by_currency = defaultdict(list)
@@ -188,14 +211,19 @@ def render_reimbursement_pending(load_data_func, update_data_func, get_current_u
                                 'document_number': document_number,
                                 'is_preview': True  # 미리보기 모드
                             }
-                            st.success(f"✅ 프린트 준비 완료! 문서번호: {document_number}")
+                            st.success(f"✅ 프린트 미리보기 준비 완료! 예정 문서번호: {document_number}")
                             st.rerun()
                     
                     with col_btn2:
                         if st.button(f"✅ 환급 완료 처리 ({len(selected_expenses)}건)", type="primary", use_container_width=True):
-                            # 문서번호 생성
+                            # 문서번호는 완료 처리할 때 한 번만 발급하고, 프린트도 이 번호를 사용
                             from components.system.document_number import generate_document_number
-                            document_number = generate_document_number('PAY', load_func=load_data_func)
+                            from utils.sequence_service import SequenceUnavailableError
+                            try:
+                                document_number = generate_document_number('PAY', load_func=load_data_func)
+                            except SequenceUnavailableError as e:
+                                st.error(f"문서번호 발급 실패: {str(e)} 잠시 후 다시 시도해주세요.")
+                                return
                             
                             # 상태를 printed로 변경
                             success_count = 0
@@ -212,6 +240,16 @@ def render_reimbursement_pending(load_data_func, update_data_func, get_current_u
                                     success_count += 1
                             
                             if success_count == len(selected_expenses):
+                                grouped_by_currency = defaultdict(list)
+                                for exp in selected_expenses:
+                                    grouped_by_currency[exp.get('currency', 'VND')].append(exp)
+                                
+                                # 저장된 문서번호로 프린트 화면 열기
+                                st.session_state['print_reimbursement'] = {
+                                    'employee_id': selected_recipient_id,
+                                    'grouped_expenses': dict(grouped_by_currency),
+                                    'document_number': document_number
+                                }
                                 st.success(f"✅ {success_count}건 환급 완료 처리! 문서번호: {document_number}")
                                 st.rerun()
                             else:
@@ -226,34 +264,25 @@ def render_reimbursement_printed(load_data_func, update_data_func, get_current_u
     
     st.subheader("🖨️ 프린트 완료 목록")
     
-    # 법인별 테이블에서 데이터 로드
-    all_expenses = load_data_func(expense_table)
+    # 법인별 테이블에서 printed 상태만 로드 (DB 필터)
+    printed_expenses = load_data_func(expense_table, filters={'reimbursement_status': 'printed'}) or []
     employees = load_data_func("employees")
     
-    if not all_expenses or not employees:
+    if not employees:
         st.info("데이터를 불러올 수 없습니다.")
         return
     
     # 직원 딕셔너리
     employee_dict = {emp.get('id'): emp for emp in employees if emp.get('id')}
     
-    # 환급 완료 항목 필터링 (printed 상태만)
-    printed_expenses = [exp for exp in all_expenses 
-                       if exp.get('reimbursement_status') == 'printed']
-    
     if not printed_expenses:
         st.info("프린트 완료된 항목이 없습니다.")
         return
     
-    # 정렬 옵션
-    sort_option = st.selectbox("정렬", ["최신순", "오래된순", "금액높은순"], key="printed_sort")
-    
-    if sort_option == "최신순":
-        printed_expenses.sort(key=lambda x: x.get('updated_at', ''), reverse=True)
-    elif sort_option == "오래된순":
-        printed_expenses.sort(key=lambda x: x.get('updated_at', ''))
-    elif sort_option == "금액높은순":
-        printed_expenses.sort(key=lambda x: x.get('amount', 0), reverse=True)
+    # 정렬 옵션 (정렬 순서별 정렬 결과 재사용)
+    sort_option = st.selectbox("정렬", list(PRINTED_SORT_ORDERS), key="printed_sort")
+    order_by, desc = PRINTED_SORT_ORDERS[sort_option]
+    printed_expenses = row_set('reimbursement_printed', printed_expenses).ordered(order_by, desc)
     
     st.write(f"📄 총 {len(printed_expenses)}건의 프린트 완료")
     
@@ -367,21 +396,17 @@ def render_reimbursement_completed(load_data_func, get_current_user_func, expens
     
     st.subheader("✅ 최종 완료 내역")
     
-    # 법인별 테이블에서 데이터 로드
-    all_expenses = load_data_func(expense_table)
+    # 법인별 테이블에서 completed 상태만 로드 (DB 필터)
+    completed_expenses = load_data_func(expense_table, filters={'reimbursement_status': 'completed'}) or []
     employees = load_data_func("employees")
     
-    if not all_expenses or not employees:
+    if not employees:
         st.info("데이터를 불러올 수 없습니다.")
         return
     
     # 직원 딕셔너리
     employee_dict = {emp.get('id'): emp for emp in employees if emp.get('id')}
     
-    # 최종 완료 항목 필터링 (completed 상태만)
-    completed_expenses = [exp for exp in all_expenses 
-                         if exp.get('reimbursement_status') == 'completed']
-    
     if not completed_expenses:
         st.info("최종 완료된 내역이 없습니다.")
         return
@@ -392,22 +417,16 @@ def render_reimbursement_completed(load_data_func, get_current_user_func, expens
     
     with col1:
         # 월별 필터
-        available_months = set()
-        for exp in completed_expenses:
-            reimbursed_at = exp.get('reimbursed_at')
-            if reimbursed_at:
-                try:
-                    dt = datetime.fromisoformat(str(reimbursed_at).replace('Z', '+00:00'))
-                    available_months.add(dt.strftime('%Y-%m'))
-                except:
-                    pass
+        # ISO 일시 문자열의 앞 7자리가 YYYY-MM
+        available_months = {str(exp.get('reimbursed_at'))[:7]
+                            for exp in completed_expenses if exp.get('reimbursed_at')}
         
         month_options = ["전체"] + sorted(list(available_months), reverse=True)
         selected_month = st.selectbox("월 선택", month_options, key="month_filter")
     
     with col2:
         # 주별 필터 (ISO 주)
-        week_options = ["전체", "최근 1주", "최근 2주", "최근 4주"]
+        week_options = ["전체"] + list(WEEK_FILTER_DAYS)
         selected_week = st.selectbox("기간 선택", week_options, key="week_filter")
     
     with col3:
@@ -416,35 +435,24 @@ def render_reimbursement_completed(load_data_func, get_current_user_func, expens
         type_options = ["전체"] + sorted(list(expense_types))
         selected_type = st.selectbox("지출 유형", type_options, key="type_filter")
     
-    # 필터링 적용
-    filtered_expenses = completed_expenses.copy()
+    # 필터링 적용 (조건을 하나의 판정 함수로 컴파일해 한 번만 순회)
+    query = QueryFilter()
     
     # 월별 필터
     if selected_month != "전체":
-        filtered_expenses = [exp for exp in filtered_expenses 
-                           if exp.get('reimbursed_at') and 
-                           datetime.fromisoformat(str(exp.get('reimbursed_at')).replace('Z', '+00:00')).strftime('%Y-%m') == selected_month]
+        year, month = (int(part) for part in selected_month.split('-'))
+        query.date_range('reimbursed_at', *month_bounds(year, month))
     
     # 주별 필터
     if selected_week != "전체":
-        from datetime import timedelta
-        now = datetime.now()
-        
-        if selected_week == "최근 1주":
-            cutoff_date = now - timedelta(days=7)
-        elif selected_week == "최근 2주":
-            cutoff_date = now - timedelta(days=14)
-        elif selected_week == "최근 4주":
-            cutoff_date = now - timedelta(days=28)
-        
-        filtered_expenses = [exp for exp in filtered_expenses 
-                           if exp.get('reimbursed_at') and 
-                           datetime.fromisoformat(str(exp.get('reimbursed_at')).replace('Z', '+00:00')) >= cutoff_date]
+        query.gte('reimbursed_at', datetime.now() - timedelta(days=WEEK_FILTER_DAYS[selected_week]))
     
     # 지출 유형 필터
     if selected_type != "전체":
-        filtered_expenses = [exp for exp in filtered_expenses 
-                           if exp.get('expense_type') == selected_type]
+        query.eq('expense_type', selected_type)
+    
+    completed_rows = row_set('reimbursement_completed', completed_expenses)
+    filtered_expenses = completed_rows.select(query)
     
     if not filtered_expenses:
         st.info("필터 조건에 맞는 데이터가 없습니다.")
@@ -502,14 +510,9 @@ def render_reimbursement_completed(load_data_func, get_current_user_func, expens
     st.markdown("---")
     
     # 정렬 옵션
-    sort_option = st.selectbox("정렬", ["최신순", "오래된순", "금액높은순"], key="completed_sort")
-    
-    if sort_option == "최신순":
-        filtered_expenses.sort(key=lambda x: x.get('reimbursed_at', ''), reverse=True)
-    elif sort_option == "오래된순":
-        filtered_expenses.sort(key=lambda x: x.get('reimbursed_at', ''))
-    elif sort_option == "금액높은순":
-        filtered_expenses.sort(key=lambda x: x.get('amount', 0), reverse=True)
+    sort_option = st.selectbox("정렬", list(COMPLETED_SORT_ORDERS), key="completed_sort")
+    order_by, desc = COMPLETED_SORT_ORDERS[sort_option]
+    filtered_expenses = completed_rows.select(query, order_by, desc)
     
     st.write(f"💚 {len(filtered_expenses)}건의 환급 완료 내역")
     
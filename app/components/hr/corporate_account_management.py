@@ -4,6 +4,8 @@ import pandas as pd
 from datetime import datetime, date
 from typing import Dict, List, Optional
 
+from utils.auth import hash_password
+
 def show_corporate_account_management(load_func, save_func, update_func, delete_func, 
                                      get_current_user_func):
     """법인 계정 관리 시스템 메인 함수"""
@@ -215,7 +217,7 @@ def render_account_form(load_func, save_func, update_func, current_user):
                 }
                 
                 if not existing_data:
-                    account_data['password'] = password
+                    account_data['password'] = hash_password(password)
                     account_data['created_at'] = datetime.now().isoformat()
                 
                 # 저장 실행
@@ -272,7 +274,7 @@ def render_password_management(load_func, update_func, current_user):
                 # 비밀번호 업데이트
                 update_data = {
                     'id': selected_acc['id'],
-                    'password': new_password,
+                    'password': hash_password(new_password),
                     'updated_at': datetime.now().isoformat()
                 }
                 
@@ -5,6 +5,12 @@ from datetime import datetime, date, timedelta
 import calendar
 from typing import Dict, List, Optional, Tuple
 
+from utils.database import Projection
+from utils.auth import hash_password, verify_password
+
+# 직원 선택 박스용 컬럼
+EMPLOYEE_OPTION_COLUMNS = Projection("id", "name", "username", "employee_id")
+
 def show_employee_management(load_func, save_func, update_func, delete_func, 
                            get_current_user_func, check_permission_func,
                            get_approval_status_info, calculate_statistics,
@@ -88,7 +94,7 @@ def render_password_management(load_func, update_func, current_user):
                     # 비밀번호 업데이트
                     update_data = {
                         'id': selected_emp['id'],
-                        'password': new_password,
+                        'password': hash_password(new_password),
                         'updated_at': datetime.now().isoformat()
                     }
                     
@@ -111,13 +117,14 @@ def render_password_management(load_func, update_func, current_user):
         
         if submitted:
             # 현재 비밀번호 확인
-            current_employee = load_func("employees", filters={"id": current_user['id']})
+            current_employee = load_func("employees", columns="id,password",
+                                         filters={"id": current_user['id']}, use_cache=False)
             if not current_employee:
                 st.error("사용자 정보를 찾을 수 없습니다.")
             else:
                 current_employee = current_employee[0]
                 
-                if current_password != current_employee.get('password'):
+                if not verify_password(current_employee.get('password'), current_password):
                     st.error("현재 비밀번호가 일치하지 않습니다.")
                 elif not new_password:
                     st.error("새 비밀번호를 입력해주세요.")
@@ -129,7 +136,7 @@ def render_password_management(load_func, update_func, current_user):
                     # 비밀번호 업데이트
                     update_data = {
                         'id': current_user['id'],
-                        'password': new_password,
+                        'password': hash_password(new_password),
                         'updated_at': datetime.now().isoformat()
                     }
                     
@@ -223,7 +230,7 @@ def render_employee_form(load_func, save_func, update_func, current_user, check_
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        employees = load_func("employees", columns="id,name,username,employee_id")
+        employees = load_func("employees", columns=EMPLOYEE_OPTION_COLUMNS)
         employee_options = ["신규 등록"] + [f"{emp['name']} ({emp['username']})" 
                                        for emp in employees if employees]
         selected_employee = st.selectbox("직원 선택", employee_options)
@@ -387,7 +394,7 @@ def render_employee_form(load_func, save_func, update_func, current_user, check_
                 }
                 
                 if not existing_data:
-                    employee_data['password'] = password
+                    employee_data['password'] = hash_password(password)
                     employee_data['created_at'] = datetime.now().isoformat()
                 
                 # 저장 실행
@@ -1,6 +1,8 @@
 import streamlit as st
 from datetime import datetime, date, timedelta
 
+from utils.sequence_service import SequenceUnavailableError
+
 def show_inventory_management(load_func, save_func, update_func, current_user):
     """재고 관리 메인 함수"""
     st.header("📋 재고 관리")
@@ -95,7 +97,11 @@ def render_receiving_management(load_func, save_func, current_user):
             if submitted:
                 if warehouse_location:
                     # 입고 번호 생성
-                    receiving_number = generate_document_number('RCV', save_func)
+                    try:
+                        receiving_number = generate_document_number('RCV', save_func)
+                    except SequenceUnavailableError as e:
+                        st.error(f"❌ 입고 번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+                        return
                     
                     # 입고 데이터 생성
                     receiving_data = {
@@ -224,7 +230,11 @@ def render_quality_inspection(load_func, save_func, update_func, current_user):
                 if submitted:
                     if approved_quantity + rejected_quantity <= total_quantity:
                         # 검수 번호 생성
-                        inspection_number = generate_document_number('QC', save_func)
+                        try:
+                            inspection_number = generate_document_number('QC', save_func)
+                        except SequenceUnavailableError as e:
+                            st.error(f"❌ 검수 번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+                            return
                         
                         # 검수 데이터 생성
                         inspection_data = {
@@ -355,7 +365,11 @@ def render_shipping_management(load_func, save_func, update_func, current_user):
                 if submitted:
                     if delivery_address or delivery_method == "고객 직접 수령":
                         # 출고 번호 생성
-                        shipment_number = generate_document_number('SHIP', save_func)
+                        try:
+                            shipment_number = generate_document_number('SHIP', save_func)
+                        except SequenceUnavailableError as e:
+                            st.error(f"❌ 출고 번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+                            return
                         
                         # 출고 데이터 생성
                         shipment_data = {
@@ -451,18 +465,16 @@ def generate_document_number(doc_type, save_func):
     """문서 번호 생성"""
     current_year = datetime.now().year
     
-    prefixes = {
-        'RCV': f"RCV-{current_year}-",    # Receiving
-        'QC': f"QC-{current_year}-",      # Quality Control
-        'SHIP': f"SHIP-{current_year}-"   # Shipment
+    # 문서 유형 → (번호 접두사, 기존 번호 테이블, 컬럼)
+    sources = {
+        'RCV': ('inventory_receiving', 'receiving_number'),    # Receiving
+        'QC': ('quality_inspection', 'inspection_number'),     # Quality Control
+        'SHIP': ('delivery_shipment', 'shipment_number')       # Shipment
     }
     
-    prefix = prefixes.get(doc_type, f"{doc_type}-{current_year}-")
+    table_name, column = sources.get(doc_type, (None, None))
     
-    # 간단한 순차 번호 생성
-    try:
-        import random
-        next_number = random.randint(1, 9999)
-        return f"{prefix}{next_number:04d}"
-    except:
-        return f"{prefix}0001"
\ No newline at end of file
+    # 연도별 시퀀스에서 중복 없이 발급
+    from utils.sequence_service import next_document_number
+    return next_document_number(doc_type, prefix=f"{doc_type}-{current_year}-", width=4,
+                                period=str(current_year), table_name=table_name, column=column)
\ No newline at end of file
@@ -1,6 +1,8 @@
 import streamlit as st
 from datetime import datetime, date, timedelta
 
+from utils.sequence_service import SequenceUnavailableError
+
 def show_purchase_order_management(load_func, save_func, update_func, current_user):
     """발주 관리 메인 함수"""
     st.header("📦 발주 관리")
@@ -146,11 +148,15 @@ def render_breakdown_external_order_form(item, load_func, save_func, update_func
             submitted = st.form_submit_button("📤 외주 발주 등록", type="primary")
             
             if submitted and supplier_name and unit_cost > 0:
-                create_breakdown_external_order(
-                    item, supplier_name, supplier_contact, supplier_email, 
-                    supplier_phone, order_date, expected_arrival, unit_cost, 
-                    total_cost, payment_terms, notes, save_func, update_func, current_user, company_code
-                )
+                try:
+                    create_breakdown_external_order(
+                        item, supplier_name, supplier_contact, supplier_email, 
+                        supplier_phone, order_date, expected_arrival, unit_cost, 
+                        total_cost, payment_terms, notes, save_func, update_func, current_user, company_code
+                    )
+                except SequenceUnavailableError as e:
+                    st.error(f"❌ 발주서 번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+                    return
                 st.success(f"✅ {item.get('item_code', 'N/A')} 외주 발주가 완료되었습니다!")
                 st.rerun()
             elif submitted:
@@ -347,11 +353,15 @@ def show_customer_order_external_form(process, current_user, save_func, update_f
         
         if submitted:
             if supplier_name and unit_cost > 0:
-                create_customer_order_external_purchase(
-                    process, supplier_name, supplier_contact, supplier_email, 
-                    supplier_phone, order_date, expected_arrival, unit_cost, 
-                    total_cost, payment_terms, notes, current_user, save_func, update_func, company_code
-                )
+                try:
+                    create_customer_order_external_purchase(
+                        process, supplier_name, supplier_contact, supplier_email, 
+                        supplier_phone, order_date, expected_arrival, unit_cost, 
+                        total_cost, payment_terms, notes, current_user, save_func, update_func, company_code
+                    )
+                except SequenceUnavailableError as e:
+                    st.error(f"❌ 발주서 번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+                    return
             else:
                 st.error("공급업체명과 단가를 입력해주세요.")
 
@@ -459,13 +469,17 @@ def render_inventory_replenishment_purchase(load_func, save_func, update_func, c
         
         if submitted:
             if item_name and supplier_name and quantity > 0 and unit_cost > 0:
-                create_inventory_replenishment_order(
-                    item_code, item_name, item_description, category,
-                    supplier_name, supplier_contact, supplier_email, supplier_phone,
-                    order_date, expected_arrival, quantity, unit_cost, total_cost,
-                    currency, payment_terms, target_warehouse, min_stock_level,
-                    reorder_point, purchase_reason, notes, current_user, save_func, company_code
-                )
+                try:
+                    create_inventory_replenishment_order(
+                        item_code, item_name, item_description, category,
+                        supplier_name, supplier_contact, supplier_email, supplier_phone,
+                        order_date, expected_arrival, quantity, unit_cost, total_cost,
+                        currency, payment_terms, target_warehouse, min_stock_level,
+                        reorder_point, purchase_reason, notes, current_user, save_func, company_code
+                    )
+                except SequenceUnavailableError as e:
+                    st.error(f"❌ 발주서 번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+                    return
             else:
                 st.error("필수 항목(상품명, 공급업체명, 수량, 단가)을 모두 입력해주세요.")
 
@@ -721,11 +735,7 @@ def generate_document_number(doc_type, save_func):
         prefix = f"{doc_type}-{current_year}-"
         table_name = 'purchase_orders_to_supplier'
     
-    # 기존 번호 조회하여 다음 번호 생성
-    try:
-        # 간단한 순차 번호 생성 (실제로는 DB에서 MAX 값을 조회해야 함)
-        import random
-        next_number = random.randint(1, 9999)
-        return f"{prefix}{next_number:04d}"
-    except:
-        return f"{prefix}0001"
\ No newline at end of file
+    # 연도별 시퀀스에서 중복 없이 발급 (카운터 시작값은 기존 최대 번호)
+    from utils.sequence_service import next_document_number
+    return next_document_number(doc_type, prefix=prefix, width=4, period=str(current_year),
+                                table_name=table_name, column='po_number')
\ No newline at end of file
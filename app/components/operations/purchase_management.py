@@ -10,8 +10,16 @@ from datetime import datetime, date
 import plotly.express as px
 import plotly.graph_objects as go
 
-def show_purchase_management(load_func, save_func, update_func, delete_func, current_user):
-    """구매품 관리 메인 함수"""
+from utils.filter_engine import filter_rows, month_bounds
+from utils.helpers import apply_batch_updates, queue_batch_result, show_batch_result
+from utils.purchase_approval import (
+    ALREADY_PROCESSED, APPROVED, FAILED, approve_purchase_with_expense
+)
+from utils.query_builder import QueryFilter
+
+def show_purchase_management(load_func, save_func, update_func, delete_func, current_user,
+                             bulk_update_func=None):
+    """구매품 관리 메인 함수 (bulk_update_func: 여러 건 반려 일괄 수정 함수)"""
     st.title("🛒 구매품 관리")
     
     # 법인별 테이블명 생성
@@ -39,7 +47,7 @@ def show_purchase_management(load_func, save_func, update_func, delete_func, cur
         
         with tab3:
             render_approval_management(current_user, load_func, update_func, save_func, 
-                                      purchase_table, expense_table)
+                                      purchase_table, expense_table, bulk_update_func, delete_func)
         
         with tab4:
             render_purchase_list(current_user, user_role, load_func, update_func, delete_func, purchase_table)
@@ -112,9 +120,10 @@ def render_purchase_form(current_user, save_func, purchase_table):
                     st.error("❌ 구매 요청 등록에 실패했습니다.")
 
 def render_approval_management(current_user, load_func, update_func, save_func, 
-                              purchase_table, expense_table):
+                              purchase_table, expense_table, bulk_update_func=None, delete_func=None):
     """승인 관리 (CEO, Master만) - 테이블 형식"""
     st.subheader("✅ 구매 요청 승인 관리")
+    show_batch_result("purchase_approval")
     
     purchases = load_func(purchase_table) or []
     employees = load_func("employees") or []
@@ -184,21 +193,20 @@ def render_approval_management(current_user, load_func, update_func, save_func,
                         st.info(f"선택된 항목: {len(selected_purchases)}건 - {total_str}")
                         
                         if st.button(f"✅ 승인 처리 ({len(selected_purchases)}건)", type="primary", use_container_width=True):
-                            success_count = 0
-                            
+                            # 건마다 지출요청서를 만들고 그 ID를 연결하므로 행 단위 처리
+                            results, skipped = {}, []
                             for purchase in selected_purchases:
-                                if approve_purchase(purchase, current_user, update_func, save_func, load_func, 
-                                                   employee_dict, purchase_table, expense_table):
-                                    success_count += 1
+                                status = approve_purchase(
+                                    purchase, current_user, update_func, save_func, load_func,
+                                    employee_dict, purchase_table, expense_table, delete_func)
+                                if status == ALREADY_PROCESSED:
+                                    skipped.append(purchase.get('id'))
+                                else:
+                                    results[purchase.get('id')] = status == APPROVED
                             
-                            if success_count == len(selected_purchases):
-                                st.success(f"✅ {len(selected_purchases)}건 승인 완료 및 지출요청서 생성!")
-                                time.sleep(2)
-                                st.rerun()
-                            else:
-                                st.warning(f"⚠️ {success_count}/{len(selected_purchases)}건만 처리되었습니다.")
-                                time.sleep(2)
-                                st.rerun()
+                            queue_batch_result("purchase_approval", results, "승인 및 지출요청서 생성",
+                                               skipped=skipped)
+                            st.rerun()
                     else:
                         st.warning("⚠️ 선택한 ID가 승인 대기 목록에 없습니다.")
                 except ValueError:
@@ -226,121 +234,60 @@ def render_approval_management(current_user, load_func, update_func, save_func,
                             if not reject_reason.strip():
                                 st.error("반려 사유를 입력해주세요.")
                             else:
-                                success_count = 0
-                                
-                                for purchase in selected_purchases:
-                                    update_data = {
-                                        'id': purchase.get('id'),
-                                        'approval_status': '반려',
-                                        'approver_id': current_user['id'],
-                                        'approved_at': datetime.now().isoformat(),
-                                        'rejected_reason': reject_reason,
-                                        'status': '반려',
-                                        'updated_at': datetime.now().isoformat()
-                                    }
-                                    
-                                    if update_func(purchase_table, update_data, "id"):
-                                        success_count += 1
+                                now = datetime.now().isoformat()
+                                patch = {
+                                    'approval_status': '반려',
+                                    'approver_id': current_user['id'],
+                                    'approved_at': now,
+                                    'rejected_reason': reject_reason,
+                                    'status': '반려',
+                                    'updated_at': now
+                                }
+                                updates = {p.get('id'): patch for p in selected_purchases}
                                 
-                                if success_count == len(selected_purchases):
-                                    st.success(f"✅ {len(selected_purchases)}건 반려 완료!")
-                                    time.sleep(2)
-                                    st.rerun()
-                                else:
-                                    st.warning(f"⚠️ {success_count}/{len(selected_purchases)}건만 반려되었습니다.")
-                                    time.sleep(2)
-                                    st.rerun()
+                                results = apply_batch_updates(purchase_table, updates, update_func, bulk_update_func)
+                                queue_batch_result("purchase_approval", results, "반려")
+                                st.rerun()
                     else:
                         st.warning("⚠️ 선택한 ID가 승인 대기 목록에 없습니다.")
                 except ValueError:
                     st.error("⚠️ ID는 숫자로 입력해주세요.")
 
 def approve_purchase(purchase, current_user, update_func, save_func, load_func, 
-                    employee_dict, purchase_table, expense_table):
-    """구매 요청 승인 + 지출요청서 자동 생성"""
+                    employee_dict, purchase_table, expense_table, delete_func=None):
+    """
+    구매 요청 승인 + 지출요청서 자동 생성
+    문서번호 발급, 생성/연결은 승인 서비스에서 처리 (지출 테이블 전체 조회 없음)
+    Returns:
+        APPROVED / ALREADY_PROCESSED / FAILED
+    """
     try:
-        total_amount = purchase.get('unit_price', 0) * purchase.get('quantity', 1)
-        
-        today = datetime.now()
-        date_prefix = f"EXP-{today.strftime('%y%m%d')}"
-        
-        all_expenses = load_func(expense_table) or []
-        today_expenses = [exp for exp in all_expenses if exp.get('document_number', '').startswith(date_prefix)]
-        
-        if today_expenses:
-            existing_numbers = []
-            for exp in today_expenses:
-                doc_num = exp.get('document_number', '')
-                if '-' in doc_num:
-                    try:
-                        seq = int(doc_num.split('-')[-1])
-                        existing_numbers.append(seq)
-                    except:
-                        pass
-            next_seq = max(existing_numbers) + 1 if existing_numbers else 1
-        else:
-            next_seq = 1
-        
-        doc_number = f"{date_prefix}-{next_seq:03d}"
-        
-        expense_data = {
-            'document_number': doc_number,
-            'expense_type': purchase.get('category', '기타'),
-            'description': f"{purchase.get('item_name', '')} ({purchase.get('quantity', 0)}{purchase.get('unit', '개')}) - {purchase.get('supplier', '')}",
-            'amount': total_amount,
-            'currency': purchase.get('currency', 'KRW'),
-            'expense_date': purchase.get('request_date', date.today().isoformat()),
-            'payment_method': '법인계좌',
-            'receipt_required': True,
-            'notes': f"구매요청서 ID: {purchase.get('id')} | {purchase.get('notes', '')}",
-            'requester': purchase.get('requester'),
-            'approval_status': 'pending',
-            'status': 'pending',
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
-        }
-        
-        expense_result = save_func(expense_table, expense_data)
-        
-        if expense_result:
-            all_expenses_updated = load_func(expense_table) or []
-            created_expense = next((exp for exp in all_expenses_updated 
-                                  if exp.get('document_number') == doc_number), None)
-            
-            expense_id = created_expense.get('id') if created_expense else None
-            
-            purchase_update = {
-                'id': purchase.get('id'),
-                'approval_status': '승인완료',
-                'approver_id': current_user['id'],
-                'approved_at': datetime.now().isoformat(),
-                'status': '승인완료',
-                'expense_id': expense_id,
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            return update_func(purchase_table, purchase_update, "id")
-        
-        return False
+        status, _ = approve_purchase_with_expense(
+            purchase, current_user['id'], save_func, update_func, delete_func,
+            purchase_table=purchase_table, expense_table=expense_table, load_func=load_func
+        )
+        return status
         
     except Exception as e:
         st.error(f"승인 처리 중 오류: {str(e)}")
-        return False
+        return FAILED
 
 def render_purchase_list(current_user, user_role, load_func, update_func, delete_func, purchase_table):
     """구매 요청 목록 - 테이블 형식"""
     st.subheader("📋 구매품 목록")
     
-    purchases = load_func(purchase_table) or []
+    # 일반 직원은 본인 요청만 (DB 필터)
+    filters = None
+    if user_role not in ['Master', 'CEO', 'Admin', 'Manager']:
+        filters = {'requester': current_user['id']}
+    
+    purchases = load_func(purchase_table, filters=filters) or []
     employees = load_func("employees") or []
     
     if not purchases:
         st.info("등록된 구매품이 없습니다.")
         return
     
-    if user_role not in ['Master', 'CEO', 'Admin', 'Manager']:
-        purchases = [p for p in purchases if p.get('requester') == current_user['id']]
-    
     st.write(f"📦 총 {len(purchases)}건의 구매 요청")
     
     employee_dict = {emp.get('id'): emp for emp in employees if emp.get('id')}
@@ -560,32 +507,20 @@ def render_purchase_statistics(load_func, purchase_table):
         categories = ["전체"] + sorted(list(set([p.get('category', '기타') for p in purchases])))
         selected_category = st.selectbox("카테고리", categories)
     
-    # 데이터 필터링
-    filtered_purchases = []
-    for p in purchases:
-        if not p.get('request_date'):
-            continue
-        
-        try:
-            req_date = datetime.fromisoformat(p['request_date'])
-            
-            if req_date.year != selected_year:
-                continue
-            
-            if selected_month != "전체":
-                month_num = int(selected_month.replace("월", ""))
-                if req_date.month != month_num:
-                    continue
-            
-            if selected_currency != "전체" and p.get('currency') != selected_currency:
-                continue
-            
-            if selected_category != "전체" and p.get('category') != selected_category:
-                continue
-            
-            filtered_purchases.append(p)
-        except:
-            continue
+    # 데이터 필터링 (조건을 하나의 판정 함수로 컴파일해 한 번만 순회)
+    query = QueryFilter()
+    if selected_month != "전체":
+        query.date_range('request_date', *month_bounds(selected_year, int(selected_month.replace("월", ""))))
+    else:
+        query.date_range('request_date', date(selected_year, 1, 1), date(selected_year, 12, 31))
+    
+    if selected_currency != "전체":
+        query.eq('currency', selected_currency)
+    
+    if selected_category != "전체":
+        query.eq('category', selected_category)
+    
+    filtered_purchases = filter_rows(purchases, query)
     
     if not filtered_purchases:
         st.warning("선택한 조건에 해당하는 데이터가 없습니다.")
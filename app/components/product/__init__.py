@@ -4,8 +4,23 @@
 - product_management: 제품 상세 정보 관리
 """
 
-from .product_code_management import show_product_code_management
-from .product_management import show_product_management
+import importlib
+
+# 공개 함수 → 하위 모듈 (처음 접근할 때 import, 한 페이지를 열 때 다른 페이지 모듈까지 불러오지 않음)
+_LAZY_EXPORTS = {
+    'show_product_code_management': '.product_code_management',
+    'show_product_management': '.product_management',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'show_product_code_management',
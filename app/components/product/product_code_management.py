@@ -9,9 +9,13 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import io
+from utils.code_import import (
+    existing_code_ids, find_file_duplicates, find_row_errors, load_existing_codes,
+    normalize_code_import, sorted_messages, write_codes
+)
 
-def show_product_code_management(load_func, save_func, update_func, delete_func):
-    """제품 코드 관리 메인"""
+def show_product_code_management(load_func, save_func, update_func, delete_func, bulk_save_func=None):
+    """제품 코드 관리 메인 (bulk_save_func: CSV 일괄 저장 함수)"""
     st.title("🏷️ 제품 코드 관리")
     
     # 탭 구성 (가격 관리 제거)
@@ -28,7 +32,7 @@ def show_product_code_management(load_func, save_func, update_func, delete_func)
         render_code_list_table_view(load_func, update_func, delete_func)
     
     with tab3:
-        render_bulk_operations(load_func, save_func, update_func, delete_func)
+        render_bulk_operations(load_func, save_func, update_func, delete_func, bulk_save_func)
 
 
 # ==========================================
@@ -386,7 +390,7 @@ def render_code_table(codes, registered_codes=None):
 # 대량 등록/수정
 # ==========================================
 
-def render_bulk_operations(load_func, save_func, update_func, delete_func):
+def render_bulk_operations(load_func, save_func, update_func, delete_func, bulk_save_func=None):
     """대량 등록/수정"""
     st.header("📤 CSV 대량 등록/수정")
     
@@ -396,7 +400,7 @@ def render_bulk_operations(load_func, save_func, update_func, delete_func):
         render_csv_template_download()
     
     with bulk_tab2:
-        render_csv_upload(load_func, save_func, update_func, delete_func)
+        render_csv_upload(load_func, save_func, update_func, delete_func, bulk_save_func)
 
 
 def render_csv_template_download():
@@ -437,7 +441,7 @@ def render_csv_template_download():
     )
 
 
-def render_csv_upload(load_func, save_func, update_func, delete_func):
+def render_csv_upload(load_func, save_func, update_func, delete_func, bulk_save_func=None):
     """CSV 업로드"""
     st.subheader("📤 CSV 파일 업로드")
     
@@ -465,7 +469,7 @@ def render_csv_upload(load_func, save_func, update_func, delete_func):
                         for error in errors:
                             st.write(f"- {error}")
                     else:
-                        success_count = bulk_insert_codes(df, save_func)
+                        success_count = bulk_insert_codes(df, bulk_save_func)
                         if success_count > 0:
                             st.success(f"✅ {success_count}개 코드가 등록되었습니다!")
                             st.balloons()
@@ -473,14 +477,16 @@ def render_csv_upload(load_func, save_func, update_func, delete_func):
             
             with col2:
                 if st.button("🔄 업데이트", use_container_width=True):
-                    errors = validate_csv_data(df, load_func, mode='update')
+                    # 기존 코드는 한 번만 조회하여 검증과 저장에 함께 사용
+                    existing_ids = existing_code_ids(load_existing_codes(load_func))
+                    errors = validate_csv_data(df, load_func, mode='update', existing_ids=existing_ids)
                     
                     if errors:
                         st.error("❌ 데이터 검증 실패:")
                         for error in errors:
                             st.write(f"- {error}")
                     else:
-                        result = bulk_upsert_codes(df, load_func, save_func, update_func)
+                        result = bulk_upsert_codes(df, load_func, bulk_save_func, existing_ids)
                         st.success(f"✅ 신규: {result['inserted']}개, 수정: {result['updated']}개")
                         st.balloons()
                         st.rerun()
@@ -524,8 +530,11 @@ def generate_codes_csv(codes):
     return df.to_csv(index=False, encoding='utf-8-sig')
 
 
-def validate_csv_data(df, load_func, mode='insert'):
-    """CSV 데이터 검증"""
+def validate_csv_data(df, load_func, mode='insert', existing_ids=None):
+    """
+    CSV 데이터 검증 (컬럼 단위 벡터 연산)
+    기존 코드는 id/full_code 등 필요한 컬럼만 한 번 읽어 해시 조회로 중복을 판정한다.
+    """
     errors = []
     
     required_columns = ['category', 'description']
@@ -536,170 +545,48 @@ def validate_csv_data(df, load_func, mode='insert'):
     if errors:
         return errors
     
-    existing_codes = load_func('product_codes') or []
-    existing_full_codes = [code.get('full_code') for code in existing_codes]
+    frame = normalize_code_import(df)
+    row_errors = find_row_errors(frame)
     
-    csv_full_codes = []
+    duplicated = find_file_duplicates(frame)
+    for row_no, full_code in zip(frame.loc[duplicated, 'row_no'], frame.loc[duplicated, 'full_code']):
+        row_errors.append((row_no, 11, f"행 {row_no}: 코드 '{full_code}'가 CSV 내에서 중복됩니다."))
     
-    for idx, row in df.iterrows():
-        row_num = idx + 2
-        
-        category = str(row.get('category', '')).strip()
-        description = str(row.get('description', '')).strip()
-        
-        if not category:
-            errors.append(f"행 {row_num}: 카테고리가 비어있습니다.")
-        
-        if not description:
-            errors.append(f"행 {row_num}: 설명이 비어있습니다.")
-        
-        has_code = False
-        for i in range(1, 8):
-            code_col = f'code{i:02d}'
-            if code_col in df.columns:
-                code_val = str(row.get(code_col, '')).strip()
-                if code_val:
-                    has_code = True
-                    if len(code_val) > 10:
-                        errors.append(f"행 {row_num}: {code_col}이 10자를 초과합니다.")
-        
-        if not has_code:
-            errors.append(f"행 {row_num}: 최소 1개 이상의 코드가 필요합니다.")
-        
-        full_code = generate_full_code(
-            str(row.get('code01', '')),
-            str(row.get('code02', '')),
-            str(row.get('code03', '')),
-            str(row.get('code04', '')),
-            str(row.get('code05', '')),
-            str(row.get('code06', '')),
-            str(row.get('code07', ''))
-        )
-        
-        if full_code:
-            if full_code in csv_full_codes:
-                errors.append(f"행 {row_num}: 코드 '{full_code}'가 CSV 내에서 중복됩니다.")
-            else:
-                csv_full_codes.append(full_code)
-            
-            if mode == 'insert' and full_code in existing_full_codes:
-                errors.append(f"행 {row_num}: 코드 '{full_code}'가 이미 DB에 존재합니다.")
+    if mode == 'insert':
+        if existing_ids is None:
+            existing_ids = existing_code_ids(load_existing_codes(load_func))
+        exists = (frame['full_code'] != '') & frame['full_code'].isin(set(existing_ids))
+        for row_no, full_code in zip(frame.loc[exists, 'row_no'], frame.loc[exists, 'full_code']):
+            row_errors.append((row_no, 12, f"행 {row_no}: 코드 '{full_code}'가 이미 DB에 존재합니다."))
     
-    return errors
+    return sorted_messages(row_errors)
 
 
-def bulk_insert_codes(df, save_func):
-    """대량 코드 삽입"""
-    success_count = 0
-    
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for idx, row in df.iterrows():
-        try:
-            full_code = generate_full_code(
-                str(row.get('code01', '')),
-                str(row.get('code02', '')),
-                str(row.get('code03', '')),
-                str(row.get('code04', '')),
-                str(row.get('code05', '')),
-                str(row.get('code06', '')),
-                str(row.get('code07', ''))
-            )
-            
-            code_data = {
-                'category': str(row.get('category', '')).strip(),
-                'code01': str(row.get('code01', '')).strip() or None,
-                'code02': str(row.get('code02', '')).strip() or None,
-                'code03': str(row.get('code03', '')).strip() or None,
-                'code04': str(row.get('code04', '')).strip() or None,
-                'code05': str(row.get('code05', '')).strip() or None,
-                'code06': str(row.get('code06', '')).strip() or None,
-                'code07': str(row.get('code07', '')).strip() or None,
-                'full_code': full_code,
-                'description': str(row.get('description', '')).strip(),
-                'is_active': str(row.get('is_active', 'TRUE')).upper() == 'TRUE',
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            if save_func('product_codes', code_data):
-                success_count += 1
-            
-            progress = (idx + 1) / len(df)
-            progress_bar.progress(progress)
-            status_text.text(f"처리 중... {idx + 1}/{len(df)}")
-        
-        except Exception as e:
-            st.warning(f"행 {idx + 2} 처리 오류: {str(e)}")
-    
-    progress_bar.empty()
-    status_text.empty()
-    
-    return success_count
+def _report_write_failures(failed):
+    """일괄 저장 실패 행 표시"""
+    for row_no, message in failed:
+        st.warning(f"행 {row_no} 처리 오류: {message}")
 
 
-def bulk_upsert_codes(df, load_func, save_func, update_func):
-    """대량 코드 Upsert"""
-    inserted_count = 0
-    updated_count = 0
-    
-    existing_codes = load_func('product_codes') or []
-    existing_dict = {code.get('full_code'): code for code in existing_codes}
-    
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for idx, row in df.iterrows():
-        try:
-            full_code = generate_full_code(
-                str(row.get('code01', '')),
-                str(row.get('code02', '')),
-                str(row.get('code03', '')),
-                str(row.get('code04', '')),
-                str(row.get('code05', '')),
-                str(row.get('code06', '')),
-                str(row.get('code07', ''))
-            )
-            
-            code_data = {
-                'category': str(row.get('category', '')).strip(),
-                'code01': str(row.get('code01', '')).strip() or None,
-                'code02': str(row.get('code02', '')).strip() or None,
-                'code03': str(row.get('code03', '')).strip() or None,
-                'code04': str(row.get('code04', '')).strip() or None,
-                'code05': str(row.get('code05', '')).strip() or None,
-                'code06': str(row.get('code06', '')).strip() or None,
-                'code07': str(row.get('code07', '')).strip() or None,
-                'full_code': full_code,
-                'description': str(row.get('description', '')).strip(),
-                'is_active': str(row.get('is_active', 'TRUE')).upper() == 'TRUE',
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            if full_code in existing_dict:
-                existing_code = existing_dict[full_code]
-                code_data['id'] = existing_code.get('id')
-                
-                if update_func('product_codes', code_data):
-                    updated_count += 1
-            else:
-                code_data['created_at'] = datetime.now().isoformat()
-                
-                if save_func('product_codes', code_data):
-                    inserted_count += 1
-            
-            progress = (idx + 1) / len(df)
-            progress_bar.progress(progress)
-            status_text.text(f"처리 중... {idx + 1}/{len(df)} (신규: {inserted_count}, 수정: {updated_count})")
-        
-        except Exception as e:
-            st.warning(f"행 {idx + 2} 처리 오류: {str(e)}")
+def bulk_insert_codes(df, bulk_save_func=None):
+    """대량 코드 삽입 (청크 단위 일괄 insert)"""
+    result = write_codes(normalize_code_import(df), bulk_save_func=bulk_save_func)
+    _report_write_failures(result['failed'])
+    return result['inserted']
+
+
+def bulk_upsert_codes(df, load_func, bulk_save_func=None, existing_ids=None):
+    """
+    대량 코드 Upsert
+    기존 full_code는 id 기준 일괄 upsert, 신규 코드는 일괄 insert
+    """
+    if existing_ids is None:
+        existing_ids = existing_code_ids(load_existing_codes(load_func))
     
-    progress_bar.empty()
-    status_text.empty()
+    result = write_codes(normalize_code_import(df), existing_ids, bulk_save_func=bulk_save_func)
+    _report_write_failures(result['failed'])
     
     return {
-        'inserted': inserted_count,
-        'updated': updated_count
-    }
\ No newline at end of file
+        'inserted': result['inserted'],
+        'updated': result['updated']
+    }
@@ -8,6 +8,9 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
+from utils.helpers import PaginationHelper, get_page_args, render_pagination_controls
+from utils.query_builder import QueryFilter, Condition
+
 def show_product_management(load_func, save_func, update_func, delete_func, current_user):
     """제품 관리 메인 페이지"""
     st.title("📦 제품 관리")
@@ -848,8 +851,8 @@ def render_product_list_table_view(load_func, update_func, delete_func, product_
     st.header("📋 제품 목록")
     
     try:
-        # 법인별 테이블에서 로드
-        products = load_func(product_table) or []
+        # 카테고리 옵션용 컬럼만 로드 (목록은 페이지 단위로 조회)
+        products = load_func(product_table, columns="category") or []
         
         if not products:
             st.info("등록된 제품이 없습니다.")
@@ -860,20 +863,25 @@ def render_product_list_table_view(load_func, update_func, delete_func, product_
         if 'editing_product_id' not in st.session_state:
             st.session_state.editing_product_id = None
         
-        render_search_filters_product(products, load_func)
+        render_search_filters_product(products, load_func, product_table)
         render_edit_delete_controls_product(load_func, update_func, delete_func, product_table)
         
         if st.session_state.show_edit_form_product and st.session_state.get('editing_product_data'):
             render_edit_form_expandable_product(update_func, product_table)
         
-        filtered_products = get_filtered_products(products)
-        render_product_table(filtered_products)
+        # 검색 조건은 DB 쿼리로 처리하고 현재 페이지만 조회 (ID 오름차순)
+        product_query = get_filtered_products_query()
+        page_args = get_page_args("product_list", product_query.cache_key())
+        page_result = load_func(product_table, filters=product_query, **page_args)
+        render_product_table(page_result, PaginationHelper.get_total("product_list", page_result))
+        if page_result:
+            render_pagination_controls("product_list", page_result)
     
     except Exception as e:
         st.error(f"❌ 제품 목록 로드 중 오류: {str(e)}")
 
 
-def render_search_filters_product(products, load_func):
+def render_search_filters_product(products, load_func, product_table):
     """검색 필터 - 제품 등록과 동일한 방식"""
     
     st.markdown("### 🔍 제품 검색")
@@ -889,7 +897,7 @@ def render_search_filters_product(products, load_func):
     if search_mode == "단계별 코드 선택":
         render_cascading_search_filters(load_func)
     else:
-        render_text_search_filters(products)
+        render_text_search_filters(products, load_func, product_table)
     
     st.markdown("---")
 
@@ -1007,7 +1015,7 @@ def render_cascading_search_filters(load_func):
         st.session_state.product_code_search_selections = {}
 
 
-def render_text_search_filters(products):
+def render_text_search_filters(products, load_func, product_table):
     """텍스트 검색 (기존 방식)"""
     
     col1, col2, col3, col4 = st.columns([3, 1.5, 1.5, 1])
@@ -1026,7 +1034,7 @@ def render_text_search_filters(products):
         st.write("")
         st.write("")
         if st.button("📥 CSV", use_container_width=True):
-            csv_data = generate_products_csv(products)
+            csv_data = generate_products_csv(load_func(product_table) or [])
             st.download_button("다운로드", csv_data, f"products_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv")
     
     # 코드 선택 초기화
@@ -1046,8 +1054,8 @@ def render_edit_delete_controls_product(load_func, update_func, delete_func, pro
         if st.button("✏️ 수정", use_container_width=True, type="primary"):
             if product_id_input and product_id_input.strip().isdigit():
                 product_id = int(product_id_input.strip())
-                # 법인별 테이블에서 로드
-                products = load_func(product_table) or []
+                # 법인별 테이블에서 해당 ID만 조회
+                products = load_func(product_table, filters={'id': product_id}) or []
                 found = next((p for p in products if p.get('id') == product_id), None)
                 
                 if found:
@@ -1155,50 +1163,39 @@ def render_edit_form_expandable_product(update_func, product_table):
                 st.rerun()
 
 
-def get_filtered_products(products):
-    """필터 적용 - 코드 선택 방식 추가"""
-    filtered = products.copy()
+def get_filtered_products_query():
+    """필터 조건을 DB 쿼리 조건(QueryFilter)으로 변환 - 코드 선택 방식 포함"""
+    query = QueryFilter()
     
     # 검색 방식 확인
     search_mode = st.session_state.get('product_list_search_mode', '텍스트 검색')
     
     if search_mode == "단계별 코드 선택":
-        # 코드 선택 방식
+        # 코드 선택 방식 - 선택된 코드 값이 모두 제품 코드에 포함
         selections = st.session_state.get('product_code_search_selections', {})
-        
-        if selections:
-            # 선택된 코드로 필터링
-            for level, value in selections.items():
-                filtered = [
-                    p for p in filtered
-                    if value in str(p.get('product_code', ''))
-                ]
+        for level, value in selections.items():
+            query.search(value, 'product_code')
     else:
-        # 텍스트 검색 방식 (기존)
+        # 텍스트 검색 방식 (제품 코드/영문명)
         search_term = st.session_state.get('product_search_term', '')
-        if search_term:
-            filtered = [
-                p for p in filtered
-                if search_term.lower() in str(p.get('product_code', '')).lower()
-                or search_term.lower() in str(p.get('product_name_en', '')).lower()
-            ]
+        query.search(search_term, 'product_code', 'product_name_en')
         
         category = st.session_state.get('product_selected_category', '전체')
         if category != '전체':
-            filtered = [p for p in filtered if p.get('category') == category]
+            query.eq('category', category)
     
     # 상태 필터 (공통)
     status = st.session_state.get('product_status_filter', '전체')
     if status == "활성":
-        filtered = [p for p in filtered if p.get('is_active')]
+        query.eq('is_active', True)
     elif status == "비활성":
-        filtered = [p for p in filtered if not p.get('is_active')]
+        query.or_(Condition('is_active', 'eq', False), Condition('is_active', 'is', None))
     
-    return sorted(filtered, key=lambda x: x.get('id', 0))
+    return query.order('id')
 
 
-def render_product_table(products):
-    """제품 테이블"""
+def render_product_table(products, total_count=None):
+    """제품 테이블 (total_count: 페이지 조회 시 전체 건수)"""
     if not products:
         st.info("조건에 맞는 제품이 없습니다.")
         return
@@ -1222,7 +1219,7 @@ def render_product_table(products):
     df = pd.DataFrame(table_data)
     
     st.dataframe(df, use_container_width=True, hide_index=True)
-    st.caption(f"📊 총 **{len(products)}개** 제품")
+    st.caption(f"📊 총 **{total_count if total_count is not None else len(products)}개** 제품")
 
 # ==========================================
 # CSV 관리
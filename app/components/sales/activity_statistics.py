@@ -0,0 +1,226 @@
+"""
+영업 활동 통계 계산
+Sales activity statistics computed with a single group-by pass
+
+고객 수 × 활동 수만큼 DataFrame을 반복 필터링하던 방문 통계를
+활동 날짜를 한 번만 파싱한 뒤 customer_id/activity_type 기준 groupby로 계산한다.
+결과는 원본 데이터가 바뀌지 않는 한 세션에 보관하여 재사용한다.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from utils.database import Projection
+
+# 통계에 필요한 활동 컬럼
+ACTIVITY_STAT_COLUMNS = Projection(
+    "id", "customer_id", "activity_type", "activity_date", "primary_contact",
+    "created_at", "updated_at"
+)
+
+# 통계에 필요한 고객 컬럼
+CUSTOMER_STAT_COLUMNS = Projection(
+    "id", "company_name_short", "company_name_original", "status", "city",
+    "created_at", "updated_at"
+)
+
+# 재방문 필요 기준 (일)
+OVERDUE_DAYS = 30
+
+# 확인 필요 기준 (일)
+WARNING_DAYS = 14
+
+# 월별 추이 표시 개월 수
+MONTHLY_PERIODS = 6
+
+# 담당자 순위 표시 수
+TOP_CONTACTS = 10
+
+_STATS_STATE_KEY = 'sales_activity_statistics'
+
+
+def _column(df: pd.DataFrame, column: str) -> pd.Series:
+    if column in df.columns:
+        return df[column]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+class ActivityStatistics:
+    """
+    방문 통계 결과
+    - customer_stats: 활동이 있는 활성 고객별 총 활동 수/유형별 건수/마지막 활동일
+    - type_stats[유형]: 유형별 고객 통계
+    - monthly[None 또는 유형]: 최근 월별 활동 수
+    - contacts[유형]: 담당자별 활동 수 순위
+    """
+
+    def __init__(self, activity_types: List[str]):
+        self.activity_types = list(activity_types)
+        self.total_customers = 0
+        self.active_customers = pd.DataFrame(columns=['name', 'city'])
+        self.has_activities = False
+        self.customer_stats = pd.DataFrame()
+        self.type_stats: Dict[str, pd.DataFrame] = {}
+        self.type_activity_counts: Dict[str, int] = {}
+        self.monthly: Dict[Optional[str], pd.Series] = {}
+        self.contacts: Dict[str, pd.Series] = {}
+        self.summary: Dict[str, int] = {}
+
+    def ranked(self, activity_type: Optional[str] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """활동 수 기준 순위 (동률은 고객 등록 순서 유지)"""
+        if activity_type is None:
+            frame, column = self.customer_stats, 'total'
+        else:
+            frame, column = self.type_stats.get(activity_type, pd.DataFrame()), 'count'
+        if frame.empty:
+            return frame
+        frame = frame.sort_values(column, ascending=False, kind='stable')
+        return frame.head(limit) if limit else frame
+
+    def overdue(self, activity_type: Optional[str] = None) -> pd.DataFrame:
+        """마지막 활동 후 OVERDUE_DAYS일 초과 고객"""
+        frame = self.customer_stats if activity_type is None else self.type_stats.get(activity_type, pd.DataFrame())
+        if frame.empty:
+            return frame
+        return frame[frame['days_since'] > OVERDUE_DAYS]
+
+    def without_activity(self, activity_type: Optional[str] = None) -> pd.DataFrame:
+        """활동(또는 해당 유형 활동)이 없는 활성 고객"""
+        frame = self.customer_stats if activity_type is None else self.type_stats.get(activity_type, pd.DataFrame())
+        return self.active_customers[~self.active_customers.index.isin(frame.index)]
+
+
+def compute_activity_statistics(activities: List[Dict[str, Any]], customers: List[Dict[str, Any]],
+                                activity_types: List[str], now: Optional[datetime] = None) -> ActivityStatistics:
+    """
+    방문 통계 계산 (활동 날짜는 한 번만 파싱, 고객/유형별 집계는 groupby 한 번)
+    활성 고객은 status가 명시적으로 'active'인 고객만 포함한다.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    stats = ActivityStatistics(activity_types)
+
+    customer_df = pd.DataFrame(customers or [])
+    stats.total_customers = len(customer_df)
+    if customer_df.empty:
+        return stats
+
+    names = _column(customer_df, 'company_name_short')
+    names = names.where(names.notna() & (names.astype(str) != ''), _column(customer_df, 'company_name_original'))
+    active_mask = _column(customer_df, 'status').astype(str).str.lower() == 'active'
+    active = pd.DataFrame({
+        'name': names,
+        'city': _column(customer_df, 'city').fillna('N/A'),
+    })[active_mask]
+    active.index = customer_df.loc[active_mask, 'id']
+    stats.active_customers = active[~active.index.duplicated(keep='last')]
+
+    acts = pd.DataFrame(activities or [])
+    stats.has_activities = not acts.empty
+    types = stats.activity_types
+    stats.summary = {
+        'total_customers': len(stats.active_customers),
+        'active': 0,
+        'inactive': len(stats.active_customers),
+        'overdue': 0,
+        'total_activities': 0,
+    }
+    if acts.empty:
+        return stats
+
+    for column in ('customer_id', 'activity_type', 'primary_contact'):
+        acts[column] = _column(acts, column)
+    dates = pd.to_datetime(_column(acts, 'activity_date'), errors='coerce')
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    acts['date'] = dates
+    acts['month'] = dates.dt.to_period('M')
+
+    # 활성 고객 활동만 고객 통계에 사용
+    in_active = acts['customer_id'].isin(stats.active_customers.index)
+    active_acts = acts[in_active]
+    customer_info = stats.active_customers[['name', 'city']]
+
+    # 고객별 / 고객·유형별 집계
+    overall = active_acts.groupby('customer_id').agg(total=('customer_id', 'size'), last_date=('date', 'max'))
+    by_type = active_acts.groupby(['customer_id', 'activity_type']).agg(
+        count=('customer_id', 'size'), last_date=('date', 'max'))
+    if by_type.empty:
+        type_counts = pd.DataFrame(columns=types, dtype=int)
+    else:
+        type_counts = by_type['count'].unstack(fill_value=0).reindex(columns=types, fill_value=0)
+
+    customer_stats = customer_info.join(overall, how='inner').join(type_counts)
+    customer_stats[types] = customer_stats[types].fillna(0).astype(int)
+    customer_stats['days_since'] = (now - customer_stats['last_date']).dt.days
+    stats.customer_stats = customer_stats
+
+    type_levels = set(by_type.index.get_level_values('activity_type')) if not by_type.empty else set()
+    for activity_type in types:
+        if activity_type in type_levels:
+            frame = customer_info.join(by_type.xs(activity_type, level='activity_type'), how='inner')
+            frame['days_since'] = (now - frame['last_date']).dt.days
+        else:
+            frame = pd.DataFrame(columns=['name', 'city', 'count', 'last_date', 'days_since'])
+        stats.type_stats[activity_type] = frame
+
+    # 유형별 활동 수 / 월별 추이 (전체 활동 기준)
+    type_totals = acts['activity_type'].value_counts()
+    stats.type_activity_counts = {t: int(type_totals.get(t, 0)) for t in types}
+    stats.monthly[None] = acts.groupby('month').size().tail(MONTHLY_PERIODS)
+    monthly_by_type = acts.groupby(['activity_type', 'month']).size()
+    monthly_types = set(monthly_by_type.index.get_level_values(0)) if not monthly_by_type.empty else set()
+    for activity_type in types:
+        if activity_type in monthly_types:
+            stats.monthly[activity_type] = monthly_by_type.xs(activity_type, level='activity_type').tail(MONTHLY_PERIODS)
+        else:
+            stats.monthly[activity_type] = pd.Series(dtype=int)
+
+    # 담당자별 활동 수 (활성 고객 활동 기준, 빈 담당자 제외)
+    contact = active_acts['primary_contact']
+    valid_contact = contact.notna() & (contact.astype(str).str.strip() != '')
+    contact_counts = active_acts[valid_contact].groupby(['activity_type', 'primary_contact'], sort=False).size()
+    contact_types = set(contact_counts.index.get_level_values(0)) if not contact_counts.empty else set()
+    for activity_type in types:
+        if activity_type in contact_types:
+            counts = contact_counts.xs(activity_type, level='activity_type')
+            stats.contacts[activity_type] = counts.sort_values(ascending=False, kind='stable').head(TOP_CONTACTS)
+        else:
+            stats.contacts[activity_type] = pd.Series(dtype=int)
+
+    active_count = len(customer_stats)
+    stats.summary.update({
+        'active': active_count,
+        'inactive': len(stats.active_customers) - active_count,
+        'overdue': int((customer_stats['days_since'] > OVERDUE_DAYS).sum()),
+        'total_activities': int(customer_stats['total'].sum()),
+    })
+    return stats
+
+
+def _data_signature(activities: List[Dict[str, Any]], customers: List[Dict[str, Any]]) -> tuple:
+    """원본 변경 여부 판단용 서명 (날짜 + 건수 + 최근 수정 시각)"""
+    def latest(rows):
+        return max((str(r.get('updated_at') or r.get('created_at') or '') for r in rows), default='')
+    return (date.today(), len(activities), latest(activities), len(customers), latest(customers))
+
+
+def get_activity_statistics(load_func, activity_table: str, customer_table: str,
+                            load_customers_func, activity_types: List[str]):
+    """
+    방문 통계 (세션 캐시)
+    원본 서명이 같으면 이전 계산 결과를 그대로 반환한다.
+    """
+    activities = load_func(activity_table, columns=ACTIVITY_STAT_COLUMNS) or []
+    customers = load_customers_func(customer_table, columns=CUSTOMER_STAT_COLUMNS) or []
+
+    key = (activity_table, customer_table, _data_signature(activities, customers))
+    cached = st.session_state.get(_STATS_STATE_KEY)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    stats = compute_activity_statistics(activities, customers, activity_types)
+    st.session_state[_STATS_STATE_KEY] = (key, stats)
+    return stats
@@ -2,6 +2,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import logging
+import time
+
+from utils.database import Projection
+from utils.query_builder import QueryFilter
+from utils.helpers import PaginationHelper, get_page_args, render_pagination_controls
+
+# 검색 필터 옵션(업종/국가/도시) 구성에 필요한 컬럼
+CUSTOMER_FILTER_COLUMNS = Projection("business_type", "country", "city")
 
 # 국가별 주요 도시 (확장판)
 CITIES_BY_COUNTRY = {
@@ -171,8 +179,9 @@ POSITION_MAPPING = {
 # 직책 역매핑 (DB → UI 표시)
 POSITION_REVERSE = {v: k for k, v in POSITION_MAPPING.items()}
 
-def show_customer_management(load_func, save_func, update_func, delete_func, current_user):
-    """고객 관리 메인 페이지"""
+def show_customer_management(load_func, save_func, update_func, delete_func, current_user,
+                             bulk_save_func=None):
+    """고객 관리 메인 페이지 (bulk_save_func: CSV 일괄 저장 함수)"""
     st.title("고객 관리 / Quản lý khách hàng")
     
     # 법인별 테이블명 생성
@@ -203,7 +212,7 @@ def show_customer_management(load_func, save_func, update_func, delete_func, cur
         render_customer_statistics(load_func, customer_table)
     
     with tab4:
-        render_csv_management(load_func, save_func, customer_table)
+        render_csv_management(load_func, save_func, customer_table, bulk_save_func)
 
 def render_customer_form(save_func, customer_table):
     """고객 등록 폼"""
@@ -1019,7 +1028,8 @@ def render_customer_list(load_func, update_func, delete_func, customer_table):
     st.header("고객 목록 / Danh sách khách hàng")
     
     try:
-        customers_data = load_func(customer_table)
+        # 필터 옵션용 컬럼만 로드 (목록 자체는 아래에서 페이지 단위로 조회)
+        customers_data = load_func(customer_table, columns=CUSTOMER_FILTER_COLUMNS)
         
         if not customers_data:
             st.info("등록된 고객이 없습니다. / Chưa có khách hàng nào.")
@@ -1149,61 +1159,21 @@ def render_customer_list(load_func, update_func, delete_func, customer_table):
                         del st.session_state[key]
                 st.rerun()
         
-        # 데이터 필터링
-        filtered_df = customers_df.copy()
+        # 모든 검색 조건을 DB 쿼리로 전달
+        customer_query = get_filtered_customers_query(
+            search_name, search_business_type, search_country, search_city,
+            search_status, search_kam, search_contact, search_date_from, search_date_to
+        )
         
-        # 1. 이름 검색
-        if search_name and search_name.strip():
-            search_term = search_name.strip().lower()
-            mask = (
-                filtered_df['company_name_original'].fillna('').str.lower().str.contains(search_term, na=False) |
-                filtered_df['company_name_short'].fillna('').str.lower().str.contains(search_term, na=False) |
-                filtered_df['company_name_english'].fillna('').str.lower().str.contains(search_term, na=False)
-            )
-            filtered_df = filtered_df[mask]
-        
-        # 2. 업종 필터
-        if search_business_type != "전체 / Tất cả":
-            business_type_db = BUSINESS_TYPE_MAPPING.get(search_business_type, search_business_type)
-            filtered_df = filtered_df[filtered_df['business_type'] == business_type_db]
-        
-        # 3. 국가 필터
-        if search_country != "전체 / Tất cả":
-            filtered_df = filtered_df[filtered_df['country'] == search_country]
-        
-        # 4. 도시 필터
-        if search_city != "전체 / Tất cả":
-            filtered_df = filtered_df[filtered_df['city'] == search_city]
-        
-        # 5. 상태 필터
-        if search_status != "전체 / Tất cả":
-            filtered_df = filtered_df[filtered_df['status'] == search_status]
-        
-        # 6. KAM 할당 필터
-        if search_kam == "할당됨":
-            filtered_df = filtered_df[filtered_df['kam_name'].notna()]
-        elif search_kam == "미할당":
-            filtered_df = filtered_df[filtered_df['kam_name'].isna()]
-        
-        # 7. 담당자명 검색
-        if search_contact and search_contact.strip():
-            contact_term = search_contact.strip().lower()
-            filtered_df = filtered_df[
-                filtered_df['contact_person'].fillna('').str.lower().str.contains(contact_term, na=False)
-            ]
-        
-        # 8. 등록일 범위
-        if search_date_from:
-            filtered_df = filtered_df[
-                pd.to_datetime(filtered_df['created_at']).dt.date >= search_date_from
-            ]
-        if search_date_to:
-            filtered_df = filtered_df[
-                pd.to_datetime(filtered_df['created_at']).dt.date <= search_date_to
-            ]
-        
-        # 정렬
-        filtered_df = filtered_df.sort_values('created_at', ascending=False)
+        total_customers = len(customers_df)
+        page_args = get_page_args("customer_list", customer_query.cache_key())
+        page_result = load_func(customer_table, filters=customer_query, **page_args)
+        filtered_df = pd.DataFrame(page_result)
+        filtered_count = PaginationHelper.get_total("customer_list", page_result) or len(filtered_df)
+        
+        if filtered_df.empty:
+            st.warning("검색 조건에 맞는 고객이 없습니다. / Không tìm thấy khách hàng phù hợp.")
+            return
         
         st.markdown("---")
         
@@ -1211,28 +1181,32 @@ def render_customer_list(load_func, update_func, delete_func, customer_table):
         result_col1, result_col2, result_col3 = st.columns([2, 2, 1])
         
         with result_col1:
-            st.write(f"📋 검색 결과: **{len(filtered_df)}건** / Kết quả: **{len(filtered_df)}**")
+            st.write(f"📋 검색 결과: **{filtered_count}건** / Kết quả: **{filtered_count}**")
         
         with result_col2:
-            if len(filtered_df) != len(customers_df):
-                st.info(f"전체 {len(customers_df)}건 중 {len(filtered_df)}건 표시")
+            if filtered_count != total_customers:
+                st.info(f"전체 {total_customers}건 중 {filtered_count}건 표시")
         
         with result_col3:
             if not filtered_df.empty:
-                csv_data = generate_customer_csv(filtered_df)
-                st.download_button(
-                    label="📥 CSV",
-                    data=csv_data,
-                    file_name=f"customers_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
+                # 버튼을 누를 때만 전체 검색 결과를 조회
+                if st.button("📥 CSV", key="customer_csv_prepare", use_container_width=True):
+                    export_df = pd.DataFrame(load_func(customer_table, filters=customer_query))
+                    st.download_button(
+                        label="💾 다운로드",
+                        data=generate_customer_csv(export_df),
+                        file_name=f"customers_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv",
+                        use_container_width=True
+                    )
         
         # 검색 결과 없음
         if filtered_df.empty:
             st.warning("검색 조건에 맞는 고객이 없습니다. / Không tìm thấy khách hàng phù hợp.")
             return
         
+        render_pagination_controls("customer_list", page_result)
+        
         st.markdown("---")
         
         # ⭐ 상세 정보 확인 섹션 (검색 결과 밑으로 이동)
@@ -1264,7 +1238,14 @@ def render_customer_list(load_func, update_func, delete_func, customer_table):
         # 선택된 고객 상세 정보 표시
         if 'show_customer_detail' in st.session_state and st.session_state['show_customer_detail']:
             customer_id = st.session_state['show_customer_detail']
-            customer = filtered_df[filtered_df['id'] == customer_id].iloc[0]
+            matched = filtered_df[filtered_df['id'] == customer_id]
+            if matched.empty:
+                # 다른 페이지의 고객이면 단건 조회
+                matched = pd.DataFrame(load_func(customer_table, filters={'id': customer_id}))
+            if matched.empty:
+                del st.session_state['show_customer_detail']
+                st.rerun()
+            customer = matched.iloc[0]
             
             # 수정 모드 확인
             if st.session_state.get(f"edit_customer_{customer_id}", False):
@@ -1343,6 +1324,38 @@ def render_customer_list(load_func, update_func, delete_func, customer_table):
         logging.error(f"고객 목록 로드 오류: {str(e)}")
         st.error(f"고객 목록 로딩 중 오류가 발생했습니다 / Lỗi tải danh sách: {str(e)}")
 
+def get_filtered_customers_query(search_name, search_business_type, search_country, search_city,
+                                 search_status, search_kam, search_contact,
+                                 search_date_from, search_date_to):
+    """검색 조건을 DB 쿼리 조건(QueryFilter)으로 변환"""
+    query = QueryFilter()
+    
+    if search_business_type != "전체 / Tất cả":
+        query.eq('business_type', BUSINESS_TYPE_MAPPING.get(search_business_type, search_business_type))
+    if search_country != "전체 / Tất cả":
+        query.eq('country', search_country)
+    if search_city != "전체 / Tất cả":
+        query.eq('city', search_city)
+    if search_status != "전체 / Tất cả":
+        query.eq('status', search_status)
+    
+    # 이름 검색 (원어/약칭/영문 중 하나라도 포함)
+    query.search(search_name, 'company_name_original', 'company_name_short', 'company_name_english')
+    
+    # KAM 할당 필터
+    if search_kam == "할당됨":
+        query.not_null('kam_name')
+    elif search_kam == "미할당":
+        query.is_null('kam_name')
+    
+    # 담당자명 검색
+    query.search(search_contact, 'contact_person')
+    
+    # 등록일 범위
+    query.date_range('created_at', search_date_from, search_date_to)
+    
+    return query.order('created_at', desc=True)
+
 def render_customer_detail_view(customer, update_func, delete_func, load_func, customer_table):
     """고객 상세 정보 확인"""
     customer_id = customer['id']
@@ -1784,7 +1797,7 @@ def render_customer_statistics(load_func, customer_table):
         logging.error(f"통계 로드 오류: {str(e)}")
         st.error(f"통계 로딩 중 오류가 발생했습니다 / Lỗi tải thống kê: {str(e)}")
 
-def render_csv_management(load_func, save_func, customer_table):
+def render_csv_management(load_func, save_func, customer_table, bulk_save_func=None):
     """CSV 다운로드/업로드 관리"""
     st.header("CSV 파일 관리 / Quản lý file CSV")
     
@@ -1831,6 +1844,11 @@ def render_csv_management(load_func, save_func, customer_table):
     with col2:
         st.subheader("CSV 업로드 / Tải lên CSV")
         
+        # 직전 업로드 결과 표시 (rerun 이후에도 한 번 보여줌)
+        last_results = st.session_state.pop('customer_csv_upload_results', None)
+        if last_results:
+            render_csv_upload_results(last_results)
+        
         uploaded_file = st.file_uploader(
             "고객 데이터 CSV 파일 선택 / Chọn file CSV",
             type=['csv'],
@@ -1885,23 +1903,12 @@ def render_csv_management(load_func, save_func, customer_table):
                     
                     if st.button("CSV 데이터 업로드 / Tải lên dữ liệu", type="primary"):
                         upload_results = process_csv_upload(
-                            df, save_func, load_func, update_existing, skip_errors, customer_table
+                            df, save_func, load_func, update_existing, skip_errors, customer_table,
+                            bulk_save_func=bulk_save_func
                         )
                         
-                        # 결과 표시
-                        if upload_results['success_count'] > 0:
-                            st.success(f"✅ 성공 / Thành công: {upload_results['success_count']}개")
-                        
-                        if upload_results['error_count'] > 0:
-                            st.warning(f"⚠️ 실패 / Thất bại: {upload_results['error_count']}개")
-                            
-                            with st.expander("오류 세부사항 / Chi tiết lỗi", expanded=False):
-                                for error in upload_results['errors']:
-                                    st.write(f"- {error}")
-                        
-                        if upload_results['updated_count'] > 0:
-                            st.info(f"🔄 업데이트 / Cập nhật: {upload_results['updated_count']}개")
-                        
+                        # 결과는 rerun 후 결과 패널에서 표시
+                        st.session_state['customer_csv_upload_results'] = upload_results
                         st.rerun()
                         
             except Exception as e:
@@ -1986,119 +1993,182 @@ def generate_customer_csv(customers_df):
     csv_string = export_df.to_csv(index=False, encoding='utf-8-sig')
     return csv_string
 
-def process_csv_upload(df, save_func, load_func, update_existing, skip_errors, customer_table):
-    """CSV 데이터 업로드 처리"""
+# CSV 가져오기 대상 컬럼
+CUSTOMER_IMPORT_COLUMNS = [
+    'company_name_original', 'company_name_short', 'company_name_english',
+    'business_number', 'business_type', 'country', 'city', 'address',
+    'contact_person', 'contact_department', 'position', 'email', 'phone', 'mobile',
+    'tax_id', 'payment_terms', 'kam_name', 'kam_department', 'kam_position',
+    'kam_phone', 'kam_notes', 'status', 'notes'
+]
+
+# 값이 없을 때 사용할 기본값
+CUSTOMER_IMPORT_DEFAULTS = {'country': 'Vietnam', 'status': 'active'}
+
+def normalize_customer_import(df):
+    """
+    CSV 행 정규화 (컬럼 단위 벡터 연산)
+    문자열로 변환 후 앞뒤 공백 제거, 빈 값은 None, 기본값 적용
+    """
+    normalized = pd.DataFrame(index=df.index)
+    for column in CUSTOMER_IMPORT_COLUMNS:
+        if column in df.columns:
+            values = df[column].astype('string').str.strip()
+            normalized[column] = values.mask(values == '')
+        else:
+            normalized[column] = pd.Series(pd.NA, index=df.index, dtype='string')
+    
+    for column, default in CUSTOMER_IMPORT_DEFAULTS.items():
+        normalized[column] = normalized[column].fillna(default)
+    return normalized
+
+def _import_records(frame):
+    """DataFrame → 저장용 dict 목록 (결측값은 None)"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+def process_csv_upload(df, save_func, load_func, update_existing, skip_errors, customer_table,
+                       bulk_save_func=None):
+    """
+    CSV 데이터 업로드 처리 (일괄 저장)
+    정규화 → 이메일 기준 중복 제거 → 청크 단위 insert/upsert
+    """
+    bulk_save = bulk_save_func
+    if bulk_save is None:
+        from utils.database import bulk_write as bulk_save
+    started = time.perf_counter()
+    timings = {}
     
     results = {
         'success_count': 0,
         'error_count': 0,
         'updated_count': 0,
-        'errors': []
+        'errors': [],
+        'total_rows': len(df)
     }
+    row_errors = []  # (행 번호, 메시지)
     
-    # 기존 고객 데이터 로드 (업데이트 모드인 경우)
-    existing_customers = {}
-    if update_existing:
-        try:
-            existing_data = load_func(customer_table)
-            if existing_data:
-                for customer in existing_data:
-                    email = customer.get('email', '').strip().lower()
-                    if email:
-                        existing_customers[email] = customer
-        except Exception as e:
-            results['errors'].append(f"기존 고객 데이터 로드 오류: {str(e)}")
-    
-    # 각 행 처리
-    for idx, row in df.iterrows():
-        try:
-            # 필수 필드 확인 (회사명만)
-            company_name = row.get('company_name_original')
-            
-            if pd.isna(company_name) or str(company_name).strip() == '':
-                if skip_errors:
-                    results['error_count'] += 1
-                    results['errors'].append(f"행 {idx + 2}: 필수 필드 누락 (company_name_original)")
-                    continue
-                else:
-                    raise ValueError(f"행 {idx + 2}: 필수 필드 누락 (company_name_original)")
-            
-            # 고객 데이터 구성
-            customer_data = {
-                'company_name_original': str(company_name).strip(),
-                'company_name_short': str(row.get('company_name_short', '')).strip() if pd.notna(row.get('company_name_short')) else None,
-                'company_name_english': str(row.get('company_name_english', '')).strip() if pd.notna(row.get('company_name_english')) else None,
-                'business_number': str(row.get('business_number', '')).strip() if pd.notna(row.get('business_number')) else None,
-                'business_type': str(row.get('business_type', '')).strip() if pd.notna(row.get('business_type')) else None,
-                'country': str(row.get('country', 'Vietnam')).strip(),
-                'city': str(row.get('city', '')).strip() if pd.notna(row.get('city')) else None,
-                'address': str(row.get('address', '')).strip() if pd.notna(row.get('address')) else None,
-                'contact_person': str(row.get('contact_person', '')).strip() if pd.notna(row.get('contact_person')) else None,
-                'contact_department': str(row.get('contact_department', '')).strip() if pd.notna(row.get('contact_department')) else None,
-                'position': str(row.get('position', '')).strip() if pd.notna(row.get('position')) else None,
-                'email': str(row.get('email', '')).strip() if pd.notna(row.get('email')) else None,
-                'phone': str(row.get('phone', '')).strip() if pd.notna(row.get('phone')) else None,
-                'mobile': str(row.get('mobile', '')).strip() if pd.notna(row.get('mobile')) else None,
-                'tax_id': str(row.get('tax_id', '')).strip() if pd.notna(row.get('tax_id')) else None,
-                'payment_terms': str(row.get('payment_terms', '')).strip() if pd.notna(row.get('payment_terms')) else None,
-                'kam_name': str(row.get('kam_name', '')).strip() if pd.notna(row.get('kam_name')) else None,
-                'kam_department': str(row.get('kam_department', '')).strip() if pd.notna(row.get('kam_department')) else None,
-                'kam_position': str(row.get('kam_position', '')).strip() if pd.notna(row.get('kam_position')) else None,
-                'kam_phone': str(row.get('kam_phone', '')).strip() if pd.notna(row.get('kam_phone')) else None,
-                'kam_notes': str(row.get('kam_notes', '')).strip() if pd.notna(row.get('kam_notes')) else None,
-                'status': str(row.get('status', 'active')).strip(),
-                'notes': str(row.get('notes', '')).strip() if pd.notna(row.get('notes')) else None,
-            }
-            
-            # 이메일 기준 중복 체크 (이메일이 있는 경우만)
-            email = customer_data.get('email')
-            email_key = email.lower() if email else None
-            existing_customer = existing_customers.get(email_key) if email_key else None
-            
-            if existing_customer and update_existing:
-                # 기존 고객 업데이트
-                customer_data['id'] = existing_customer['id']
-                customer_data['updated_at'] = datetime.now().isoformat()
-                
-                # update_func 파라미터 사용 (법인별 테이블)
-                result = update_func(customer_table, customer_data)
-                
-                if result:
-                    results['updated_count'] += 1
-                else:
-                    results['error_count'] += 1
-                    results['errors'].append(f"행 {idx + 2}: 업데이트 실패 ({email})")
-                    
-            elif existing_customer and not update_existing:
-                # 중복 이메일이지만 업데이트 모드가 아님
-                if skip_errors:
-                    results['error_count'] += 1
-                    results['errors'].append(f"행 {idx + 2}: 중복 이메일 ({email})")
-                    continue
-                else:
-                    raise ValueError(f"행 {idx + 2}: 중복 이메일 ({email})")
-                    
-            else:
-                # 신규 고객 등록 (법인별 테이블)
-                customer_data['created_at'] = datetime.now().isoformat()
-                result = save_func(customer_table, customer_data)
-                
-                if result:
-                    results['success_count'] += 1
-                else:
-                    results['error_count'] += 1
-                    results['errors'].append(f"행 {idx + 2}: 저장 실패")
-                    
-        except Exception as e:
-            if skip_errors:
-                results['error_count'] += 1
-                results['errors'].append(f"행 {idx + 2}: {str(e)}")
-                continue
-            else:
-                raise
+    # 1. 정규화 (CSV 행 번호 = DataFrame 위치 + 2)
+    stage = time.perf_counter()
+    normalized = normalize_customer_import(df.reset_index(drop=True))
+    row_numbers = pd.Series(normalized.index + 2, index=normalized.index)
+    
+    missing_name = normalized['company_name_original'].isna()
+    for row_no in row_numbers[missing_name]:
+        row_errors.append((row_no, f"행 {row_no}: 필수 필드 누락 (company_name_original)"))
+    timings['normalize_ms'] = (time.perf_counter() - stage) * 1000
+    
+    # 2. 이메일 기준 중복 제거 (파일 내 중복 + 기존 고객)
+    stage = time.perf_counter()
+    email_key = normalized['email'].str.lower()
+    has_email = email_key.notna()
+    
+    file_duplicate = has_email & email_key.duplicated(keep='first') & ~missing_name
+    for row_no, email in zip(row_numbers[file_duplicate], normalized.loc[file_duplicate, 'email']):
+        row_errors.append((row_no, f"행 {row_no}: 중복 이메일 ({email})"))
     
+    existing_ids = {}
+    try:
+        existing_data = load_func(customer_table, columns="id,email", use_cache=False) or []
+        for customer in existing_data:
+            email = (customer.get('email') or '').strip().lower()
+            if email:
+                existing_ids[email] = customer.get('id')
+    except Exception as e:
+        results['errors'].append(f"기존 고객 데이터 로드 오류: {str(e)}")
+    
+    candidates = ~missing_name & ~file_duplicate
+    # 정수 ID가 float로 바뀌지 않도록 object Series로 구성
+    matched_id = pd.Series([existing_ids.get(key) if isinstance(key, str) else None for key in email_key],
+                           index=normalized.index, dtype=object)
+    is_existing = candidates & matched_id.notna()
+    
+    if not update_existing:
+        for row_no, email in zip(row_numbers[is_existing], normalized.loc[is_existing, 'email']):
+            row_errors.append((row_no, f"행 {row_no}: 중복 이메일 ({email})"))
+        update_mask = pd.Series(False, index=normalized.index)
+    else:
+        update_mask = is_existing
+    insert_mask = candidates & ~is_existing
+    timings['dedup_ms'] = (time.perf_counter() - stage) * 1000
+    
+    # 오류 행 건너뛰기를 끈 경우 저장 전에 중단 (일부만 저장되지 않도록)
+    if row_errors and not skip_errors:
+        raise ValueError(sorted(row_errors)[0][1])
+    
+    # 3. 청크 단위 저장
+    stage = time.perf_counter()
+    now = datetime.now().isoformat()
+    chunks = 0
+    chunk_size = None
+    
+    if insert_mask.any():
+        insert_frame = normalized[insert_mask].copy()
+        insert_frame['created_at'] = now
+        insert_rows = _import_records(insert_frame)
+        insert_result = bulk_save(customer_table, insert_rows,
+                                  row_labels=row_numbers[insert_mask].tolist())
+        results['success_count'] += insert_result['written']
+        chunks += insert_result['chunks']
+        chunk_size = insert_result['chunk_size']
+        for row_no, message in insert_result['failed']:
+            row_errors.append((row_no, f"행 {row_no}: 저장 실패 ({message})"))
+    
+    if update_mask.any():
+        update_frame = normalized[update_mask].copy()
+        update_frame['id'] = matched_id[update_mask]
+        update_frame['updated_at'] = now
+        emails = dict(zip(row_numbers[update_mask], update_frame['email']))
+        update_result = bulk_save(customer_table, _import_records(update_frame), upsert=True,
+                                  row_labels=row_numbers[update_mask].tolist())
+        results['updated_count'] += update_result['written']
+        chunks += update_result['chunks']
+        chunk_size = chunk_size or update_result['chunk_size']
+        for row_no, message in update_result['failed']:
+            row_errors.append((row_no, f"행 {row_no}: 업데이트 실패 ({emails.get(row_no)})"))
+    timings['write_ms'] = (time.perf_counter() - stage) * 1000
+    
+    # 4. 결과 및 처리량 지표
+    row_errors.sort(key=lambda item: item[0])
+    results['errors'].extend(message for _, message in row_errors)
+    results['error_count'] += len(row_errors)
+    
+    elapsed = time.perf_counter() - started
+    processed = results['success_count'] + results['updated_count']
+    results['metrics'] = {
+        'elapsed_sec': elapsed,
+        'rows_per_sec': (processed / elapsed) if elapsed > 0 else 0.0,
+        'chunks': chunks,
+        'chunk_size': chunk_size,
+        **timings
+    }
     return results
 
+def render_csv_upload_results(upload_results):
+    """CSV 업로드 결과 패널 (건수 + 처리량 지표)"""
+    if upload_results['success_count'] > 0:
+        st.success(f"✅ 성공 / Thành công: {upload_results['success_count']}개")
+    
+    if upload_results['error_count'] > 0:
+        st.warning(f"⚠️ 실패 / Thất bại: {upload_results['error_count']}개")
+        
+        with st.expander("오류 세부사항 / Chi tiết lỗi", expanded=False):
+            for error in upload_results['errors']:
+                st.write(f"- {error}")
+    
+    if upload_results['updated_count'] > 0:
+        st.info(f"🔄 업데이트 / Cập nhật: {upload_results['updated_count']}개")
+    
+    metrics = upload_results.get('metrics')
+    if metrics:
+        metric_col1, metric_col2, metric_col3 = st.columns(3)
+        metric_col1.metric("처리 시간 / Thời gian", f"{metrics['elapsed_sec']:.2f}s")
+        metric_col2.metric("처리량 / Tốc độ", f"{metrics['rows_per_sec']:,.0f} 행/s")
+        metric_col3.metric("청크 / Lô", f"{metrics['chunks']} × {metrics['chunk_size'] or '-'}")
+        st.caption(
+            f"정규화 {metrics['normalize_ms']:.0f}ms · 중복 확인 {metrics['dedup_ms']:.0f}ms · "
+            f"저장 {metrics['write_ms']:.0f}ms (총 {upload_results.get('total_rows', 0)}행)"
+        )
+
 def create_csv_template():
     """CSV 템플릿 생성"""
     template_data = {
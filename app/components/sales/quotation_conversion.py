@@ -131,20 +131,12 @@ def generate_document_number(doc_type, save_func):
         prefix = seq.get('date_prefix', f"{doc_type.upper()[:2]}-")
         last_number = seq.get('last_number', 0)
     
-    # 다음 번호 계산
-    next_number = last_number + 1
-    
-    # 문서 번호 생성: SP-2025-0001
-    document_number = f"{prefix}{current_year}-{next_number:04d}"
-    
-    # 번호 업데이트
-    try:
-        # document_sequences 업데이트 로직 (실제 구현시 update_func 사용)
-        pass
-    except:
-        pass
-    
-    return document_number
+    # 문서 번호 생성: SP-2025-0001 (연도별 시퀀스, last_number 이후부터 발급)
+    from utils.sequence_service import get_sequence_service
+    next_number = get_sequence_service().next_value(
+        doc_type, period=str(current_year), seed_func=lambda: last_number or 0
+    )
+    return f"{prefix}{current_year}-{next_number:04d}"
 
 def update_quotation_status(quotation_id, new_status, save_func):
     """견적서 상태 업데이트"""
@@ -4,6 +4,11 @@ from datetime import datetime, timedelta
 import logging
 import time
 
+from utils.helpers import get_page_args, render_pagination_controls
+from utils.product_search import get_product_index
+from utils.query_builder import QueryFilter, Condition, escape_like
+from utils.sequence_service import SequenceUnavailableError, next_document_number, peek_document_number
+
 def show_quotation_management(save_func, load_func, update_func, delete_func, current_user):
     """견적서 관리 메인"""
     st.title("📋 견적서 관리")
@@ -71,7 +76,10 @@ def render_product_selection_for_quotation(load_func, mode='new'):
             st.warning("등록된 제품이 없습니다.")
             return
         
-        products_df = pd.DataFrame(products_data)
+        # 제품 검색 인덱스 (법인별 제품 테이블마다 하나, 목록이 바뀐 경우에만 백그라운드에서 다시 색인,
+        # 색인 중에 검색하면 끝날 때까지 기다림)
+        product_index = get_product_index(products_table)
+        product_index.warm(products_data)
         
         st.markdown("### 📋 제품 코드 필터")
         st.caption("각 단계를 선택하여 제품을 필터링하세요.")
@@ -154,19 +162,31 @@ def render_product_selection_for_quotation(load_func, mode='new'):
         
         matching_codes = filter_codes_by_selections(all_codes, selections)
         
+        # 코드/제품명 검색 (코드 필터 결과 안에서, 베트남어 악센트 무시)
+        search_term = st.text_input(
+            "🔍 제품 코드/제품명 검색",
+            placeholder="예: HRS-YMO, nozzle, khuon",
+            key=f"quot_{mode}_product_search"
+        )
+        
         st.markdown("---")
         
         if matching_codes:
-            matching_product_codes = [code.get('full_code') for code in matching_codes]
-            filtered_products = products_df[products_df['product_code'].isin(matching_product_codes)]
+            matching_product_codes = {code.get('full_code') for code in matching_codes}
+            product_index.sync(products_data)
+            if search_term.strip():
+                code_filter = (lambda p: p.get('product_code') in matching_product_codes) if selections else None
+                filtered_products = product_index.search(search_term, where=code_filter)
+            else:
+                filtered_products = product_index.by_codes(matching_product_codes)
             
-            if not filtered_products.empty:
+            if filtered_products:
                 st.info(f"🔍 {len(filtered_products)}개 제품 매칭")
                 
                 table_data = []
-                for _, product in filtered_products.iterrows():
-                    cost_usd = float(product.get('cost_price_usd', 0))
-                    selling_vnd = float(product.get('actual_selling_price_vnd', 0))
+                for product in filtered_products:
+                    cost_usd = float(product.get('cost_price_usd') or 0)
+                    selling_vnd = float(product.get('actual_selling_price_vnd') or 0)
                     
                     table_data.append({
                         'ID': product.get('id', ''),
@@ -189,16 +209,16 @@ def render_product_selection_for_quotation(load_func, mode='new'):
                     if st.button("➡️ 선택", use_container_width=True, type="primary", key=f"quot_{mode}_select_btn"):
                         if product_id_input and product_id_input.strip().isdigit():
                             product_id = int(product_id_input.strip())
-                            selected = filtered_products[filtered_products['id'] == product_id]
+                            selected = next((p for p in filtered_products if p.get('id') == product_id), None)
                             
-                            if not selected.empty:
+                            if selected is not None:
                                 if mode == 'new':
-                                    st.session_state.selected_product_for_quotation_new = selected.iloc[0].to_dict()
+                                    st.session_state.selected_product_for_quotation_new = dict(selected)
                                 else:
-                                    st.session_state.selected_product_for_quotation_edit = selected.iloc[0].to_dict()
+                                    st.session_state.selected_product_for_quotation_edit = dict(selected)
                                     st.session_state.pop('show_product_selector_edit', None)
                                 
-                                st.success(f"✅ 제품 선택 완료: {selected.iloc[0]['product_code']}")
+                                st.success(f"✅ 제품 선택 완료: {selected.get('product_code')}")
                                 st.rerun()
                             else:
                                 st.error(f"❌ ID {product_id}를 찾을 수 없습니다.")
@@ -614,6 +634,8 @@ def render_quotation_form_with_customer(save_func, load_func, customer_table, qu
         with calc_col3:
             st.metric("최종 금액", f"{final_amount:,.0f} VND")
             st.caption(f"${final_amount / exchange_rate:,.2f}")
+        
+        render_freight_options_for_quotation()
     
     # 항목이 없으면 저장 불가
     if not st.session_state.quotation_items:
@@ -625,8 +647,9 @@ def render_quotation_form_with_customer(save_func, load_func, customer_table, qu
         col1, col2 = st.columns(2)
         
         with col1:
-            quote_number = generate_quote_number(load_func, quotation_table)
-            st.text_input("견적번호", value=quote_number, disabled=True)
+            # 미리보기만 표시 (번호는 저장할 때 발급)
+            st.text_input("견적번호", value=preview_quote_number(quotation_table), disabled=True,
+                          help="저장 시 확정됩니다. 동시에 다른 견적서가 저장되면 번호가 바뀔 수 있습니다.")
             quote_date = st.date_input("견적일", value=datetime.now().date())
         
         with col2:
@@ -690,6 +713,11 @@ def render_quotation_form_with_customer(save_func, load_func, customer_table, qu
             
             customer_company_name = selected_customer.get('company_name_original')
             
+            try:
+                quote_number = generate_quote_number(load_func, quotation_table)
+            except SequenceUnavailableError as e:
+                st.error(f"견적번호 발급 실패: {str(e)} 잠시 후 다시 저장해주세요.")
+                return
 
             # 견적서 기본 정보
             quotation_data = {
@@ -765,7 +793,7 @@ def render_quotation_form_with_customer(save_func, load_func, customer_table, qu
                     save_func(quotation_items_table, item_data)
 
                 save_type = "임시저장" if temp_save else "정식저장"
-                st.success(f"✅ 견적서가 성공적으로 {save_type}되었습니다!")
+                st.success(f"✅ 견적서 {quote_number}가 성공적으로 {save_type}되었습니다!")
                 st.session_state.pop('selected_customer_for_quotation', None)
                 st.session_state.show_quotation_input_form = False
                 st.session_state.pop('quotation_items', None)
@@ -774,6 +802,44 @@ def render_quotation_form_with_customer(save_func, load_func, customer_table, qu
             else:
                 st.error("❌ 견적서 저장에 실패했습니다.")
 
+def render_freight_options_for_quotation(key_prefix='quotation_freight'):
+    """견적 화물의 물류사/운송수단별 운임·도착 예정일 비교"""
+    with st.expander("🚚 운송 옵션 비교", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            weight = st.number_input("화물 중량(kg)", min_value=0.0, value=0.0, format="%.1f", key=f"{key_prefix}_weight")
+        with col2:
+            mode = st.selectbox("운송수단", ["전체", "항공", "해상", "육로"], key=f"{key_prefix}_mode")
+        with col3:
+            route = st.text_input("구간", value='', key=f"{key_prefix}_route")
+        
+        if weight <= 0:
+            st.caption("중량을 입력하면 요금표 기준 운송 옵션이 표시됩니다.")
+            return
+        
+        from utils.database_logistics import get_freight_options
+        options = get_freight_options(
+            [{'weight': weight, 'mode': mode, 'route': safe_strip(route) or None}], limit=5
+        )
+        if options.empty:
+            st.info("조건에 맞는 요금표가 없습니다.")
+            return
+        
+        display = pd.DataFrame({
+            '순위': options['rank'],
+            '물류사': options['provider'],
+            '운송수단': options['mode_code'],
+            '구간': options['route'],
+            '총비용(USD)': options['total_cost'].round(2),
+            '운임': options['freight_charge'].round(2),
+            'FSC': options['fsc_charge'].round(2),
+            'Trucking': (options['trucking_lc'] + options['trucking_oc']).round(2),
+            '표준 소요일': options['standard_days'],
+            '도착 예정일': options['eta'].dt.strftime('%Y-%m-%d'),
+        })
+        st.dataframe(display, use_container_width=True, hide_index=True)
+
+
 def render_quotation_list(load_func, update_func, delete_func, save_func, 
                          customer_table, quotation_table):
     """견적서 목록 및 관리"""
@@ -802,13 +868,8 @@ def render_quotation_list(load_func, update_func, delete_func, save_func,
     
     st.subheader("📋 견적서 목록")
     
-    # 데이터 로드
-    quotations = load_func(quotation_table) or []
-    customers = load_func(customer_table) or []
-    
-    if not quotations:
-        st.info("등록된 견적서가 없습니다.")
-        return
+    # 고객명 표시에 필요한 컬럼만 로드
+    customers = load_func(customer_table, columns="id,company_name_short") or []
     
     # 고객 딕셔너리 생성
     customer_dict = {c.get('id'): c for c in customers}
@@ -825,22 +886,15 @@ def render_quotation_list(load_func, update_func, delete_func, save_func,
     with col3:
         sort_order = st.selectbox("정렬", ["최신순", "오래된순"])
     
-    # 필터링
-    filtered = quotations.copy()
+    # 검색/상태/정렬 조건은 DB 쿼리로 처리하고 현재 페이지만 조회
+    quotation_query = get_quotation_list_query(search_term, status_filter, sort_order, customers)
+    page_args = get_page_args("quotation_list", quotation_query.cache_key())
+    page_result = load_func(quotation_table, filters=quotation_query, **page_args)
+    filtered = list(page_result)
     
-    if search_term:
-        filtered = [q for q in filtered 
-                   if search_term.lower() in q.get('quote_number', '').lower()
-                   or search_term.lower() in customer_dict.get(q.get('customer_id'), {}).get('company_name_short', '').lower()]
-    
-    if status_filter != "전체":
-        filtered = [q for q in filtered if q.get('status') == status_filter]
-    
-    # 정렬
-    if sort_order == "최신순":
-        filtered.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    else:
-        filtered.sort(key=lambda x: x.get('created_at', ''))
+    if not filtered and not quotation_query.conditions and page_result.offset == 0:
+        st.info("등록된 견적서가 없습니다.")
+        return
     
     # 테이블 표시
     if filtered:
@@ -860,7 +914,7 @@ def render_quotation_list(load_func, update_func, delete_func, save_func,
         
         df = pd.DataFrame(table_data)
         st.dataframe(df, use_container_width=True, hide_index=True)
-        st.caption(f"📊 총 **{len(filtered)}건** 견적서")
+        render_pagination_controls("quotation_list", page_result)
     else:
         st.info("검색 결과가 없습니다.")
     
@@ -869,6 +923,28 @@ def render_quotation_list(load_func, update_func, delete_func, save_func,
     # 컨트롤 버튼
     render_quotation_controls(load_func, update_func, delete_func, save_func, quotation_table, customer_table)
 
+def get_quotation_list_query(search_term, status_filter, sort_order, customers):
+    """견적서 목록 검색 조건을 DB 쿼리 조건(QueryFilter)으로 변환"""
+    query = QueryFilter()
+    
+    if status_filter != "전체":
+        query.eq('status', status_filter)
+    
+    term = (search_term or '').strip()
+    if term:
+        # 견적번호/고객명 검색 - 고객 약칭이 일치하는 고객 ID도 함께 조건으로 사용
+        lowered = term.lower()
+        customer_ids = [c.get('id') for c in customers
+                        if lowered in (c.get('company_name_short') or '').lower()]
+        pattern = f"%{escape_like(term)}%"
+        conditions = [Condition('quote_number', 'ilike', pattern),
+                      Condition('customer_name', 'ilike', pattern)]
+        if customer_ids:
+            conditions.append(Condition('customer_id', 'in', tuple(customer_ids)))
+        query.or_(*conditions)
+    
+    return query.order('created_at', desc=(sort_order == "최신순"))
+
 def render_quotation_edit_inline(load_func, update_func, save_func, delete_func, customer_table, quotation_table):
     """목록 내 인라인 수정 - 여러 제품 지원"""
    
@@ -1116,6 +1192,8 @@ def render_quotation_edit_inline(load_func, update_func, save_func, delete_func,
         with calc_col3:
             st.metric("최종 금액", f"{final_amount:,.0f} VND")
             st.caption(f"${final_amount / exchange_rate:,.2f}")
+        
+        render_freight_options_for_quotation('quotation_freight_edit')
     
     # 항목이 없으면 저장 불가
     if not st.session_state.editing_quotation_items:
@@ -1465,36 +1543,16 @@ def render_quotation_csv_management(load_func, save_func, quotation_table):
         st.info("견적서 CSV 업로드 기능은 추후 구현 예정입니다.")
 
 def generate_quote_number(load_func, quotation_table='quotations'):
-    """견적번호 자동 생성"""
-    today = datetime.now()
-    date_str = today.strftime('%y%m%d')
-    
-    try:
-        quotations_data = load_func(quotation_table)  # ← quotation_table 사용
-        if not quotations_data:
-            return f"YMV-{date_str}-001"
-        
-        today_pattern = f"YMV-{date_str}-"
-        today_quotes = [q for q in quotations_data if q.get('quote_number', '').startswith(today_pattern)]
-        
-        if not today_quotes:
-            return f"YMV-{date_str}-001"
-        
-        max_count = 0
-        for quote in today_quotes:
-            try:
-                count_str = quote.get('quote_number', '').split('-')[-1]
-                count = int(count_str)
-                if count > max_count:
-                    max_count = count
-            except:
-                continue
-        
-        new_count = max_count + 1
-        return f"YMV-{date_str}-{new_count:03d}"
-    except:
-        timestamp = today.strftime('%H%M%S')
-        return f"YMV-{date_str}-{timestamp[:3]}"
+    """견적번호 자동 생성 (YMV-YYMMDD-NNN, 시퀀스 서비스에서 원자적으로 발급, 저장 시에만 호출)"""
+    date_str = datetime.now().strftime('%y%m%d')
+    return next_document_number('QUO', prefix=f"YMV-{date_str}-", period=date_str,
+                                table_name=quotation_table, column='quote_number')
+
+def preview_quote_number(quotation_table='quotations'):
+    """다음 견적번호 미리보기 (번호를 소비하지 않음, 폼 재실행마다 호출해도 안전)"""
+    date_str = datetime.now().strftime('%y%m%d')
+    return peek_document_number('QUO', prefix=f"YMV-{date_str}-", period=date_str,
+                                table_name=quotation_table, column='quote_number')
 
 def get_next_revision_number(current_revision):
     """Revision 번호 증가"""
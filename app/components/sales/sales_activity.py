@@ -3,6 +3,14 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 import logging
 
+from utils.database import Projection
+from utils.query_builder import QueryFilter
+from utils.helpers import PaginationHelper, get_page_args, render_pagination_controls
+from .activity_statistics import OVERDUE_DAYS, WARNING_DAYS, get_activity_statistics
+
+# 고객명 표시용 컬럼
+CUSTOMER_NAME_COLUMNS = Projection("id", "company_name_short", "company_name_original")
+
 # 활동 유형 매핑
 ACTIVITY_TYPES = {
     'meeting': '🤝 미팅 / Họp',
@@ -604,23 +612,13 @@ def render_activity_list(load_func, update_func, delete_func,
     st.subheader("📋 영업 활동 목록 / Danh sách hoạt động")
     
     try:
-        # 활동 데이터 로드
-        activities = load_func(activity_table)
-        customers = load_customers_func(customer_table)
-        
-        if not activities:
-            st.info("등록된 영업 활동이 없습니다.")
-            return
-        
-        # 고객 ID -> 이름 매핑
+        # 고객 ID -> 이름 매핑 (표시용 컬럼만 로드)
+        customers = load_customers_func(customer_table, columns=CUSTOMER_NAME_COLUMNS) or []
         customer_map = {}
         for customer in customers:
             name = customer.get('company_name_short') or customer.get('company_name_original')
             customer_map[customer['id']] = name
         
-        # DataFrame 변환
-        activities_df = pd.DataFrame(activities)
-        
         # 필터링
         col1, col2, col3, col4 = st.columns(4)
         
@@ -652,24 +650,25 @@ def render_activity_list(load_func, update_func, delete_func,
                 key="filter_date_to"
             )
         
-        # 필터 적용
-        filtered_df = activities_df.copy()
-        
+        # 유형/상태/기간 조건은 DB 쿼리로 처리 (활동일 최신순)
+        activity_query = QueryFilter()
         if type_filter != "전체":
-            type_db = ACTIVITY_TYPES_REVERSE.get(type_filter)
-            filtered_df = filtered_df[filtered_df['activity_type'] == type_db]
-        
+            activity_query.eq('activity_type', ACTIVITY_TYPES_REVERSE.get(type_filter))
         if status_filter != "전체":
-            status_db = STATUS_REVERSE.get(status_filter)
-            filtered_df = filtered_df[filtered_df['status'] == status_db]
+            activity_query.eq('status', STATUS_REVERSE.get(status_filter))
+        activity_query.date_range('activity_date', date_from, date_to).order('activity_date', desc=True)
         
-        if date_from:
-            filtered_df = filtered_df[pd.to_datetime(filtered_df['activity_date']).dt.date >= date_from]
+        # 현재 페이지만 서버에서 조회
+        page_args = get_page_args("activity_list", activity_query.cache_key(), keyset=False)
+        page_result = load_func(activity_table, filters=activity_query, **page_args)
         
-        if date_to:
-            filtered_df = filtered_df[pd.to_datetime(filtered_df['activity_date']).dt.date <= date_to]
+        if not page_result and page_result.offset == 0 and not activity_query.conditions:
+            st.info("등록된 영업 활동이 없습니다.")
+            return
         
-        st.write(f"📊 총 {len(filtered_df)}건")
+        filtered_df = pd.DataFrame(page_result)
+        total_count = PaginationHelper.get_total("activity_list", page_result)
+        st.write(f"📊 총 {total_count if total_count is not None else len(filtered_df)}건")
         
         st.markdown("---")
         
@@ -677,6 +676,8 @@ def render_activity_list(load_func, update_func, delete_func,
             st.warning("검색 조건에 맞는 활동이 없습니다.")
             return
         
+        render_pagination_controls("activity_list", page_result)
+        
         # 활동 목록 표시
         for idx, activity in filtered_df.iterrows():
             activity_id = activity.get('id')
@@ -951,109 +952,93 @@ def render_customer_timeline_search(load_func, activity_table, customer_table, l
         logging.error(f"타임라인 로드 오류: {str(e)}")
         st.error(f"타임라인 로딩 중 오류: {str(e)}")
 
+def _days_label(days):
+    """경과 일수 표시 (날짜 해석 불가 시 '-')"""
+    return '-' if pd.isna(days) else f"{int(days)}일"
+
+
+def _date_label(value, fmt):
+    return '-' if pd.isna(value) else value.strftime(fmt)
+
+
+def _render_monthly_trend(monthly):
+    """최근 월별 활동 수 표/차트"""
+    if len(monthly) > 0:
+        month_df = pd.DataFrame({
+            '월': [str(month) for month in monthly.index],
+            '활동 수': monthly.astype(int).tolist()
+        })
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            st.dataframe(month_df, use_container_width=True, hide_index=True)
+        
+        with col2:
+            st.bar_chart(month_df.set_index('월'))
+    else:
+        st.info("월별 데이터가 충분하지 않습니다.")
+
+
 def render_visit_statistics(load_func, activity_table, customer_table, load_customers_func):
     """활동 유형별 통계 (활성 고객만, 유형별 상세 테이블)"""
     st.subheader("📊 고객 방문 통계 / Thống kê thăm khách hàng")
     
     try:
-        # 데이터 로드
-        activities = load_func(activity_table)
-        customers = load_customers_func(customer_table)
+        # 고객/유형별 집계는 groupby 한 번으로 계산하고 원본이 바뀌기 전까지 재사용
+        stats = get_activity_statistics(load_func, activity_table, customer_table,
+                                        load_customers_func, list(ACTIVITY_TYPES.keys()))
         
-        if not customers:
+        if stats.total_customers == 0:
             st.warning("등록된 고객이 없습니다.")
             return
         
-        # 고객 맵 생성
-        customer_map = {}
-        for customer in customers:
-            name = customer.get('company_name_short') or customer.get('company_name_original')
-            customer_map[customer['id']] = {
-                'name': name,
-                'status': customer.get('status'),
-                'country': customer.get('country', 'N/A'),
-                'city': customer.get('city', 'N/A')
-            }
-        
-        # 활성 고객만 필터링 (명시적으로 'active'인 경우만)
-        active_customers = {}
-        for cid, info in customer_map.items():
-            status_value = info.get('status')
-            
-            # 명시적으로 'active'인 경우만 포함
-            if status_value and str(status_value).lower() == 'active':
-                active_customers[cid] = info
+        active_customers = stats.active_customers
         
         # 활성 고객 수 표시
         st.info(f"💡 통계는 **활성 고객 {len(active_customers)}개사**만 대상으로 합니다.")
         
         if len(active_customers) == 0:
             st.warning("⚠️ 활성 상태인 고객이 없습니다. 고객 관리에서 고객 상태를 '활성'으로 설정해주세요.")
-            st.info(f"전체 고객: {len(customers)}개 (활성: 0개)")
+            st.info(f"전체 고객: {stats.total_customers}개 (활성: 0개)")
             return
         
-        if not activities:
+        if not stats.has_activities:
             st.info("등록된 영업 활동이 없습니다.")
             
             st.write(f"### ❌ 미활동 고객: {len(active_customers)}개사")
             
-            not_visited_data = []
-            for customer_id, info in active_customers.items():
-                not_visited_data.append({
-                    '고객명': info['name'],
-                    '도시': info['city'],
-                    '상태': '❌ 미활동'
-                })
-            
             st.dataframe(
-                pd.DataFrame(not_visited_data),
+                pd.DataFrame({
+                    '고객명': active_customers['name'].tolist(),
+                    '도시': active_customers['city'].tolist(),
+                    '상태': '❌ 미활동'
+                }),
                 use_container_width=True,
                 hide_index=True
             )
             return
         
-        # DataFrame 변환
-        activities_df = pd.DataFrame(activities)
-        
         # 전체 통계 요약
         st.markdown("### 📈 전체 통계 요약 / Tổng quan")
         
         col1, col2, col3, col4, col5 = st.columns(5)
-        
-        # 고객별 활동 집계
-        customer_activity_count = {}
-        for customer_id in active_customers.keys():
-            count = len(activities_df[activities_df['customer_id'] == customer_id])
-            customer_activity_count[customer_id] = count
-        
-        active_count = len([c for c in customer_activity_count.values() if c > 0])
-        inactive_count = len([c for c in customer_activity_count.values() if c == 0])
-        total_activities = sum(customer_activity_count.values())
-        
-        # 30일 이상 미활동 고객
-        overdue_count = 0
-        for customer_id in active_customers.keys():
-            customer_acts = activities_df[activities_df['customer_id'] == customer_id]
-            if len(customer_acts) > 0:
-                last_date = pd.to_datetime(customer_acts['activity_date']).max()
-                days_since = (datetime.now() - last_date).days
-                if days_since > 30:
-                    overdue_count += 1
+        summary = stats.summary
         
         with col1:
-            st.metric("총 고객 수", len(active_customers))
+            st.metric("총 고객 수", summary['total_customers'])
         
         with col2:
-            st.metric("활동 고객", active_count)
+            st.metric("활동 고객", summary['active'])
         
         with col3:
-            st.metric("미활동 고객", inactive_count)
+            st.metric("미활동 고객", summary['inactive'])
         
         with col4:
-            st.metric("재방문 필요", overdue_count, delta="30일 초과", delta_color="inverse")
+            st.metric("재방문 필요", summary['overdue'], delta="30일 초과", delta_color="inverse")
         
         with col5:
-            st.metric("총 활동 수", total_activities)
+            st.metric("총 활동 수", summary['total_activities'])
         
         st.markdown("---")
         
@@ -1072,58 +1057,14 @@ def render_visit_statistics(load_func, activity_table, customer_table, load_cust
             with tab:
                 if tab_idx == 0:
                     # 전체 탭 - 유형별 상세 테이블
-                    selected_type = None
-                    filtered_activities = activities_df.copy()
-                    tab_title = "전체 활동"
-                    
-                    if len(filtered_activities) == 0:
-                        st.warning(f"활동이 없습니다.")
-                        continue
-                    
-                    # 활동 유형별 상세 테이블
                     st.markdown(f"#### 🏆 Top 20 고객 (활동 유형별)")
                     
-                    # 고객별 활동 유형 집계
-                    customer_activity_details = {}
-                    
-                    for customer_id in active_customers.keys():
-                        customer_acts = filtered_activities[filtered_activities['customer_id'] == customer_id]
-                        
-                        if len(customer_acts) > 0:
-                            # 활동 유형별 카운트
-                            type_counts = {}
-                            for act_type in ACTIVITY_TYPES.keys():
-                                count = len(customer_acts[customer_acts['activity_type'] == act_type])
-                                type_counts[act_type] = count
-                            
-                            # 총 활동 수
-                            total_count = len(customer_acts)
-                            
-                            # 마지막 활동
-                            last_date = pd.to_datetime(customer_acts['activity_date']).max()
-                            days_since = (datetime.now() - last_date).days
-                            
-                            customer_activity_details[customer_id] = {
-                                'name': active_customers[customer_id]['name'],
-                                'city': active_customers[customer_id]['city'],
-                                'total': total_count,
-                                'types': type_counts,
-                                'last_date': last_date,
-                                'days_since': days_since
-                            }
-                    
-                    # 총 활동 수로 정렬
-                    sorted_details = sorted(customer_activity_details.items(), 
-                                          key=lambda x: x[1]['total'], 
-                                          reverse=True)
-                    
-                    # Top 20 데이터 준비
                     detail_data = []
-                    for i, (customer_id, details) in enumerate(sorted_details[:20]):
+                    for i, details in enumerate(stats.ranked(limit=20).to_dict('records')):
                         # 경과 일수에 따른 상태
-                        if details['days_since'] > 30:
+                        if details['days_since'] > OVERDUE_DAYS:
                             status = "🔴"
-                        elif details['days_since'] > 14:
+                        elif details['days_since'] > WARNING_DAYS:
                             status = "🟡"
                         else:
                             status = "🟢"
@@ -1133,16 +1074,16 @@ def render_visit_statistics(load_func, activity_table, customer_table, load_cust
                             '고객명': details['name'],
                             '도시': details['city'],
                             '총': details['total'],
-                            '🤝': details['types'].get('meeting', 0),
-                            '🏢': details['types'].get('visit', 0),
-                            '📞': details['types'].get('call', 0),
-                            '📧': details['types'].get('email', 0),
-                            '💰': details['types'].get('quotation', 0),
-                            '🎬': details['types'].get('demo', 0),
-                            '협상': details['types'].get('negotiation', 0),
-                            '📝': details['types'].get('contract', 0),
-                            '마지막': details['last_date'].strftime('%m-%d'),
-                            '경과': f"{details['days_since']}일",
+                            '🤝': details['meeting'],
+                            '🏢': details['visit'],
+                            '📞': details['call'],
+                            '📧': details['email'],
+                            '💰': details['quotation'],
+                            '🎬': details['demo'],
+                            '협상': details['negotiation'],
+                            '📝': details['contract'],
+                            '마지막': _date_label(details['last_date'], '%m-%d'),
+                            '경과': _days_label(details['days_since']),
                             '상태': status
                         })
                     
@@ -1181,99 +1122,41 @@ def render_visit_statistics(load_func, activity_table, customer_table, load_cust
                     
                     # 월별 활동 추이
                     st.markdown(f"#### 📈 월별 활동 추이")
-                    
-                    filtered_activities['month'] = pd.to_datetime(filtered_activities['activity_date']).dt.to_period('M')
-                    monthly_counts = filtered_activities.groupby('month').size()
-                    recent_months = monthly_counts.tail(6)
-                    
-                    if len(recent_months) > 0:
-                        month_data = []
-                        for month, count in recent_months.items():
-                            month_data.append({
-                                '월': str(month),
-                                '활동 수': count
-                            })
-                        
-                        col1, col2 = st.columns([2, 1])
-                        
-                        with col1:
-                            st.dataframe(
-                                pd.DataFrame(month_data),
-                                use_container_width=True,
-                                hide_index=True
-                            )
-                        
-                        with col2:
-                            st.bar_chart(pd.DataFrame(month_data).set_index('월'))
-                    else:
-                        st.info("월별 데이터가 충분하지 않습니다.")
+                    _render_monthly_trend(stats.monthly[None])
                     
                     continue
                 
-                else:
-                    # 특정 활동 유형 탭
-                    type_key = list(ACTIVITY_TYPES.keys())[tab_idx - 1]
-                    selected_type = type_key
-                    filtered_activities = activities_df[activities_df['activity_type'] == type_key]
-                    tab_title = ACTIVITY_TYPES[type_key]
+                # 특정 활동 유형 탭
+                type_key = list(ACTIVITY_TYPES.keys())[tab_idx - 1]
+                tab_title = ACTIVITY_TYPES[type_key]
                 
-                if len(filtered_activities) == 0:
+                if stats.type_activity_counts.get(type_key, 0) == 0:
                     st.warning(f"'{tab_title}' 활동이 없습니다.")
                     
                     # 미활동 고객 표시
                     st.write(f"### ❌ 해당 활동이 없는 고객: {len(active_customers)}개사")
                     
-                    no_activity_data = []
-                    for customer_id, info in active_customers.items():
-                        no_activity_data.append({
-                            '고객명': info['name'],
-                            '도시': f"{info['city']}",
-                            '비고': f"{tab_title} 필요"
-                        })
-                    
                     st.dataframe(
-                        pd.DataFrame(no_activity_data),
+                        pd.DataFrame({
+                            '고객명': active_customers['name'].tolist(),
+                            '도시': active_customers['city'].astype(str).tolist(),
+                            '비고': f"{tab_title} 필요"
+                        }),
                         use_container_width=True,
                         hide_index=True
                     )
                     continue
                 
-                # 고객별 통계 계산
-                customer_stats = {}
-                
-                for customer_id in active_customers.keys():
-                    customer_acts = filtered_activities[filtered_activities['customer_id'] == customer_id]
-                    
-                    if len(customer_acts) > 0:
-                        count = len(customer_acts)
-                        last_date = pd.to_datetime(customer_acts['activity_date']).max()
-                        days_since = (datetime.now() - last_date).days
-                        
-                        # 담당자 집계
-                        contacts = customer_acts['primary_contact'].dropna().tolist()
-                        
-                        customer_stats[customer_id] = {
-                            'name': active_customers[customer_id]['name'],
-                            'city': active_customers[customer_id]['city'],
-                            'count': count,
-                            'last_date': last_date,
-                            'days_since': days_since,
-                            'contacts': contacts
-                        }
-                
-                # 정렬 (활동 수 기준)
-                sorted_stats = sorted(customer_stats.items(), key=lambda x: x[1]['count'], reverse=True)
-                
                 # Top 10 고객
                 st.markdown(f"#### 🏆 Top 10 고객 ({tab_title})")
                 
                 top_10_data = []
-                for i, (customer_id, stats) in enumerate(sorted_stats[:10]):
+                for i, stat in enumerate(stats.ranked(type_key, limit=10).to_dict('records')):
                     # 상태 결정
-                    if stats['days_since'] > 30:
+                    if stat['days_since'] > OVERDUE_DAYS:
                         status_icon = "🔴"
                         status_text = "주의"
-                    elif stats['days_since'] > 14:
+                    elif stat['days_since'] > WARNING_DAYS:
                         status_icon = "🟡"
                         status_text = "확인"
                     else:
@@ -1282,11 +1165,11 @@ def render_visit_statistics(load_func, activity_table, customer_table, load_cust
                     
                     top_10_data.append({
                         '순위': f"#{i+1}",
-                        '고객명': stats['name'],
-                        '도시': f"{stats['city']}",
-                        '활동 수': stats['count'],
-                        '마지막 활동': stats['last_date'].strftime('%Y-%m-%d'),
-                        '경과': f"{stats['days_since']}일",
+                        '고객명': stat['name'],
+                        '도시': f"{stat['city']}",
+                        '활동 수': int(stat['count']),
+                        '마지막 활동': _date_label(stat['last_date'], '%Y-%m-%d'),
+                        '경과': _days_label(stat['days_since']),
                         '상태': f"{status_icon} {status_text}"
                     })
                 
@@ -1301,85 +1184,46 @@ def render_visit_statistics(load_func, activity_table, customer_table, load_cust
                 
                 # 월별 활동 추이
                 st.markdown(f"#### 📈 월별 활동 추이 ({tab_title})")
-                
-                filtered_activities['month'] = pd.to_datetime(filtered_activities['activity_date']).dt.to_period('M')
-                monthly_counts = filtered_activities.groupby('month').size()
-                recent_months = monthly_counts.tail(6)
-                
-                if len(recent_months) > 0:
-                    month_data = []
-                    for month, count in recent_months.items():
-                        month_data.append({
-                            '월': str(month),
-                            '활동 수': count
-                        })
-                    
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.dataframe(
-                            pd.DataFrame(month_data),
-                            use_container_width=True,
-                            hide_index=True
-                        )
-                    
-                    with col2:
-                        st.bar_chart(pd.DataFrame(month_data).set_index('월'))
-                else:
-                    st.info("월별 데이터가 충분하지 않습니다.")
+                _render_monthly_trend(stats.monthly[type_key])
                 
                 st.markdown("---")
                 
                 # 담당자별 활동 수
                 st.markdown(f"#### 👥 담당자별 활동 수 ({tab_title})")
                 
-                contact_counts = {}
-                for customer_id, stats in customer_stats.items():
-                    for contact in stats['contacts']:
-                        if contact and contact.strip():
-                            contact_counts[contact] = contact_counts.get(contact, 0) + 1
-                
-                if contact_counts:
-                    sorted_contacts = sorted(contact_counts.items(), key=lambda x: x[1], reverse=True)
-                    
-                    contact_data = []
-                    for contact, count in sorted_contacts[:10]:
-                        contact_data.append({
-                            '담당자': contact,
-                            '활동 수': count
-                        })
+                contact_counts = stats.contacts[type_key]
+                if len(contact_counts) > 0:
+                    contact_df = pd.DataFrame({
+                        '담당자': [str(contact) for contact in contact_counts.index],
+                        '활동 수': contact_counts.astype(int).tolist()
+                    })
                     
                     col1, col2 = st.columns([2, 1])
                     
                     with col1:
-                        st.dataframe(
-                            pd.DataFrame(contact_data),
-                            use_container_width=True,
-                            hide_index=True
-                        )
+                        st.dataframe(contact_df, use_container_width=True, hide_index=True)
                     
                     with col2:
-                        st.bar_chart(pd.DataFrame(contact_data).set_index('담당자'))
+                        st.bar_chart(contact_df.set_index('담당자'))
                 else:
                     st.info("담당자 정보가 없습니다.")
                 
                 st.markdown("---")
                 
                 # 주의 필요 고객 (30일 이상)
-                overdue_customers = [(cid, stats) for cid, stats in customer_stats.items() 
-                                    if stats['days_since'] > 30]
+                overdue_customers = stats.overdue(type_key)
                 
-                if overdue_customers:
+                if len(overdue_customers) > 0:
                     st.markdown(f"#### ⚠️ 주의 필요 고객 (30일 이상 {tab_title} 없음)")
                     st.write(f"**총 {len(overdue_customers)}개사**")
                     
                     overdue_data = []
-                    for customer_id, stats in overdue_customers:
+                    for stat in overdue_customers.to_dict('records'):
                         overdue_data.append({
-                            '고객명': stats['name'],
-                            '도시': f"{stats['city']}",
-                            '마지막 활동': stats['last_date'].strftime('%Y-%m-%d'),
-                            '경과 일수': f"🔴 {stats['days_since']}일"
+                            '고객명': stat['name'],
+                            '도시': f"{stat['city']}",
+                            '마지막 활동': _date_label(stat['last_date'], '%Y-%m-%d'),
+                            '경과 일수': f"🔴 {_days_label(stat['days_since'])}"
                         })
                     
                     st.dataframe(
@@ -1391,23 +1235,18 @@ def render_visit_statistics(load_func, activity_table, customer_table, load_cust
                     st.markdown("---")
                 
                 # 미활동 고객
-                no_activity_customers = set(active_customers.keys()) - set(customer_stats.keys())
+                no_activity_customers = stats.without_activity(type_key)
                 
-                if no_activity_customers:
+                if len(no_activity_customers) > 0:
                     st.markdown(f"#### ❌ 해당 활동이 없는 고객 ({tab_title})")
                     st.write(f"**총 {len(no_activity_customers)}개사**")
                     
-                    no_activity_data = []
-                    for customer_id in no_activity_customers:
-                        info = active_customers[customer_id]
-                        no_activity_data.append({
-                            '고객명': info['name'],
-                            '도시': f"{info['city']}",
-                            '비고': f"{tab_title} 필요"
-                        })
-                    
                     st.dataframe(
-                        pd.DataFrame(no_activity_data),
+                        pd.DataFrame({
+                            '고객명': no_activity_customers['name'].tolist(),
+                            '도시': no_activity_customers['city'].astype(str).tolist(),
+                            '비고': f"{tab_title} 필요"
+                        }),
                         use_container_width=True,
                         hide_index=True
                     )
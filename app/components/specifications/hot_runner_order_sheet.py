@@ -14,6 +14,7 @@ from components.specifications.customer_section import (
 from components.specifications.technical_section import render_technical_section
 from components.specifications.gate_section import render_gate_section
 from utils.language_config import get_label
+from utils.sequence_service import SequenceUnavailableError
 
 
 def clear_order_form_session():
@@ -91,36 +92,18 @@ def generate_order_number(load_func, hot_runner_table, quotation_id=None):
     """주문번호 생성 (HRO-YYMMDD-NNN) + Revision 처리"""
     from datetime import datetime
     
-    today = datetime.now().strftime("%y%m%d")
-    prefix = f"HRO-{today}-"
-    
-    # 법인별 테이블에서 오늘 생성된 주문 조회
-    all_orders = load_func(hot_runner_table) or []
-    today_orders = [o for o in all_orders 
-                    if o.get('order_number', '').startswith(prefix)]
-    
-    # 다음 번호 계산
-    if today_orders:
-        numbers = []
-        for order in today_orders:
-            order_num = order.get('order_number', '')
-            try:
-                # HRO-YYMMDD-NNN 형식에서 NNN 추출
-                num = int(order_num.split('-')[-1])
-                numbers.append(num)
-            except:
-                continue
-        next_num = max(numbers) + 1 if numbers else 1
-    else:
-        next_num = 1
+    from utils.sequence_service import next_document_number
     
-    order_number = f"{prefix}{next_num:03d}"
+    # 법인별 (HRO, 법인, 날짜) 시퀀스에서 다음 번호 발급
+    today = datetime.now().strftime("%y%m%d")
+    order_number = next_document_number('HRO', period=today,
+                                        table_name=hot_runner_table, column='order_number')
     
     # Revision 계산
     revision = "RV01"
     if quotation_id:
         # 동일 견적서의 기존 규격 결정서 조회
-        existing = load_func(hot_runner_table, 
+        existing = load_func(hot_runner_table, columns="revision",
                            filters={'quotation_id': quotation_id})
         if existing:
             # 가장 높은 revision 찾기
@@ -205,11 +188,15 @@ def render_order_form(load_func, save_func, current_user, hot_runner_table):
             return
         
         # 주문번호 및 revision 생성
-        order_number, revision = generate_order_number(
-            load_func,
-            hot_runner_table,
-            customer_data.get('quotation_id')
-        )
+        try:
+            order_number, revision = generate_order_number(
+                load_func,
+                hot_runner_table,
+                customer_data.get('quotation_id')
+            )
+        except SequenceUnavailableError as e:
+            st.error(f"❌ 주문번호 발급 실패: {str(e)} 잠시 후 다시 제출해주세요.")
+            return
         
         # 상태 결정
         status = 'submitted' if submit_button else 'draft'
@@ -1,41 +1,34 @@
 import streamlit as st
 from datetime import datetime
 
+from utils.connection_pool import get_shared_client
+from utils.database import Projection, fan_out_query
+from utils.query_cache import invalidate_table
+
+# 승인 대기 목록 컬럼
+SPEC_LIST_COLUMNS = Projection(
+    "id", "order_number", "customer_id", "customer_name", "project_name", "part_name",
+    "order_type", "order_amount", "status", "created_at", "created_by"
+)
+
 def get_connection():
-    """Supabase 연결 반환"""
-    return st.session_state.get('supabase')
+    """Supabase 연결 반환 (공유 풀 클라이언트)"""
+    return get_shared_client()
 
 def get_all_pending_specs():
-    """모든 법인의 승인 대기 중인 Hot Runner 주문서 조회"""
-    supabase = get_connection()
-    all_specs = []
-    
-    for company in ['ymv', 'ymk', 'ymth', 'ymc']:
-        try:
-            # Hot Runner 주문서 조회
-            response = supabase.table(f"hot_runner_orders_{company}").select("""
-                id,
-                order_number,
-                customer_id,
-                customer_name,
-                project_name,
-                part_name,
-                order_type,
-                order_amount,
-                status,
-                created_at,
-                created_by
-            """).eq("status", "pending").order("created_at", desc=True).execute()
-            
-            if response.data:
-                # 법인 코드 추가
-                for spec in response.data:
-                    spec['company_code'] = company.upper()
-                    all_specs.append(spec)
-        
-        except Exception as e:
-            st.warning(f"{company.upper()} 조회 실패: {str(e)}")
-            continue
+    """모든 법인의 승인 대기 중인 Hot Runner 주문서 조회 (법인별 병렬 조회)"""
+    all_specs = fan_out_query(
+        "hot_runner_orders",
+        ['YMV', 'YMK', 'YMTH', 'YMC'],
+        columns=SPEC_LIST_COLUMNS,
+        filters={"status": "pending"},
+        order_by="created_at",
+        desc=True
+    )
+    
+    # 실패/시간 초과 법인은 경고만 표시하고 나머지 결과는 그대로 사용
+    for company, message in all_specs.errors.items():
+        st.warning(f"{company} 조회 실패: {message}")
     
     return all_specs
 
@@ -53,6 +46,7 @@ def approve_spec_decision(spec_id, company_code, approver_id):
         }
         
         response = supabase.table(table_name).update(update_data).eq("id", spec_id).execute()
+        invalidate_table(table_name)
         return response.data
     except Exception as e:
         st.error(f"승인 실패: {str(e)}")
@@ -73,6 +67,7 @@ def reject_spec_decision(spec_id, company_code, approver_id, reason):
         }
         
         response = supabase.table(table_name).update(update_data).eq("id", spec_id).execute()
+        invalidate_table(table_name)
         return response.data
     except Exception as e:
         st.error(f"반려 실패: {str(e)}")
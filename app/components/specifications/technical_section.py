@@ -4,6 +4,7 @@ import streamlit as st
 import pandas as pd
 import json
 from utils.language_config import get_label
+from utils.product_search import get_product_index
 
 def render_product_code_search(load_func, language='KO', key_prefix=''):
     """제품 CODE 검색 UI - Code 1~7 검색 가능 (제품 관리와 동일한 방식)"""
@@ -17,6 +18,10 @@ def render_product_code_search(load_func, language='KO', key_prefix=''):
         st.warning("등록된 제품이 없습니다.")
         return None
     
+    # 검색창을 그리기 전에 인덱스 구성 시작 (첫 키 입력이 색인을 기다리지 않도록)
+    index = get_product_index('products')
+    index.warm(products)
+    
     # Code 1~7 검색 옵션
     search_col1, search_col2 = st.columns([1, 3])
     
@@ -34,32 +39,25 @@ def render_product_code_search(load_func, language='KO', key_prefix=''):
             key=f"{key_prefix}product_code_search"
         )
     
-    # 검색 결과
+    # 검색 결과 (제품 검색 인덱스: 코드/영문명/베트남어명, 베트남어 악센트 무시, 순위순)
     if search_term or code_number != "전체":
-        filtered_products = products
+        index.sync(products)
         
         # Code 번호 필터
+        code_filter = None
         if code_number != "전체":
-            filtered_products = [
-                p for p in filtered_products
-                if f"-{code_number}-" in p.get('product_code', '')
-            ]
+            code_marker = f"-{code_number}-"
+            code_filter = lambda p: code_marker in (p.get('product_code') or '')
         
-        # 검색어 필터
-        if search_term:
-            filtered_products = [
-                p for p in filtered_products 
-                if (search_term.upper() in p.get('product_code', '').upper() or
-                    search_term.lower() in p.get('product_name_en', '').lower() or
-                    search_term.lower() in p.get('product_name_vn', '').lower())
-            ]
+        total_count = index.count(search_term, where=code_filter)
+        filtered_products = index.search(search_term, limit=10, where=code_filter)
         
         if filtered_products:
-            st.markdown(f"**검색 결과: {len(filtered_products)}건**")
+            st.markdown(f"**검색 결과: {total_count}건**")
             
             # 테이블 형식으로 표시
             df_data = []
-            for prod in filtered_products[:10]:  # 최대 10개
+            for prod in filtered_products:  # 최대 10개
                 df_data.append({
                     'ID': prod.get('id'),
                     'CODE': prod.get('product_code', 'N/A'),
@@ -90,7 +88,12 @@ def render_product_code_search(load_func, language='KO', key_prefix=''):
             )
             
             if st.button("✓ 선택", type="primary", key=f"{key_prefix}select_product_btn"):
-                selected_product = next((p for p in filtered_products if p.get('id') == selected_id), None)
+                # 표시된 10개 밖의 검색 결과도 선택 가능
+                matches = index.search(
+                    search_term, limit=1,
+                    where=lambda p: p.get('id') == selected_id and (code_filter is None or code_filter(p))
+                )
+                selected_product = matches[0] if matches else None
                 if selected_product:
                     return selected_product.get('product_code', '')
                 else:
@@ -2,12 +2,16 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 
+from utils.connection_pool import get_shared_client
+from utils.query_cache import invalidate_table
+
 def get_db_client():
-    """Supabase 클라이언트 가져오기"""
-    if 'supabase' not in st.session_state:
+    """Supabase 클라이언트 가져오기 (공유 풀 클라이언트)"""
+    try:
+        return get_shared_client()
+    except Exception:
         st.error("Supabase 연결이 초기화되지 않았습니다.")
         return None
-    return st.session_state.supabase
 
 
 def render_ymk_approval_interface():
@@ -439,6 +443,7 @@ def approve_orders(order_ids):
                 'reviewed_at': reviewed_at,
                 'updated_at': reviewed_at
             }).eq('id', order_id).eq('status', 'submitted').execute()
+        invalidate_table('hot_runner_orders')
         
         st.success(f"✅ {len(order_ids)}건의 규격 결정서가 승인되었습니다.")
         
@@ -466,6 +471,7 @@ def reject_orders(order_ids, rejection_reason):
                 'rejection_reason': rejection_reason,
                 'updated_at': reviewed_at
             }).eq('id', order_id).eq('status', 'submitted').execute()
+        invalidate_table('hot_runner_orders')
         
         st.success(f"✅ {len(order_ids)}건의 규격 결정서가 반려되었습니다.")
         
@@ -9,10 +9,19 @@ from datetime import datetime
 import uuid
 import time
 from .code_management_ui import CodeManagementUI
+from utils.connection_pool import get_shared_client
+from utils.query_cache import invalidate_table
+from utils.code_import import (
+    EXISTING_CODE_COLUMNS, find_file_duplicates, find_row_errors, load_existing_codes,
+    normalize_code_import, sorted_messages, write_codes
+)
 
 class CodeManagementComponent:
-    def __init__(self, supabase):
-        self.supabase = supabase
+    def __init__(self, supabase=None, bulk_save_func=None):
+        # 별도 클라이언트를 만들지 않고 공유 풀 클라이언트 재사용
+        self.supabase = supabase or get_shared_client()
+        # CSV 일괄 저장 함수 (db_operations.bulk_save_data: 저장 후 읽기 캐시 무효화)
+        self.bulk_save_func = bulk_save_func
         self.ui = CodeManagementUI(self)
     
     def generate_unique_key(self, prefix="code"):
@@ -45,6 +54,7 @@ class CodeManagementComponent:
         
         try:
             response = self.supabase.table(table).insert(data).execute()
+            invalidate_table(table)
             return True
         except Exception as e:
             st.error(f"데이터 저장 실패 ({table}): {e}")
@@ -58,6 +68,7 @@ class CodeManagementComponent:
         try:
             item_id = data.pop(id_field)
             response = self.supabase.table(table).update(data).eq(id_field, item_id).execute()
+            invalidate_table(table)
             return True
         except Exception as e:
             st.error(f"데이터 업데이트 실패 ({table}): {e}")
@@ -75,6 +86,7 @@ class CodeManagementComponent:
         
         try:
             response = self.supabase.table(table).delete().eq(id_field, item_id).execute()
+            invalidate_table(table)
             
             if response.data:
                 return True
@@ -285,7 +297,8 @@ class CodeManagementComponent:
         st.subheader("📤 CSV 파일 업로드")
         
         st.markdown("### 🏷️ 카테고리 선택")
-        existing_codes = self.load_data_from_supabase('product_codes')
+        # 카테고리 목록과 중복 확인에 필요한 컬럼만 한 번 조회
+        existing_codes = self.load_data_from_supabase('product_codes', EXISTING_CODE_COLUMNS)
         
         if existing_codes:
             categories = list(set([code.get('category') for code in existing_codes]))
@@ -333,7 +346,7 @@ HR,ST,OP,16,MCC,xx,00,Hot Runner Standard 16MCC,TRUE""")
                 st.info(f"선택된 카테고리: **{selected_category}**")
                 
                 validation_errors = self._validate_csv_data_no_category(df)
-                duplicate_errors = self._check_duplicate_codes(df, selected_category)
+                duplicate_errors = self._check_duplicate_codes(df, selected_category, existing_codes)
                 all_errors = validation_errors + duplicate_errors
 
                 if all_errors:
@@ -382,7 +395,7 @@ HR,ST,OP,16,MCC,xx,00,Hot Runner Standard 16MCC,TRUE""")
                 st.error(f"CSV 파일 처리 중 오류: {str(e)}")
     
     def _validate_csv_data_no_category(self, df):
-        """CSV 데이터 검증"""
+        """CSV 데이터 검증 (컬럼 단위 벡터 연산)"""
         errors = []
         
         required_columns = ['description']
@@ -396,75 +409,26 @@ HR,ST,OP,16,MCC,xx,00,Hot Runner Standard 16MCC,TRUE""")
         if errors:
             return errors
         
-        for idx, row in df.iterrows():
-            row_num = idx + 2
-            
-            if pd.isna(row.get('description')) or str(row.get('description')).strip() == '':
-                errors.append(f"행 {row_num}: 설명이 비어있습니다.")
-            
-            is_active = str(row.get('is_active', 'TRUE')).upper()
-            if is_active not in ['TRUE', 'FALSE', '']:
-                errors.append(f"행 {row_num}: is_active는 TRUE 또는 FALSE여야 합니다.")
-            
-            has_code = False
-            for i in range(1, 8):
-                code_col = f'code{i:02d}'
-                if code_col in df.columns and not pd.isna(row.get(code_col)) and str(row.get(code_col)).strip():
-                    has_code = True
-                    break
-            
-            if not has_code:
-                errors.append(f"행 {row_num}: 최소 1개 이상의 코드가 필요합니다.")
-        
-        return errors
+        frame = normalize_code_import(df, category='')
+        return sorted_messages(find_row_errors(frame, require_category=False, check_active=True, max_length=None))
     
     def _bulk_save_codes_with_category(self, df, category):
-        """대량 코드 저장"""
+        """대량 코드 저장 (청크 단위 일괄 insert)"""
         user = self.get_current_user()
         if not user:
             st.error("사용자 정보를 확인할 수 없습니다.")
             return False
         
-        success_count = 0
         total_count = len(df)
+        frame = normalize_code_import(df, category=category)
         
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for idx, row in df.iterrows():
-            try:
-                new_code = {
-                    'category': category,
-                    'code01': str(row.get('code01', '')).strip() or None,
-                    'code02': str(row.get('code02', '')).strip() or None,
-                    'code03': str(row.get('code03', '')).strip() or None,
-                    'code04': str(row.get('code04', '')).strip() or None,
-                    'code05': str(row.get('code05', '')).strip() or None,
-                    'code06': str(row.get('code06', '')).strip() or None,
-                    'code07': str(row.get('code07', '')).strip() or None,
-                    'description': str(row.get('description', '')).strip(),
-                    'is_active': str(row.get('is_active', 'TRUE')).upper() == 'TRUE',
-                    'created_by': user['id'],
-                    'created_at': datetime.now().isoformat(),
-                    'updated_at': datetime.now().isoformat()
-                }
-                
-                for key, value in new_code.items():
-                    if value == '':
-                        new_code[key] = None
-                
-                if self.save_data_to_supabase('product_codes', new_code):
-                    success_count += 1
-                
-                progress = (idx + 1) / total_count
-                progress_bar.progress(progress)
-                status_text.text(f"처리 중... {idx + 1}/{total_count} ({success_count}개 성공)")
-                
-            except Exception as e:
-                st.warning(f"행 {idx + 2} 처리 중 오류: {str(e)}")
+        with st.spinner(f"{total_count}개 코드 저장 중..."):
+            result = write_codes(frame, bulk_save_func=self.bulk_save_func,
+                                 include_full_code=False, extra={'created_by': user['id']})
+        success_count = result['inserted']
         
-        progress_bar.empty()
-        status_text.empty()
+        for row_no, message in result['failed']:
+            st.warning(f"행 {row_no} 처리 중 오류: {message}")
         
         if success_count == total_count:
             return True
@@ -479,6 +443,7 @@ HR,ST,OP,16,MCC,xx,00,Hot Runner Standard 16MCC,TRUE""")
         """특정 카테고리 코드 삭제"""
         try:
             response = self.supabase.table('product_codes').delete().eq('category', category).execute()
+            invalidate_table('product_codes')
             if response.data:
                 st.info(f"기존 '{category}' 카테고리 {len(response.data)}개 코드가 삭제되었습니다.")
                 return True
@@ -489,65 +454,39 @@ HR,ST,OP,16,MCC,xx,00,Hot Runner Standard 16MCC,TRUE""")
             st.error(f"카테고리 삭제 실패: {e}")
             return False
     
-    def _check_duplicate_codes(self, df, category):
-        """코드 중복 확인"""
+    def _check_duplicate_codes(self, df, category, existing_codes=None):
+        """
+        코드 중복 확인
+        CSV 내부 중복은 duplicated(), 기존 코드와의 중복은 full_code 해시 조인으로 판정
+        """
         duplicate_errors = []
         
-        csv_codes = []
-        for idx, row in df.iterrows():
-            code_parts = []
-            for i in range(1, 8):
-                code_col = f'code{i:02d}'
-                code_value = str(row.get(code_col, '')).strip()
-                if code_value:
-                    code_parts.append(code_value)
-            
-            if code_parts:
-                full_code = "-".join(code_parts)
-                csv_codes.append({
-                    'row': idx + 2,
-                    'full_code': full_code
-                })
+        frame = normalize_code_import(df, category=category)
+        frame = frame[frame['full_code'] != '']
+        
+        first_rows = frame.drop_duplicates('full_code', keep='first').set_index('full_code')['row_no']
+        duplicated = find_file_duplicates(frame)
+        for row_no, full_code in zip(frame.loc[duplicated, 'row_no'], frame.loc[duplicated, 'full_code']):
+            duplicate_errors.append(
+                f"CSV 내부 중복: 행 {first_rows[full_code]}와 행 {row_no}에서 동일한 코드 '{full_code}'"
+            )
+        
+        if existing_codes is None:
+            existing_codes = self.load_data_from_supabase('product_codes', EXISTING_CODE_COLUMNS)
+        existing = load_existing_codes(lambda table, columns, **_: existing_codes)
+        existing_categories = existing.drop_duplicates('full_code', keep='first').set_index('full_code')['category']
         
-        seen_codes = {}
-        for code_info in csv_codes:
-            full_code = code_info['full_code']
-            if full_code in seen_codes:
+        matched = frame.join(existing_categories.rename('existing_category'), on='full_code', how='inner')
+        for row_no, full_code, existing_category in zip(
+                matched['row_no'], matched['full_code'], matched['existing_category']):
+            if existing_category == category:
                 duplicate_errors.append(
-                    f"CSV 내부 중복: 행 {seen_codes[full_code]}와 행 {code_info['row']}에서 동일한 코드 '{full_code}'"
+                    f"같은 카테고리 내 중복: 행 {row_no}의 코드 '{full_code}'가 이미 존재함"
                 )
             else:
-                seen_codes[full_code] = code_info['row']
-        
-        existing_codes = self.load_data_from_supabase('product_codes')
-        existing_full_codes = {}
-        
-        for existing_code in existing_codes:
-            existing_parts = []
-            for i in range(1, 8):
-                code_value = existing_code.get(f'code{i:02d}')
-                if code_value:
-                    existing_parts.append(str(code_value).strip())
-            
-            if existing_parts:
-                existing_full_code = "-".join(existing_parts)
-                existing_full_codes[existing_full_code] = {
-                    'category': existing_code.get('category'),
-                    'id': existing_code.get('id')
-                }
-        
-        for code_info in csv_codes:
-            full_code = code_info['full_code']
-            if full_code in existing_full_codes:
-                existing_info = existing_full_codes[full_code]
-                if existing_info['category'] == category:
-                    duplicate_errors.append(
-                        f"같은 카테고리 내 중복: 행 {code_info['row']}의 코드 '{full_code}'가 이미 존재함"
-                    )
-                else:
-                    duplicate_errors.append(
-                        f"다른 카테고리와 중복: 행 {code_info['row']}의 코드 '{full_code}'가 '{existing_info['category']}' 카테고리에 이미 존재함"
-                    )
+                duplicate_errors.append(
+                    f"다른 카테고리와 중복: 행 {row_no}의 코드 '{full_code}'가 '{existing_category}' 카테고리에 이미 존재함"
+                )
         
         return duplicate_errors
     
@@ -1,50 +1,26 @@
 from datetime import datetime
 
+from utils.sequence_service import next_document_number, peek_document_number
+
+def _number_column(doc_type):
+    """doc_type에 따라 기존 번호를 조회할 컬럼 결정"""
+    if doc_type == 'PAY':
+        return 'reimbursement_document_number'
+    return 'document_number'
+
 def generate_document_number(doc_type, save_func=None, load_func=None):
-    """문서 번호 생성 - DOC-YYMMDD-001 형식"""
+    """
+    문서 번호 생성 - DOC-YYMMDD-001 형식 (시퀀스 서비스에서 원자적으로 발급, 저장 시에만 호출)
+    발급 실패 시 SequenceUnavailableError - 호출부에서 st.error로 알리고 저장 중단
+    """
     
     today = datetime.now().strftime('%y%m%d')
-    prefix = f"{doc_type}-{today}"
-    
-    # doc_type에 따라 조회할 컬럼 결정
-    if doc_type == 'PAY':
-        column_name = 'reimbursement_document_number'
-    elif doc_type == 'EXP':
-        column_name = 'document_number'
-    else:
-        column_name = 'document_number'
-    
-    # DB에서 오늘 날짜 문서 중 최대 번호 조회
-    if load_func:
-        try:
-            expenses = load_func('expenses')
-            today_docs = [
-                exp.get(column_name, '') 
-                for exp in expenses 
-                if exp.get(column_name, '') and 
-                   exp.get(column_name, '').startswith(prefix) and
-                   exp.get(column_name, '') != 'TEMP'  # TEMP 제외
-            ]
-            
-            if today_docs:
-                # 마지막 번호 추출
-                last_numbers = []
-                for doc in today_docs:
-                    try:
-                        num = int(doc.split('-')[-1])
-                        last_numbers.append(num)
-                    except:
-                        continue
-                
-                if last_numbers:
-                    next_num = max(last_numbers) + 1
-                else:
-                    next_num = 1
-            else:
-                next_num = 1
-        except:
-            next_num = 1
-    else:
-        next_num = 1
+    return next_document_number(doc_type, period=today,
+                                table_name='expenses', column=_number_column(doc_type))
+
+def preview_document_number(doc_type):
+    """다음 문서 번호 미리보기 (번호를 소비하지 않음, 실제 발급 번호와 다를 수 있음)"""
     
-    return f"{prefix}-{next_num:03d}"
\ No newline at end of file
+    today = datetime.now().strftime('%y%m%d')
+    return peek_document_number(doc_type, period=today,
+                                table_name='expenses', column=_number_column(doc_type))
@@ -7,6 +7,8 @@ import streamlit as st
 import uuid
 import time
 
+from utils.product_search import search_products, warm_product_index
+
 class MultilingualInputComponent:
     def __init__(self, supabase):
         self.supabase = supabase
@@ -203,8 +205,11 @@ class MultilingualInputComponent:
         
         return ' '.join(terms)
     
-    def render_multilingual_search(self, products, key_prefix="search"):
-        """다국어 검색 기능"""
+    def render_multilingual_search(self, products, key_prefix="search", index_key="products"):
+        """다국어 검색 기능 (index_key: 제품 검색 인덱스 키, 보통 제품 테이블명)"""
+        # 검색창을 그리기 전에 인덱스 구성 시작 (첫 키 입력이 색인을 기다리지 않도록)
+        warm_product_index(products, key=index_key)
+        
         search_term = st.text_input(
             "🔍 제품 검색 (다국어 지원)",
             placeholder="제품 코드, 영어명, 베트남어명으로 검색",
@@ -214,16 +219,8 @@ class MultilingualInputComponent:
         if not search_term:
             return products
         
-        # 검색 실행
-        filtered_products = []
-        search_lower = search_term.lower()
-        
-        for product in products:
-            search_text = self.get_search_terms(product)
-            if search_lower in search_text:
-                filtered_products.append(product)
-        
-        return filtered_products
+        # 검색 실행 (제품 검색 인덱스: 목록이 바뀐 경우에만 다시 색인, 순위순 결과)
+        return search_products(products, search_term, key=index_key)
     
     def render_language_priority_info(self):
         """언어 우선순위 정보 표시"""
@@ -243,6 +240,7 @@ class MultilingualInputComponent:
             **검색 시:**
             - 모든 언어의 제품명에서 검색
             - 제품 코드도 검색 대상에 포함
+            - 베트남어는 성조/악센트 없이 입력해도 검색 (khuon → Khuôn)
             """)
     
     def get_multilingual_display_options(self):
@@ -40,6 +40,11 @@ class Settings:
     SUPABASE_URL = os.getenv('SUPABASE_URL', '')
     SUPABASE_KEY = os.getenv('SUPABASE_KEY', '')
     
+    # DB 백엔드 ('supabase' 또는 네트워크 없이 동작하는 'local', utils/local_backend.py)
+    DB_BACKEND = os.getenv('YMV_DB_BACKEND', 'supabase').strip().lower()
+    LOCAL_DB_DIR = os.getenv('YMV_LOCAL_DB_DIR', '')  # 비우면 메모리 전용
+    LOCAL_DB_SEED_ROWS = int(os.getenv('YMV_LOCAL_DB_SEED_ROWS', '0') or 0)
+    
     @classmethod
     def get_all_settings(cls) -> Dict[str, Any]:
         """모든 설정을 딕셔너리로 반환"""
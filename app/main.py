@@ -16,57 +16,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 서드파티 라이브러리
-import supabase
-from supabase import create_client, Client
-
-# 내부 컴포넌트 - Sales
-from components.sales.customer_management import show_customer_management
-from components.sales.quotation_management import show_quotation_management
-from components.sales.sales_process_main import show_sales_process_management
-from components.sales.performance_management import show_performance_management
-from components.sales.sales_activity import show_sales_activity 
-
-# 내부 컴포넌트 - Finance
-from components.finance.expense_management import show_expense_management
-from components.finance.reimbursement_management import show_reimbursement_management
-
-# 내부 컴포넌트 - HR
-from components.hr.employee_management import show_employee_management
-from components.hr.corporate_account_management import show_corporate_account_management
-
-# 내부 컴포넌트 - Supplier
-from components.supplier.supplier_management import show_supplier_management
-
-# 내부 컴포넌트 - Product
-from components.product.product_management import show_product_management
-from components.product.product_code_management import show_product_code_management
-
-# 내부 컴포넌트 - Operations
-from components.operations.purchase_management import show_purchase_management
-
-# 내부 컴포넌트 - Logistics
-from components.logistics.logistics_management import show_logistics_management
-
-# 내부 컴포넌트 - Dashboard
-from components.dashboard import show_dashboard_main
-
-# 내부 컴포넌트 - System
-from components.system.multilingual_input import MultilingualInputComponent
-
-# 내부 컴포넌트 - Specifications
-from components.specifications.hot_runner_order_sheet import show_hot_runner_order_management
-from components.specifications.spec_decision_approval import spec_decision_approval
-
 # 유틸리티 모듈
 from utils.database import create_database_operations
+from utils.local_backend import create_local_database_operations
+from config.config_settings import settings
+from utils.connection_pool import get_shared_client
 from utils.auth import AuthManager
-from utils.helpers import (
-    StatusHelper, StatisticsCalculator, CSVGenerator, PrintFormGenerator,
-    get_approval_status_info, calculate_expense_statistics, 
-    create_csv_download, render_print_form,
-    CorporatePermissionHelper
-)
+
+# 페이지 컴포넌트는 메뉴를 처음 선택할 때 import (utils.page_registry.PAGE_MODULES)
+# 로그인 화면에서는 pandas/plotly를 쓰는 컴포넌트와 utils.helpers를 불러오지 않는다
+from utils.page_registry import get_page
 
 # ===========================================
 # 전역 초기화 및 설정
@@ -74,14 +33,20 @@ from utils.helpers import (
 
 @st.cache_resource
 def init_supabase():
-    """Supabase 클라이언트 초기화"""
-    url = st.secrets["SUPABASE_URL"]
-    key = st.secrets["SUPABASE_ANON_KEY"]
-    return create_client(url, key)
+    """Supabase 클라이언트 초기화 (utils 계층과 같은 공유 풀 클라이언트)"""
+    return get_shared_client()
 
 @st.cache_resource
 def init_managers():
-    """매니저 클래스들 초기화"""
+    """매니저 클래스들 초기화 (settings.DB_BACKEND == 'local'이면 네트워크 없는 로컬 백엔드)"""
+    if settings.DB_BACKEND == 'local':
+        db_ops = create_local_database_operations(
+            data_dir=settings.LOCAL_DB_DIR or None,
+            seed_rows=settings.LOCAL_DB_SEED_ROWS
+        )
+        auth_manager = AuthManager(db_ops)
+        return db_ops, auth_manager
+    
     supabase_client = init_supabase()
     
     # session_state에 supabase 저장 (물류 함수에서 사용)
@@ -190,7 +155,10 @@ def show_login_page():
         else:
             # 법인 로그인
             try:
-                corporate_accounts = db_operations.load_data('corporate_accounts') or []
+                # 로그인 선택 목록에는 비밀번호 없이 표시용 컬럼만 조회
+                corporate_accounts = db_operations.load_data(
+                    'corporate_accounts', columns="account_id,company_code,company_name,is_active"
+                ) or []
                 
                 if not corporate_accounts:
                     st.warning("등록된 법인 계정이 없습니다.")
@@ -244,11 +212,17 @@ def show_login_page():
 
 def show_dashboard():
     """대시보드 페이지"""
+    show_dashboard_main = get_page("대시보드")
     show_dashboard_main(db_operations.load_data, auth_manager.get_current_user)
 
 
 def show_expense_management_page():
     """지출 관리 페이지"""
+    from utils.helpers import (
+        get_approval_status_info, calculate_expense_statistics,
+        create_csv_download, render_print_form
+    )
+    show_expense_management = get_page("지출 요청서")
     current_user = auth_manager.get_current_user()
     show_expense_management(
         db_operations.load_data,
@@ -260,7 +234,8 @@ def show_expense_management_page():
         calculate_expense_statistics,
         create_csv_download,
         render_print_form,
-        current_user
+        current_user,
+        bulk_update_func=db_operations.bulk_update
     )
 
 def show_reimbursement_management_page():
@@ -272,6 +247,7 @@ def show_reimbursement_management_page():
         st.warning("⚠️ 환급 관리 권한이 없습니다.")
         return
     
+    show_reimbursement_management = get_page("환급 관리")
     show_reimbursement_management(
         db_operations.load_data,
         db_operations.update_data,
@@ -280,6 +256,11 @@ def show_reimbursement_management_page():
 
 def show_employee_management_page():
     """직원 관리 페이지"""
+    from utils.helpers import (
+        get_approval_status_info, calculate_expense_statistics,
+        create_csv_download, render_print_form
+    )
+    show_employee_management = get_page("직원 관리")
     db_operations, auth_manager = init_managers()
     show_employee_management(
         db_operations.load_data,
@@ -296,6 +277,7 @@ def show_employee_management_page():
 
 def show_corporate_account_management_page():
     """법인 관리 페이지"""
+    show_corporate_account_management = get_page("법인 계정 관리")
     show_corporate_account_management(
         db_operations.load_data,
         db_operations.save_data,
@@ -307,11 +289,13 @@ def show_corporate_account_management_page():
 def show_product_code_management_page():
     """제품 코드 관리 페이지"""
     try:
+        show_product_code_management = get_page("제품 코드 관리")
         show_product_code_management(
             load_func=db_operations.load_data,
             save_func=db_operations.save_data,
             update_func=db_operations.update_data,
-            delete_func=db_operations.delete_data
+            delete_func=db_operations.delete_data,
+            bulk_save_func=db_operations.bulk_save_data
         )
     except Exception as e:
         st.error(f"제품 코드 관리 페이지 로드 중 오류가 발생했습니다: {str(e)}")
@@ -320,6 +304,7 @@ def show_product_code_management_page():
 def show_product_management_page():
     """제품 관리 페이지"""
     try:
+        show_product_management = get_page("제품 관리")
         current_user = auth_manager.get_current_user()
         show_product_management(
             load_func=db_operations.load_data,
@@ -335,6 +320,7 @@ def show_product_management_page():
 def show_supplier_management_page():
     """공급업체 관리 페이지"""
     try:
+        show_supplier_management = get_page("공급업체 관리")
         show_supplier_management(
             load_func=db_operations.load_data,
             save_func=db_operations.save_data,
@@ -347,13 +333,15 @@ def show_supplier_management_page():
 def show_customer_management_page():
     """고객 관리 페이지"""
     try:
+        show_customer_management = get_page("고객 관리")
         current_user = auth_manager.get_current_user()
         show_customer_management(
             load_func=db_operations.load_data,
             save_func=db_operations.save_data,
             update_func=db_operations.update_data,
             delete_func=db_operations.delete_data,
-            current_user=current_user
+            current_user=current_user,
+            bulk_save_func=db_operations.bulk_save_data
         )
     except Exception as e:
         st.error(f"고객 관리 페이지 로드 중 오류: {str(e)}")
@@ -362,6 +350,7 @@ def show_customer_management_page():
 def show_sales_activity_page():
     """영업 활동 관리 페이지"""
     try:
+        show_sales_activity = get_page("영업 활동 관리")
         current_user = auth_manager.get_current_user()
         show_sales_activity(
             load_func=db_operations.load_data,
@@ -377,6 +366,11 @@ def show_sales_activity_page():
 
 def show_sales_process_management_page():
     """영업 프로세스 관리 페이지"""
+    from utils.helpers import (
+        get_approval_status_info, calculate_expense_statistics,
+        create_csv_download, render_print_form
+    )
+    show_sales_process_management = get_page("영업 프로세스")
     show_sales_process_management(
         db_operations.load_data,
         db_operations.save_data,
@@ -390,14 +384,31 @@ def show_sales_process_management_page():
         render_print_form
     )
 
+def show_performance_management_page():
+    """실적 관리 페이지"""
+    show_performance_management = get_page("실적 관리")
+    show_performance_management(db_operations.load_data, db_operations.update_data)
+
 def show_purchase_management_page():
     """구매품 관리 페이지"""
+    show_purchase_management = get_page("구매품 관리")
     show_purchase_management(
         db_operations.load_data,
         db_operations.save_data,
         db_operations.update_data,
         db_operations.delete_data,
-        auth_manager.get_current_user()
+        auth_manager.get_current_user(),
+        bulk_update_func=db_operations.bulk_update
+    )
+
+def show_logistics_management_page():
+    """물류사 관리 페이지"""
+    show_logistics_management = get_page("물류사 관리")
+    show_logistics_management(
+        db_operations.load_data,
+        db_operations.save_data,
+        db_operations.update_data,
+        db_operations.delete_data
     )
 
 def show_quotation_management_page():
@@ -408,6 +419,7 @@ def show_quotation_management_page():
         st.warning("로그인이 필요합니다. 사이드바에서 로그인해주세요.")
         return
     
+    show_quotation_management = get_page("견적서 관리")
     show_quotation_management(
         save_func=db_operations.save_data,
         load_func=db_operations.load_data,
@@ -420,6 +432,7 @@ def show_quotation_management_page():
 def show_multilingual_input():
     """다국어 입력 페이지"""
     st.title("🌐 다국어 입력 시스템")
+    MultilingualInputComponent = get_page("다국어 입력")
     ml_input = MultilingualInputComponent(init_supabase())
     
     # 언어 우선순위 정보 표시
@@ -447,6 +460,7 @@ def show_multilingual_input():
 
 def show_hot_runner_order_sheet_page():
     """Hot Runner Order Sheet 페이지"""
+    show_hot_runner_order_management = get_page("규격 결정서")
     show_hot_runner_order_management(
         db_operations.load_data,
         db_operations.save_data,
@@ -456,8 +470,32 @@ def show_hot_runner_order_sheet_page():
 
 def show_spec_decision_approval_page():
     """규격결정서 승인 페이지 (YMK/CEO 전용)"""
+    spec_decision_approval = get_page("규격결정서 승인")
     spec_decision_approval()
 
+# 메뉴 이름 → 페이지 함수
+PAGE_HANDLERS = {
+    "대시보드": show_dashboard,
+    "고객 관리": show_customer_management_page,
+    "영업 활동 관리": show_sales_activity_page,
+    "견적서 관리": show_quotation_management_page,
+    "규격 결정서": show_hot_runner_order_sheet_page,
+    "규격결정서 승인": show_spec_decision_approval_page,
+    "실적 관리": show_performance_management_page,
+    "영업 프로세스": show_sales_process_management_page,
+    "제품 코드 관리": show_product_code_management_page,
+    "제품 관리": show_product_management_page,
+    "공급업체 관리": show_supplier_management_page,
+    "구매품 관리": show_purchase_management_page,
+    "물류사 관리": show_logistics_management_page,
+    "직원 관리": show_employee_management_page,
+    "법인 계정 관리": show_corporate_account_management_page,
+    "지출 요청서": show_expense_management_page,
+    "환급 관리": show_reimbursement_management_page,
+    "다국어 입력": show_multilingual_input,
+    "Hot Runner Order Sheet": show_hot_runner_order_sheet_page,
+}
+
 # ===========================================
 # 메인 애플리케이션
 # ===========================================
@@ -655,50 +693,10 @@ def main():
     # 현재 페이지 표시
     current_page = st.session_state.current_page
     
-    # 페이지별 라우팅
-    if current_page == "대시보드":
-        show_dashboard()
-    elif current_page == "고객 관리":
-        show_customer_management_page()
-    elif current_page == "영업 활동 관리":  
-        show_sales_activity_page()    
-    elif current_page == "견적서 관리":
-        show_quotation_management_page()
-    elif current_page == "규격 결정서":
-        show_hot_runner_order_sheet_page()
-    elif current_page == "규격결정서 승인":
-        show_spec_decision_approval_page()
-    elif current_page == "실적 관리":
-        show_performance_management(db_operations.load_data, db_operations.update_data)
-    elif current_page == "영업 프로세스":
-        show_sales_process_management_page()
-    elif current_page == "제품 코드 관리":
-        show_product_code_management_page()
-    elif current_page == "제품 관리":
-        show_product_management_page()
-    elif current_page == "공급업체 관리":
-        show_supplier_management_page()
-    elif current_page == "구매품 관리":
-        show_purchase_management_page()
-    elif current_page == "물류사 관리":
-        show_logistics_management(
-            db_operations.load_data,
-            db_operations.save_data,
-            db_operations.update_data,
-            db_operations.delete_data
-        )
-    elif current_page == "직원 관리":
-        show_employee_management_page()
-    elif current_page == "법인 계정 관리":
-        show_corporate_account_management_page()
-    elif current_page == "지출 요청서":
-        show_expense_management_page()
-    elif current_page == "환급 관리":
-        show_reimbursement_management_page()
-    elif current_page == "다국어 입력":
-        show_multilingual_input()
-    elif current_page == "Hot Runner Order Sheet":
-        show_hot_runner_order_sheet_page()
+    # 페이지별 라우팅 (선택된 페이지의 모듈만 import)
+    page_handler = PAGE_HANDLERS.get(current_page)
+    if page_handler is not None:
+        page_handler()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,425 @@
+# app/shared/local_storage.py
+"""
+로컬 파일 저장 엔진 (LocalDatabase 백엔드)
+Append-only local table store with primary-key index, compaction and file locking
+
+테이블마다 아래 파일을 사용한다.
+    <table>.json       스냅샷 (기존 LocalDatabase 파일과 같은 행 목록 형식)
+    <table>.log        스냅샷 이후 변경 기록 (JSON Lines, 한 줄에 한 건)
+    <table>.meta.json  {"generation": 스냅샷 세대, "next_id": 다음 ID}
+    <table>.lock       프로세스 간 잠금 파일
+
+- 메모리에는 id → 행 사전(기본 키 인덱스)을 두고 변경은 로그에 한 줄씩 추가 (O(1) 쓰기)
+- 로그가 COMPACT_MIN_OPS 이상이고 행 수보다 많아지면 스냅샷으로 압축
+- 스냅샷/메타 파일은 임시 파일에 쓴 뒤 os.replace로 교체 (중간 상태 파일이 남지 않음)
+- 모든 읽기/쓰기는 잠금 파일을 잡은 상태에서 다른 프로세스가 추가한 로그만 이어 읽음
+- next_id는 메타/로그에 기록되므로 마지막 행을 삭제해도 ID가 재사용되지 않음
+- 이미 있는 id로 insert하거나 update로 다른 행의 id를 쓰면 DuplicateKeyError (덮어쓰지 않음)
+- 선언된 보조 인덱스(컬럼 값 → 행 ID)는 행 추가/수정/삭제 때 함께 갱신되며
+  where 동등 조건에 인덱스 컬럼이 있으면 전체 스캔 대신 해시 조회
+- data_dir=None이면 파일 없이 메모리에만 보관 (로컬 DB 백엔드/벤치마크용)
+
+인덱스 벤치마크 (10k / 100k / 1M행): python -m shared.local_storage_benchmark
+
+로그 기록은 전체 행 저장(put) / 삭제(del)만 있으므로 다시 적용해도 결과가 같다.
+압축 도중 중단되어 로그가 남아 있어도 새 스냅샷 위에 다시 적용하면 된다.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# 압축 기준 (로그 기록 수)
+COMPACT_MIN_OPS = 1000
+
+# 해시할 수 없는 값(list/dict)을 가진 행의 인덱스 버킷
+_UNHASHABLE = object()
+
+
+class DuplicateKeyError(ValueError):
+    """이미 있는 id로 행을 추가하거나 id를 바꾸려 함 (DB의 기본 키 중복 오류와 같은 의미)"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _atomic_write(path: Path, text: str):
+    """임시 파일에 쓴 뒤 rename으로 교체"""
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """프로세스 간 배타 잠금 (POSIX flock / Windows msvcrt.locking)"""
+    with open(path, 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def matches(row: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """where의 모든 키가 같은 값인지 (기존 LocalDatabase 조건과 동일)"""
+    if not where:
+        return True
+    for key, value in where.items():
+        if row.get(key) != value:
+            return False
+    return True
+
+
+def _bucket_key(value: Any) -> Any:
+    try:
+        hash(value)
+    except TypeError:
+        return _UNHASHABLE
+    return value
+
+
+class LocalTableStore:
+    """테이블 하나의 스냅샷 + 변경 로그 + 기본 키 인덱스 + 보조 인덱스"""
+
+    def __init__(self, data_dir: Optional[Path], table_name: str, filename: Optional[str] = None,
+                 compact_min_ops: int = COMPACT_MIN_OPS, index_columns: Iterable[str] = ()):
+        stem = Path(filename or f'{table_name}.json').stem
+        self.table_name = table_name
+        # data_dir가 없으면 메모리 전용 (파일 기록/프로세스 잠금 없음)
+        self.in_memory = data_dir is None
+        base = data_dir if data_dir is not None else Path('.')
+        self.snapshot_path = base / f'{stem}.json'
+        self.log_path = base / f'{stem}.log'
+        self.meta_path = base / f'{stem}.meta.json'
+        self.lock_path = base / f'{stem}.lock'
+        self.compact_min_ops = compact_min_ops
+
+        self.rows: Dict[Any, Dict[str, Any]] = {}
+        # 행 추가 순서 (인덱스 조회 결과를 파일 순서대로 돌려주기 위함)
+        self._order: Dict[Any, int] = {}
+        self._sequence = 0
+        # 컬럼 → 값 → {행 ID}
+        self.indexes: Dict[str, Dict[Any, set]] = {column: {} for column in index_columns}
+        self.next_id = 1
+        self._generation: Optional[int] = None
+        self._log_offset = 0
+        self._log_ops = 0
+        self._thread_lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 파일 → 메모리
+    # ------------------------------------------------------------------
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_snapshot(self, meta: Dict[str, Any]):
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = []
+        self.next_id = max(int(meta.get('next_id') or 1), 1)
+        self.reset(data if isinstance(data, list) else [])
+        self._generation = int(meta.get('generation') or 0)
+        self._log_offset = 0
+        self._log_ops = 0
+
+    def reset(self, rows: Iterable[Dict[str, Any]]):
+        """메모리 상태를 rows로 다시 구성 (인덱스 포함)"""
+        self.rows = {}
+        self._order = {}
+        self._sequence = 0
+        self.indexes = {column: {} for column in self.indexes}
+        for row in rows:
+            self._put(row)
+
+    def add_index(self, column: str):
+        """보조 인덱스 선언 (기존 행으로 즉시 구성)"""
+        if column in self.indexes:
+            return
+        buckets: Dict[Any, set] = {}
+        for row_id, row in self.rows.items():
+            buckets.setdefault(_bucket_key(row.get(column)), set()).add(row_id)
+        self.indexes[column] = buckets
+
+    def _unindex(self, row: Dict[str, Any]):
+        for column, buckets in self.indexes.items():
+            key = _bucket_key(row.get(column))
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.discard(row['id'])
+                if not bucket:
+                    del buckets[key]
+
+    def _put(self, row: Dict[str, Any]):
+        """행 등록 (ID가 없는 예전 행은 새 ID 부여) + 인덱스/next_id 갱신"""
+        if row.get('id') is None:
+            row['id'] = self.next_id
+        row_id = row['id']
+        previous = self.rows.get(row_id)
+        if previous is not None:
+            self._unindex(previous)
+        else:
+            self._sequence += 1
+            self._order[row_id] = self._sequence
+        self.rows[row_id] = row
+        for column, buckets in self.indexes.items():
+            buckets.setdefault(_bucket_key(row.get(column)), set()).add(row_id)
+        if isinstance(row_id, int) and row_id >= self.next_id:
+            self.next_id = row_id + 1
+
+    def _remove(self, row_id: Any):
+        row = self.rows.pop(row_id, None)
+        if row is not None:
+            self._unindex(row)
+            self._order.pop(row_id, None)
+
+    def _apply(self, record: Dict[str, Any]):
+        if record.get('op') == 'put':
+            self._put(record['row'])
+        elif record.get('op') == 'del':
+            self._remove(record.get('id'))
+        if record.get('next_id'):
+            self.next_id = max(self.next_id, int(record['next_id']))
+
+    def _catch_up(self):
+        """잠금 상태에서 다른 프로세스의 압축/추가 기록 반영"""
+        meta = self._read_meta()
+        if self._generation is None or int(meta.get('generation') or 0) != self._generation:
+            self._load_snapshot(meta)
+        try:
+            size = self.log_path.stat().st_size
+        except OSError:
+            size = 0
+        if size < self._log_offset:
+            # 로그가 잘렸으면(압축) 스냅샷부터 다시
+            self._load_snapshot(meta)
+        if size == self._log_offset:
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._log_offset)
+            chunk = f.read()
+        # 마지막 줄이 아직 쓰는 중이면 다음에 읽음
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        for line in complete.decode('utf-8').splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+                self._log_ops += 1
+        self._log_offset += len(complete)
+
+    @contextmanager
+    def locked(self) -> Iterator['LocalTableStore']:
+        """스레드 + 프로세스 잠금 후 최신 상태로 맞춤"""
+        with self._thread_lock:
+            if self.in_memory:
+                yield self
+                return
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with _file_lock(self.lock_path):
+                self._catch_up()
+                yield self
+
+    # ------------------------------------------------------------------
+    # 메모리 → 파일
+    # ------------------------------------------------------------------
+
+    def _append(self, records: List[Dict[str, Any]]):
+        """변경 기록 추가 (잠금 상태에서 호출)"""
+        if not records:
+            return
+        for record in records:
+            self._apply(record)
+        if self.in_memory:
+            return
+        payload = ''.join(_dumps(record) + '\n' for record in records).encode('utf-8')
+        with open(self.log_path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_offset += len(payload)
+        self._log_ops += len(records)
+        if self._log_ops >= self.compact_min_ops and self._log_ops > len(self.rows):
+            self.compact()
+
+    def compact(self):
+        """스냅샷 재작성 + 메타 갱신 + 로그 비우기 (잠금 상태에서 호출)"""
+        if self.in_memory:
+            return
+        generation = (self._generation or 0) + 1
+        _atomic_write(self.snapshot_path, json.dumps(
+            list(self.rows.values()), ensure_ascii=False, indent=2, default=str))
+        _atomic_write(self.meta_path, _dumps({'generation': generation, 'next_id': self.next_id}))
+        _atomic_write(self.log_path, '')
+        self._generation = generation
+        self._log_offset = 0
+        self._log_ops = 0
+
+    # ------------------------------------------------------------------
+    # 행 연산 (잠금 상태에서 호출)
+    # ------------------------------------------------------------------
+
+    def _candidate_ids(self, where: Dict[str, Any]) -> Optional[set]:
+        """where 조건 중 가장 작은 인덱스 버킷 (사용할 인덱스가 없으면 None)"""
+        best = None
+        for column, value in where.items():
+            buckets = self.indexes.get(column)
+            key = _bucket_key(value)
+            if buckets is None or key is _UNHASHABLE:
+                continue
+            bucket = buckets.get(key, set())
+            if best is None or len(bucket) < len(best):
+                best = bucket
+                if not best:
+                    break
+        return best
+
+    def find(self, where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        if not where:
+            return list(self.rows.values())
+        if 'id' in where and _bucket_key(where['id']) is not _UNHASHABLE:
+            row = self.rows.get(where['id'])
+            return [row] if row is not None and matches(row, where) else []
+        candidates = self._candidate_ids(where)
+        if candidates is None:
+            return [row for row in self.rows.values() if matches(row, where)]
+        ordered = sorted(candidates, key=self._order.__getitem__)
+        return [row for row in (self.rows[row_id] for row_id in ordered) if matches(row, where)]
+
+    def insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """행 추가 (id가 이미 있으면 DuplicateKeyError, 기존 행을 덮어쓰지 않음)"""
+        if row.get('id') is None:
+            row['id'] = self.next_id
+        elif row['id'] in self.rows:
+            raise DuplicateKeyError(f"{self.table_name}: id={row['id']} 중복")
+        stored = dict(row)
+        next_id = max(self.next_id, row['id'] + 1) if isinstance(row['id'], int) else self.next_id
+        self._append([{'op': 'put', 'row': stored, 'next_id': next_id}])
+        return row
+
+    def update(self, patch: Dict[str, Any], where: Optional[Dict[str, Any]]) -> int:
+        """조건에 맞는 행 수정 → 수정된 행 수 (id 변경 시 다른 행과 겹치면 DuplicateKeyError)"""
+        now = datetime.now().isoformat()
+        targets = self.find(where)
+        records = []
+        new_ids = set()
+        for row in targets:
+            changed = dict(row)
+            changed.update(patch)
+            changed['updated_at'] = now
+            if changed['id'] != row['id']:
+                if changed['id'] in self.rows or changed['id'] in new_ids:
+                    raise DuplicateKeyError(f"{self.table_name}: id={changed['id']} 중복")
+                new_ids.add(changed['id'])
+                records.append({'op': 'del', 'id': row['id']})
+            records.append({'op': 'put', 'row': changed})
+        self._append(records)
+        return len(targets)
+
+    def delete(self, where: Optional[Dict[str, Any]]) -> int:
+        records = [{'op': 'del', 'id': row['id']} for row in self.find(where)]
+        self._append(records)
+        return len(records)
+
+
+class LocalStorageEngine:
+    """데이터 폴더의 테이블 저장소 모음 (data_dir=None이면 메모리 전용)"""
+
+    def __init__(self, data_dir: Any = 'data', filenames: Optional[Dict[str, str]] = None,
+                 compact_min_ops: int = COMPACT_MIN_OPS,
+                 indexes: Optional[Dict[str, Iterable[str]]] = None):
+        self.data_dir = Path(data_dir) if data_dir is not None else None
+        if self.data_dir is not None:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.filenames = dict(filenames or {})
+        self.index_columns = {table: list(columns) for table, columns in (indexes or {}).items()}
+        self.compact_min_ops = compact_min_ops
+        self._stores: Dict[str, LocalTableStore] = {}
+        self._lock = threading.Lock()
+
+    def store(self, table_name: str) -> LocalTableStore:
+        with self._lock:
+            store = self._stores.get(table_name)
+            if store is None:
+                store = LocalTableStore(self.data_dir, table_name, self.filenames.get(table_name),
+                                        self.compact_min_ops, self.index_columns.get(table_name, ()))
+                self._stores[table_name] = store
+            return store
+
+    def exists(self, table_name: str) -> bool:
+        store = self.store(table_name)
+        if store.in_memory:
+            return bool(store.rows)
+        return store.snapshot_path.exists() or store.log_path.exists()
+
+    def select(self, table_name: str, where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        with self.store(table_name).locked() as store:
+            return [dict(row) for row in store.find(where)]
+
+    def insert(self, table_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        with self.store(table_name).locked() as store:
+            return store.insert(row)
+
+    def update(self, table_name: str, patch: Dict[str, Any], where: Optional[Dict[str, Any]]) -> int:
+        with self.store(table_name).locked() as store:
+            return store.update(patch, where)
+
+    def delete(self, table_name: str, where: Optional[Dict[str, Any]]) -> int:
+        with self.store(table_name).locked() as store:
+            return store.delete(where)
+
+    def replace_all(self, table_name: str, rows: List[Dict[str, Any]]):
+        """테이블 전체를 rows로 교체 (초기 데이터용)"""
+        with self.store(table_name).locked() as store:
+            store.reset(dict(row) for row in rows)
+            store.compact()
+
+    def table_names(self) -> List[str]:
+        """지금까지 연 테이블 목록"""
+        with self._lock:
+            return list(self._stores)
+
+    def compact(self, table_name: Optional[str] = None):
+        for name in [table_name] if table_name else list(self._stores):
+            with self.store(name).locked() as store:
+                store.compact()
@@ -0,0 +1,100 @@
+# app/shared/local_storage_benchmark.py
+"""
+로컬 저장 엔진 보조 인덱스 벤치마크
+Secondary index vs full scan lookups in LocalTableStore
+
+같은 행을 가진 두 저장소(보조 인덱스 있음 / 없음)에서 where 동등 조건 조회 시간을 비교한다.
+메모리 전용 저장소(data_dir=None)를 쓰므로 파일 기록 시간은 포함되지 않는다.
+
+행 수마다 기록:
+    index_build_ms       reset()으로 행 + 보조 인덱스를 구성한 시간
+    username_indexed_ms  users.username 로그인 조회 (고선택도) 1건당 평균 - 인덱스
+    username_scan_ms     같은 조회 1건당 평균 - 전체 스캔 (scan_lookups건만 측정)
+    status_indexed_ms    purchases.status 같은 저선택도 조회 1건당 평균 - 인덱스
+    status_scan_ms       같은 조회 1건당 평균 - 전체 스캔
+
+사용:
+    python -m shared.local_storage_benchmark                  # 10k / 100k / 1M행
+    python -m shared.local_storage_benchmark --sizes 10000 100000 --lookups 500
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Sequence
+
+from shared.local_storage import LocalTableStore
+
+# 기본 데이터 크기 (행 수)
+BENCHMARK_SIZES = (10_000, 100_000, 1_000_000)
+
+_STATUSES = ['pending', 'approved', 'rejected', 'ordered', 'received']
+
+
+def _per_lookup_ms(store: LocalTableStore, wheres: Sequence[Dict[str, Any]]) -> float:
+    started = time.perf_counter()
+    for where in wheres:
+        store.find(where)
+    return (time.perf_counter() - started) * 1000 / len(wheres)
+
+
+def benchmark_secondary_index(sizes: Iterable[int] = BENCHMARK_SIZES, lookups: int = 2000,
+                              scan_lookups: int = 20, status_repeat: int = 3,
+                              seed: int = 3) -> List[Dict[str, Any]]:
+    """
+    보조 인덱스 조회 vs 전체 스캔
+    Returns: 행 수별 조회 1건당 평균 시간(ms), 인덱스/스캔 결과가 다르면 mismatch에 조건 기록
+    """
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        rows = [{'id': i, 'username': f'user{i}', 'status': _STATUSES[i % len(_STATUSES)],
+                 'is_active': True} for i in range(1, size + 1)]
+        indexed = LocalTableStore(None, 'users', index_columns=('username', 'status'))
+        started = time.perf_counter()
+        indexed.reset(rows)
+        build_ms = (time.perf_counter() - started) * 1000
+        scan = LocalTableStore(None, 'users')
+        scan.reset(rows)
+
+        logins = [{'username': f'user{rng.randint(1, size)}', 'is_active': True} for _ in range(lookups)]
+        status = [{'status': 'pending'}] * status_repeat
+        mismatch = [where for where in logins[:scan_lookups] + status[:1]
+                    if indexed.find(where) != scan.find(where)]
+
+        results.append({
+            'rows': size,
+            'index_build_ms': round(build_ms, 1),
+            'username_indexed_ms': round(_per_lookup_ms(indexed, logins), 5),
+            'username_scan_ms': round(_per_lookup_ms(scan, logins[:scan_lookups]), 3),
+            'status_indexed_ms': round(_per_lookup_ms(indexed, status), 3),
+            'status_scan_ms': round(_per_lookup_ms(scan, status), 3),
+            'mismatch': mismatch,
+        })
+    return results
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 저장 엔진 보조 인덱스 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(BENCHMARK_SIZES),
+                        help="행 수 (기본 10000 100000 1000000)")
+    parser.add_argument('--lookups', type=int, default=2000, help="인덱스 조회 측정 건수")
+    parser.add_argument('--scan-lookups', type=int, default=20, help="전체 스캔 조회 측정 건수")
+    args = parser.parse_args(argv)
+
+    results = benchmark_secondary_index(args.sizes, args.lookups, args.scan_lookups)
+    print(f"{'행 수':>10}  {'구성 ms':>9}  {'username 인덱스':>16}  {'username 스캔':>14}  "
+          f"{'status 인덱스':>14}  {'status 스캔':>12}")
+    for r in results:
+        print(f"{r['rows']:>10,}  {r['index_build_ms']:>9}  {r['username_indexed_ms']:>16}  "
+              f"{r['username_scan_ms']:>14}  {r['status_indexed_ms']:>14}  {r['status_scan_ms']:>12}")
+
+    failed = [r for r in results if r['mismatch']]
+    for r in failed:
+        print(f"인덱스/스캔 결과 불일치 ({r['rows']:,}행): {r['mismatch']}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,27 @@
 # app/shared/database.py
 import streamlit as st
-import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from shared.local_storage import LocalStorageEngine
+
+# 테이블별 보조 인덱스 (where 동등 조건 해시 조회)
+LOCAL_INDEXES = {
+    'users': ['username'],
+    'customers': ['company_name'],
+    'products': ['product_code'],
+    'purchases': ['status'],
+    'expenses': ['employee_id', 'status'],
+    'quotations': ['customer_id'],
+    'quotation_items': ['quotation_id'],
+}
+
 class LocalDatabase:
     """로컬 파일 기반 데이터베이스 (Supabase 연결 전까지 사용)"""
     
-    def __init__(self):
-        self.data_dir = Path('data')
+    def __init__(self, data_dir='data'):
+        self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
         # 테이블별 파일 매핑
@@ -23,6 +35,9 @@ class LocalDatabase:
             'quotation_items': 'quotation_items.json'
         }
         
+        # 변경 로그 + 기본 키/보조 인덱스 저장 엔진 (프로세스 간 잠금)
+        self.storage = LocalStorageEngine(self.data_dir, self.tables, indexes=LOCAL_INDEXES)
+        
         # 초기 데이터 설정
         self._initialize_default_data()
     
@@ -108,107 +123,32 @@ class LocalDatabase:
     
     def _file_exists(self, table_name: str) -> bool:
         """파일 존재 여부 확인"""
-        filepath = self.data_dir / self.tables[table_name]
-        return filepath.exists()
-    
-    def _load_from_file(self, table_name: str) -> List[Dict[str, Any]]:
-        """파일에서 데이터 로드"""
-        filepath = self.data_dir / self.tables[table_name]
-        
-        if not filepath.exists():
-            return []
-        
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return []
+        return self.storage.exists(table_name)
     
     def _save_to_file(self, table_name: str, data: List[Dict[str, Any]]):
-        """파일에 데이터 저장"""
-        filepath = self.data_dir / self.tables[table_name]
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
-    
-    def _get_next_id(self, table_name: str) -> int:
-        """다음 ID 가져오기"""
-        data = self._load_from_file(table_name)
-        if not data:
-            return 1
-        return max(item.get('id', 0) for item in data) + 1
+        """테이블 전체 저장 (초기 데이터용)"""
+        self.storage.replace_all(table_name, data)
     
     def select(self, table_name: str, where: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """데이터 조회"""
-        data = self._load_from_file(table_name)
-        
-        if where is None:
-            return data
-        
-        # 간단한 WHERE 조건 처리
-        filtered_data = []
-        for item in data:
-            match = True
-            for key, value in where.items():
-                if item.get(key) != value:
-                    match = False
-                    break
-            if match:
-                filtered_data.append(item)
-        
-        return filtered_data
+        return self.storage.select(table_name, where)
     
     def insert(self, table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """데이터 삽입"""
-        existing_data = self._load_from_file(table_name)
-        
-        # ID 자동 생성
-        if 'id' not in data:
-            data['id'] = self._get_next_id(table_name)
-        
+        """데이터 삽입 (ID는 테이블별 영구 카운터로 생성)"""
         # 생성 시간 추가
         if 'created_at' not in data:
             data['created_at'] = datetime.now().isoformat()
         
-        existing_data.append(data)
-        self._save_to_file(table_name, existing_data)
-        
-        return data
+        return self.storage.insert(table_name, data)
     
     def update(self, table_name: str, data: Dict[str, Any], where: Dict[str, Any]):
         """데이터 업데이트"""
-        existing_data = self._load_from_file(table_name)
-        
-        for item in existing_data:
-            match = True
-            for key, value in where.items():
-                if item.get(key) != value:
-                    match = False
-                    break
-            
-            if match:
-                item.update(data)
-                item['updated_at'] = datetime.now().isoformat()
-        
-        self._save_to_file(table_name, existing_data)
+        self.storage.update(table_name, data, where)
         return True
     
     def delete(self, table_name: str, where: Dict[str, Any]):
         """데이터 삭제"""
-        existing_data = self._load_from_file(table_name)
-        
-        filtered_data = []
-        for item in existing_data:
-            match = True
-            for key, value in where.items():
-                if item.get(key) != value:
-                    match = False
-                    break
-            
-            if not match:  # 조건에 맞지 않는 항목만 유지
-                filtered_data.append(item)
-        
-        self._save_to_file(table_name, filtered_data)
+        self.storage.delete(table_name, where)
         return True
 
 # 전역 데이터베이스 인스턴스
@@ -0,0 +1,11 @@
+"""
+pytest 공통 설정
+앱 모듈은 app/ 디렉터리 기준으로 import한다 (from utils.x import ...).
+"""
+
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
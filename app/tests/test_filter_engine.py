@@ -0,0 +1,118 @@
+"""utils.filter_engine 테스트 (컴파일 필터 vs 해석식 평가, 정렬 캐시)"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+from utils.filter_engine import (
+    _COMPARATORS, _coerce, RowSet, filter_rows, like_regex, month_bounds, plain_value,
+    row_set, row_sort_key,
+)
+from utils.query_builder import Condition, QueryFilter
+
+
+def reference_match(row, condition):
+    """컴파일하지 않는 해석식 평가 (기준값)"""
+    if isinstance(condition, tuple):
+        return any(reference_match(row, c) for c in condition)
+    if condition.operator == 'and':
+        return all(reference_match(row, c) for c in condition.value)
+    left, op, right = row.get(condition.column), condition.operator, condition.value
+    if op in ('is', 'not.is'):
+        if right is None:
+            result = left is None
+        else:
+            result = isinstance(left, bool) and left == bool(right)
+        return result if op == 'is' else not result
+    if left is None:
+        return False
+    if op == 'in':
+        return any(reference_match(row, Condition(condition.column, 'eq', v)) for v in right)
+    if right is None:
+        return False
+    if op == 'ilike':
+        return like_regex(str(right)).fullmatch(str(plain_value(left))) is not None
+    left, right = _coerce(left, right)
+    try:
+        return _COMPARATORS[op](left, right)
+    except TypeError:
+        return False
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = random.Random(7)
+    types = ['교통비', '식비', '숙박비', '사무용품', '기타']
+    rows = []
+    for i in range(1, 20001):
+        reimbursed = (f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T"
+                      f"{rng.randint(0, 23):02d}:00:00" if rng.random() > 0.05 else None)
+        rows.append({
+            'id': i,
+            'expense_type': rng.choice(types),
+            'amount': rng.choice([rng.randint(1, 5000) * 1000, None]) if i % 50 == 0 else rng.randint(1, 5000) * 1000,
+            'currency': rng.choice(['VND', 'USD', 'KRW']),
+            'reimbursement_status': rng.choice(['pending', 'printed', 'completed', None]),
+            'accounting_confirmed': rng.random() > 0.3,
+            'requester': rng.randint(1, 50),
+            'description': f"item {rng.randint(1, 999)}",
+            'reimbursed_at': reimbursed,
+            'updated_at': reimbursed,
+        })
+    return rows
+
+
+MARCH = month_bounds(2025, 3)
+
+FILTERS = [
+    QueryFilter().eq('reimbursement_status', 'completed'),
+    QueryFilter().eq('reimbursement_status', 'completed').date_range('reimbursed_at', *MARCH)
+                 .eq('expense_type', '식비'),
+    QueryFilter().in_('currency', ['VND', 'USD']).gte('amount', '1000000').neq('requester', 3),
+    QueryFilter().search('ITEM 1', 'description', 'expense_type').is_null('reimbursed_at'),
+    QueryFilter().or_(Condition('requester', 'in', (1, '2', 3)), Condition('amount', 'lt', 5000))
+                 .not_null('reimbursement_status'),
+    QueryFilter().eq('accounting_confirmed', True).eq('amount', '120000'),
+]
+
+
+@pytest.mark.parametrize('query', FILTERS)
+def test_compiled_filter_matches_reference(data, query):
+    expected = [row['id'] for row in data
+                if all(reference_match(row, condition) for condition in query.conditions)]
+    assert [row['id'] for row in filter_rows(data, query)] == expected
+
+
+@pytest.mark.parametrize('column, desc', [
+    ('reimbursed_at', True), ('reimbursed_at', False), ('amount', True), ('amount', False),
+])
+def test_select_from_sorted_view_matches_sort_after_filter(data, column, desc):
+    query = QueryFilter().eq('reimbursement_status', 'completed').eq('expense_type', '식비')
+    expected = sorted(filter_rows(data, query), key=row_sort_key(column), reverse=desc)
+    assert [r['id'] for r in RowSet(data).select(query, column, desc)] == [r['id'] for r in expected]
+
+
+def test_limit_and_row_set_reuse(data):
+    query = QueryFilter().eq('reimbursement_status', 'completed')
+    rows_set = RowSet(data)
+    assert rows_set.select(query, 'amount', True, limit=5) == rows_set.select(query, 'amount', True)[:5]
+    assert row_set('test', data) is row_set('test', list(data))
+
+
+def test_compiled_query_matches_multi_pass_filters(data):
+    """환급 완료 탭: 필터마다 목록을 다시 만들던 방식과 같은 결과"""
+    completed = [r for r in data if r.get('reimbursement_status') == 'completed']
+    cutoff = datetime(2025, 3, 10)
+
+    result = [r for r in completed if r.get('reimbursed_at')
+              and datetime.fromisoformat(r['reimbursed_at']).strftime('%Y-%m') == '2025-03']
+    result = [r for r in result if datetime.fromisoformat(r['reimbursed_at']) >= cutoff]
+    result = [r for r in result if r.get('expense_type') == '식비']
+    result.sort(key=lambda r: r.get('amount') or 0, reverse=True)
+
+    query = (QueryFilter().date_range('reimbursed_at', *MARCH)
+             .gte('reimbursed_at', cutoff).eq('expense_type', '식비'))
+    selected = row_set('test_completed', completed).select(query, 'amount', True)
+    assert sorted(r['id'] for r in selected) == sorted(r['id'] for r in result)
+    assert [r['amount'] for r in selected] == [r['amount'] for r in result]
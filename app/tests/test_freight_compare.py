@@ -0,0 +1,117 @@
+"""utils.freight_compare 테스트 (일괄 비교 vs 화물별 단순 계산)"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+
+from utils.freight_compare import FIXED_CHARGE_COLUMNS, FreightComparisonService  # noqa: E402
+from utils.freight_rates import FSC_TABLE, TRUCKING_TABLE, FreightRateEngine  # noqa: E402
+
+MODES = [{'id': 1, 'code': 'AIR', 'name': '항공'}, {'id': 2, 'code': 'SEA', 'name': '해상'},
+         {'id': 3, 'code': 'TRUCK', 'name': '육로'}]
+PROVIDERS = ['DHL', 'FedEx', 'Kuehne', 'Schenker', 'CJ']
+ROUTES = ['HCM-ICN', 'HAN-ICN', 'HCM-PUS']
+RULES = {
+    FSC_TABLE: [{'rule_id': 1, 'rule_name': 'FSC', 'min_charge': 20, 'is_active': True,
+                 'brackets': {'0-45': 1.1, '45-300': 0.9, '300+': 0.7}}],
+    TRUCKING_TABLE: [
+        {'rule_id': 1, 'rule_name': 'LC', 'charge_type': 'LC', 'calculation_method': 'FIXED',
+         'fixed_charge': 80, 'is_active': True},
+        {'rule_id': 2, 'rule_name': 'OC', 'charge_type': 'OC', 'calculation_method': 'WEIGHT_BASED',
+         'weight_brackets': {'0-50': 1.5, '51-100': 1.2, '101-500': 1.0, '501-1000': 0.8, '1001+': 0.6},
+         'is_active': True},
+    ],
+}
+
+
+def synthetic_catalog(rng):
+    rates, lead_times, rate_id = [], [], 0
+    for provider in PROVIDERS:
+        for mode in MODES:
+            for route in ROUTES:
+                for effective in ('2024-01-01', '2025-01-01'):
+                    rate_id += 1
+                    rates.append({
+                        'id': rate_id, 'provider_name': provider, 'transport_mode_id': mode['id'],
+                        'route': route, 'effective_date': effective,
+                        'freight_rate_per_kg': round(rng.uniform(0.5, 6), 2),
+                        'delivery_order_usd': 25, 'handling_usd': rng.choice([0, 15, 30]),
+                        'customs_clearance_usd': 40, 'customs_transited_usd': 0, 'customs_charge_usd': 10,
+                        'fsc_rule_id': rng.choice([1, None]), 'trucking_lc_rule_id': rng.choice([1, None]),
+                        'trucking_oc_rule_id': rng.choice([2, None]),
+                    })
+                lead_times.append({'provider_name': provider, 'transport_mode_id': mode['id'], 'route': route,
+                                   'standard_days': rng.randint(2, 30), 'min_days': 1, 'max_days': 40})
+    return rates, lead_times
+
+
+@pytest.fixture(scope='module')
+def scenario():
+    rng = random.Random(5)
+    rates, lead_times = synthetic_catalog(rng)
+
+    def fetch_rules(table, rule_ids=None):
+        return [r for r in RULES[table] if rule_ids is None or r['rule_id'] in set(rule_ids)]
+
+    engine = FreightRateEngine(fetch_rules)
+    service = FreightComparisonService(lambda: (rates, lead_times, MODES), engine)
+    shipments = [{'shipment_id': i, 'weight': round(rng.uniform(1, 1500), 1),
+                  'mode': rng.choice([None, 'AIR', '해상', 3]), 'route': rng.choice([None] + ROUTES),
+                  'provider': rng.choice([None, None, 'dhl'])}
+                 for i in range(300)]
+    return rates, engine, service, shipments
+
+
+def expected_best_cost(shipment, latest, engine):
+    """화물마다 요금표 전체를 훑어 최저 총비용 계산"""
+    mode_ids = {'AIR': 1, '해상': 2, 3: 3}
+    fsc = engine.rules(FSC_TABLE, [1])[1]
+    oc = engine.rules(TRUCKING_TABLE, [2])[2]
+    weight = shipment['weight']
+    totals = []
+    for (provider, mode_id, route), rate in latest.items():
+        if shipment['provider'] and provider != shipment['provider'].upper():
+            continue
+        if shipment['mode'] is not None and mode_id != mode_ids[shipment['mode']]:
+            continue
+        if shipment['route'] and route != shipment['route']:
+            continue
+        total = weight * rate['freight_rate_per_kg'] + sum(rate[c] for c in FIXED_CHARGE_COLUMNS)
+        if rate['fsc_rule_id']:
+            _, unit, _ = fsc.table.price(np.array([weight]))
+            total += max(weight * unit[0], fsc.min_charge)
+        if rate['trucking_lc_rule_id']:
+            total += 80
+        if rate['trucking_oc_rule_id']:
+            total += oc.table.price(np.array([weight]))[2][0]
+        totals.append(total)
+    return min(totals) if totals else None
+
+
+def test_best_option_matches_per_shipment_scan(scenario):
+    rates, engine, service, shipments = scenario
+    result = service.compare(shipments)
+
+    latest = {}
+    for rate in sorted(rates, key=lambda r: r['effective_date']):
+        latest[(rate['provider_name'].upper(), rate['transport_mode_id'], rate['route'].upper())] = rate
+    best = result[result['rank'] == 1].set_index('shipment_id')['total_cost']
+
+    for shipment in shipments:
+        expected = expected_best_cost(shipment, latest, engine)
+        actual = best.get(shipment['shipment_id'])
+        if expected is None:
+            assert actual is None
+        else:
+            assert actual == pytest.approx(expected, abs=1e-6)
+
+
+def test_catalog_is_shared_until_invalidated(scenario):
+    _, _, service, _ = scenario
+    catalog = service.catalog()
+    assert service.catalog() is catalog
+    service.invalidate()
+    assert service.catalog() is not catalog
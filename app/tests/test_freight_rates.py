@@ -0,0 +1,123 @@
+"""utils.freight_rates 테스트 (일괄 계산 vs 구간 문자열 순차 파싱)"""
+
+import json
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+
+from utils.freight_rates import (  # noqa: E402
+    FSC_TABLE, TRUCKING_TABLE, FreightRateEngine, _load_brackets, parse_bracket
+)
+
+
+def reference_bracket(brackets, weight):
+    """기존 방식: 구간 문자열을 순서대로 파싱해 첫 번째로 맞는 구간"""
+    for label, rate in brackets.items():
+        low, high = parse_bracket(label)
+        if low <= weight <= high:
+            return label, float(rate)
+    return None, 0.0
+
+
+def rule_tables():
+    fsc_rows = [
+        {'rule_id': 1, 'rule_name': 'Air FSC', 'min_charge': 30, 'is_active': True,
+         'brackets': json.dumps({'0-45': 1.2, '45-100': 1.0, '100-300': 0.85, '300+': 0.7})},
+        {'rule_id': 2, 'rule_name': 'Sea FSC', 'min_charge': 0, 'is_active': True,
+         'brackets': {'0-500': 0.2, '501-1000': 0.15, '1001-+': 0.1}},
+        {'rule_id': 3, 'rule_name': 'Old FSC', 'min_charge': 10, 'is_active': False,
+         'brackets': {'0-100': 2.0}},
+    ]
+    trucking_rows = [
+        {'rule_id': 1, 'rule_name': 'HCM 고정', 'charge_type': 'PICKUP', 'calculation_method': 'FIXED',
+         'fixed_charge': 120, 'is_active': True},
+        {'rule_id': 2, 'rule_name': 'HN 구간', 'charge_type': 'DELIVERY', 'calculation_method': 'WEIGHT_BASED',
+         'weight_brackets': json.dumps({'0-50': 1.5, '51-100': 1.2, '101-500': 1.0, '501-1000': 0.8, '1001+': 0.6}),
+         'is_active': True},
+        {'rule_id': 3, 'rule_name': '초과중량', 'charge_type': 'DELIVERY', 'calculation_method': 'weight_based',
+         'weight_threshold_kg': 100, 'rate_per_kg_vnd': 2500, 'is_active': True},
+    ]
+    return {FSC_TABLE: fsc_rows, TRUCKING_TABLE: trucking_rows}
+
+
+@pytest.fixture
+def tables():
+    return rule_tables()
+
+
+@pytest.fixture
+def fetches():
+    return []
+
+
+@pytest.fixture
+def engine(tables, fetches):
+    def fetch(table, rule_ids=None):
+        fetches.append(table)
+        wanted = None if rule_ids is None else set(rule_ids)
+        return [r for r in tables[table] if wanted is None or r['rule_id'] in wanted]
+    return FreightRateEngine(fetch)
+
+
+@pytest.fixture
+def batch():
+    rng = random.Random(11)
+    return [(rng.choice([1, 2, 3, 4]), round(rng.uniform(0, 1500), 1)) for _ in range(5000)]
+
+
+def test_fsc_batch_matches_sequential_parsing(engine, tables, batch):
+    fsc = engine.price_fsc_batch(batch)
+    rules = {r['rule_id']: r for r in tables[FSC_TABLE]}
+    for i, (rule_id, weight) in enumerate(batch):
+        rule = rules.get(rule_id)
+        if rule and rule['is_active']:
+            label, rate = reference_bracket(_load_brackets(rule['brackets']), weight)
+            assert fsc.at[i, 'applied_bracket'] == label
+            assert fsc.at[i, 'final_charge'] == pytest.approx(max(weight * rate, float(rule['min_charge'])))
+        else:
+            assert fsc.at[i, 'error'] is not None
+
+
+def test_trucking_batch_matches_sequential_parsing(engine, tables, batch):
+    trucking = engine.price_trucking_batch(batch)
+    rules = {r['rule_id']: r for r in tables[TRUCKING_TABLE]}
+    for i, (rule_id, weight) in enumerate(batch):
+        rule = rules.get(rule_id)
+        if rule is None:
+            continue
+        if rule['calculation_method'] == 'FIXED':
+            expected = float(rule['fixed_charge'])
+        elif rule.get('weight_brackets'):
+            expected = weight * reference_bracket(_load_brackets(rule['weight_brackets']), weight)[1]
+        else:
+            expected = max(weight - rule['weight_threshold_kg'], 0) * rule['rate_per_kg_vnd']
+        assert trucking.at[i, 'calculated_charge'] == pytest.approx(expected, abs=1e-6)
+
+
+def test_missing_text_values_stay_none(engine, batch):
+    """object 컬럼의 빈 값은 NaN이 아니라 None (호출부가 참/거짓으로 검사)"""
+    fsc = engine.price_fsc_batch(batch)
+    trucking = engine.price_trucking_batch(batch)
+    for frame, columns in ((fsc, ('rule_name', 'applied_bracket', 'error')),
+                           (trucking, ('rule_name', 'charge_type', 'method', 'applied_bracket', 'error'))):
+        for column in columns:
+            assert frame[column].dtype == object
+            assert all(value is None or isinstance(value, str) for value in frame[column])
+    assert any(value is None for value in fsc['error'])
+
+
+def test_rules_are_fetched_once_per_table(engine, fetches, batch):
+    engine.price_fsc_batch(batch)
+    engine.price_trucking_batch(batch)
+    engine.price_fsc_batch(batch)
+    assert sorted(fetches) == sorted([FSC_TABLE, TRUCKING_TABLE])
+
+
+def test_invalidate_recompiles_changed_rule(engine, tables):
+    assert engine.price_fsc_batch([(1, 10)]).at[0, 'final_charge'] == 30.0
+    tables[FSC_TABLE][0]['brackets'] = {'0+': 9.0}
+    engine.invalidate(FSC_TABLE, 1)
+    assert engine.price_fsc_batch([(1, 10)]).at[0, 'final_charge'] == 90.0
@@ -0,0 +1,64 @@
+"""utils.language_config 테스트 (컴파일된 라벨 테이블 vs 사전 직접 조회, 번역 누락/미정의 키 집계)"""
+
+import pytest
+
+from utils.language_config import (
+    LANGUAGE_LABELS, SUPPORTED_LANGUAGES, get_all_labels, get_label, get_label_coverage,
+    reset_label_telemetry,
+)
+
+LANGUAGES = list(SUPPORTED_LANGUAGES) + ['ko', 'vn', 'th', 'en', 'Ko', ' KO ', 'JP', 'xx']
+KEYS = list(LANGUAGE_LABELS) + ['__unknown__', '']
+
+
+def naive_label(key, language):
+    """테이블 없이 LANGUAGE_LABELS를 그대로 찾는 조회 (기준값)"""
+    language = language.strip().upper()
+    if language not in SUPPORTED_LANGUAGES:
+        language = 'EN'
+    if key in LANGUAGE_LABELS:
+        return LANGUAGE_LABELS[key].get(language, LANGUAGE_LABELS[key].get('EN', key))
+    return key
+
+
+@pytest.fixture(autouse=True)
+def clean_telemetry():
+    reset_label_telemetry()
+    yield
+    reset_label_telemetry()
+
+
+@pytest.mark.parametrize('language', LANGUAGES)
+def test_get_label_matches_naive_lookup(language):
+    assert [get_label(key, language) for key in KEYS] == [naive_label(key, language) for key in KEYS]
+    # 두 번째 조회는 캐시된 테이블 사용 - 결과 동일
+    assert [get_label(key, language) for key in KEYS] == [naive_label(key, language) for key in KEYS]
+
+
+def test_all_labels_match_get_label():
+    for language in LANGUAGES:
+        labels = get_all_labels(language)
+        assert dict(labels) == {key: naive_label(key, language) for key in LANGUAGE_LABELS}
+        with pytest.raises(TypeError):
+            labels['__new__'] = 'x'
+
+
+def test_coverage_lists_fallback_keys():
+    coverage = get_label_coverage()
+    assert coverage['total_keys'] == len(LANGUAGE_LABELS)
+    assert set(coverage['missing_translations']) == set(SUPPORTED_LANGUAGES)
+    for language, keys in coverage['missing_translations'].items():
+        assert keys == sorted(k for k, translations in LANGUAGE_LABELS.items() if language not in translations)
+    assert coverage['unknown_keys'] == {}
+
+
+def test_unknown_keys_counted_and_reset():
+    get_label('__unknown__', 'KO')
+    get_label('__unknown__', 'jp')
+    get_label('__other__')
+    for key in list(LANGUAGE_LABELS)[:10]:
+        get_label(key, 'VN')
+    assert get_label_coverage()['unknown_keys'] == {'__unknown__': 2, '__other__': 1}
+
+    reset_label_telemetry()
+    assert get_label_coverage()['unknown_keys'] == {}
@@ -0,0 +1,107 @@
+"""utils.local_backend 테스트 (원격 파사드와 같은 필터/프로젝션/페이지/수정 규약)"""
+
+import pytest
+
+pytest.importorskip('streamlit')
+pytest.importorskip('supabase')
+
+from utils.local_backend import (  # noqa: E402
+    LOCAL_SEED_PASSWORD, create_local_database_operations
+)
+from utils.query_builder import QueryFilter  # noqa: E402
+
+ROWS = 200
+TABLE = 'customers_ymv'
+
+
+@pytest.fixture
+def ops():
+    return create_local_database_operations(seed_rows=ROWS, seed=7)
+
+
+@pytest.fixture
+def all_rows(ops):
+    return ops.load_data(TABLE)
+
+
+def test_seed_row_count(all_rows):
+    assert len(all_rows) == ROWS
+
+
+def test_dict_and_in_filters(ops, all_rows):
+    active = ops.load_data(TABLE, filters={'status': 'active'})
+    assert [r['id'] for r in active] == [r['id'] for r in all_rows if r['status'] == 'active']
+
+    ids = [r['id'] for r in all_rows[:5]]
+    assert sorted(r['id'] for r in ops.load_data(TABLE, filters={'id': ids})) == sorted(ids)
+
+
+def test_query_filter_search_order_and_projection(ops, all_rows):
+    query = (QueryFilter().search('customer 1', 'company_name_short', 'company_name_english')
+             .neq('status', 'inactive').order('created_at', desc=True))
+    searched = ops.load_data(TABLE, columns="id,status,created_at", filters=query)
+    expected = sorted((r for r in all_rows if r['status'] != 'inactive'
+                       and 'customer 1' in r['company_name_short'].lower()),
+                      key=lambda r: (r['created_at'], r['id']), reverse=True)
+    assert [r['id'] for r in searched] == [r['id'] for r in expected]
+    assert searched and set(searched[0]) == {'id', 'status', 'created_at'}
+
+
+def test_like_pattern_is_escaped(ops):
+    assert not ops.load_data(TABLE, filters=QueryFilter().contains('company_name_short', '100%'))
+
+
+def test_keyset_pages_cover_sorted_rows(ops, all_rows):
+    seen, cursor = [], {}
+    while True:
+        page = ops.load_data(TABLE, columns="id,created_at", limit=37, order_by='created_at',
+                             use_cache=False, **cursor)
+        seen.extend(r['id'] for r in page)
+        if not page.next_cursor:
+            break
+        cursor = {'after_id': page.next_cursor['after_id'],
+                  'after_created_at': page.next_cursor['after_created_at']}
+    assert seen == [r['id'] for r in sorted(all_rows, key=lambda r: (r['created_at'], r['id']))]
+
+    counted = ops.load_data(TABLE, limit=10, offset=20, count='exact')
+    assert counted.total == ROWS and len(counted) == 10 and counted.has_more
+
+
+def test_update_call_patterns(ops, all_rows):
+    target = all_rows[0]['id']
+    ops.update_data(TABLE, target, {'city': 'A'})
+    ops.update_data(TABLE, {'id': target, 'country': 'B'})
+    ops.update_data(TABLE, {'id': target, 'contact_person': 'C'}, "id")
+    updated = ops.load_data(TABLE, filters={'id': target})[0]
+    assert (updated['city'], updated['country'], updated['contact_person']) == ('A', 'B', 'C')
+
+
+def test_save_invalidates_cache_and_delete(ops, all_rows):
+    saved = ops.save_data(TABLE, {'company_name_short': 'New', 'status': 'active'})
+    assert saved and saved['id'] == ROWS + 1
+    assert ops.load_data(TABLE, filters={'id': saved['id']})
+    ops.delete_data(TABLE, saved['id'], "id")
+    assert not ops.load_data(TABLE, filters={'id': saved['id']})
+
+
+def test_bulk_upsert_and_bulk_update(ops, all_rows):
+    target = all_rows[0]['id']
+    result = ops.bulk_save_data(TABLE, [{'id': target, 'city': 'Z'}, {'company_name_short': 'Bulk'}],
+                                upsert=True)
+    assert result['written'] == 2
+    assert ops.load_data(TABLE, filters={'id': target})[0]['city'] == 'Z'
+
+    ops.reset_metrics()
+    bulk_ids = [r['id'] for r in all_rows[:5]] + [10 ** 9]
+    outcome = ops.bulk_update(TABLE, bulk_ids, {'status': 'inactive'}, batch_size=4)
+    assert list(outcome.values()) == [True] * 5 + [False]
+    assert ops.get_metrics()['calls'].get('bulk_update') == 2
+    assert all(r['status'] == 'inactive' for r in ops.load_data(TABLE, filters={'id': bulk_ids[:5]}))
+
+
+def test_seed_employees_can_log_in(ops):
+    from utils.auth import verify_password
+
+    employee = ops.load_data('employees', filters={'employee_id': 'E00001'})[0]
+    assert verify_password(employee['password'], LOCAL_SEED_PASSWORD)
+    assert not verify_password(employee['password'], 'wrong')
@@ -0,0 +1,114 @@
+"""shared.local_storage 테스트"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from shared.local_storage import DuplicateKeyError, LocalStorageEngine, LocalTableStore
+
+
+def _concurrent_writer(data_dir, worker, count):
+    engine = LocalStorageEngine(data_dir, compact_min_ops=50)
+    for i in range(count):
+        engine.insert('items', {'worker': worker, 'seq': i})
+        if i % 10 == 0:
+            engine.update('items', {'touched': True}, {'worker': worker, 'seq': i})
+
+
+def _dump_rows(rows):
+    return sorted(json.dumps(row, sort_keys=True, default=str) for row in rows)
+
+
+def test_concurrent_processes_keep_unique_ids(tmp_path):
+    workers, count = 4, 100
+    processes = [multiprocessing.Process(target=_concurrent_writer, args=(str(tmp_path), w, count))
+                 for w in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    engine = LocalStorageEngine(tmp_path, indexes={'items': ['worker']})
+    rows = engine.select('items')
+    ids = [row['id'] for row in rows]
+    assert len(rows) == workers * count
+    assert len(set(ids)) == len(ids)
+    assert sum(1 for row in rows if row.get('touched')) == workers * ((count + 9) // 10)
+    assert [r['id'] for r in engine.select('items', {'worker': 1})] == \
+        [r['id'] for r in rows if r['worker'] == 1]
+
+
+def test_deleted_ids_are_not_reused(tmp_path):
+    engine = LocalStorageEngine(tmp_path)
+    last = [engine.insert('items', {'n': i})['id'] for i in range(3)][-1]
+    engine.delete('items', {'id': last})
+
+    assert LocalStorageEngine(tmp_path).insert('items', {'n': 9})['id'] > last
+
+
+def test_compaction_preserves_rows_across_restart(tmp_path):
+    engine = LocalStorageEngine(tmp_path, compact_min_ops=10)
+    for i in range(30):
+        engine.insert('items', {'n': i})
+    engine.update('items', {'flag': True}, {'n': 3})
+    engine.delete('items', {'n': 4})
+    before = engine.select('items')
+
+    engine.compact('items')
+    assert _dump_rows(LocalStorageEngine(tmp_path).select('items')) == _dump_rows(before)
+
+
+def test_secondary_index_matches_full_scan():
+    statuses = ['pending', 'approved', 'rejected']
+    indexed = LocalTableStore(None, 'users', index_columns=('username', 'status'))
+    scan = LocalTableStore(None, 'users')
+    rows = [{'id': i, 'username': f'user{i % 50}', 'status': statuses[i % 3], 'is_active': i % 4 != 0}
+            for i in range(1, 501)]
+    indexed.reset(dict(row) for row in rows)
+    scan.reset(dict(row) for row in rows)
+
+    for where in ({'username': 'user7', 'is_active': True}, {'status': 'pending'},
+                  {'status': 'approved', 'username': 'user10'}, {'username': 'nobody'}):
+        assert indexed.find(where) == scan.find(where)
+
+
+def test_update_counts_rows_when_id_changes():
+    store = LocalTableStore(None, 'items')
+    store.insert({'name': 'a'})
+    store.insert({'name': 'b'})
+
+    assert store.update({'id': 10}, {'name': 'a'}) == 1
+    assert store.find({'id': 10})[0]['name'] == 'a'
+    assert store.find({'id': 1}) == []
+    assert store.update({'flag': True}, None) == 2
+
+
+def test_update_rejects_id_of_another_row():
+    store = LocalTableStore(None, 'items')
+    store.insert({'name': 'a'})
+    store.insert({'name': 'b'})
+
+    with pytest.raises(DuplicateKeyError):
+        store.update({'id': 2}, {'name': 'a'})
+    assert [row['name'] for row in store.find()] == ['a', 'b']
+
+
+def test_insert_rejects_existing_id():
+    engine = LocalStorageEngine(None)
+    engine.insert('items', {'id': 5, 'name': 'first'})
+
+    with pytest.raises(DuplicateKeyError):
+        engine.insert('items', {'id': 5, 'name': 'second'})
+    assert engine.select('items', {'id': 5})[0]['name'] == 'first'
+
+
+def test_index_benchmark_runs_and_agrees_with_scan():
+    """벤치마크 스크립트가 작은 크기에서 실행되고 인덱스/스캔 결과가 같은지 (측정값은 검사하지 않음)"""
+    from shared.local_storage_benchmark import benchmark_secondary_index, main
+
+    results = benchmark_secondary_index(sizes=(1000,), lookups=50, scan_lookups=5)
+    assert [r['rows'] for r in results] == [1000]
+    assert not results[0]['mismatch']
+    assert main(['--sizes', '500', '--lookups', '20', '--scan-lookups', '2']) == 0
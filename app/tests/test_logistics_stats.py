@@ -0,0 +1,64 @@
+"""utils.logistics_stats 테스트 (SQLite 집계와 Python 집계 비교)"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.logistics_stats import (
+    PERIOD_DAYS, RESPONSIBLE_LABELS, SQLiteLogisticsBackend, cutoff_for, delivery_statistics,
+    provider_delivery_stats, python_rollup, section_analysis, top_delay_causes
+)
+
+NOW = datetime(2025, 6, 30, 12, 0, 0)
+
+
+def synthetic_imports(rows=2000, seed=7):
+    rng = random.Random(seed)
+    providers = ['DHL', 'FedEx', 'Kuehne', None]
+    severities = ['on_time', 'minor', 'major', 'critical']
+    data = []
+    for _ in range(rows):
+        severity = rng.choice(severities)
+        delayed = severity != 'on_time'
+        data.append({
+            'shipping_date': (NOW - timedelta(days=rng.randint(0, 400))).isoformat(),
+            'logistics_provider_name': rng.choice(providers),
+            'delay_severity': severity,
+            'is_delayed': delayed,
+            'delay_reason_detail': rng.choice(['서류 미비', '선박 지연', '통관 검사', None]) if delayed else None,
+            'delay_responsible_party': rng.choice(list(RESPONSIBLE_LABELS)) if delayed else None,
+            'lead_time_difference_days': rng.randint(1, 15) if delayed else rng.choice([0, None]),
+            'shipping_to_port_days': rng.choice([0, 1, 2, None]),
+            'port_to_arrival_days': rng.choice([0, 2, 3, None]),
+            'customs_clearance_days': rng.choice([0, 1, 4, None]),
+        })
+    return data
+
+
+@pytest.fixture(scope='module')
+def imports():
+    return synthetic_imports()
+
+
+@pytest.fixture(scope='module')
+def sqlite_backend(imports):
+    return SQLiteLogisticsBackend(imports)
+
+
+@pytest.mark.parametrize('days', sorted(set(PERIOD_DAYS.values())))
+def test_sqlite_rollup_matches_python_rollup(imports, sqlite_backend, days):
+    cutoff = cutoff_for(days, NOW)
+    expected = python_rollup([r for r in imports if r['shipping_date'] >= cutoff])
+    actual = sqlite_backend.rollup(cutoff)
+
+    assert delivery_statistics(actual) == delivery_statistics(expected)
+    assert delivery_statistics(actual, 'DHL') == delivery_statistics(expected, 'DHL')
+    assert provider_delivery_stats(actual) == provider_delivery_stats(expected)
+    assert top_delay_causes(actual) == top_delay_causes(expected)
+    assert section_analysis(actual) == section_analysis(expected)
+
+
+def test_rollup_counts_every_row(imports):
+    rollup = python_rollup(imports)
+    assert sum(group['row_count'] for group in rollup) == len(imports)
@@ -0,0 +1,114 @@
+"""utils.product_search 테스트 (인덱스 결과 vs 선형 검색, 코드 부분 일치, 백그라운드 구성)"""
+
+import random
+
+import pytest
+
+from utils.product_search import (
+    _TOKEN, SEARCH_FIELDS, ProductSearchIndex, normalize_text, tokenize
+)
+
+CODE = 'HRS-YMO-ST-1-MCC-01-0012'
+
+
+def synthetic_products(count, seed):
+    rng = random.Random(seed)
+    words_en = ['Mold', 'Nozzle', 'Heater', 'Manifold', 'Gate', 'Valve', 'Cylinder', 'Tip',
+                'Sensor', 'Controller', 'Cable', 'Plate', 'Insert', 'Bushing', 'Thermocouple']
+    words_vn = ['Khuôn', 'Vòi phun', 'Bộ gia nhiệt', 'Ống dẫn', 'Cổng', 'Van', 'Xi lanh', 'Đầu',
+                'Cảm biến', 'Bộ điều khiển', 'Cáp', 'Tấm', 'Chèn', 'Ống lót', 'Cặp nhiệt điện']
+    codes = ['HRS', 'HRC', 'MTC', 'SPR']
+    products = []
+    for i in range(1, count + 1):
+        w = rng.randrange(len(words_en))
+        products.append({
+            'id': i,
+            'product_code': (f"{rng.choice(codes)}-YM{rng.choice('OKTC')}-{rng.choice(['ST', 'VG', 'OP'])}-"
+                             f"{rng.randint(1, 7)}-{rng.choice(['MCC', 'MCS', 'TPC'])}-{i % 100:02d}-{i // 100:04d}"),
+            'product_name': f"{words_en[w]} {rng.randint(10, 99)}",
+            'product_name_en': f"{words_en[w]} {words_en[rng.randrange(len(words_en))]} {rng.randint(100, 999)}",
+            'product_name_vn': f"{words_vn[w]} {words_vn[rng.randrange(len(words_vn))]}",
+            'updated_at': '2025-01-01T00:00:00',
+        })
+    return products
+
+
+def linear(products, query):
+    """색인 없이 행마다 같은 규칙으로 찾은 결과 (기준값)"""
+    tokens = tokenize(query)
+    code = normalize_text(query).strip()
+    hits = set()
+    for row in products:
+        row_code = normalize_text(row['product_code'])
+        row_tokens = [t for field in SEARCH_FIELDS for t in _TOKEN.findall(normalize_text(row.get(field)))]
+        if (row_code.startswith(code) or (len(code) >= 2 and code in row_code)
+                or all(any(t.startswith(q) or (len(q) >= 3 and q in t) for t in row_tokens)
+                       for q in tokens)):
+            hits.add(row['id'])
+    return hits
+
+
+@pytest.fixture(scope='module')
+def products():
+    rows = synthetic_products(5000, 11)
+    rows.append({'id': 9001, 'product_code': CODE, 'product_name': 'Target',
+                 'updated_at': '2025-01-01T00:00:00'})
+    return rows
+
+
+@pytest.fixture(scope='module')
+def index(products):
+    built = ProductSearchIndex()
+    built.sync(products)
+    return built
+
+
+@pytest.mark.parametrize('query', [
+    'khuon', 'KHUÔN', 'vòi', 'nozzle 12', 'hrs-ymo', 'mcc', 'eater', 'ca', 'cảm biến', 'xyz',
+    'O-ST', 'MO-S', '12', '0012', 'st-1-mcc', 'k-st 12',
+])
+def test_index_matches_linear_search(products, index, query):
+    assert {row['id'] for row in index.search(query)} == linear(products, query)
+    assert index.count(query) == len(linear(products, query))
+
+
+@pytest.mark.parametrize('query', ['O-ST', 'MO-S', '12', '0012', 'ymo-st-1'])
+def test_code_substring_across_separators(index, query):
+    assert 9001 in {row['id'] for row in index.search(query)}
+
+
+def test_code_prefix_ranked_first(index):
+    top = index.search('HRS-YMO', limit=3)
+    assert top and all(normalize_text(row['product_code']).startswith('hrs-ymo') for row in top)
+
+
+def test_code_substring_ranked_after_token_matches(index):
+    ranked = index.search('12')
+    ids = [row['id'] for row in ranked]
+    token_hit = next(i for i, row in enumerate(ranked) if '12' in tokenize(row['product_name']))
+    assert token_hit < ids.index(9001)
+
+
+def test_incremental_update_and_where(products):
+    index = ProductSearchIndex()
+    index.sync(products)
+    changed = [dict(row) for row in products]
+    changed[5] = {**changed[5], 'product_name_en': 'Quasar Widget',
+                  'product_code': 'ZZ-QUASAR-99', 'updated_at': '2025-02-01T00:00:00'}
+    index.sync(changed)
+    assert index.stats['incremental_updates'] == 1
+    assert [row['id'] for row in index.search('quasar')] == [changed[5]['id']]
+    assert [row['id'] for row in index.search('asar-9')] == [changed[5]['id']]
+    assert not index.search('quasar', where=lambda row: row['id'] != changed[5]['id'])
+
+
+def test_warm_builds_in_background(products):
+    index = ProductSearchIndex()
+    assert index.warm(products)
+    # 같은 목록을 구성 중이거나 이미 맞춰졌으면 다시 시작하지 않음
+    assert not index.warm(products)
+    # 검색 전 sync는 구성 중이면 끝날 때까지 기다리고, 아직 시작 전이면 직접 구성 (한 번만 구성됨)
+    index.sync(products)
+    assert 9001 in {row['id'] for row in index.search('MO-S')}
+    assert index.stats['full_builds'] == 1
+    assert not index.warm(products)
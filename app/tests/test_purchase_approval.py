@@ -0,0 +1,148 @@
+"""utils.purchase_approval 테스트 (RPC 결과 구분, 조건부 선점 폴백)"""
+
+import pytest
+
+from utils.purchase_approval import (
+    ALREADY_PROCESSED, APPROVED, FAILED, PENDING_STATUS, PurchaseApprovalService
+)
+from utils.sequence_service import SequenceService
+
+
+class FakeRpcClient:
+    """rpc(...).execute()가 미리 정한 결과를 돌려주거나 예외를 던지는 클라이언트"""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return self
+
+    def execute(self):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return type('Result', (), {'data': self.outcome})()
+
+
+class MemoryTables:
+    """save/update(match 조건부)/delete/load 함수를 제공하는 메모리 테이블"""
+
+    def __init__(self, purchases):
+        self.tables = {'purchases': {p['id']: dict(p) for p in purchases}, 'expenses': {}}
+        self.fail_saves = False
+        self.fail_link = False
+
+    def save(self, table, data):
+        if self.fail_saves:
+            return None
+        rows = self.tables[table]
+        row = {**data, 'id': len(rows) + 1}
+        rows[row['id']] = row
+        return row
+
+    def update(self, table, data, key, match=None):
+        row = self.tables[table].get(data[key])
+        if row is None or any(row.get(k) != v for k, v in (match or {}).items()):
+            return False
+        if self.fail_link and set(data) == {'id', 'expense_id'}:
+            return False
+        row.update({k: v for k, v in data.items() if k != key})
+        return True
+
+    def delete(self, table, record_id):
+        return self.tables[table].pop(record_id, None) is not None
+
+    def load(self, table, columns="*", filters=None, **kwargs):
+        return [row for row in self.tables[table].values() if row['id'] == filters['id']]
+
+
+def make_purchase(purchase_id=1, status=PENDING_STATUS):
+    return {'id': purchase_id, 'item_name': 'Bolt', 'quantity': 2, 'unit_price': 10,
+            'currency': 'USD', 'approval_status': status, 'status': status}
+
+
+@pytest.fixture
+def local_sequence(monkeypatch):
+    sequence = SequenceService(use_rpc=False)
+    monkeypatch.setattr('utils.sequence_service._service', sequence)
+    monkeypatch.setattr('utils.sequence_service.load_max_suffix', lambda *args: 0)
+    return sequence
+
+
+def approve(service, tables, purchase, **kwargs):
+    return service.approve(purchase, 7, tables.save, tables.update, tables.delete,
+                           load_func=tables.load, **kwargs)
+
+
+def test_rpc_success_returns_created_expense():
+    client = FakeRpcClient([{'id': 5, 'document_number': 'EXP-250101-001'}])
+    service = PurchaseApprovalService(lambda: client, floor_func=lambda period: 3)
+    tables = MemoryTables([make_purchase()])
+
+    assert approve(service, tables, make_purchase()) == (APPROVED, client.outcome[0])
+    params = client.calls[0][1]
+    assert 'document_number' not in params['p_expense']
+    assert params['p_floor'] == 3
+
+    # 기존 최대 번호는 기간별로 처음 한 번만 조회
+    approve(service, tables, make_purchase())
+    assert client.calls[1][1]['p_floor'] == 0
+
+
+def test_rpc_not_pending_is_already_processed():
+    client = FakeRpcClient(Exception('purchase 1 is not pending'))
+    service = PurchaseApprovalService(lambda: client, floor_func=lambda period: 0)
+    tables = MemoryTables([make_purchase()])
+
+    assert approve(service, tables, make_purchase()) == (ALREADY_PROCESSED, None)
+    assert not tables.tables['expenses']
+
+
+def test_ambiguous_rpc_error_does_not_fall_back():
+    client = FakeRpcClient(Exception('connection reset by peer'))
+    service = PurchaseApprovalService(lambda: client, floor_func=lambda period: 0)
+    tables = MemoryTables([make_purchase()])
+
+    assert approve(service, tables, make_purchase()) == (FAILED, None)
+    assert not tables.tables['expenses']
+    assert tables.tables['purchases'][1]['approval_status'] == PENDING_STATUS
+    # 일시 오류로 RPC 경로를 끄지 않음
+    assert service._rpc_available
+
+
+def test_missing_rpc_falls_back_with_conditional_claim(local_sequence):
+    client = FakeRpcClient(Exception('PGRST202: Could not find the function'))
+    service = PurchaseApprovalService(lambda: client, floor_func=lambda period: 0)
+    tables = MemoryTables([make_purchase(1), make_purchase(2, status='반려')])
+
+    status, created = approve(service, tables, make_purchase(1))
+    assert status == APPROVED and created['document_number'].startswith('EXP-')
+    purchase = tables.tables['purchases'][1]
+    assert purchase['approval_status'] == '승인완료' and purchase['expense_id'] == created['id']
+    assert not service._rpc_available
+
+    # 화면의 목록은 승인대기였지만 DB에서는 이미 반려된 구매요청: 지출요청서/번호를 만들지 않음
+    assert approve(service, tables, make_purchase(2)) == (ALREADY_PROCESSED, None)
+    assert len(tables.tables['expenses']) == 1
+    assert local_sequence.peek_value('EXP', '', created['document_number'].split('-')[1]) == 2
+
+
+def test_fallback_releases_claim_when_expense_fails(local_sequence):
+    service = PurchaseApprovalService(use_rpc=False)
+    tables = MemoryTables([make_purchase()])
+    tables.fail_saves = True
+
+    assert approve(service, tables, make_purchase()) == (FAILED, None)
+    purchase = tables.tables['purchases'][1]
+    assert purchase['approval_status'] == PENDING_STATUS and purchase['expense_id'] is None
+
+
+def test_fallback_deletes_expense_when_link_fails(local_sequence):
+    service = PurchaseApprovalService(use_rpc=False)
+    tables = MemoryTables([make_purchase()])
+    tables.fail_link = True
+
+    assert approve(service, tables, make_purchase()) == (FAILED, None)
+    assert not tables.tables['expenses']
+    assert tables.tables['purchases'][1]['approval_status'] == PENDING_STATUS
@@ -0,0 +1,108 @@
+"""utils.sequence_service 테스트"""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import utils.sequence_service as sequence_service
+from utils.sequence_service import SequenceService, SequenceUnavailableError, parse_suffix
+
+
+class FakeRpcClient:
+    """rpc() 호출마다 errors에서 예외를 하나씩 꺼내 던지고, 없으면 value를 돌려준다"""
+
+    def __init__(self, errors=(), value=7, last_number=None):
+        self.errors = list(errors)
+        self.value = value
+        self.last_number = last_number
+        self.calls = 0
+
+    def rpc(self, name, params):
+        self.calls += 1
+        error = self.errors.pop(0) if self.errors else None
+
+        def execute():
+            if error is not None:
+                raise error
+            return SimpleNamespace(data=self.value)
+        return SimpleNamespace(execute=execute)
+
+    def table(self, name):
+        rows = [] if self.last_number is None else [{'last_number': self.last_number}]
+        query = SimpleNamespace()
+        query.select = query.eq = query.limit = lambda *args, **kwargs: query
+        query.execute = lambda: SimpleNamespace(data=rows)
+        return query
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(sequence_service, 'RPC_RETRY_DELAY', 0.001)
+
+
+def test_concurrent_issue_has_no_duplicates_or_gaps():
+    service = SequenceService(use_rpc=False)
+    workers, per_worker = 8, 100
+    prefix = "STRESS-250101-"
+
+    def issue(_):
+        return [service.next_number('STRESS', prefix, width=5, period='250101')
+                for _ in range(per_worker)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        numbers = [n for batch in pool.map(issue, range(workers)) for n in batch]
+
+    assert len(set(numbers)) == len(numbers)
+    assert sorted(parse_suffix(n, prefix) for n in numbers) == list(range(1, workers * per_worker + 1))
+
+
+def test_local_counter_starts_after_seed():
+    service = SequenceService(use_rpc=False)
+    assert service.next_value('QUO', seed_func=lambda: 41) == 42
+    assert service.next_value('QUO', seed_func=lambda: 41) == 43
+
+
+def test_transient_rpc_error_is_retried_without_latching():
+    client = FakeRpcClient(errors=[TimeoutError('read timeout')])
+    service = SequenceService(client_factory=lambda: client)
+
+    assert service.next_value('QUO') == 7
+    assert client.calls == 2
+    assert service._rpc_available
+
+
+def test_persistent_rpc_error_raises_instead_of_local_fallback():
+    client = FakeRpcClient(errors=[ConnectionError('reset')] * 10)
+    service = SequenceService(client_factory=lambda: client)
+
+    with pytest.raises(SequenceUnavailableError):
+        service.next_value('QUO')
+    assert client.calls == sequence_service.RPC_ATTEMPTS
+    assert service._rpc_available
+
+
+def test_missing_rpc_function_switches_to_local_counter():
+    client = FakeRpcClient(errors=[Exception("{'code': 'PGRST202', 'message': 'Could not find the function'}")])
+    service = SequenceService(client_factory=lambda: client)
+
+    assert service.next_value('QUO') == 1
+    assert service.next_value('QUO') == 2
+    assert client.calls == 1
+    assert not service._rpc_available
+
+
+def test_peek_does_not_consume_numbers():
+    service = SequenceService(use_rpc=False)
+    assert service.peek_value('PAY', seed_func=lambda: 4) == 5
+    assert service.peek_value('PAY', seed_func=lambda: 4) == 5
+    assert service.next_value('PAY', seed_func=lambda: 4) == 5
+    assert service.peek_value('PAY') == 6
+
+
+def test_peek_reads_db_counter_without_rpc_call():
+    client = FakeRpcClient(last_number=12)
+    service = SequenceService(client_factory=lambda: client)
+
+    assert service.peek_number('QUO', 'YMV-250101-', period='250101') == 'YMV-250101-013'
+    assert client.calls == 0
@@ -1,22 +1,171 @@
 """
 YMV ERP 시스템 인증 관리 유틸리티
 Authentication utilities for YMV ERP System
+
+로그인은 employee_id / account_id 단건 조회로 처리한다. 고유 인덱스 권장:
+    create unique index if not exists employees_employee_id_key on employees (employee_id);
+    create unique index if not exists corporate_accounts_account_id_key on corporate_accounts (account_id);
 """
 
 import streamlit as st
+import base64
+import hashlib
+import hmac
+import os
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 
 
+# ==================== 비밀번호 해시 ====================
+
+# 해시 형식: pbkdf2_sha256$<반복 횟수>$<salt>$<hash>
+PASSWORD_HASH_ALGORITHM = 'pbkdf2_sha256'
+
+# 작업 계수 (PBKDF2 반복 횟수) - 높일수록 안전하지만 로그인 시간이 늘어남
+PASSWORD_HASH_ITERATIONS = 260000
+
+PASSWORD_SALT_BYTES = 16
+
+# 검증 결과 캐시 최대 항목 수
+VERIFY_CACHE_SIZE = 1024
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def hash_password(password, iterations=None):
+    """
+    비밀번호 해시 생성 (랜덤 salt + PBKDF2-SHA256)
+    Hash a password with a random salt and tunable work factor
+    """
+    iterations = iterations or PASSWORD_HASH_ITERATIONS
+    salt = os.urandom(PASSWORD_SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f"{PASSWORD_HASH_ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def is_password_hash(stored):
+    """저장값이 해시 형식인지 확인 (아니면 기존 평문 비밀번호)"""
+    return isinstance(stored, str) and stored.startswith(PASSWORD_HASH_ALGORITHM + '$')
+
+
+def needs_rehash(stored, iterations=None):
+    """평문이거나 현재 작업 계수보다 약한 해시인지 확인"""
+    if not is_password_hash(stored):
+        return True
+    try:
+        return int(stored.split('$')[1]) < (iterations or PASSWORD_HASH_ITERATIONS)
+    except (IndexError, ValueError):
+        return True
+
+
+def check_password(stored, password):
+    """저장값(해시 또는 기존 평문)과 입력 비밀번호 비교"""
+    if not stored or password is None:
+        return False
+    if not is_password_hash(stored):
+        # 기존 평문 비밀번호 (로그인 성공 시 해시로 교체됨)
+        return hmac.compare_digest(str(stored).encode('utf-8'), password.encode('utf-8'))
+    try:
+        _, iterations, salt, expected = stored.split('$')
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'),
+                                     _b64decode(salt), int(iterations))
+        return hmac.compare_digest(digest, _b64decode(expected))
+    except (ValueError, TypeError):
+        return False
+
+
+class PasswordVerifier:
+    """
+    비밀번호 검증 + 결과 캐시
+    같은 (저장 해시, 비밀번호) 조합은 PBKDF2를 다시 계산하지 않는다.
+    캐시 키에는 비밀번호 대신 프로세스별 비밀키로 만든 HMAC만 보관한다.
+    """
+    
+    def __init__(self, max_entries=VERIFY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._key = os.urandom(32)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def verify(self, stored, password):
+        """비밀번호 검증 (성공한 결과만 캐시)"""
+        if not stored or password is None:
+            return False
+        cache_key = (stored, hmac.new(self._key, password.encode('utf-8'), hashlib.sha256).digest())
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return True
+        
+        if not check_password(stored, password):
+            return False
+        
+        with self._lock:
+            self._cache[cache_key] = True
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return True
+    
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# 프로세스 전역 검증기
+_verifier = PasswordVerifier()
+
+
+def verify_password(stored, password):
+    """비밀번호 검증 (캐시 사용)"""
+    return _verifier.verify(stored, password)
+
+
+def without_password(record):
+    """세션에 저장할 사용자 정보에서 비밀번호 제거"""
+    return {k: v for k, v in record.items() if k != 'password'}
+
+
 class AuthManager:
     """
     인증 관리 클래스
     Authentication management class
     """
     
-    def __init__(self, db_operations):
-        """AuthManager 초기화"""
+    def __init__(self, db_operations, hash_iterations=None):
+        """
+        AuthManager 초기화
+        Args:
+            db_operations: DB 작업 객체
+            hash_iterations: 비밀번호 해시 작업 계수 (기본 PASSWORD_HASH_ITERATIONS)
+        """
         self.db = db_operations
+        self.hash_iterations = hash_iterations or PASSWORD_HASH_ITERATIONS
+    
+    def _find_account(self, table_name, id_column, account_id):
+        """아이디 컬럼으로 계정 한 건만 조회 (고유 인덱스 사용)"""
+        rows = self.db.load_data(table_name, filters={id_column: account_id}, use_cache=False)
+        return rows[0] if rows else None
+    
+    def _upgrade_password_hash(self, table_name, record, password):
+        """평문/약한 해시로 저장된 비밀번호를 현재 작업 계수의 해시로 교체"""
+        if not needs_rehash(record.get('password'), self.hash_iterations):
+            return
+        try:
+            self.db.update_data(table_name, {
+                'id': record.get('id'),
+                'password': hash_password(password, self.hash_iterations)
+            })
+        except Exception:
+            # 로그인 성공에 영향을 주지 않도록 에러는 무시
+            pass
 
     def login_user(self, account_id, password):
         """
@@ -28,62 +177,60 @@ class AuthManager:
                 st.error("아이디와 비밀번호를 입력해주세요.")
                 return False
             
-            # 1단계: 직원 로그인 시도
-            employees = self.db.load_data("employees")
-            if employees:
-                for employee in employees:
-                    if (employee.get("employee_id") == account_id and 
-                        employee.get("password") == password):
-                        
-                        # 활성 계정 확인
-                        if not employee.get('is_active', True):
-                            st.error("비활성화된 계정입니다.")
-                            return False
-                        
-                        # 세션에 사용자 정보 저장
-                        st.session_state.logged_in = True
-                        st.session_state.user_info = employee
-                        st.session_state.user_type = "employee"
-                        
-                        # 로그인 시간 기록
-                        self._record_login_activity(employee.get('id'), 'employee')
-                        
-                        return True
+            # 1단계: 직원 로그인 시도 (사번으로 단건 조회)
+            employee = self._find_account("employees", "employee_id", account_id)
+            if employee and verify_password(employee.get("password"), password):
+                
+                # 활성 계정 확인
+                if not employee.get('is_active', True):
+                    st.error("비활성화된 계정입니다.")
+                    return False
+                
+                self._upgrade_password_hash("employees", employee, password)
+                
+                # 세션에 사용자 정보 저장 (비밀번호 제외)
+                st.session_state.logged_in = True
+                st.session_state.user_info = without_password(employee)
+                st.session_state.user_type = "employee"
+                
+                # 로그인 시간 기록
+                self._record_login_activity(employee.get('id'), 'employee')
+                
+                return True
             
-            # 2단계: 법인 계정 로그인 시도
-            corporate_accounts = self.db.load_data("corporate_accounts")
-            if corporate_accounts:
-                for account in corporate_accounts:
-                    if (account.get("account_id") == account_id and 
-                        account.get("password") == password):
-                        
-                        # 활성 계정 확인
-                        if not account.get('is_active', True):
-                            st.error("비활성화된 법인 계정입니다.")
-                            return False
-                        
-                        # 세션에 법인 계정 정보 저장 (직원 형식으로 변환)
-                        st.session_state.logged_in = True
-                        st.session_state.user_info = {
-                            'id': account.get('id'),
-                            'name': account.get('company_name'),
-                            'employee_id': account.get('account_id'),
-                            'role': 'Corporate',  # 법인 계정 role
-                            'department': account.get('company_name'),
-                            'company_code': account.get('company_code'),
-                            'country': account.get('country'),
-                            'company': account.get('company_code'),  # 추가
-                            'is_super_admin': account.get('is_super_admin', False),  # 추가
-                            'approval_authority': account.get('approval_authority', False),  # False로 변경
-                            'is_corporate': True,  # 추가
-                            'is_active': account.get('is_active', True)
-                        }
-                        st.session_state.user_type = "corporate"
-                        
-                        # 로그인 시간 기록
-                        self._record_login_activity(account.get('id'), 'corporate')
-                        
-                        return True
+            # 2단계: 법인 계정 로그인 시도 (계정 ID로 단건 조회)
+            account = self._find_account("corporate_accounts", "account_id", account_id)
+            if account and verify_password(account.get("password"), password):
+                
+                # 활성 계정 확인
+                if not account.get('is_active', True):
+                    st.error("비활성화된 법인 계정입니다.")
+                    return False
+                
+                self._upgrade_password_hash("corporate_accounts", account, password)
+                
+                # 세션에 법인 계정 정보 저장 (직원 형식으로 변환)
+                st.session_state.logged_in = True
+                st.session_state.user_info = {
+                    'id': account.get('id'),
+                    'name': account.get('company_name'),
+                    'employee_id': account.get('account_id'),
+                    'role': 'Corporate',  # 법인 계정 role
+                    'department': account.get('company_name'),
+                    'company_code': account.get('company_code'),
+                    'country': account.get('country'),
+                    'company': account.get('company_code'),  # 추가
+                    'is_super_admin': account.get('is_super_admin', False),  # 추가
+                    'approval_authority': account.get('approval_authority', False),  # False로 변경
+                    'is_corporate': True,  # 추가
+                    'is_active': account.get('is_active', True)
+                }
+                st.session_state.user_type = "corporate"
+                
+                # 로그인 시간 기록
+                self._record_login_activity(account.get('id'), 'corporate')
+                
+                return True
             
             # 인증 실패
             st.error("잘못된 아이디 또는 비밀번호입니다.")
@@ -293,8 +440,10 @@ class AuthManager:
             if not current_user:
                 return False
             
-            # 현재 비밀번호 확인
-            if current_user.get('password') != current_password:
+            # 현재 비밀번호 확인 (세션에는 비밀번호가 없으므로 DB에서 한 건 조회)
+            stored = self.db.load_data("employees", columns="id,password",
+                                       filters={'id': current_user['id']}, use_cache=False)
+            if not stored or not verify_password(stored[0].get('password'), current_password):
                 st.error("현재 비밀번호가 올바르지 않습니다.")
                 return False
             
@@ -306,15 +455,13 @@ class AuthManager:
             # 비밀번호 업데이트
             update_data = {
                 'id': current_user['id'],
-                'password': new_password,
+                'password': hash_password(new_password, self.hash_iterations),
                 'updated_at': datetime.now().isoformat()
             }
             
             success = self.db.update_data("employees", update_data)
             
             if success:
-                # 세션의 사용자 정보도 업데이트
-                st.session_state.user_info['password'] = new_password
                 st.success("비밀번호가 성공적으로 변경되었습니다.")
             
             return success
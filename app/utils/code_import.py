@@ -0,0 +1,182 @@
+"""
+YMV ERP 시스템 제품 코드 CSV 검증/저장 엔진
+Vectorised validation and bulk write for product_codes CSV imports
+
+행 단위 iterrows 루프 대신 컬럼 단위 pandas 문자열 연산으로 검증하고,
+기존 코드는 필요한 컬럼만 한 번 읽어 해시(set/dict) 조회로 중복을 판정한다.
+저장은 utils.database.bulk_write 청크 insert/upsert를 사용한다.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+# 7단계 코드 컬럼
+CODE_COLUMNS = [f'code{i:02d}' for i in range(1, 8)]
+
+# 코드 단계별 최대 길이
+CODE_MAX_LENGTH = 10
+
+# 기존 코드 중복 확인용 조회 컬럼 (full_code가 비어 있는 예전 행은 코드 단계로 재계산)
+EXISTING_CODE_COLUMNS = "id,category,full_code," + ",".join(CODE_COLUMNS)
+
+
+def _text(df: pd.DataFrame, column: str, default: str = '') -> pd.Series:
+    """컬럼을 공백 제거된 문자열 Series로 변환 (컬럼이 없으면 default)"""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[column].fillna('').astype(str).str.strip()
+
+
+def build_full_codes(codes: pd.DataFrame) -> pd.Series:
+    """
+    code01~code07 → full_code ('HR-ST-OP')
+    비어 있지 않은 단계만 '-'로 연결한다.
+    """
+    joined = pd.Series('', index=codes.index, dtype=object)
+    for column in CODE_COLUMNS:
+        values = codes[column]
+        joined = joined + values.where(values == '', '-' + values)
+    return joined.str[1:]
+
+
+def normalize_code_import(df: pd.DataFrame, category: Optional[str] = None) -> pd.DataFrame:
+    """
+    CSV → 정규화된 코드 프레임
+    컬럼: row_no, category, code01~07, full_code, description, is_active, is_active_raw
+    category를 주면 CSV의 category 컬럼 대신 해당 값을 사용한다.
+    """
+    df = df.reset_index(drop=True)
+    frame = pd.DataFrame(index=df.index)
+    frame['row_no'] = df.index + 2
+    frame['category'] = category if category is not None else _text(df, 'category')
+    for column in CODE_COLUMNS:
+        frame[column] = _text(df, column)
+    frame['full_code'] = build_full_codes(frame)
+    frame['description'] = _text(df, 'description')
+    active = _text(df, 'is_active', 'TRUE').str.upper()
+    frame['is_active_raw'] = active
+    # 빈 값은 기존 동작대로 활성 처리하지 않음 (TRUE만 활성)
+    frame['is_active'] = active == 'TRUE'
+    return frame
+
+
+def load_existing_codes(load_func: Callable, columns: str = EXISTING_CODE_COLUMNS) -> pd.DataFrame:
+    """
+    기존 product_codes를 필요한 컬럼만 한 번 조회
+    반환 프레임에는 full_code가 항상 채워져 있다.
+    """
+    try:
+        rows = load_func('product_codes', columns=columns, use_cache=False) or []
+    except TypeError:
+        # use_cache를 받지 않는 조회 함수
+        rows = load_func('product_codes', columns=columns) or []
+    existing = pd.DataFrame(rows)
+    if existing.empty:
+        return pd.DataFrame(columns=['id', 'category', 'full_code'])
+    for column in CODE_COLUMNS:
+        existing[column] = _text(existing, column)
+    stored = _text(existing, 'full_code')
+    existing['full_code'] = stored.where(stored != '', build_full_codes(existing))
+    return existing[existing['full_code'] != '']
+
+
+def existing_code_ids(existing: pd.DataFrame) -> Dict[str, Any]:
+    """full_code → id 해시 (같은 코드가 여러 건이면 첫 건)"""
+    unique = existing.drop_duplicates('full_code', keep='first')
+    return dict(zip(unique['full_code'].tolist(), unique['id'].tolist()))
+
+
+def find_row_errors(frame: pd.DataFrame, require_category: bool = True,
+                    check_active: bool = False,
+                    max_length: Optional[int] = CODE_MAX_LENGTH) -> List[Tuple[int, int, str]]:
+    """
+    행 단위 필수값/코드 형식 오류 (컬럼 단위 마스크로 판정)
+    max_length가 None이면 코드 길이는 검사하지 않는다.
+    Returns: [(row_no, 순서, 메시지)]
+    """
+    errors = []
+
+    def collect(mask, order, message):
+        for row_no in frame.loc[mask, 'row_no']:
+            errors.append((row_no, order, message.format(row=row_no)))
+
+    if require_category:
+        collect(frame['category'] == '', 0, "행 {row}: 카테고리가 비어있습니다.")
+    collect(frame['description'] == '', 1, "행 {row}: 설명이 비어있습니다.")
+    if check_active:
+        collect(~frame['is_active_raw'].isin(['TRUE', 'FALSE', '']), 2,
+                "행 {row}: is_active는 TRUE 또는 FALSE여야 합니다.")
+    if max_length is not None:
+        for position, column in enumerate(CODE_COLUMNS):
+            collect(frame[column].str.len() > max_length, 3 + position,
+                    "행 {row}: " + column + "이 " + str(max_length) + "자를 초과합니다.")
+    collect(frame['full_code'] == '', 10, "행 {row}: 최소 1개 이상의 코드가 필요합니다.")
+    return errors
+
+
+def find_file_duplicates(frame: pd.DataFrame) -> pd.Series:
+    """CSV 내부에서 앞 행과 full_code가 겹치는 행 마스크"""
+    return (frame['full_code'] != '') & frame['full_code'].duplicated(keep='first')
+
+
+def sorted_messages(errors: Iterable[Tuple[int, int, str]]) -> List[str]:
+    """(row_no, 순서, 메시지) 목록을 행 순서대로 정렬한 메시지 목록"""
+    return [message for _, _, message in sorted(errors, key=lambda item: (item[0], item[1]))]
+
+
+def code_records(frame: pd.DataFrame, include_full_code: bool = True,
+                 extra: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """정규화 프레임 → 저장용 dict 목록 (빈 코드 단계는 None)"""
+    columns = ['category'] + CODE_COLUMNS + (['full_code'] if include_full_code else []) + \
+        ['description', 'is_active']
+    out = frame[columns].astype(object)
+    for column in CODE_COLUMNS:
+        out[column] = out[column].where(out[column] != '', None)
+    for key, value in (extra or {}).items():
+        out[key] = value
+    return out.to_dict('records')
+
+
+def write_codes(frame: pd.DataFrame, existing_ids: Optional[Dict[str, Any]] = None,
+                bulk_save_func: Optional[Callable] = None,
+                include_full_code: bool = True,
+                extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    코드 일괄 저장
+    existing_ids에 있는 full_code는 id 기준 upsert, 나머지는 청크 insert
+    Returns: {'inserted', 'updated', 'failed': [(row_no, message)], 'chunks'}
+    """
+    bulk_save = bulk_save_func
+    if bulk_save is None:
+        from utils.database import bulk_write as bulk_save
+
+    now = datetime.now().isoformat()
+    existing_ids = existing_ids or {}
+    # 정수 ID가 float로 바뀌지 않도록 object Series로 구성
+    matched = pd.Series([existing_ids.get(code) for code in frame['full_code']],
+                        index=frame.index, dtype=object)
+    update_mask = matched.notna()
+    result = {'inserted': 0, 'updated': 0, 'failed': [], 'chunks': 0}
+
+    if (~update_mask).any():
+        rows = code_records(frame[~update_mask], include_full_code,
+                            {**(extra or {}), 'created_at': now, 'updated_at': now})
+        saved = bulk_save('product_codes', rows, row_labels=frame.loc[~update_mask, 'row_no'].tolist())
+        result['inserted'] = saved['written']
+        result['failed'].extend(saved['failed'])
+        result['chunks'] += saved['chunks']
+
+    if update_mask.any():
+        rows = code_records(frame[update_mask], include_full_code, {'updated_at': now})
+        for row, record_id in zip(rows, matched[update_mask].tolist()):
+            row['id'] = record_id
+        saved = bulk_save('product_codes', rows, upsert=True,
+                          row_labels=frame.loc[update_mask, 'row_no'].tolist())
+        result['updated'] = saved['written']
+        result['failed'].extend(saved['failed'])
+        result['chunks'] += saved['chunks']
+
+    result['failed'].sort(key=lambda item: item[0])
+    return result
@@ -0,0 +1,120 @@
+"""
+YMV ERP 시스템 Supabase 연결 풀
+Process-wide Supabase client pool for YMV ERP System
+
+Supabase 클라이언트(내부 httpx 세션)는 keep-alive 커넥션 풀을 가지고 있으므로
+프로세스 당 하나만 만들어 모든 CRUD 함수가 재사용하도록 한다.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import streamlit as st
+from supabase import create_client, Client
+
+
+class SupabaseConnectionPool:
+    """
+    (url, key) 단위로 Supabase 클라이언트를 한 번만 생성하여 공유하는 풀
+    Shares one Supabase client per (url, key) across the whole process
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str], Client] = {}
+        self._lock = threading.Lock()
+        self._acquisitions = 0
+        self._created = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_create = 0.0
+
+    def get_client(self, url: str, key: str) -> Client:
+        """풀에서 클라이언트 가져오기 (없으면 최초 1회 생성)"""
+        pool_key = (url, key)
+
+        # 이미 만들어진 클라이언트는 락 없이 바로 반환
+        client = self._clients.get(pool_key)
+        if client is not None:
+            with self._lock:
+                self._acquisitions += 1
+            return client
+
+        wait_start = time.perf_counter()
+        with self._lock:
+            wait = time.perf_counter() - wait_start
+            self._acquisitions += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+            client = self._clients.get(pool_key)
+            if client is None:
+                create_start = time.perf_counter()
+                client = create_client(url, key)
+                self._total_create += time.perf_counter() - create_start
+                self._clients[pool_key] = client
+                self._created += 1
+                logging.info("Supabase 공유 클라이언트 생성")
+            return client
+
+    def reset(self):
+        """풀 초기화 (시크릿 변경 시 사용)"""
+        with self._lock:
+            self._clients.clear()
+
+    def _open_http_connections(self) -> Optional[int]:
+        """httpx 커넥션 풀에 열려 있는 커넥션 수 (확인 불가 시 None)"""
+        total = 0
+        found = False
+        for client in list(self._clients.values()):
+            try:
+                session = client.postgrest.session
+                pool = session._transport._pool
+                total += len(pool.connections)
+                found = True
+            except Exception:
+                continue
+        return total if found else None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        풀 지표 반환
+        Returns open clients/connections, reuse ratio and wait time
+        """
+        with self._lock:
+            acquisitions = self._acquisitions
+            created = self._created
+            reused = max(acquisitions - created, 0)
+            return {
+                'open_clients': len(self._clients),
+                'open_http_connections': self._open_http_connections(),
+                'clients_created': created,
+                'acquisitions': acquisitions,
+                'reused': reused,
+                'reuse_ratio': (reused / acquisitions) if acquisitions else 0.0,
+                'avg_wait_ms': (self._total_wait / acquisitions * 1000) if acquisitions else 0.0,
+                'max_wait_ms': self._max_wait * 1000,
+                'total_create_ms': self._total_create * 1000,
+            }
+
+
+# 프로세스 전역 풀 인스턴스
+_pool = SupabaseConnectionPool()
+
+
+def get_pool() -> SupabaseConnectionPool:
+    """전역 연결 풀 반환"""
+    return _pool
+
+
+def get_shared_client() -> Client:
+    """secrets 설정으로 공유 Supabase 클라이언트 가져오기"""
+    url = st.secrets["SUPABASE_URL"]
+    key = st.secrets["SUPABASE_ANON_KEY"]
+    return _pool.get_client(url, key)
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """전역 연결 풀 지표 반환"""
+    return _pool.get_metrics()
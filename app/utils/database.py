@@ -1,9 +1,17 @@
 import streamlit as st
-from supabase import create_client, Client
+from supabase import Client
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, List, Union, Iterable, Callable, Sequence, Tuple
 from datetime import datetime, date, timedelta
 
+from utils.connection_pool import get_shared_client, get_pool_metrics
+from utils.query_cache import TableReadCache, invalidate_table, make_cache_key
+from utils.query_builder import QueryFilter, as_query_filter
+from utils.sequence_service import next_document_number
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 
@@ -22,16 +30,197 @@ class ConnectionWrapper:
             raise
 
 def get_connection() -> ConnectionWrapper:
-    """Supabase 연결 가져오기"""
+    """Supabase 연결 가져오기 (프로세스 공유 클라이언트 재사용)"""
     try:
-        url = st.secrets["SUPABASE_URL"]  # ✅ 맞음
-        key = st.secrets["SUPABASE_ANON_KEY"]  # ✅ 맞음    
-        client = create_client(url, key)
-        return ConnectionWrapper(client)
+        return ConnectionWrapper(get_shared_client())
     except Exception as e:
         logging.error(f"Supabase 연결 오류: {str(e)}")
         raise
 
+# ============================================
+# 컬럼 프로젝션
+# ============================================
+
+class Projection:
+    """
+    컬럼 프로젝션 선언
+    Typed column projection that components can declare once and reuse
+
+    예: EMPLOYEE_OPTIONS = Projection("id", "name", "username", "employee_id")
+        load_func("employees", columns=EMPLOYEE_OPTIONS)
+    """
+    
+    __slots__ = ('columns',)
+    
+    def __init__(self, *columns: str):
+        if len(columns) == 1 and not isinstance(columns[0], str):
+            columns = tuple(columns[0])
+        self.columns = tuple(c.strip() for c in columns if c and c.strip())
+    
+    def __iter__(self):
+        return iter(self.columns)
+    
+    def __len__(self):
+        return len(self.columns)
+    
+    def __add__(self, other):
+        extra = other.columns if isinstance(other, Projection) else tuple(other)
+        return Projection(*(self.columns + tuple(c for c in extra if c not in self.columns)))
+    
+    def to_select(self) -> str:
+        """PostgREST select 절 문자열"""
+        return ",".join(self.columns) if self.columns else "*"
+    
+    def __repr__(self):
+        return f"Projection({', '.join(repr(c) for c in self.columns)})"
+
+
+ColumnSpec = Union[str, Projection, Iterable[str], None]
+
+# 컬럼 누락으로 '*' 폴백이 발생한 (테이블, select 절) - 이후에는 바로 '*' 사용
+_projection_fallbacks = set()
+
+def build_select_clause(columns: ColumnSpec) -> str:
+    """컬럼 지정(문자열/리스트/Projection)을 select 절 문자열로 변환"""
+    if columns is None:
+        return "*"
+    if isinstance(columns, Projection):
+        return columns.to_select()
+    if isinstance(columns, str):
+        parts = [c.strip() for c in columns.split(",") if c.strip()]
+    else:
+        parts = [str(c).strip() for c in columns if c and str(c).strip()]
+    if not parts or "*" in parts:
+        return "*"
+    return ",".join(parts)
+
+def is_missing_column_error(error: Exception) -> bool:
+    """존재하지 않는 컬럼을 select 해서 발생한 오류인지 확인"""
+    message = str(error)
+    if '42703' in message or 'PGRST204' in message:
+        return True
+    lowered = message.lower()
+    return 'column' in lowered and ('does not exist' in lowered or 'could not find' in lowered)
+
+def execute_select(table_name: str, columns: ColumnSpec, build_query, count: Optional[str] = None):
+    """
+    프로젝션을 적용하여 select 실행, 컬럼 누락 시에만 '*'로 재시도
+    Args:
+        table_name: 테이블 명
+        columns: 컬럼 지정
+        build_query: select 결과(query builder)를 받아 필터 등을 붙이는 함수
+        count: 전체 건수 계산 방식 ('exact' / 'estimated' / None)
+    Returns:
+        PostgREST 응답
+    """
+    conn = get_connection()
+    select_clause = build_select_clause(columns)
+    
+    if select_clause != "*" and (table_name, select_clause) in _projection_fallbacks:
+        select_clause = "*"
+    
+    def run(clause):
+        if count:
+            return build_query(conn.table(table_name).select(clause, count=count)).execute()
+        return build_query(conn.table(table_name).select(clause)).execute()
+    
+    try:
+        return run(select_clause)
+    except Exception as e:
+        if select_clause == "*" or not is_missing_column_error(e):
+            raise
+        logging.warning(f"컬럼 프로젝션 실패, '*'로 재시도 ({table_name}: {select_clause}): {str(e)}")
+        _projection_fallbacks.add((table_name, select_clause))
+        return run("*")
+
+# ============================================
+# 페이지네이션
+# ============================================
+
+# 페이지네이션 관련 load_data 인자
+PAGINATION_KEYS = ('limit', 'offset', 'order_by', 'desc', 'after_id', 'after_created_at', 'count')
+
+class PageResult(list):
+    """
+    페이지 조회 결과
+    list와 호환되며 전체 건수와 다음 페이지 커서를 함께 가진다.
+    """
+    
+    def __init__(self, rows=(), total: Optional[int] = None, limit: Optional[int] = None,
+                 offset: int = 0, next_cursor: Optional[Dict[str, Any]] = None):
+        super().__init__(rows)
+        self.total = total
+        self.limit = limit
+        self.offset = offset
+        self.next_cursor = next_cursor
+    
+    @property
+    def has_more(self) -> bool:
+        """다음 페이지 존재 여부"""
+        if self.total is not None:
+            return self.offset + len(self) < self.total
+        return self.next_cursor is not None
+
+def apply_pagination(query, limit: Optional[int] = None, offset: Optional[int] = None,
+                     order_by: Optional[str] = None, desc: bool = False,
+                     after_id: Optional[Any] = None, after_created_at: Optional[str] = None):
+    """
+    정렬, keyset 커서, limit/offset을 쿼리에 적용
+    - after_created_at(+after_id): (created_at, id) 기준 keyset
+    - after_id만 지정: id 기준 keyset
+    """
+    if after_created_at is not None:
+        order_by = 'created_at'
+    elif after_id is not None:
+        order_by = 'id'
+    
+    paged = limit is not None or offset
+    if order_by:
+        direction = 'desc' if desc else 'asc'
+        if order_by != 'id' and paged:
+            # 동일 값에서도 페이지 경계가 흔들리지 않도록 id를 보조 정렬키로 사용
+            # (order=created_at.desc,id.desc 형태의 단일 파라미터)
+            query = query.order(f"{order_by}.{direction},id", desc=desc)
+        else:
+            query = query.order(order_by, desc=desc)
+    elif paged:
+        query = query.order('id', desc=desc)
+    
+    op = 'lt' if desc else 'gt'
+    if after_created_at is not None:
+        if after_id is not None:
+            query = query.or_(
+                f'created_at.{op}."{after_created_at}",'
+                f'and(created_at.eq."{after_created_at}",id.{op}.{after_id})'
+            )
+        else:
+            query = getattr(query, op)('created_at', after_created_at)
+    elif after_id is not None:
+        query = getattr(query, op)('id', after_id)
+    
+    if limit is not None:
+        start = offset or 0
+        query = query.range(start, start + limit - 1)
+    elif offset:
+        query = query.range(offset, offset + 10 ** 9)
+    return query
+
+def build_page_result(response, limit: Optional[int] = None, offset: Optional[int] = None,
+                      order_by: Optional[str] = None) -> PageResult:
+    """
+    PostgREST 응답을 PageResult로 변환
+    next_cursor는 id 또는 created_at 정렬일 때만 만든다 (그 외 정렬은 offset 사용)
+    """
+    rows = response.data or []
+    next_cursor = None
+    if limit is not None and len(rows) == limit and rows and order_by in (None, 'id', 'created_at'):
+        last = rows[-1]
+        next_cursor = {'after_id': last.get('id')}
+        if order_by == 'created_at':
+            next_cursor['after_created_at'] = last.get('created_at')
+    return PageResult(rows, total=getattr(response, 'count', None), limit=limit,
+                      offset=offset or 0, next_cursor=next_cursor)
+
 # ============================================
 # 범용 CRUD 함수
 # ============================================
@@ -41,6 +230,7 @@ def save_data(table_name: str, data: Dict[str, Any]) -> Optional[Dict]:
     try:
         conn = get_connection()
         result = conn.table(table_name).insert(data).execute()
+        invalidate_table(table_name)
         
         if result.data:
             logging.info(f"데이터 저장 성공: {table_name}")
@@ -50,38 +240,63 @@ def save_data(table_name: str, data: Dict[str, Any]) -> Optional[Dict]:
         logging.error(f"데이터 저장 오류 ({table_name}): {str(e)}")
         return None
 
-def load_data(table_name: str, columns: str = "*", filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+def load_data(table_name: str, columns: ColumnSpec = "*",
+              filters: Union[Dict[str, Any], QueryFilter, None] = None,
+              limit: Optional[int] = None, offset: Optional[int] = None,
+              order_by: Optional[str] = None, desc: bool = False,
+              after_id: Optional[Any] = None, after_created_at: Optional[str] = None,
+              count: Optional[str] = None) -> List[Dict]:
     """
     데이터 로드
     Args:
         table_name: 테이블 명
-        columns: 선택할 컬럼 (호환성을 위해 존재, 항상 "*" 사용)
-        filters: 필터 조건 딕셔너리
+        columns: 선택할 컬럼 ("a,b", ["a", "b"] 또는 Projection, 누락 컬럼이 있으면 "*"로 폴백)
+        filters: 필터 조건 딕셔너리 (리스트 값은 IN) 또는 QueryFilter
+        limit / offset: 페이지 크기 / 시작 위치
+        order_by / desc: 정렬 컬럼 / 내림차순 여부
+        after_id / after_created_at: keyset 커서 (이전 페이지 마지막 행 기준)
+        count: 전체 건수 계산 방식 ('exact' 또는 'estimated')
     Returns:
-        데이터 리스트
+        데이터 리스트 (페이지 인자 사용 시 PageResult)
     """
+    paged = any(v is not None for v in (limit, offset, after_id, after_created_at, count))
+    query_filter = as_query_filter(filters)
+    if order_by is None and query_filter is not None and query_filter.order_by:
+        order_by, desc = query_filter.order_by, query_filter.desc
     try:
-        conn = get_connection()
-        query = conn.table(table_name).select("*")  # columns 인자는 무시하고 항상 "*" 사용
+        def apply_filters(query):
+            if query_filter is not None:
+                query = query_filter.apply(query)
+            return apply_pagination(query, limit, offset, order_by, desc, after_id, after_created_at)
         
-        if filters and isinstance(filters, dict):  # ✅ dict 타입 체크 추가
-            for key, value in filters.items():
-                query = query.eq(key, value)
-        
-        result = query.execute()
+        result = execute_select(table_name, columns, apply_filters, count=count)
+        if paged:
+            if after_created_at is not None:
+                order_by = 'created_at'
+            elif after_id is not None:
+                order_by = 'id'
+            return build_page_result(result, limit, offset, order_by)
         return result.data if result.data else []
     except Exception as e:
         logging.error(f"데이터 로드 오류 ({table_name}): {str(e)}")
-        return []
+        return PageResult(total=0, limit=limit, offset=offset or 0) if paged else []
 
-def update_data(table_name: str, data: Dict[str, Any]) -> bool:
-    """데이터 수정"""
+def update_data(table_name: str, data: Dict[str, Any],
+                match: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    데이터 수정
+    match를 주면 그 컬럼 값이 모두 같을 때만 수정한다 (조건부 수정, 맞는 행이 없으면 False).
+    """
     try:
         record_id = data.pop('id')
         data['updated_at'] = datetime.now().isoformat()
         
         conn = get_connection()
-        result = conn.table(table_name).update(data).eq('id', record_id).execute()
+        query = conn.table(table_name).update(data).eq('id', record_id)
+        for column, value in (match or {}).items():
+            query = query.eq(column, value)
+        result = query.execute()
+        invalidate_table(table_name)
         
         if result.data:
             logging.info(f"데이터 수정 성공: {table_name}, id={record_id}")
@@ -91,11 +306,36 @@ def update_data(table_name: str, data: Dict[str, Any]) -> bool:
         logging.error(f"데이터 수정 오류 ({table_name}): {str(e)}")
         return False
 
+def resolve_update_args(args: Sequence[Any]) -> Optional[Tuple[Any, Dict[str, Any]]]:
+    """
+    update_func 호출 인자 해석 → (record_id, 변경 데이터) 또는 None
+    호출 패턴:
+    1. (record_id, data)
+    2. (data,) where data contains 'id'
+    3. (data, key_column) where data contains key_column (예: update_func(table, data, "id"))
+    """
+    if len(args) == 2:
+        first, second = args
+        if isinstance(first, dict) and isinstance(second, str):
+            if second not in first:
+                return None
+            data = dict(first)
+            return data.pop(second), data
+        if isinstance(second, dict):
+            data = {k: v for k, v in second.items() if k != 'id'}
+            return first, data
+        return None
+    if len(args) == 1 and isinstance(args[0], dict) and 'id' in args[0]:
+        data = dict(args[0])
+        return data.pop('id'), data
+    return None
+
 def delete_data(table_name: str, record_id: int) -> bool:
     """데이터 삭제"""
     try:
         conn = get_connection()
         result = conn.table(table_name).delete().eq('id', record_id).execute()
+        invalidate_table(table_name)
         
         logging.info(f"데이터 삭제 성공: {table_name}, id={record_id}")
         return True
@@ -103,6 +343,245 @@ def delete_data(table_name: str, record_id: int) -> bool:
         logging.error(f"데이터 삭제 오류 ({table_name}, id={record_id}): {str(e)}")
         return False
 
+# ============================================
+# 대량 저장 (bulk insert / upsert)
+# ============================================
+
+# 요청 1건당 목표 본문 크기와 청크 행 수 범위
+BULK_TARGET_BYTES = 512 * 1024
+BULK_MIN_CHUNK = 50
+BULK_MAX_CHUNK = 1000
+
+def choose_chunk_size(rows: Sequence[Dict[str, Any]], sample_size: int = 50) -> int:
+    """행 평균 JSON 크기로 청크 크기 자동 결정 (요청 본문 ~BULK_TARGET_BYTES)"""
+    if not rows:
+        return BULK_MIN_CHUNK
+    sample = rows[:sample_size]
+    avg_bytes = max(len(json.dumps(sample, default=str).encode('utf-8')) / len(sample), 1)
+    return int(min(BULK_MAX_CHUNK, max(BULK_MIN_CHUNK, BULK_TARGET_BYTES // avg_bytes)))
+
+def bulk_write(table_name: str, rows: Sequence[Dict[str, Any]], upsert: bool = False,
+               on_conflict: Optional[str] = None, chunk_size: Optional[int] = None,
+               row_labels: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+    """
+    여러 행을 청크 단위로 한 번에 insert/upsert
+    청크가 실패하면 해당 청크만 행 단위로 다시 시도해 실패 행을 정확히 보고한다.
+    Args:
+        table_name: 테이블 명
+        rows: 저장할 행 목록 (한 호출 안에서는 같은 컬럼 구성 권장)
+        upsert: True면 upsert (기본 키 또는 on_conflict 기준)
+        on_conflict: upsert 충돌 기준 컬럼
+        chunk_size: 청크 행 수 (None이면 자동)
+        row_labels: 행별 오류 메시지에 사용할 라벨 (예: CSV 행 번호)
+    Returns:
+        {'written', 'saved', 'failed': [(label, message)], 'chunks', 'chunk_size', 'elapsed_ms'}
+    """
+    rows = list(rows)
+    labels = list(row_labels) if row_labels is not None else list(range(len(rows)))
+    chunk_size = chunk_size or choose_chunk_size(rows)
+    conn = get_connection()
+    
+    def execute(batch):
+        table = conn.table(table_name)
+        if upsert:
+            if on_conflict:
+                return table.upsert(batch, on_conflict=on_conflict).execute()
+            return table.upsert(batch).execute()
+        return table.insert(batch).execute()
+    
+    started = time.perf_counter()
+    saved = []
+    failed = []
+    chunks = 0
+    for start in range(0, len(rows), chunk_size):
+        batch = rows[start:start + chunk_size]
+        batch_labels = labels[start:start + chunk_size]
+        chunks += 1
+        try:
+            result = execute(batch)
+            saved.extend(result.data or [])
+        except Exception as e:
+            logging.warning(f"대량 저장 청크 실패, 행 단위 재시도 ({table_name}, {len(batch)}행): {str(e)}")
+            for row, label in zip(batch, batch_labels):
+                try:
+                    result = execute([row])
+                    saved.extend(result.data or [])
+                except Exception as row_error:
+                    failed.append((label, str(row_error)))
+    
+    if saved:
+        invalidate_table(table_name)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logging.info(f"대량 저장 완료: {table_name}, {len(saved)}/{len(rows)}행, {chunks}청크, {elapsed_ms:.0f}ms")
+    return {
+        'written': len(rows) - len(failed),
+        'saved': saved,
+        'failed': failed,
+        'chunks': chunks,
+        'chunk_size': chunk_size,
+        'elapsed_ms': elapsed_ms,
+    }
+
+# ============================================
+# 일괄 상태 변경 (bulk update)
+# ============================================
+
+# update().in_('id', ids) 1회에 넣는 최대 ID 수 (요청 URL 길이 제한)
+BULK_UPDATE_BATCH = 200
+
+def bulk_update(table_name: str, ids: Iterable[Any], patch: Dict[str, Any],
+                batch_size: int = BULK_UPDATE_BATCH) -> Dict[Any, bool]:
+    """
+    여러 행에 같은 변경을 적용 (배치마다 update ... in_('id', ids) 요청 1회)
+    Args:
+        table_name: 테이블 명
+        ids: 변경할 행 ID 목록
+        patch: 변경할 컬럼 값 (id는 무시, updated_at은 자동 설정)
+        batch_size: 요청 1회당 ID 수
+    Returns:
+        {id: 성공 여부} (응답에 돌아온 행만 성공, 없는 ID나 실패한 배치는 False)
+    """
+    ids = list(dict.fromkeys(ids))
+    results = {record_id: False for record_id in ids}
+    if not ids:
+        return results
+    patch = {k: v for k, v in patch.items() if k != 'id'}
+    patch.setdefault('updated_at', datetime.now().isoformat())
+    
+    conn = get_connection()
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        try:
+            result = conn.table(table_name).update(patch).in_('id', batch).execute()
+            for row in result.data or []:
+                if row.get('id') in results:
+                    results[row['id']] = True
+        except Exception as e:
+            logging.error(f"일괄 수정 오류 ({table_name}, {len(batch)}건): {str(e)}")
+    
+    if any(results.values()):
+        invalidate_table(table_name)
+    logging.info(f"일괄 수정 완료: {table_name}, {sum(results.values())}/{len(ids)}건")
+    return results
+
+# ============================================
+# 법인별 병렬 조회 (fan-out)
+# ============================================
+
+# 법인 코드 목록 기본값
+ALL_COMPANY_CODES = ('YMV', 'YMTH', 'YMK', 'YMC')
+
+# 법인별 쿼리 기본 제한 시간 (초)
+FANOUT_TIMEOUT_SECONDS = 10.0
+
+class FanOutResult(list):
+    """
+    법인별 병렬 조회 결과
+    list와 호환되며 실패/시간 초과 법인과 법인별 소요 시간을 함께 가진다.
+    """
+    
+    def __init__(self, rows=(), errors: Optional[Dict[str, str]] = None,
+                 timings: Optional[Dict[str, float]] = None, elapsed_ms: float = 0.0):
+        super().__init__(rows)
+        self.errors = errors or {}
+        self.timings = timings or {}
+        self.elapsed_ms = elapsed_ms
+    
+    @property
+    def is_partial(self) -> bool:
+        """일부 법인 조회가 실패/시간 초과했는지 여부"""
+        return bool(self.errors)
+
+def fan_out_query(base_table: str, companies: Optional[Sequence[str]] = None,
+                  columns: ColumnSpec = "*",
+                  filters: Union[Dict[str, Any], QueryFilter, None] = None,
+                  order_by: Optional[str] = None, desc: bool = False,
+                  query_func: Optional[Callable[[str], List[Dict]]] = None,
+                  timeout: Optional[float] = FANOUT_TIMEOUT_SECONDS,
+                  company_field: str = 'company_code') -> FanOutResult:
+    """
+    법인별 테이블(base_table_ymv, _ymk ...)을 동시에 조회하여 하나로 합침
+    Args:
+        base_table: 기본 테이블명 (예: 'hot_runner_orders')
+        companies: 법인 코드 목록 (기본: 전체 법인)
+        columns / filters: load_data와 동일
+        order_by / desc: 법인별 정렬 및 합친 결과 정렬 기준
+        query_func: 테이블명을 받아 행 리스트를 돌려주는 사용자 정의 조회 함수
+        timeout: 법인별 제한 시간(초, 쿼리 시작 시점부터), 초과한 법인은 결과에서 제외
+        company_field: 각 행에 추가할 법인 코드 컬럼명
+    Returns:
+        FanOutResult (성공한 법인 결과만 포함한 부분 결과일 수 있음)
+    """
+    from utils.helpers import get_company_table
+    
+    companies = [c for c in (companies or ALL_COMPANY_CODES) if c]
+    query_filter = as_query_filter(filters)
+    
+    def run_default(table_name):
+        def build(query):
+            if query_filter is not None:
+                query = query_filter.apply(query)
+            if order_by:
+                query = query.order(order_by, desc=desc)
+            return query
+        return execute_select(table_name, columns, build).data or []
+    
+    runner = query_func or run_default
+    
+    started_at = {}
+    
+    def run(company):
+        started_at[company] = time.perf_counter()
+        rows = runner(get_company_table(base_table, company))
+        return rows, (time.perf_counter() - started_at[company]) * 1000
+    
+    rows_by_company = {}
+    errors = {}
+    timings = {}
+    started = time.perf_counter()
+    # 호출마다 법인 수만큼의 전용 풀을 사용: 대기열이 없고, 시간 초과된 쿼리가
+    # 다른 화면의 조회 스레드를 붙잡지 않는다
+    executor = ThreadPoolExecutor(max_workers=max(len(companies), 1),
+                                  thread_name_prefix="company-fanout")
+    try:
+        futures = {company: executor.submit(run, company) for company in companies}
+        for company, future in futures.items():
+            remaining = None
+            if timeout is not None:
+                begun = started_at.get(company, started)
+                remaining = max(0.0, begun + timeout - time.perf_counter())
+            try:
+                rows, took_ms = future.result(timeout=remaining)
+                timings[company] = took_ms
+                rows_by_company[company] = rows
+            except FutureTimeoutError:
+                future.cancel()
+                errors[company] = f"시간 초과 ({timeout}초)"
+            except Exception as e:
+                errors[company] = str(e)
+    finally:
+        # 시간 초과된 쿼리는 기다리지 않음 (스레드는 응답이 오면 스스로 종료)
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    merged = []
+    for company in companies:
+        for row in rows_by_company.get(company, []):
+            row[company_field] = company.upper()
+            merged.append(row)
+    
+    if order_by:
+        # 법인별로 정렬된 결과를 합친 뒤 전체 기준으로 다시 정렬 (None은 뒤로)
+        present = [r for r in merged if r.get(order_by) is not None]
+        missing = [r for r in merged if r.get(order_by) is None]
+        present.sort(key=lambda r: r[order_by], reverse=desc)
+        merged = present + missing
+    
+    for company, message in errors.items():
+        logging.warning(f"법인별 조회 실패 ({base_table}, {company}): {message}")
+    
+    return FanOutResult(merged, errors=errors, timings=timings,
+                        elapsed_ms=(time.perf_counter() - started) * 1000)
+
 # ============================================
 # 고객 관련 함수
 # ============================================
@@ -150,22 +629,10 @@ def delete_quotation(table_name: str, quotation_id: int) -> bool:
     return delete_data(table_name, quotation_id)
 
 def get_next_quotation_number(table_name: str, year: int) -> str:
-    """다음 견적 번호 생성"""
+    """다음 견적 번호 생성 (YYYY-NNNN, 시퀀스 서비스에서 원자적으로 발급)"""
     try:
-        conn = get_connection()
-        
-        result = conn.table(table_name)\
-            .select("quotation_number")\
-            .ilike('quotation_number', f'{year}%')\
-            .execute()
-        
-        if result.data:
-            numbers = [int(q['quotation_number'].split('-')[-1]) for q in result.data if q.get('quotation_number')]
-            next_num = max(numbers) + 1 if numbers else 1
-        else:
-            next_num = 1
-        
-        return f"{year}-{next_num:04d}"
+        return next_document_number('QNO', prefix=f"{year}-", width=4, period=str(year),
+                                    table_name=table_name, column='quotation_number')
     except Exception as e:
         logging.error(f"견적 번호 생성 오류 ({table_name}): {str(e)}")
         return f"{year}-0001"
@@ -179,6 +646,7 @@ def save_sales_activity(table_name: str, data: Dict[str, Any]) -> Optional[Dict]
     try:
         conn = get_connection()
         result = conn.table(table_name).insert(data).execute()
+        invalidate_table(table_name)
         
         if result.data:
             logging.info(f"영업 활동 저장 성공: {table_name}")
@@ -229,6 +697,7 @@ def update_sales_activity(table_name: str, data: Dict[str, Any]) -> bool:
             .update(data)\
             .eq('id', activity_id)\
             .execute()
+        invalidate_table(table_name)
         
         if result.data:
             logging.info(f"영업 활동 수정 성공: {table_name}, id={activity_id}")
@@ -246,6 +715,7 @@ def delete_sales_activity(table_name: str, activity_id: int) -> bool:
             .delete()\
             .eq('id', activity_id)\
             .execute()
+        invalidate_table(table_name)
         
         logging.info(f"영업 활동 삭제 성공: {table_name}, id={activity_id}")
         return True
@@ -311,11 +781,19 @@ def get_upcoming_actions(table_name: str, days: int = 7) -> List[Dict]:
 # ============================================
 
 def get_supabase_client():
-    """Supabase 클라이언트 가져오기"""
-    if 'supabase' not in st.session_state:
+    """Supabase 클라이언트 가져오기 (공유 풀 사용)"""
+    try:
+        return get_shared_client()
+    except Exception as e:
+        logging.error(f"Supabase 연결 오류: {str(e)}")
         st.error("Supabase 연결이 초기화되지 않았습니다.")
         return None
-    return st.session_state.supabase
+
+def _invalidate_freight_rule(table, rule_id=None):
+    """규칙 변경 후 컴파일된 요금표 캐시와 읽기 캐시 제거"""
+    from utils.freight_rates import invalidate_rule
+    invalidate_rule(table, rule_id)
+    invalidate_table(table)
 
 # FSC 규칙 관리 함수
 def get_fsc_rules(search_query=None, status_filter=None):
@@ -373,6 +851,7 @@ def save_fsc_rule(rule_name, min_charge, brackets_json):
         response = client.table('fsc_rules').insert(data).execute()
         
         if response.data:
+            _invalidate_freight_rule('fsc_rules', response.data[0]['rule_id'])
             return True, response.data[0]['rule_id']
         return False, "저장 실패"
     except Exception as e:
@@ -394,6 +873,7 @@ def update_fsc_rule(rule_id, rule_name, min_charge, brackets_json):
         response = client.table('fsc_rules').update(data).eq('rule_id', rule_id).execute()
         
         if response.data:
+            _invalidate_freight_rule('fsc_rules', rule_id)
             return True, "수정 완료"
         return False, "수정 실패"
     except Exception as e:
@@ -407,60 +887,29 @@ def delete_fsc_rule(rule_id):
     
     try:
         response = client.table('fsc_rules').update({'is_active': False}).eq('rule_id', rule_id).execute()
+        _invalidate_freight_rule('fsc_rules', rule_id)
         return True if response.data else False
     except Exception as e:
         st.error(f"FSC 규칙 삭제 실패: {str(e)}")
         return False
 
 def calculate_fsc(rule_id, weight):
-    """FSC 금액 계산"""
-    rule = get_fsc_rule_by_id(rule_id)
-    
-    if not rule:
-        return None, "규칙을 찾을 수 없습니다"
-    
-    if not rule.get('is_active'):
-        return None, "비활성 규칙입니다"
-    
-    min_charge = float(rule['min_charge'])
-    brackets = rule['brackets']
+    """FSC 금액 계산 (컴파일된 구간표 사용)"""
+    from utils.freight_rates import price_fsc_batch
     
-    import json
-    brackets_dict = json.loads(brackets) if isinstance(brackets, str) else brackets
+    row = price_fsc_batch([(rule_id, weight)]).iloc[0]
     
-    applied_bracket = None
-    unit_price = 0
-    
-    for bracket_range, price in brackets_dict.items():
-        if '+' in bracket_range:
-            min_weight = int(bracket_range.replace('+', ''))
-            if weight >= min_weight:
-                applied_bracket = bracket_range
-                unit_price = float(price)
-                break
-        else:
-            parts = bracket_range.split('-')
-            min_weight = int(parts[0])
-            max_weight = int(parts[1])
-            if min_weight <= weight <= max_weight:
-                applied_bracket = bracket_range
-                unit_price = float(price)
-                break
-    
-    if applied_bracket is None:
-        return None, "적용 가능한 구간이 없습니다"
-    
-    calculated_fsc = weight * unit_price
-    final_fsc = max(calculated_fsc, min_charge)
+    if row['error']:
+        return None, row['error']
     
     return {
         'weight': weight,
-        'applied_bracket': applied_bracket,
-        'unit_price': unit_price,
-        'calculated_fsc': calculated_fsc,
-        'min_charge': min_charge,
-        'final_fsc': final_fsc,
-        'min_charge_applied': final_fsc == min_charge
+        'applied_bracket': row['applied_bracket'],
+        'unit_price': float(row['unit_price']),
+        'calculated_fsc': float(row['calculated_charge']),
+        'min_charge': float(row['min_charge']),
+        'final_fsc': float(row['final_charge']),
+        'min_charge_applied': bool(row['min_charge_applied'])
     }, None
 
 # Trucking 규칙 관리 함수
@@ -524,6 +973,7 @@ def save_trucking_rule(rule_name, charge_type, calculation_method, fixed_charge=
         response = client.table('trucking_rules').insert(data).execute()
         
         if response.data:
+            _invalidate_freight_rule('trucking_rules', response.data[0]['rule_id'])
             return True, response.data[0]['rule_id']
         return False, "저장 실패"
     except Exception as e:
@@ -547,6 +997,7 @@ def update_trucking_rule(rule_id, rule_name, charge_type, calculation_method, fi
         response = client.table('trucking_rules').update(data).eq('rule_id', rule_id).execute()
         
         if response.data:
+            _invalidate_freight_rule('trucking_rules', rule_id)
             return True, "수정 완료"
         return False, "수정 실패"
     except Exception as e:
@@ -560,73 +1011,45 @@ def delete_trucking_rule(rule_id):
     
     try:
         response = client.table('trucking_rules').update({'is_active': False}).eq('rule_id', rule_id).execute()
+        _invalidate_freight_rule('trucking_rules', rule_id)
         return True if response.data else False
     except Exception as e:
         st.error(f"Trucking 규칙 삭제 실패: {str(e)}")
         return False
 
 def calculate_trucking(rule_id, weight):
-    """Trucking 금액 계산"""
-    rule = get_trucking_rule_by_id(rule_id)
+    """Trucking 금액 계산 (컴파일된 구간표 사용)"""
+    from utils.freight_rates import METHOD_FIXED, price_trucking_batch
     
-    if not rule:
-        return None, "규칙을 찾을 수 없습니다"
+    row = price_trucking_batch([(rule_id, weight)]).iloc[0]
     
-    if not rule.get('is_active'):
-        return None, "비활성 규칙입니다"
+    if row['error']:
+        return None, row['error']
     
-    rule_name = rule['rule_name']
-    charge_type = rule['charge_type']
-    calculation_method = rule['calculation_method']
-    fixed_charge = rule.get('fixed_charge')
-    weight_brackets = rule.get('weight_brackets')
+    final_charge = float(row['calculated_charge'])
     
-    if calculation_method == 'FIXED':
+    if row['method'] == METHOD_FIXED:
         return {
-            'rule_name': rule_name,
-            'charge_type': charge_type,
+            'rule_name': row['rule_name'],
+            'charge_type': row['charge_type'],
             'calculation_method': '고정요금',
             'weight': weight,
-            'final_charge': fixed_charge,
-            'details': f'고정요금: ${fixed_charge:,.2f}'
+            'final_charge': final_charge,
+            'details': f'고정요금: ${final_charge:,.2f}'
         }, None
     
-    import json
-    brackets_dict = json.loads(weight_brackets) if isinstance(weight_brackets, str) else weight_brackets
-    
-    applied_bracket = None
-    unit_price = 0
-    
-    for bracket_range, price in brackets_dict.items():
-        if '+' in bracket_range:
-            min_weight = int(bracket_range.replace('+', ''))
-            if weight >= min_weight:
-                applied_bracket = bracket_range
-                unit_price = float(price)
-                break
-        else:
-            parts = bracket_range.split('-')
-            min_weight = int(parts[0])
-            max_weight = int(parts[1])
-            if min_weight <= weight <= max_weight:
-                applied_bracket = bracket_range
-                unit_price = float(price)
-                break
-    
-    if applied_bracket is None:
-        return None, "적용 가능한 구간이 없습니다"
-    
-    calculated_charge = weight * unit_price
+    unit_price = float(row['unit_price'])
     
     return {
-        'rule_name': rule_name,
-        'charge_type': charge_type,
+        'rule_name': row['rule_name'],
+        'charge_type': row['charge_type'],
         'calculation_method': '중량기반',
         'weight': weight,
-        'applied_bracket': applied_bracket,
+        'applied_bracket': row['applied_bracket'],
         'unit_price': unit_price,
-        'final_charge': calculated_charge,
-        'details': f'{applied_bracket}kg 구간: ${unit_price}/kg × {weight}kg'
+        'final_charge': final_charge,
+        'details': (f"{row['applied_bracket']}kg 구간: ${unit_price}/kg × {weight}kg"
+                    if row['applied_bracket'] else f'기준 중량 초과분 × ${unit_price}/kg')
     }, None
 
 # ============================================
@@ -644,56 +1067,111 @@ def test_connection() -> bool:
         logging.error(f"데이터베이스 연결 실패: {str(e)}")
         return False
 
-def create_database_operations(supabase_client):
+def create_database_operations(supabase_client, cache_ttls=None, cache_max_entries=None):
     """
     DatabaseOperations 인스턴스 생성 (main.py 호환용)
+    Args:
+        supabase_client: Supabase 클라이언트
+        cache_ttls: 테이블별 읽기 캐시 TTL(초) 덮어쓰기 (0이면 캐시 안 함)
+        cache_max_entries: 읽기 캐시 최대 항목 수
     """
     class SimpleDBOperations:
         def __init__(self, client):
             self.client = client
+            self.cache = TableReadCache()
+            if cache_ttls:
+                self.cache.table_ttls.update(cache_ttls)
+            if cache_max_entries:
+                self.cache.max_entries = cache_max_entries
         
         def load_data(self, table_name, columns="*", filters=None, *args, **kwargs):
             """
-            데이터 로드 (유연한 인자 처리)
+            데이터 로드 (유연한 인자 처리, 읽기 캐시 사용)
             Args:
                 table_name: 테이블 명
-                columns: 컬럼 선택 (호환성용, 무시됨)
+                columns: 컬럼 선택 (문자열, 리스트 또는 Projection)
                 filters: 필터 조건
+                limit, offset, order_by, desc, after_id, after_created_at, count:
+                    페이지네이션 인자 (load_data 참고)
+                use_cache: False이면 캐시를 건너뛰고 DB에서 직접 조회
             """
-            return load_data(table_name, columns, filters)
+            page_args = {k: kwargs[k] for k in PAGINATION_KEYS if kwargs.get(k) is not None}
+            
+            if not kwargs.get('use_cache', True):
+                return load_data(table_name, columns, filters, **page_args)
+            
+            key = make_cache_key(table_name, filters, build_select_clause(columns), page_args)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            
+            rows = load_data(table_name, columns, filters, **page_args)
+            # 빈 결과는 조회 오류일 수 있으므로 캐시하지 않음
+            if rows:
+                self.cache.put(key, rows)
+            return rows
+        
         def save_data(self, table_name, data, *args, **kwargs):
             """데이터 저장 (유연한 인자 처리)"""
-            return save_data(table_name, data)
+            try:
+                return save_data(table_name, data)
+            finally:
+                self.cache.invalidate(table_name)
         
         def update_data(self, table_name, *args, **kwargs):
             """
             데이터 수정 (유연한 인자 처리)
-            호출 패턴:
-            1. update_data(table_name, record_id, data) → data에 id 추가
+            호출 패턴 (resolve_update_args 참고):
+            1. update_data(table_name, record_id, data)
             2. update_data(table_name, data) where data contains 'id'
+            3. update_data(table_name, data, "id")
+            match={컬럼: 값}을 주면 조건부 수정 (update_data 참고)
             """
-            if len(args) == 2:
-                # 패턴 1: (record_id, data)
-                record_id, data = args
-                # data에 id 추가해서 전역 함수 호출
-                data_with_id = {**data, 'id': record_id}
-                return update_data(table_name, data_with_id)
-            elif len(args) == 1:
-                # 패턴 2: (data) where data contains 'id'
-                data = args[0]
-                if isinstance(data, dict) and 'id' in data:
-                    return update_data(table_name, data)
-                else:
-                    logging.error(f"update_data: data must contain 'id' field")
-                    return False
-            else:
-                logging.error(f"update_data: invalid arguments count: {len(args)}")
-                return False 
+            # 결과와 관계없이 해당 테이블 캐시 무효화
+            self.cache.invalidate(table_name)
+            
+            resolved = resolve_update_args(args)
+            if resolved is None:
+                logging.error(f"update_data: invalid arguments ({table_name}, {len(args)} args)")
+                return False
+            record_id, data = resolved
+            return update_data(table_name, {**data, 'id': record_id}, match=kwargs.get('match'))
 
 
+        def bulk_save_data(self, table_name, rows, upsert=False, on_conflict=None,
+                           chunk_size=None, row_labels=None):
+            """여러 행 일괄 insert/upsert (bulk_write 참고)"""
+            try:
+                return bulk_write(table_name, rows, upsert=upsert, on_conflict=on_conflict,
+                                  chunk_size=chunk_size, row_labels=row_labels)
+            finally:
+                self.cache.invalidate(table_name)
+        
+        def bulk_update(self, table_name, ids, patch, batch_size=BULK_UPDATE_BATCH):
+            """여러 행에 같은 변경 적용 → {id: 성공 여부} (bulk_update 참고)"""
+            try:
+                return bulk_update(table_name, ids, patch, batch_size=batch_size)
+            finally:
+                self.cache.invalidate(table_name)
+        
         def delete_data(self, table_name, record_id, *args, **kwargs):
             """데이터 삭제 (유연한 인자 처리)"""
-            return delete_data(table_name, record_id)
+            try:
+                return delete_data(table_name, record_id)
+            finally:
+                self.cache.invalidate(table_name)
+        
+        def invalidate_cache(self, table_name=None):
+            """읽기 캐시 무효화 (table_name 없으면 전체)"""
+            self.cache.invalidate(table_name)
+        
+        def get_cache_stats(self):
+            """읽기 캐시 히트/미스 통계"""
+            return self.cache.get_stats()
+        
+        def get_pool_metrics(self):
+            """공유 연결 풀 지표 (열린 커넥션, 재사용률, 대기 시간)"""
+            return get_pool_metrics()
     
     return SimpleDBOperations(supabase_client)
 
@@ -713,6 +1191,7 @@ def delete_quotation_items_by_quotation_id(table_name: str, quotation_id: int) -
     try:
         conn = get_connection()
         result = conn.table(table_name).delete().eq('quotation_id', quotation_id).execute()
+        invalidate_table(table_name)
         
         logging.info(f"견적 항목 삭제 성공: {table_name}, quotation_id={quotation_id}")
         return True
@@ -4,9 +4,19 @@ Logistics-related database functions
 """
 
 import streamlit as st
+import pandas as pd
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.database import get_supabase_client  # ✅ 정확한 경로
+from utils.freight_compare import compare_freight_options, invalidate_freight_catalog
+from utils.freight_rates import (
+    FSC_TABLE, NO_RULE, TRUCKING_TABLE, invalidate_rule, price_fsc_batch, price_trucking_batch
+)
+from utils.query_cache import invalidate_table
+from utils.logistics_stats import (
+    delivery_statistics, get_logistics_stats_service, period_days,
+    provider_delivery_stats, section_analysis, top_delay_causes
+)
 
 
 # ==========================================
@@ -68,8 +78,10 @@ def save_fsc_rule(rule_name, min_charge, brackets_json, is_active=True):
         }
         
         response = client.table('fsc_rules').insert(data).execute()
+        invalidate_table('fsc_rules')
         
         if response.data and len(response.data) > 0:
+            invalidate_rule(FSC_TABLE, response.data[0]['rule_id'])
             return response.data[0]['rule_id']
         return None
             
@@ -92,8 +104,10 @@ def update_fsc_rule(id, rule_name, min_charge, brackets_json, is_active):
         }
         
         response = client.table('fsc_rules').update(data).eq('rule_id', id).execute()
+        invalidate_table('fsc_rules')
         
         if response.data:
+            invalidate_rule(FSC_TABLE, id)
             return True
         return False
             
@@ -108,6 +122,8 @@ def delete_fsc_rule(id):
         client = get_supabase_client()
         
         response = client.table('fsc_rules').delete().eq('rule_id', id).execute()
+        invalidate_table('fsc_rules')
+        invalidate_rule(FSC_TABLE, id)
         
         if response.data:
             return True
@@ -118,37 +134,19 @@ def delete_fsc_rule(id):
         return False
 
 def calculate_fsc(id, weight):
-    """FSC 요금 계산"""
+    """FSC 요금 계산 (컴파일된 구간표 사용)"""
     try:
-        # FSC 규칙 조회
-        rule = get_fsc_rule_by_id(id)
+        row = price_fsc_batch([(id, weight)], active_only=False).iloc[0]
         
-        if not rule:
+        if row['error'] == NO_RULE:
             return None
-            
-        min_charge = float(rule.get('min_charge', 0))
-        brackets = rule.get('brackets', {})
-        
-        # 해당 무게 구간 찾기
-        calculated_charge = 0
-        for bracket_range, rate in brackets.items():
-            min_weight, max_weight = bracket_range.split('-')
-            min_weight = float(min_weight)
-            max_weight = float(max_weight) if max_weight != '+' else float('inf')
-            
-            if min_weight <= weight <= max_weight:
-                calculated_charge = weight * float(rate)
-                break
-        
-        # 최소 요금 적용
-        final_charge = max(calculated_charge, min_charge)
         
         return {
             'weight': weight,
-            'calculated_charge': calculated_charge,
-            'min_charge': min_charge,
-            'final_charge': final_charge,
-            'rule_name': rule.get('rule_name', '')
+            'calculated_charge': float(row['calculated_charge']),
+            'min_charge': float(row['min_charge']),
+            'final_charge': float(row['final_charge']),
+            'rule_name': row['rule_name'] or ''
         }
         
     except Exception as e:
@@ -223,8 +221,10 @@ def save_trucking_rule(rule_name, charge_type, calculation_method,
         }
         
         response = client.table('trucking_rules').insert(data).execute()
+        invalidate_table('trucking_rules')
         
         if response.data and len(response.data) > 0:
+            invalidate_rule(TRUCKING_TABLE, response.data[0]['rule_id'])
             return response.data[0]['rule_id']
         return None
             
@@ -252,8 +252,10 @@ def update_trucking_rule(id, rule_name, charge_type, calculation_method,
         }
         
         response = client.table('trucking_rules').update(data).eq('rule_id', id).execute()
+        invalidate_table('trucking_rules')
         
         if response.data:
+            invalidate_rule(TRUCKING_TABLE, id)
             return True
         return False
             
@@ -267,6 +269,8 @@ def delete_trucking_rule(id):
         client = get_supabase_client()
         
         response = client.table('trucking_rules').delete().eq('rule_id', id).execute()
+        invalidate_table('trucking_rules')
+        invalidate_rule(TRUCKING_TABLE, id)
         
         if response.data:
             return True
@@ -277,51 +281,19 @@ def delete_trucking_rule(id):
         return False
 
 def calculate_trucking(id, weight):
-    """Trucking 요금 계산"""
+    """Trucking 요금 계산 (컴파일된 구간표 사용)"""
     try:
-        # Trucking 규칙 조회
-        rule = get_trucking_rule_by_id(id)
+        row = price_trucking_batch([(id, weight)], active_only=False).iloc[0]
         
-        if not rule:
+        if row['error'] == NO_RULE:
             return None
-            
-        calculation_method = rule.get('calculation_method', '')
-        charge_type = rule.get('charge_type', '')
-        
-        calculated_charge = 0
-        
-        if calculation_method == 'FIXED':
-            # 고정 요금
-            calculated_charge = float(rule.get('fixed_charge', 0))
-            
-        elif calculation_method == 'weight_based':
-            # 무게 기반 계산
-            threshold = float(rule.get('weight_threshold_kg', 0))
-            rate_per_kg = float(rule.get('rate_per_kg_vnd', 0))
-            
-            if weight > threshold:
-                calculated_charge = (weight - threshold) * rate_per_kg
-            else:
-                calculated_charge = 0
-                
-        elif calculation_method == 'bracket':
-            # 구간별 계산
-            brackets = rule.get('weight_brackets', {})
-            for bracket_range, rate in brackets.items():
-                min_weight, max_weight = bracket_range.split('-')
-                min_weight = float(min_weight)
-                max_weight = float(max_weight) if max_weight != '+' else float('inf')
-                
-                if min_weight <= weight <= max_weight:
-                    calculated_charge = weight * float(rate)
-                    break
         
         return {
             'weight': weight,
-            'charge_type': charge_type,
-            'calculation_method': calculation_method,
-            'calculated_charge': calculated_charge,
-            'rule_name': rule.get('rule_name', '')
+            'charge_type': row['charge_type'] or '',
+            'calculation_method': row['calculation_method'] or '',
+            'calculated_charge': float(row['calculated_charge']),
+            'rule_name': row['rule_name'] or ''
         }
         
     except Exception as e:
@@ -385,6 +357,8 @@ def save_rate_table(data):
     try:
         client = get_supabase_client()
         response = client.table('logistics_rate_table').insert(data).execute()
+        invalidate_table('logistics_rate_table')
+        invalidate_freight_catalog()
         return True, response.data[0]['id'] if response.data else None
     except Exception as e:
         return False, str(e)
@@ -395,6 +369,8 @@ def update_rate_table(rate_id, data):
     try:
         client = get_supabase_client()
         response = client.table('logistics_rate_table').update(data).eq('id', rate_id).execute()
+        invalidate_table('logistics_rate_table')
+        invalidate_freight_catalog()
         return True, "수정 완료"
     except Exception as e:
         return False, str(e)
@@ -405,12 +381,27 @@ def delete_rate_table(rate_id):
     try:
         client = get_supabase_client()
         response = client.table('logistics_rate_table').update({'is_active': False}).eq('id', rate_id).execute()
+        invalidate_table('logistics_rate_table')
+        invalidate_freight_catalog()
         return True if response.data else False
     except Exception as e:
         st.error(f"요금표 삭제 오류: {str(e)}")
         return False
 
 
+def get_freight_options(shipments, sort_by='cost', limit=None):
+    """
+    화물별 운송 옵션 비교
+    shipments: [{'shipment_id', 'weight', 'provider', 'mode', 'route', 'ship_date'}] (weight 외 선택)
+    sort_by: 'cost'(총비용) 또는 'eta'(표준 소요일)
+    """
+    try:
+        return compare_freight_options(shipments, sort_by=sort_by, limit=limit)
+    except Exception as e:
+        st.error(f"운송 옵션 비교 오류: {str(e)}")
+        return pd.DataFrame()
+
+
 # ==========================================
 # Lead Time 관리 함수 (신규 추가)
 # ==========================================
@@ -521,6 +512,8 @@ def save_lead_time(data):
             'is_active': True
         }
         response = client.table('standard_lead_times').insert(insert_data).execute()
+        invalidate_table('standard_lead_times')
+        invalidate_freight_catalog()
         return True if response.data else False
     except Exception as e:
         st.error(f"리드타임 저장 오류: {str(e)}")
@@ -541,6 +534,8 @@ def update_lead_time(data):
             'description': data.get('description')
         }
         response = client.table('standard_lead_times').update(update_data).eq('id', data['id']).execute()
+        invalidate_table('standard_lead_times')
+        invalidate_freight_catalog()
         return True if response.data else False
     except Exception as e:
         st.error(f"리드타임 수정 오류: {str(e)}")
@@ -552,6 +547,8 @@ def delete_lead_time(lead_time_id):
     try:
         client = get_supabase_client()
         response = client.table('standard_lead_times').update({'is_active': False}).eq('id', lead_time_id).execute()
+        invalidate_table('standard_lead_times')
+        invalidate_freight_catalog()
         return True if response.data else False
     except Exception as e:
         st.error(f"리드타임 삭제 오류: {str(e)}")
@@ -636,6 +633,7 @@ def save_delay_reason(data):
             'is_active': True
         }
         response = client.table('delay_reasons_master').insert(insert_data).execute()
+        invalidate_table('delay_reasons_master')
         return True if response.data else False
     except Exception as e:
         st.error(f"지연 사유 저장 오류: {str(e)}")
@@ -654,6 +652,7 @@ def update_delay_reason(data):
             'prevention_note': data.get('prevention_note')
         }
         response = client.table('delay_reasons_master').update(update_data).eq('id', data['id']).execute()
+        invalidate_table('delay_reasons_master')
         return True if response.data else False
     except Exception as e:
         st.error(f"지연 사유 수정 오류: {str(e)}")
@@ -665,6 +664,7 @@ def delete_delay_reason(reason_id):
     try:
         client = get_supabase_client()
         response = client.table('delay_reasons_master').update({'is_active': False}).eq('id', reason_id).execute()
+        invalidate_table('delay_reasons_master')
         return True if response.data else False
     except Exception as e:
         st.error(f"지연 사유 삭제 오류: {str(e)}")
@@ -691,53 +691,10 @@ def get_all_providers():
 
 
 def get_delivery_statistics(period, provider_filter):
-    """납기 통계"""
+    """납기 통계 (기간별 공유 rollup에서 계산)"""
     try:
-        client = get_supabase_client()
-        
-        # 기간 계산
-        period_map = {
-            "이번 달": 30,
-            "최근 3개월": 90,
-            "최근 6개월": 180,
-            "올해": 365
-        }
-        days = period_map.get(period, 30)
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        query = client.table('logistics_imports').select('*').gte('shipping_date', cutoff_date)
-        
-        if provider_filter and provider_filter != "전체":
-            query = query.eq('logistics_provider_name', provider_filter)
-        
-        response = query.execute()
-        
-        if response.data:
-            total = len(response.data)
-            on_time = sum(1 for item in response.data if item.get('delay_severity') == 'on_time')
-            minor = sum(1 for item in response.data if item.get('delay_severity') == 'minor')
-            major = sum(1 for item in response.data if item.get('delay_severity') == 'major')
-            critical = sum(1 for item in response.data if item.get('delay_severity') == 'critical')
-            
-            delayed_items = [item for item in response.data if item.get('is_delayed')]
-            avg_delay = sum(item.get('lead_time_difference_days', 0) for item in delayed_items) / len(delayed_items) if delayed_items else 0
-            max_delay = max((item.get('lead_time_difference_days', 0) for item in response.data), default=0)
-            
-            return {
-                'total': total,
-                'on_time': on_time,
-                'minor': minor,
-                'major': major,
-                'critical': critical,
-                'avg_delay': avg_delay,
-                'max_delay': max_delay,
-                'rate_change': 0
-            }
-        
-        return {
-            'total': 0, 'on_time': 0, 'minor': 0, 'major': 0, 'critical': 0,
-            'avg_delay': 0, 'max_delay': 0, 'rate_change': 0
-        }
+        rollup = get_logistics_stats_service().rollup(period_days(period))
+        return delivery_statistics(rollup, provider_filter)
     except Exception as e:
         st.error(f"납기 통계 조회 오류: {str(e)}")
         return {
@@ -747,112 +704,20 @@ def get_delivery_statistics(period, provider_filter):
 
 
 def get_provider_delivery_stats(period):
-    """물류사별 통계"""
+    """물류사별 통계 (기간별 공유 rollup에서 계산)"""
     try:
-        client = get_supabase_client()
-        
-        period_map = {"이번 달": 30, "최근 3개월": 90, "최근 6개월": 180, "올해": 365}
-        days = period_map.get(period, 30)
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        response = client.table('logistics_imports').select('*').gte('shipping_date', cutoff_date).execute()
-        
-        if not response.data:
-            return []
-        
-        # 물류사별 그룹핑
-        provider_stats = {}
-        for item in response.data:
-            provider = item.get('logistics_provider_name')
-            if not provider:
-                continue
-            
-            if provider not in provider_stats:
-                provider_stats[provider] = {'total': 0, 'on_time': 0, 'delays': []}
-            
-            provider_stats[provider]['total'] += 1
-            if item.get('delay_severity') == 'on_time':
-                provider_stats[provider]['on_time'] += 1
-            if item.get('is_delayed'):
-                provider_stats[provider]['delays'].append(item.get('lead_time_difference_days', 0))
-        
-        # 결과 변환
-        result = []
-        for provider, stats in provider_stats.items():
-            on_time_rate = (stats['on_time'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            avg_delay = sum(stats['delays']) / len(stats['delays']) if stats['delays'] else 0
-            
-            if on_time_rate >= 80:
-                reliability = '⭐⭐⭐⭐'
-            elif on_time_rate >= 60:
-                reliability = '⭐⭐⭐'
-            else:
-                reliability = '⭐⭐'
-            
-            result.append({
-                'provider': provider,
-                'total': stats['total'],
-                'on_time_rate': round(on_time_rate, 1),
-                'avg_delay': round(avg_delay, 1),
-                'reliability': reliability
-            })
-        
-        return sorted(result, key=lambda x: x['on_time_rate'], reverse=True)
+        rollup = get_logistics_stats_service().rollup(period_days(period))
+        return provider_delivery_stats(rollup)
     except Exception as e:
         st.error(f"물류사별 통계 조회 오류: {str(e)}")
         return []
 
 
 def get_top_delay_causes(period, provider_filter):
-    """지연 원인 TOP 5"""
+    """지연 원인 TOP 5 (기간별 공유 rollup에서 계산)"""
     try:
-        client = get_supabase_client()
-        
-        period_map = {"이번 달": 30, "최근 3개월": 90, "최근 6개월": 180, "올해": 365}
-        days = period_map.get(period, 30)
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        query = client.table('logistics_imports').select('*').eq('is_delayed', True).gte('shipping_date', cutoff_date)
-        
-        if provider_filter and provider_filter != "전체":
-            query = query.eq('logistics_provider_name', provider_filter)
-        
-        response = query.execute()
-        
-        if not response.data:
-            return []
-        
-        # 지연 사유별 그룹핑
-        cause_stats = {}
-        for item in response.data:
-            reason = item.get('delay_reason_detail', '미분류')
-            responsible = item.get('delay_responsible_party', '미정')
-            
-            if reason not in cause_stats:
-                cause_stats[reason] = {'count': 0, 'delays': [], 'responsible': responsible}
-            
-            cause_stats[reason]['count'] += 1
-            cause_stats[reason]['delays'].append(item.get('lead_time_difference_days', 0))
-        
-        # 상위 5개 추출
-        result = []
-        responsible_map = {
-            'customs': '세관',
-            'logistics_provider': '물류사',
-            'supplier': '공급업체',
-            'force_majeure': '불가항력'
-        }
-        
-        for reason, stats in sorted(cause_stats.items(), key=lambda x: x[1]['count'], reverse=True)[:5]:
-            avg_delay = sum(stats['delays']) / len(stats['delays']) if stats['delays'] else 0
-            result.append({
-                'reason_name': reason,
-                'count': stats['count'],
-                'avg_delay': round(avg_delay, 1),
-                'responsible': responsible_map.get(stats['responsible'], stats['responsible'])
-            })
-        
-        return result
+        rollup = get_logistics_stats_service().rollup(period_days(period))
+        return top_delay_causes(rollup, provider_filter)
     except Exception as e:
         st.error(f"지연 원인 조회 오류: {str(e)}")
         return []
@@ -900,58 +765,10 @@ def get_delayed_logistics(severity_filter, provider_filter, date_range):
 
 
 def get_section_analysis(period):
-    """구간별 분석"""
+    """구간별 분석 (기간별 공유 rollup에서 계산)"""
     try:
-        client = get_supabase_client()
-        
-        period_map = {"최근 1개월": 30, "최근 3개월": 90, "최근 6개월": 180}
-        days = period_map.get(period, 30)
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        response = client.table('logistics_imports').select('*').gte('shipping_date', cutoff_date).execute()
-        
-        if not response.data:
-            return []
-        
-        # 구간별 데이터 수집
-        sections = {
-            '출고→항구': {'standard': 1.0, 'actuals': []},
-            '항구→도착': {'standard': 2.0, 'actuals': []},
-            '통관 처리': {'standard': 1.0, 'actuals': []}
-        }
-        
-        for item in response.data:
-            if item.get('shipping_to_port_days'):
-                sections['출고→항구']['actuals'].append(item['shipping_to_port_days'])
-            if item.get('port_to_arrival_days'):
-                sections['항구→도착']['actuals'].append(item['port_to_arrival_days'])
-            if item.get('customs_clearance_days'):
-                sections['통관 처리']['actuals'].append(item['customs_clearance_days'])
-        
-        # 결과 생성
-        result = []
-        for section, data in sections.items():
-            if data['actuals']:
-                actual = sum(data['actuals']) / len(data['actuals'])
-                standard = data['standard']
-                diff = actual - standard
-                
-                if diff <= 0.2:
-                    status = "✅ 정상"
-                elif diff <= 1:
-                    status = "⚠️ 주의"
-                else:
-                    status = "🔴 병목"
-                
-                result.append({
-                    'section': section,
-                    'standard': standard,
-                    'actual': round(actual, 1),
-                    'difference': round(diff, 1),
-                    'status': status
-                })
-        
-        return result
+        rollup = get_logistics_stats_service().rollup(period_days(period))
+        return section_analysis(rollup)
     except Exception as e:
         st.error(f"구간별 분석 오류: {str(e)}")
         return []
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+YMV ERP 시스템 환율 테이블
+Effective-dated exchange-rate table for YMV ERP System
+
+통화쌍별로 적용 시작일(effective_date)이 있는 환율 목록을 보관하고,
+거래일 기준으로 그날 유효한 환율을 찾아 변환한다.
+DB의 exchange_rates 테이블에 없는 통화쌍(테이블이 없거나 비어 있는 경우 포함)은
+DEFAULT_EXCHANGE_RATES의 기본 환율을 사용한다.
+
+DB 측 준비 (Supabase SQL Editor에서 1회 실행):
+
+    create table if not exists exchange_rates (
+        id             bigserial primary key,
+        base_currency  text not null,
+        quote_currency text not null,
+        rate           numeric not null,
+        effective_date date not null,
+        created_at     timestamptz not null default now(),
+        unique (base_currency, quote_currency, effective_date)
+    );
+
+rate는 1 base_currency = rate quote_currency 이다. (예: USD → VND 24000)
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+EXCHANGE_RATE_TABLE = 'exchange_rates'
+
+EXCHANGE_RATE_COLUMNS = "base_currency,quote_currency,rate,effective_date"
+
+# 환율 테이블에 해당 통화쌍이 없을 때 사용하는 기본 환율
+DEFAULT_EXCHANGE_RATES = [
+    {'base_currency': 'USD', 'quote_currency': 'VND', 'rate': 24000, 'effective_date': '2025-09-28'},
+]
+
+CurrencyPair = Tuple[str, str]
+
+
+def _to_day(value: Any) -> np.datetime64:
+    """날짜/일시/문자열 → datetime64[D] (해석 불가 시 NaT)"""
+    if value is None or value == '':
+        return np.datetime64('NaT', 'D')
+    if isinstance(value, (date, datetime)):
+        return np.datetime64(value.strftime('%Y-%m-%d'), 'D')
+    try:
+        return np.datetime64(str(value)[:10], 'D')
+    except ValueError:
+        return np.datetime64('NaT', 'D')
+
+
+class ExchangeRateTable:
+    """
+    적용일 기준 환율표
+    통화쌍마다 적용일 오름차순 배열을 두고 이진 탐색(searchsorted)으로 환율을 찾는다.
+    역방향 통화쌍은 역수로 자동 등록된다.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        pairs: Dict[CurrencyPair, Dict[np.datetime64, float]] = {}
+        for row in rows:
+            base = str(row.get('base_currency') or '').upper()
+            quote = str(row.get('quote_currency') or '').upper()
+            day = _to_day(row.get('effective_date'))
+            try:
+                rate = float(row.get('rate'))
+            except (TypeError, ValueError):
+                continue
+            if not base or not quote or base == quote or rate <= 0 or np.isnat(day):
+                continue
+            pairs.setdefault((base, quote), {})[day] = rate
+            # 직접 등록된 역방향 환율이 있으면 그 값을 우선
+            pairs.setdefault((quote, base), {}).setdefault(day, 1 / rate)
+
+        self._pairs: Dict[CurrencyPair, Tuple[np.ndarray, np.ndarray]] = {}
+        for pair, by_day in pairs.items():
+            days = np.array(sorted(by_day), dtype='datetime64[D]')
+            self._pairs[pair] = (days, np.array([by_day[d] for d in days], dtype=float))
+        self.version = tuple(sorted(
+            (pair, len(days), str(days[-1]), float(rates[-1]))
+            for pair, (days, rates) in self._pairs.items()
+        ))
+
+    def has_pair(self, base: str, quote: str) -> bool:
+        return base.upper() == quote.upper() or (base.upper(), quote.upper()) in self._pairs
+
+    def _series(self, base: str, quote: str) -> Tuple[np.ndarray, np.ndarray]:
+        key = (base.upper(), quote.upper())
+        if key not in self._pairs:
+            raise KeyError(f"환율 정보가 없습니다: {base} → {quote}")
+        return self._pairs[key]
+
+    def rate(self, base: str, quote: str, on: Any = None) -> float:
+        """on 날짜에 유효한 환율 (on이 없으면 최신 환율)"""
+        if base.upper() == quote.upper():
+            return 1.0
+        days, rates = self._series(base, quote)
+        day = _to_day(on) if on is not None else np.datetime64('NaT', 'D')
+        if np.isnat(day):
+            return float(rates[-1])
+        # 첫 적용일 이전 거래는 가장 오래된 환율 사용
+        idx = max(int(np.searchsorted(days, day, side='right')) - 1, 0)
+        return float(rates[idx])
+
+    def rates_for(self, base: str, quote: str, dates: pd.Series) -> np.ndarray:
+        """날짜 Series 전체에 대한 적용 환율 배열 (벡터 연산)"""
+        if base.upper() == quote.upper():
+            return np.ones(len(dates))
+        days, rates = self._series(base, quote)
+        values = pd.to_datetime(dates.astype(str).str[:10], format='%Y-%m-%d', errors='coerce')
+        lookup = values.to_numpy(dtype='datetime64[D]')
+        idx = np.searchsorted(days, lookup, side='right') - 1
+        idx = np.clip(idx, 0, len(rates) - 1)
+        result = rates[idx]
+        # 날짜가 없는 행은 최신 환율
+        result[np.isnat(lookup)] = rates[-1]
+        return result
+
+    def convert(self, amounts: pd.Series, base: str, quote: str,
+                dates: Optional[pd.Series] = None) -> pd.Series:
+        """금액 Series를 거래일 환율로 변환"""
+        if dates is None:
+            return amounts * self.rate(base, quote)
+        return amounts * self.rates_for(base, quote, dates)
+
+    def latest(self, base: str, quote: str) -> Tuple[float, Optional[str]]:
+        """(최신 환율, 적용일)"""
+        if base.upper() == quote.upper():
+            return 1.0, None
+        days, rates = self._series(base, quote)
+        return float(rates[-1]), str(days[-1])
+
+
+def load_exchange_rates(load_func: Optional[Callable] = None) -> ExchangeRateTable:
+    """
+    환율표 로드 (exchange_rates 테이블 + 테이블에 없는 통화쌍은 기본 환율)
+    """
+    rows = []
+    if load_func is not None:
+        try:
+            rows = load_func(EXCHANGE_RATE_TABLE, columns=EXCHANGE_RATE_COLUMNS) or []
+        except Exception as e:
+            logging.warning(f"환율 테이블 로드 실패, 기본 환율 사용: {str(e)}")
+            rows = []
+    table = ExchangeRateTable(rows)
+    missing = [row for row in DEFAULT_EXCHANGE_RATES
+               if not table.has_pair(row['base_currency'], row['quote_currency'])]
+    if missing:
+        pairs = ', '.join(f"{r['base_currency']}/{r['quote_currency']}" for r in missing)
+        logging.info(f"환율 테이블에 없는 통화쌍은 기본 환율 사용: {pairs}")
+    return ExchangeRateTable(list(rows) + missing) if missing else table
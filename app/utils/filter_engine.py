@@ -0,0 +1,386 @@
+"""
+YMV ERP 시스템 메모리 필터 엔진
+Compiled single-pass filtering and pre-sorted views for in-memory row lists
+
+화면에서 이미 받은 행 목록(옵션 목록/통계에도 쓰이는 전체 목록)을 다시 거를 때 사용한다.
+- 조건은 DB 조회와 같은 QueryFilter로 표현한다 (eq/neq/gt/gte/lt/lte/ilike/in/is/not.is, or/and 묶음).
+  같은 조건 객체를 load_data(filters=...)로 넘기면 DB에서, filter_rows()로 넘기면 메모리에서 처리된다.
+- compile_filter(): 조건을 한 번 판정 함수로 컴파일 (연산자 선택, LIKE 정규식, IN 집합, 비교 값 변환을
+  미리 처리)하고 행마다 함수 하나만 호출한다. 필터마다 리스트를 새로 만들던 다단계 필터링 대신 한 번만 순회한다.
+- RowSet: 정렬 순서별 정렬 결과를 기억한다. 정렬 옵션을 바꾸거나 필터만 바뀐 rerun에서는
+  정렬된 목록을 한 번 순회하며 거르기만 하므로 다시 정렬하지 않는다.
+- row_set(key, rows): 같은 내용의 목록이면 이전 RowSet(정렬 캐시 포함)을 재사용
+
+비교 규칙은 PostgREST와 같다: NULL과의 비교는 거짓, 필터 값은 컬럼 값 타입에 맞춰 변환,
+날짜/일시는 ISO 문자열로 비교, 정렬은 오름차순 NULL 마지막 / 내림차순 NULL 처음 + id 보조 정렬.
+
+예:
+    query = (QueryFilter()
+             .date_range('reimbursed_at', first_day, last_day)
+             .eq('expense_type', selected_type))
+    rows = row_set('reimbursement_completed', completed).select(query, 'amount', desc=True)
+
+"""
+
+import calendar
+import operator
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.query_builder import Condition, as_query_filter
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# 정렬 키에서 NULL을 다른 모든 값보다 크게 둔다 (오름차순 마지막 / 내림차순 처음)
+_NULL_RANK = 2
+
+# 재사용할 RowSet 최대 개수
+MAX_ROW_SETS = 32
+
+_COMPARATORS = {
+    'eq': operator.eq,
+    'neq': operator.ne,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+}
+
+
+# ============================================
+# 값 비교
+# ============================================
+
+def plain_value(value: Any) -> Any:
+    """날짜/일시는 ISO 문자열로 (DB에 문자열로 저장된 값과 비교)"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _coerce(left: Any, right: Any) -> Tuple[Any, Any]:
+    """PostgREST처럼 필터 값을 컬럼 값의 타입에 맞춤"""
+    left, right = plain_value(left), plain_value(right)
+    if isinstance(left, bool) or isinstance(right, bool):
+        return str(left).lower(), str(right).lower()
+    if isinstance(left, (int, float)) and isinstance(right, str):
+        try:
+            return left, float(right)
+        except ValueError:
+            return str(left), right
+    if isinstance(left, str) and isinstance(right, (int, float)):
+        try:
+            return float(left), right
+        except ValueError:
+            return left, str(right)
+    return left, right
+
+
+@lru_cache(maxsize=256)
+def like_regex(pattern: str) -> 're.Pattern':
+    """LIKE 패턴(%, _, 백슬래시 이스케이프) → 정규식"""
+    parts = []
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            parts.append(re.escape(ch))
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch == '%':
+            parts.append('.*')
+        elif ch == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(ch))
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def compare_values(left: Any, operator_name: str, right: Any) -> bool:
+    """값 하나 비교 (컴파일하지 않는 단건 평가용)"""
+    return _compile_condition(Condition('value', operator_name, right))({'value': left})
+
+
+# ============================================
+# 조건 컴파일
+# ============================================
+
+def _never(row: Dict[str, Any]) -> bool:
+    return False
+
+
+def _always(row: Dict[str, Any]) -> bool:
+    return True
+
+
+def _compile_comparison(column: str, operator_name: str, value: Any) -> Predicate:
+    compare = _COMPARATORS[operator_name]
+    right = plain_value(value)
+    if right is None:
+        return _never
+    right_type = type(right)
+
+    def predicate(row):
+        left = row.get(column)
+        if left is None:
+            return False
+        # 같은 타입(대부분 문자열끼리)이면 변환 없이 바로 비교
+        if type(left) is right_type:
+            return compare(left, right)
+        left_value, right_value = _coerce(left, right)
+        try:
+            return compare(left_value, right_value)
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def _compile_in(column: str, values: Sequence[Any]) -> Predicate:
+    values = [v for v in values if v is not None]
+    if not values:
+        return _never
+    members = [_compile_comparison(column, 'eq', v) for v in values]
+    # 문자열 값은 집합 조회로 (문자열 컬럼끼리는 변환 규칙이 필요 없음)
+    strings = frozenset(v for v in values if type(v) is str)
+    only_strings = len(strings) == len(values)
+
+    def predicate(row):
+        left = row.get(column)
+        if left is None:
+            return False
+        if type(left) is str and only_strings:
+            return left in strings
+        return any(member(row) for member in members)
+
+    return predicate
+
+
+def _compile_ilike(column: str, pattern: Any) -> Predicate:
+    if pattern is None:
+        return _never
+    match = like_regex(str(pattern)).fullmatch
+
+    def predicate(row):
+        left = row.get(column)
+        if left is None:
+            return False
+        return match(left if type(left) is str else str(plain_value(left))) is not None
+
+    return predicate
+
+
+def _compile_is(column: str, value: Any, negate: bool) -> Predicate:
+    if value is None:
+        if negate:
+            return lambda row: row.get(column) is not None
+        return lambda row: row.get(column) is None
+    expected = bool(value)
+
+    def predicate(row):
+        left = row.get(column)
+        return (isinstance(left, bool) and left == expected) != negate
+
+    return predicate
+
+
+def _all_of(predicates: List[Predicate]) -> Predicate:
+    if not predicates:
+        return _always
+    if len(predicates) == 1:
+        return predicates[0]
+    # 화면 필터는 대부분 2~4개 조건이므로 반복문 없이 펼쳐서 호출
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda row: first(row) and second(row)
+    if len(predicates) == 3:
+        first, second, third = predicates
+        return lambda row: first(row) and second(row) and third(row)
+    if len(predicates) == 4:
+        first, second, third, fourth = predicates
+        return lambda row: first(row) and second(row) and third(row) and fourth(row)
+
+    def predicate(row):
+        for check in predicates:
+            if not check(row):
+                return False
+        return True
+
+    return predicate
+
+
+def _any_of(predicates: List[Predicate]) -> Predicate:
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def predicate(row):
+        for check in predicates:
+            if check(row):
+                return True
+        return False
+
+    return predicate
+
+
+def _compile_condition(condition: Any) -> Predicate:
+    """Condition / or 묶음(tuple) / and 묶음 → 판정 함수"""
+    if isinstance(condition, tuple):
+        return _any_of([_compile_condition(c) for c in condition]) if condition else _never
+    operator_name = condition.operator
+    if operator_name == 'and':
+        return _all_of([_compile_condition(c) for c in condition.value])
+    if operator_name in _COMPARATORS:
+        return _compile_comparison(condition.column, operator_name, condition.value)
+    if operator_name == 'in':
+        return _compile_in(condition.column, tuple(condition.value or ()))
+    if operator_name == 'ilike':
+        return _compile_ilike(condition.column, condition.value)
+    if operator_name in ('is', 'not.is'):
+        return _compile_is(condition.column, condition.value, operator_name == 'not.is')
+    raise ValueError(f"지원하지 않는 연산자: {operator_name}")
+
+
+def compile_filter(filters: Any) -> Predicate:
+    """
+    필터(dict 또는 QueryFilter) → 행 판정 함수
+    모든 조건을 만족하면 True (조건이 없으면 항상 True)
+    """
+    query_filter = as_query_filter(filters)
+    if query_filter is None:
+        return _always
+    return _all_of([_compile_condition(condition) for condition in query_filter.conditions])
+
+
+# ============================================
+# 정렬
+# ============================================
+
+def _sort_value(value: Any) -> Tuple:
+    if value is None:
+        return (_NULL_RANK, '')
+    if isinstance(value, (bool, int, float)):
+        return (0, float(value))
+    return (1, str(plain_value(value)))
+
+
+def row_sort_key(order_by: str) -> Callable[[Dict[str, Any]], Tuple]:
+    """정렬 컬럼 + id 보조 정렬 키"""
+    if order_by == 'id':
+        return lambda row: _sort_value(row.get('id'))
+    return lambda row: (_sort_value(row.get(order_by)), _sort_value(row.get('id')))
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """해당 월의 첫날과 마지막 날 (QueryFilter.date_range 인자)"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+# ============================================
+# 행 집합
+# ============================================
+
+class RowSet:
+    """
+    행 목록 + 정렬 순서별 정렬 결과 캐시
+    행 dict는 복사하지 않으므로 호출 측에서 수정하지 않는다.
+    """
+
+    def __init__(self, rows: Sequence[Dict[str, Any]]):
+        self.rows = list(rows)
+        self._orders: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def ordered(self, order_by: Optional[str], desc: bool = False) -> List[Dict[str, Any]]:
+        """정렬된 행 목록 (정렬 순서별로 한 번만 정렬)"""
+        if not order_by:
+            return self.rows
+        key = (order_by, bool(desc))
+        rows = self._orders.get(key)
+        if rows is None:
+            rows = sorted(self.rows, key=row_sort_key(order_by), reverse=bool(desc))
+            with self._lock:
+                self._orders[key] = rows
+        return rows
+
+    def select(self, filters: Any = None, order_by: Optional[str] = None,
+               desc: Optional[bool] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        필터 + 정렬 (정렬된 목록을 한 번 순회하며 거름)
+        order_by를 주지 않으면 QueryFilter.order() 값을 사용
+        """
+        query_filter = as_query_filter(filters)
+        if order_by is None and query_filter is not None and query_filter.order_by:
+            order_by = query_filter.order_by
+            if desc is None:
+                desc = query_filter.desc
+        predicate = compile_filter(query_filter)
+        source = self.ordered(order_by, bool(desc))
+        if predicate is _always:
+            return list(source[:limit] if limit is not None else source)
+        if limit is None:
+            return [row for row in source if predicate(row)]
+        result = []
+        for row in source:
+            if predicate(row):
+                result.append(row)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def count(self, filters: Any = None) -> int:
+        """조건을 만족하는 행 수"""
+        predicate = compile_filter(filters)
+        return sum(1 for row in self.rows if predicate(row))
+
+
+def _signature(rows: Sequence[Dict[str, Any]]) -> Tuple[int, int]:
+    """목록 내용 식별값 (행 수 + id/수정시각 해시)"""
+    return len(rows), hash(tuple((row.get('id'), row.get('updated_at')) for row in rows))
+
+
+_row_sets: 'OrderedDict[Any, Tuple[Tuple[int, int], RowSet]]' = OrderedDict()
+_row_sets_lock = threading.Lock()
+
+
+def row_set(key: Any, rows: Sequence[Dict[str, Any]]) -> RowSet:
+    """
+    키별 RowSet 재사용
+    목록 내용(id, updated_at)이 같으면 이전 RowSet과 정렬 캐시를 그대로 돌려준다.
+    """
+    signature = _signature(rows)
+    with _row_sets_lock:
+        cached = _row_sets.get(key)
+        if cached is not None and cached[0] == signature:
+            _row_sets.move_to_end(key)
+            return cached[1]
+    rows_set = RowSet(rows)
+    with _row_sets_lock:
+        _row_sets[key] = (signature, rows_set)
+        _row_sets.move_to_end(key)
+        while len(_row_sets) > MAX_ROW_SETS:
+            _row_sets.popitem(last=False)
+    return rows_set
+
+
+def filter_rows(rows: Sequence[Dict[str, Any]], filters: Any = None,
+                order_by: Optional[str] = None, desc: Optional[bool] = None,
+                limit: Optional[int] = None, key: Any = None) -> List[Dict[str, Any]]:
+    """
+    행 목록 필터 + 정렬
+    key를 주면 같은 목록에 대한 정렬 결과를 rerun 사이에 재사용
+    """
+    rows_set = row_set(key, rows) if key is not None else RowSet(rows)
+    return rows_set.select(filters, order_by, desc, limit)
+
+
+def clear_row_sets():
+    """재사용 중인 RowSet 비우기"""
+    with _row_sets_lock:
+        _row_sets.clear()
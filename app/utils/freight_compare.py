@@ -0,0 +1,332 @@
+"""
+YMV ERP 시스템 운송 옵션 비교 엔진
+Batch freight comparison across rate tables, lead times, FSC and trucking rules
+
+"이 화물을 보낼 수 있는 물류사/운송수단 조합별 총비용과 도착 예정일"을
+여러 화물에 대해 한 번에 계산한다.
+
+- 활성 요금표(logistics_rate_table), 표준 리드타임(standard_lead_times),
+  운송수단(transport_modes)을 한 번 읽어 물류사/운송수단/구간별 위치 인덱스로 보관
+- 같은 물류사·운송수단·구간의 요금표가 여러 건이면 적용일이 지난 최신 요금표 사용
+- 화물 × 후보 옵션을 한 프레임으로 펼친 뒤 운임/FSC/Trucking을 열 단위로 계산
+  (FSC/Trucking은 utils.freight_rates 일괄 계산, DB 왕복 없음)
+- 카탈로그는 짧은 TTL로 공유하며 요금표/리드타임 변경 시 invalidate
+
+총비용 = 중량 × freight_rate_per_kg + D/O + Handling + 통관 비용 3종
+        + FSC + Trucking(LC) + Trucking(OC)
+금액은 요금표 통화(USD) 기준 단순 합계이다.
+"""
+
+import logging
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.freight_rates import (
+    FSC_TABLE, TRUCKING_TABLE, FreightRateEngine, get_freight_rate_engine
+)
+
+RATE_TABLE = 'logistics_rate_table'
+LEAD_TIME_TABLE = 'standard_lead_times'
+TRANSPORT_MODE_TABLE = 'transport_modes'
+
+RATE_COLUMNS = (
+    "id,provider_name,transport_mode_id,route,effective_date,freight_rate_per_kg,"
+    "delivery_order_usd,handling_usd,customs_clearance_usd,customs_transited_usd,customs_charge_usd,"
+    "fsc_rule_id,trucking_lc_rule_id,trucking_oc_rule_id"
+)
+LEAD_TIME_COLUMNS = "provider_name,transport_mode_id,route,standard_days,min_days,max_days"
+TRANSPORT_MODE_COLUMNS = "id,code,name"
+
+# 요금표의 고정 비용 컬럼
+FIXED_CHARGE_COLUMNS = [
+    'delivery_order_usd', 'handling_usd', 'customs_clearance_usd',
+    'customs_transited_usd', 'customs_charge_usd',
+]
+
+# 화면 표시명 → 운송수단 코드 (get_lead_times 필터와 동일)
+MODE_NAME_CODES = {"항공": "AIR", "육로": "TRUCK", "해상": "SEA"}
+
+# 정렬 기준
+SORT_KEYS = {
+    'cost': ['total_cost', 'standard_days'],
+    'eta': ['standard_days', 'total_cost'],
+}
+
+CATALOG_TTL_SECONDS = 300
+
+_EMPTY = np.array([], dtype=int)
+
+
+def _key(value: Any) -> Optional[str]:
+    """필터/인덱스 키 정규화 (빈 값/'전체'는 필터 없음)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # 결측값이 섞인 정수 컬럼(3.0)도 같은 키로
+        value = int(value)
+    text = str(value).strip().upper()
+    return text if text and text != '전체' else None
+
+
+def _number(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values, errors='coerce')
+
+
+def _column(df: pd.DataFrame, column: str) -> pd.Series:
+    if column in df.columns:
+        return df[column]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _position_index(keys: pd.Series) -> Dict[Any, np.ndarray]:
+    """키 → 옵션 위치 배열"""
+    return {key: positions for key, positions in keys.groupby(keys, sort=False).indices.items()}
+
+
+class FreightCatalog:
+    """
+    비교용 옵션표 + 인덱스
+    options: 물류사·운송수단·구간별 최신 활성 요금표 1행 (리드타임 결합)
+    by_provider / by_mode / by_route: 키 → options 위치 배열
+    """
+
+    def __init__(self, rates: List[Dict[str, Any]], lead_times: List[Dict[str, Any]],
+                 modes: List[Dict[str, Any]], today: Optional[date] = None):
+        today = (today or date.today()).isoformat()
+        self.loaded_at = time.monotonic()
+
+        # 운송수단 id / 코드 / 표시명 → id
+        self.mode_codes = {m['id']: str(m.get('code') or '').upper() for m in modes}
+        self._mode_ids: Dict[str, Any] = {}
+        for mode in modes:
+            for alias in (mode['id'], mode.get('code'), mode.get('name')):
+                if _key(alias):
+                    self._mode_ids[_key(alias)] = mode['id']
+        for name, code in MODE_NAME_CODES.items():
+            if code in self._mode_ids:
+                self._mode_ids[name] = self._mode_ids[code]
+
+        frame = pd.DataFrame(rates or [])
+        if not frame.empty:
+            frame['effective_date'] = _column(frame, 'effective_date').fillna('').astype(str).str[:10]
+            frame = frame[frame['effective_date'] <= today]
+        if frame.empty:
+            self.options = pd.DataFrame(columns=[
+                'rate_id', 'provider', 'provider_key', 'mode_id', 'mode_code', 'route', 'route_key',
+                'effective_date', 'freight_rate_per_kg', 'fixed_charges',
+                'fsc_rule_id', 'lc_rule_id', 'oc_rule_id', 'standard_days', 'min_days', 'max_days'])
+        else:
+            frame['provider_key'] = _column(frame, 'provider_name').map(_key)
+            frame['route_key'] = _column(frame, 'route').map(_key)
+            # 같은 조합은 적용일이 가장 최근인 요금표만
+            frame = frame.sort_values('effective_date', kind='stable')\
+                .drop_duplicates(['provider_key', 'transport_mode_id', 'route_key'], keep='last')
+            self.options = pd.DataFrame({
+                'rate_id': frame['id'].astype(object),
+                'provider': frame['provider_name'],
+                'provider_key': frame['provider_key'],
+                'mode_id': frame['transport_mode_id'].astype(object),
+                'mode_code': frame['transport_mode_id'].map(self.mode_codes),
+                'route': _column(frame, 'route'),
+                'route_key': frame['route_key'],
+                'effective_date': frame['effective_date'],
+                'freight_rate_per_kg': _number(_column(frame, 'freight_rate_per_kg')).fillna(0.0),
+                'fixed_charges': sum(_number(_column(frame, c)).fillna(0.0) for c in FIXED_CHARGE_COLUMNS),
+                'fsc_rule_id': _column(frame, 'fsc_rule_id').astype(object),
+                'lc_rule_id': _column(frame, 'trucking_lc_rule_id').astype(object),
+                'oc_rule_id': _column(frame, 'trucking_oc_rule_id').astype(object),
+            }).reset_index(drop=True)
+            self._attach_lead_times(lead_times)
+
+        self.by_provider = _position_index(self.options['provider_key'])
+        self.by_mode = _position_index(self.options['mode_id'])
+        self.by_route = _position_index(self.options['route_key'])
+        self._all = np.arange(len(self.options))
+
+    def _attach_lead_times(self, lead_times: List[Dict[str, Any]]):
+        """(물류사, 운송수단, 구간) 리드타임 → 없으면 (물류사, 운송수단) 최단 표준일"""
+        exact: Dict[Tuple, Tuple] = {}
+        fallback: Dict[Tuple, Tuple] = {}
+        for item in lead_times or []:
+            days = (item.get('standard_days'), item.get('min_days'), item.get('max_days'))
+            pair = (_key(item.get('provider_name')), item.get('transport_mode_id'))
+            exact[pair + (_key(item.get('route')),)] = days
+            if days[0] is not None and (pair not in fallback or days[0] < fallback[pair][0]):
+                fallback[pair] = days
+        missing = (None, None, None)
+        days = [
+            exact.get((p, m, r)) or fallback.get((p, m), missing)
+            for p, m, r in zip(self.options['provider_key'], self.options['mode_id'], self.options['route_key'])
+        ]
+        for position, column in enumerate(('standard_days', 'min_days', 'max_days')):
+            self.options[column] = _number(pd.Series([d[position] for d in days], dtype=object))
+
+    def mode_id(self, mode: Any) -> Any:
+        """운송수단 id / 코드('AIR') / 표시명('항공') → id (모르는 값은 그대로)"""
+        key = _key(mode)
+        return self._mode_ids.get(key, mode) if key else None
+
+    def candidates(self, provider: Any = None, mode: Any = None, route: Any = None) -> np.ndarray:
+        """필터 조건에 맞는 옵션 위치 (조건이 없으면 전체)"""
+        positions = self._all
+        for index, key in ((self.by_provider, _key(provider)),
+                           (self.by_mode, self.mode_id(mode)),
+                           (self.by_route, _key(route))):
+            if key is not None:
+                positions = np.intersect1d(positions, index.get(key, _EMPTY), assume_unique=True)
+        return positions
+
+
+def _shipments_frame(shipments: Any) -> pd.DataFrame:
+    """화물 목록 → shipment_id, weight, provider, mode, route, ship_date 프레임"""
+    frame = shipments.reset_index(drop=True).copy() if isinstance(shipments, pd.DataFrame) \
+        else pd.DataFrame(list(shipments or []))
+    out = pd.DataFrame(index=frame.index)
+    out['shipment_id'] = _column(frame, 'shipment_id').where(
+        _column(frame, 'shipment_id').notna(), pd.Series(frame.index, dtype=object))
+    out['weight'] = _number(_column(frame, 'weight'))
+    for column in ('provider', 'mode', 'route'):
+        out[column] = _column(frame, column)
+    out['ship_date'] = pd.to_datetime(_column(frame, 'ship_date'), errors='coerce')\
+        .fillna(pd.Timestamp(date.today()))
+    invalid = out['weight'].isna() | (out['weight'] < 0)
+    if invalid.any():
+        logging.warning(f"중량이 없는 화물 {int(invalid.sum())}건은 비교에서 제외")
+    return out[~invalid]
+
+
+def _rule_charges(price_func: Callable, rule_ids: pd.Series, weights: np.ndarray,
+                  column: str) -> Tuple[np.ndarray, np.ndarray]:
+    """규칙이 지정된 행만 일괄 계산 → (금액 배열, 오류 배열)"""
+    charges = np.zeros(len(weights))
+    errors = np.full(len(weights), None, dtype=object)
+    mask = rule_ids.notna().to_numpy()
+    if mask.any():
+        priced = price_func(list(zip(rule_ids[mask].tolist(), weights[mask].tolist())))
+        charges[mask] = priced[column].to_numpy(dtype=float)
+        errors[mask] = priced['error'].to_numpy(dtype=object)
+    return charges, errors
+
+
+def score_shipments(catalog: FreightCatalog, shipments: Any,
+                    rate_engine: Optional[FreightRateEngine] = None,
+                    sort_by: str = 'cost', limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    화물별 후보 옵션 비용/도착 예정일 계산 후 순위 부여
+    shipments 항목: weight(필수), shipment_id, provider, mode, route, ship_date
+    Returns: 화물 입력 순서 → 순위 순서로 정렬된 옵션 프레임 (rank는 1부터)
+    """
+    engine = rate_engine or get_freight_rate_engine()
+    ships = _shipments_frame(shipments)
+
+    # 같은 필터 조합은 한 번만 인덱스 조회
+    lookups: Dict[Tuple, np.ndarray] = {}
+    picks = []
+    for filters in zip(ships['provider'].map(_key), ships['mode'].map(_key), ships['route'].map(_key)):
+        if filters not in lookups:
+            lookups[filters] = catalog.candidates(*filters)
+        picks.append(lookups[filters])
+    counts = np.array([len(p) for p in picks], dtype=int)
+    if not counts.sum():
+        return pd.DataFrame(columns=['shipment_id', 'rank', 'provider', 'mode_code', 'route', 'total_cost', 'eta'])
+
+    ship_pos = np.repeat(np.arange(len(ships)), counts)
+    rows = catalog.options.iloc[np.concatenate(picks)].reset_index(drop=True)
+    shipment_part = ships.iloc[ship_pos].reset_index(drop=True)
+    rows.insert(0, 'shipment_pos', ship_pos)
+    rows.insert(1, 'shipment_id', shipment_part['shipment_id'])
+    rows['weight'] = shipment_part['weight']
+
+    weights = rows['weight'].to_numpy(dtype=float)
+    rows['freight_charge'] = weights * rows['freight_rate_per_kg'].to_numpy(dtype=float)
+    rows['fsc_charge'], fsc_errors = _rule_charges(engine.price_fsc_batch, rows['fsc_rule_id'], weights, 'final_charge')
+    rows['trucking_lc'], lc_errors = _rule_charges(engine.price_trucking_batch, rows['lc_rule_id'], weights, 'calculated_charge')
+    rows['trucking_oc'], oc_errors = _rule_charges(engine.price_trucking_batch, rows['oc_rule_id'], weights, 'calculated_charge')
+    rows['total_cost'] = rows['freight_charge'] + rows['fixed_charges'] + rows['fsc_charge'] + \
+        rows['trucking_lc'] + rows['trucking_oc']
+
+    notes = pd.Series('', index=rows.index, dtype=object)
+    for label, errors in (('FSC', fsc_errors), ('LC', lc_errors), ('OC', oc_errors)):
+        flagged = pd.Series(errors, index=rows.index).notna()
+        notes[flagged] = notes[flagged] + f'{label}: ' + pd.Series(errors, index=rows.index)[flagged] + ' '
+    rows['notes'] = notes.str.strip()
+
+    ship_dates = shipment_part['ship_date']
+    for column, days in (('eta', 'standard_days'), ('eta_min', 'min_days'), ('eta_max', 'max_days')):
+        rows[column] = ship_dates + pd.to_timedelta(rows[days], unit='D')
+
+    keys = SORT_KEYS.get(sort_by, SORT_KEYS['cost'])
+    rows = rows.sort_values(['shipment_pos'] + keys + ['provider_key'], kind='stable', na_position='last')
+    rows['rank'] = rows.groupby('shipment_pos').cumcount() + 1
+    if limit:
+        rows = rows[rows['rank'] <= limit]
+    return rows.drop(columns=['provider_key', 'route_key']).reset_index(drop=True)
+
+
+def _fetch_catalog_rows() -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """요금표/리드타임/운송수단 활성 행 조회 (필요 컬럼만)"""
+    from utils.connection_pool import get_shared_client
+    client = get_shared_client()
+    rates = client.table(RATE_TABLE).select(RATE_COLUMNS).eq('is_active', True).execute().data or []
+    lead_times = client.table(LEAD_TIME_TABLE).select(LEAD_TIME_COLUMNS).eq('is_active', True).execute().data or []
+    modes = client.table(TRANSPORT_MODE_TABLE).select(TRANSPORT_MODE_COLUMNS).execute().data or []
+    return rates, lead_times, modes
+
+
+class FreightComparisonService:
+    """카탈로그 공유 (TTL) + 일괄 비교"""
+
+    def __init__(self, fetch_func: Optional[Callable[[], Tuple]] = None,
+                 rate_engine: Optional[FreightRateEngine] = None,
+                 ttl: float = CATALOG_TTL_SECONDS):
+        self._fetch = fetch_func or _fetch_catalog_rows
+        self._rate_engine = rate_engine
+        self.ttl = ttl
+        self._catalog: Optional[FreightCatalog] = None
+        self._lock = threading.Lock()
+
+    @property
+    def rate_engine(self) -> FreightRateEngine:
+        return self._rate_engine or get_freight_rate_engine()
+
+    def catalog(self) -> FreightCatalog:
+        with self._lock:
+            catalog = self._catalog
+        if catalog is not None and time.monotonic() - catalog.loaded_at < self.ttl:
+            return catalog
+        catalog = FreightCatalog(*self._fetch())
+        # 요금표가 참조하는 FSC/Trucking 규칙도 미리 컴파일
+        self.rate_engine.preload(FSC_TABLE)
+        self.rate_engine.preload(TRUCKING_TABLE)
+        with self._lock:
+            self._catalog = catalog
+        return catalog
+
+    def invalidate(self):
+        with self._lock:
+            self._catalog = None
+
+    def compare(self, shipments: Any, sort_by: str = 'cost', limit: Optional[int] = None) -> pd.DataFrame:
+        return score_shipments(self.catalog(), shipments, self.rate_engine, sort_by, limit)
+
+
+_service = FreightComparisonService()
+
+
+def get_freight_comparison_service() -> FreightComparisonService:
+    return _service
+
+
+def compare_freight_options(shipments: Any, sort_by: str = 'cost', limit: Optional[int] = None) -> pd.DataFrame:
+    """공유 카탈로그로 화물별 운송 옵션 비교"""
+    return _service.compare(shipments, sort_by, limit)
+
+
+def invalidate_freight_catalog():
+    """요금표/리드타임 저장·수정·삭제 후 호출"""
+    _service.invalidate()
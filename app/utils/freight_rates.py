@@ -0,0 +1,340 @@
+"""
+YMV ERP 시스템 FSC/Trucking 요금 엔진
+Compiled bracket tables and batch pricing for fsc_rules / trucking_rules
+
+규칙마다 매 계산 시 DB 조회 + json.loads + 구간 문자열 파싱을 하던 방식 대신,
+규칙을 한 번 조회해 구간 상한/하한/단가 numpy 배열로 컴파일해 두고
+searchsorted(이진 탐색)로 구간을 찾는다.
+
+- 컴파일된 규칙은 프로세스 단위로 캐시하며 규칙 저장/수정/삭제 시 invalidate로 제거
+- 캐시에 없는 규칙은 한 번의 in_ 조회로 모아서 로드 (견적 행마다 DB 왕복하지 않음)
+- price_fsc_batch / price_trucking_batch: (rule_id, 중량) 쌍 수천 건을 한 번에 계산
+
+구간 표기: "0-45", "45-100", "300+", "300-+" (상한 포함, 앞 구간 우선)
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FSC_TABLE = 'fsc_rules'
+TRUCKING_TABLE = 'trucking_rules'
+
+NO_RULE = "규칙을 찾을 수 없습니다"
+INACTIVE_RULE = "비활성 규칙입니다"
+NO_BRACKET = "적용 가능한 구간이 없습니다"
+
+# 요금 계산 방식 (trucking_rules.calculation_method → 내부 구분)
+METHOD_FIXED = 'fixed'
+METHOD_THRESHOLD = 'threshold'
+METHOD_BRACKET = 'bracket'
+
+RuleId = Any
+
+
+def _rule_key(value: Any) -> RuleId:
+    """rule_id 정규화 (문자열로 넘어온 숫자 ID도 같은 키로)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _to_float(value: Any, default: float = 0.0) -> float:
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if np.isnan(result) else result
+
+
+def parse_bracket(label: Any) -> Tuple[float, float]:
+    """
+    구간 문자열 → (하한, 상한)
+    "0-45" → (0, 45), "300+" / "300-+" / "300-" → (300, inf)
+    """
+    text = str(label).strip().replace(' ', '')
+    if text.endswith('+'):
+        return float(text[:-1].rstrip('-')), float('inf')
+    low, _, high = text.partition('-')
+    return float(low), float(high) if high else float('inf')
+
+
+def _object_column(values: np.ndarray) -> pd.Series:
+    """문자열/None 혼합 컬럼 (pandas 3의 문자열 dtype 추론으로 None이 NaN이 되지 않도록 object 유지)"""
+    return pd.Series(values, dtype=object)
+
+
+def _load_brackets(value: Any) -> Dict[str, Any]:
+    if isinstance(value, str):
+        value = json.loads(value) if value.strip() else {}
+    return value or {}
+
+
+class BracketTable:
+    """
+    중량 구간표
+    상한 오름차순 배열에서 searchsorted(side='left')로 중량 이상인 첫 상한을 찾고,
+    그 구간 하한 이하이면 적용한다. (경계값 45는 "0-45" 구간)
+    """
+
+    def __init__(self, brackets: Any):
+        parsed = []
+        for label, rate in _load_brackets(brackets).items():
+            try:
+                low, high = parse_bracket(label)
+                parsed.append((high, low, float(rate), str(label)))
+            except (TypeError, ValueError):
+                logging.warning(f"잘못된 중량 구간 무시: {label}={rate}")
+        parsed.sort(key=lambda item: (item[0], item[1]))
+        self.highs = np.array([p[0] for p in parsed], dtype=float)
+        self.lows = np.array([p[1] for p in parsed], dtype=float)
+        self.rates = np.array([p[2] for p in parsed], dtype=float)
+        self.labels = np.array([p[3] for p in parsed] + [None], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+    def lookup(self, weights: np.ndarray) -> np.ndarray:
+        """중량 배열 → 구간 위치 배열 (없으면 -1)"""
+        if not len(self):
+            return np.full(len(weights), -1)
+        idx = np.searchsorted(self.highs, weights, side='left')
+        inside = idx < len(self)
+        idx = np.where(inside, idx, 0)
+        inside &= self.lows[idx] <= weights
+        return np.where(inside, idx, -1)
+
+    def price(self, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(구간 위치, 단가, 중량 × 단가) — 구간이 없으면 단가/금액 0"""
+        idx = self.lookup(weights)
+        matched = idx >= 0
+        unit = np.where(matched, self.rates[np.maximum(idx, 0)] if len(self) else 0.0, 0.0)
+        return idx, unit, np.where(matched, weights * unit, 0.0)
+
+
+class CompiledFscRule:
+    """fsc_rules 한 건의 컴파일 결과"""
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.rule_id = _rule_key(rule.get('rule_id'))
+        self.rule_name = rule.get('rule_name', '')
+        self.is_active = bool(rule.get('is_active'))
+        self.min_charge = _to_float(rule.get('min_charge'))
+        self.table = BracketTable(rule.get('brackets'))
+
+
+class CompiledTruckingRule:
+    """
+    trucking_rules 한 건의 컴파일 결과
+    - FIXED: 고정요금
+    - 구간표가 없고 rate_per_kg_vnd가 있으면 기준 중량 초과분 × kg당 요금
+    - 그 외(WEIGHT_BASED / bracket): 중량 구간 단가
+    """
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.rule_id = _rule_key(rule.get('rule_id'))
+        self.rule_name = rule.get('rule_name', '')
+        self.charge_type = rule.get('charge_type', '')
+        self.calculation_method = rule.get('calculation_method', '')
+        self.is_active = bool(rule.get('is_active'))
+        self.fixed_charge = _to_float(rule.get('fixed_charge'))
+        self.threshold = _to_float(rule.get('weight_threshold_kg'))
+        self.rate_per_kg = _to_float(rule.get('rate_per_kg_vnd'))
+        self.table = BracketTable(rule.get('weight_brackets'))
+
+        if str(self.calculation_method).upper() == 'FIXED':
+            self.method = METHOD_FIXED
+        elif not len(self.table) and rule.get('rate_per_kg_vnd') is not None:
+            self.method = METHOD_THRESHOLD
+        else:
+            self.method = METHOD_BRACKET
+
+
+def _fetch_rules(table: str, rule_ids: Optional[List[RuleId]] = None) -> List[Dict[str, Any]]:
+    """규칙 조회 (rule_ids가 없으면 활성 규칙 전체)"""
+    from utils.connection_pool import get_shared_client
+    query = get_shared_client().table(table).select('*')
+    if rule_ids is None:
+        query = query.eq('is_active', True)
+    else:
+        query = query.in_('rule_id', list(rule_ids))
+    return query.execute().data or []
+
+
+class FreightRateEngine:
+    """컴파일된 FSC/Trucking 규칙 캐시 + 일괄 계산"""
+
+    _COMPILERS = {FSC_TABLE: CompiledFscRule, TRUCKING_TABLE: CompiledTruckingRule}
+
+    def __init__(self, fetch_func: Optional[Callable[..., List[Dict[str, Any]]]] = None):
+        self._fetch = fetch_func or _fetch_rules
+        # 조회했지만 없는 규칙은 None으로 기록해 반복 조회하지 않음
+        self._rules: Dict[str, Dict[RuleId, Any]] = {table: {} for table in self._COMPILERS}
+        self._lock = threading.Lock()
+
+    def _compile(self, table: str, rows: List[Dict[str, Any]]) -> Dict[RuleId, Any]:
+        compiled = {}
+        for row in rows:
+            try:
+                rule = self._COMPILERS[table](row)
+            except (TypeError, ValueError) as e:
+                logging.warning(f"{table} 규칙 컴파일 실패 ({row.get('rule_id')}): {str(e)}")
+                continue
+            compiled[rule.rule_id] = rule
+        return compiled
+
+    def rules(self, table: str, rule_ids: Iterable[Any]) -> Dict[RuleId, Any]:
+        """rule_id → 컴파일 규칙 (캐시에 없는 규칙은 한 번의 조회로 로드)"""
+        keys = {_rule_key(rule_id) for rule_id in rule_ids}
+        with self._lock:
+            cache = self._rules[table]
+            missing = [key for key in keys if key not in cache]
+        if missing:
+            compiled = self._compile(table, self._fetch(table, missing))
+            with self._lock:
+                cache.update({key: compiled.get(key) for key in missing})
+        with self._lock:
+            return {key: cache.get(key) for key in keys}
+
+    def preload(self, table: str) -> Dict[RuleId, Any]:
+        """활성 규칙 전체를 한 번에 컴파일해 캐시"""
+        compiled = self._compile(table, self._fetch(table))
+        with self._lock:
+            self._rules[table].update(compiled)
+        return compiled
+
+    def invalidate(self, table: Optional[str] = None, rule_id: Any = None):
+        """규칙 변경 시 캐시 제거 (table/rule_id가 없으면 전체)"""
+        with self._lock:
+            for name in ([table] if table else list(self._rules)):
+                if rule_id is None:
+                    self._rules[name].clear()
+                else:
+                    self._rules[name].pop(_rule_key(rule_id), None)
+
+    @staticmethod
+    def _pairs_frame(pairs: Any) -> pd.DataFrame:
+        if isinstance(pairs, pd.DataFrame):
+            frame = pairs[['rule_id', 'weight']].reset_index(drop=True).copy()
+        else:
+            frame = pd.DataFrame(list(pairs), columns=['rule_id', 'weight'])
+        frame['weight'] = pd.to_numeric(frame['weight'], errors='coerce')
+        frame['rule_key'] = [_rule_key(rule_id) for rule_id in frame['rule_id']]
+        return frame
+
+    def _groups(self, table: str, frame: pd.DataFrame, active_only: bool, error: np.ndarray):
+        """규칙별 행 위치 묶음 (규칙 없음/비활성은 error에 기록)"""
+        rules = self.rules(table, frame['rule_key'].unique()) if len(frame) else {}
+        for key, positions in frame.groupby('rule_key', sort=False).indices.items():
+            rule = rules.get(key)
+            if rule is None:
+                error[positions] = NO_RULE
+            elif active_only and not rule.is_active:
+                error[positions] = INACTIVE_RULE
+            else:
+                yield rule, positions
+
+    def price_fsc_batch(self, pairs: Any, active_only: bool = True) -> pd.DataFrame:
+        """
+        FSC 일괄 계산
+        pairs: [(rule_id, weight)] 또는 rule_id/weight 컬럼 DataFrame
+        Returns: 입력 순서대로 rule_id, weight, rule_name, applied_bracket, unit_price,
+                 calculated_charge, min_charge, final_charge, min_charge_applied, error
+        """
+        frame = self._pairs_frame(pairs)
+        n = len(frame)
+        weights = frame['weight'].to_numpy(dtype=float)
+        names = np.full(n, None, dtype=object)
+        brackets = np.full(n, None, dtype=object)
+        unit = np.zeros(n)
+        calculated = np.zeros(n)
+        minimum = np.zeros(n)
+        error = np.full(n, None, dtype=object)
+
+        for rule, positions in self._groups(FSC_TABLE, frame, active_only, error):
+            idx, unit[positions], calculated[positions] = rule.table.price(weights[positions])
+            names[positions] = rule.rule_name
+            brackets[positions] = rule.table.labels[idx]
+            minimum[positions] = rule.min_charge
+            error[positions[idx < 0]] = NO_BRACKET
+
+        final = np.maximum(calculated, minimum)
+        return pd.DataFrame({
+            'rule_id': frame['rule_id'],
+            'weight': weights,
+            'rule_name': _object_column(names),
+            'applied_bracket': _object_column(brackets),
+            'unit_price': unit,
+            'calculated_charge': calculated,
+            'min_charge': minimum,
+            'final_charge': final,
+            'min_charge_applied': final == minimum,
+            'error': _object_column(error),
+        })
+
+    def price_trucking_batch(self, pairs: Any, active_only: bool = True) -> pd.DataFrame:
+        """
+        Trucking 일괄 계산
+        Returns: 입력 순서대로 rule_id, weight, rule_name, charge_type, calculation_method,
+                 method, applied_bracket, unit_price, calculated_charge, error
+        """
+        frame = self._pairs_frame(pairs)
+        n = len(frame)
+        weights = frame['weight'].to_numpy(dtype=float)
+        columns = {name: np.full(n, None, dtype=object)
+                   for name in ('rule_name', 'charge_type', 'calculation_method', 'method', 'applied_bracket')}
+        unit = np.zeros(n)
+        calculated = np.zeros(n)
+        error = np.full(n, None, dtype=object)
+
+        for rule, positions in self._groups(TRUCKING_TABLE, frame, active_only, error):
+            columns['rule_name'][positions] = rule.rule_name
+            columns['charge_type'][positions] = rule.charge_type
+            columns['calculation_method'][positions] = rule.calculation_method
+            columns['method'][positions] = rule.method
+            part = weights[positions]
+            if rule.method == METHOD_FIXED:
+                calculated[positions] = rule.fixed_charge
+            elif rule.method == METHOD_THRESHOLD:
+                unit[positions] = rule.rate_per_kg
+                calculated[positions] = np.where(part > rule.threshold, (part - rule.threshold) * rule.rate_per_kg, 0.0)
+            else:
+                idx, unit[positions], calculated[positions] = rule.table.price(part)
+                columns['applied_bracket'][positions] = rule.table.labels[idx]
+                error[positions[idx < 0]] = NO_BRACKET
+
+        return pd.DataFrame({
+            'rule_id': frame['rule_id'],
+            'weight': weights,
+            **{name: _object_column(values) for name, values in columns.items()},
+            'unit_price': unit,
+            'calculated_charge': calculated,
+            'error': _object_column(error),
+        })
+
+
+_engine = FreightRateEngine()
+
+
+def get_freight_rate_engine() -> FreightRateEngine:
+    return _engine
+
+
+def price_fsc_batch(pairs: Any, active_only: bool = True) -> pd.DataFrame:
+    """공유 엔진으로 FSC 일괄 계산"""
+    return _engine.price_fsc_batch(pairs, active_only)
+
+
+def price_trucking_batch(pairs: Any, active_only: bool = True) -> pd.DataFrame:
+    """공유 엔진으로 Trucking 일괄 계산"""
+    return _engine.price_trucking_batch(pairs, active_only)
+
+
+def invalidate_rule(table: str, rule_id: Any = None):
+    """규칙 저장/수정/삭제 후 호출"""
+    _engine.invalidate(table, rule_id)
@@ -964,6 +964,196 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         st.components.v1.html(print_html, height=1400, scrolling=True)
 
 
+class PaginationHelper:
+    """
+    목록 화면 서버 페이지네이션 헬퍼
+    Server-side pagination helper for list views
+
+    세션 상태에 페이지 번호/크기/keyset 커서를 저장하고,
+    load_func에 그대로 넘길 수 있는 페이지 인자를 만든다.
+    """
+    
+    PAGE_SIZES = [20, 50, 100]
+    DEFAULT_PAGE_SIZE = 50
+    
+    @staticmethod
+    def _state(key):
+        state_key = f"{key}_pager"
+        if state_key not in st.session_state:
+            st.session_state[state_key] = {
+                'page': 1,
+                'page_size': PaginationHelper.DEFAULT_PAGE_SIZE,
+                'signature': None,
+                'cursors': {},
+                'used_cursor': False
+            }
+        return st.session_state[state_key]
+    
+    @staticmethod
+    def get_page_args(key, filter_signature=None, keyset=True, count='exact'):
+        """
+        현재 페이지 조회 인자 반환
+        
+        Args:
+            key: 목록 화면 고유 키
+            filter_signature: 필터 조건 (바뀌면 1페이지로 초기화)
+            keyset: created_at/id 정렬 목록이면 True (다음 페이지를 keyset 커서로 조회)
+            count: 전체 건수 계산 방식 ('exact' / 'estimated')
+        
+        Returns:
+            load_func에 넘길 kwargs (limit, offset 또는 after_id/after_created_at, count)
+        """
+        state = PaginationHelper._state(key)
+        signature = repr(filter_signature)
+        if state['signature'] != signature:
+            state['signature'] = signature
+            state['page'] = 1
+            state['cursors'] = {}
+        
+        page = state['page']
+        page_size = state['page_size']
+        cursor = state['cursors'].get(page) if keyset else None
+        state['used_cursor'] = cursor is not None
+        
+        args = {'limit': page_size, 'count': count}
+        if cursor:
+            args['after_id'] = cursor.get('after_id')
+            if cursor.get('after_created_at'):
+                args['after_created_at'] = cursor['after_created_at']
+        else:
+            args['offset'] = (page - 1) * page_size
+        return args
+    
+    @staticmethod
+    def get_total(key, result):
+        """전체 건수 (keyset 조회 시 건너뛴 행 수를 더해서 계산)"""
+        state = PaginationHelper._state(key)
+        total = getattr(result, 'total', None)
+        if total is None:
+            return None
+        if state['used_cursor']:
+            return (state['page'] - 1) * state['page_size'] + total
+        return total
+    
+    @staticmethod
+    def render_pagination_controls(key, result):
+        """이전/다음 페이지, 페이지 크기 컨트롤 렌더링"""
+        state = PaginationHelper._state(key)
+        page = state['page']
+        page_size = state['page_size']
+        total = PaginationHelper.get_total(key, result)
+        
+        # 다음 페이지 keyset 커서 기억
+        next_cursor = getattr(result, 'next_cursor', None)
+        if next_cursor and next_cursor.get('after_id') is not None:
+            state['cursors'][page + 1] = next_cursor
+        
+        if total is not None:
+            total_pages = max((total + page_size - 1) // page_size, 1)
+        else:
+            total_pages = page + (1 if next_cursor else 0)
+        
+        col1, col2, col3, col4 = st.columns([1, 2, 1, 2])
+        
+        with col1:
+            if st.button("◀ 이전", key=f"{key}_prev", disabled=page <= 1, use_container_width=True):
+                state['page'] = page - 1
+                st.rerun()
+        
+        with col2:
+            shown_from = (page - 1) * page_size + 1 if len(result) else 0
+            shown_to = (page - 1) * page_size + len(result)
+            total_text = f"{total:,}" if total is not None else "?"
+            st.caption(f"{page} / {total_pages} 페이지 · {shown_from:,}-{shown_to:,} / 전체 {total_text}건")
+        
+        with col3:
+            if st.button("다음 ▶", key=f"{key}_next", disabled=page >= total_pages, use_container_width=True):
+                state['page'] = page + 1
+                st.rerun()
+        
+        with col4:
+            new_size = st.selectbox(
+                "페이지 크기",
+                PaginationHelper.PAGE_SIZES,
+                index=PaginationHelper.PAGE_SIZES.index(page_size) if page_size in PaginationHelper.PAGE_SIZES else 1,
+                key=f"{key}_page_size",
+                label_visibility="collapsed"
+            )
+            if new_size != page_size:
+                state['page_size'] = new_size
+                state['page'] = 1
+                state['cursors'] = {}
+                st.rerun()
+
+
+class BatchUpdateHelper:
+    """
+    여러 건 승인/반려 처리 헬퍼
+    Batch status transitions for approval screens
+
+    같은 변경 내용끼리 묶어 bulk_update_func(table, ids, patch)로 한 번에 보내고,
+    처리 결과 메시지는 세션 상태에 저장해 st.rerun() 이후 화면에 표시한다.
+    """
+    
+    @staticmethod
+    def group_updates(updates):
+        """{id: 변경 데이터} → [(변경 데이터, [id, ...])] (같은 변경끼리 묶음, 순서 유지)"""
+        groups = {}
+        for record_id, patch in updates.items():
+            patch = {k: v for k, v in patch.items() if k != 'id'}
+            key = tuple(sorted((k, repr(v)) for k, v in patch.items()))
+            groups.setdefault(key, (patch, []))[1].append(record_id)
+        return list(groups.values())
+    
+    @staticmethod
+    def apply_updates(table_name, updates, update_func, bulk_update_func=None):
+        """
+        id별 변경 데이터 적용
+        Args:
+            updates: {id: 변경 데이터}
+            update_func: 단건 수정 함수 (bulk_update_func가 없을 때 사용)
+            bulk_update_func: bulk_update(table, ids, patch) → {id: 성공 여부}
+        Returns:
+            {id: 성공 여부}
+        """
+        results = {}
+        for patch, ids in BatchUpdateHelper.group_updates(updates):
+            if bulk_update_func is not None:
+                results.update(bulk_update_func(table_name, ids, patch))
+            else:
+                for record_id in ids:
+                    results[record_id] = bool(update_func(table_name, {**patch, 'id': record_id}, "id"))
+        return results
+    
+    @staticmethod
+    def queue_result(key, results, action_label, skipped=None):
+        """
+        처리 결과 메시지 저장 (다음 실행에서 show_result로 표시)
+        skipped: 다른 사용자가 먼저 처리해 건너뛴 ID (실패로 세지 않음)
+        """
+        succeeded = sum(1 for ok in results.values() if ok)
+        total = len(results)
+        if succeeded == total:
+            level, message = 'success', f"✅ {total}건 {action_label} 완료!"
+        else:
+            failed_ids = ", ".join(str(record_id) for record_id, ok in results.items() if not ok)
+            level, message = 'warning', f"⚠️ {succeeded}/{total}건만 {action_label}되었습니다. (실패 ID: {failed_ids})"
+        if skipped:
+            skipped_ids = ", ".join(str(record_id) for record_id in skipped)
+            message += f" (이미 처리되어 건너뜀 ID: {skipped_ids})"
+            if total == 0:
+                level, message = 'info', f"ℹ️ 선택한 항목은 이미 처리되었습니다. (ID: {skipped_ids})"
+        st.session_state[f"{key}_batch_result"] = (level, message)
+    
+    @staticmethod
+    def show_result(key):
+        """저장된 처리 결과 메시지 표시 (한 번만)"""
+        pending = st.session_state.pop(f"{key}_batch_result", None)
+        if pending:
+            level, message = pending
+            getattr(st, level)(message)
+
+
 # 하위 호환성을 위한 래퍼 함수들
 def get_approval_status_info(status):
     """하위 호환성 래퍼 함수"""
@@ -1009,4 +1199,24 @@ def get_accessible_companies(user):
 
 def filter_by_company(data_list, user, company_field='company'):
     """하위 호환성 래퍼 함수"""
-    return CorporatePermissionHelper.filter_by_company(data_list, user, company_field)
\ No newline at end of file
+    return CorporatePermissionHelper.filter_by_company(data_list, user, company_field)
+
+def get_page_args(key, filter_signature=None, keyset=True, count='exact'):
+    """현재 페이지 조회 인자 (PaginationHelper.get_page_args 참고)"""
+    return PaginationHelper.get_page_args(key, filter_signature, keyset, count)
+
+def render_pagination_controls(key, result):
+    """페이지 이동/크기 컨트롤 렌더링 (PaginationHelper.render_pagination_controls 참고)"""
+    return PaginationHelper.render_pagination_controls(key, result)
+
+def apply_batch_updates(table_name, updates, update_func, bulk_update_func=None):
+    """id별 변경 데이터 일괄 적용 (BatchUpdateHelper.apply_updates 참고)"""
+    return BatchUpdateHelper.apply_updates(table_name, updates, update_func, bulk_update_func)
+
+def queue_batch_result(key, results, action_label, skipped=None):
+    """처리 결과 메시지 저장 (BatchUpdateHelper.queue_result 참고)"""
+    return BatchUpdateHelper.queue_result(key, results, action_label, skipped)
+
+def show_batch_result(key):
+    """저장된 처리 결과 메시지 표시 (BatchUpdateHelper.show_result 참고)"""
+    return BatchUpdateHelper.show_result(key)
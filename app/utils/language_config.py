@@ -3,6 +3,9 @@ Language Configuration for YVM ERP System
 다국어 지원: 한국어(KO), 영어(EN), 베트남어(VN), 태국어(TH)
 """
 
+from collections import Counter
+from types import MappingProxyType
+
 # 지원 언어
 SUPPORTED_LANGUAGES = {
     'KO': '한국어',
@@ -775,28 +778,79 @@ LANGUAGE_LABELS = {
 }
 
 
+# ============================================
+# 컴파일된 라벨 테이블
+# ============================================
+# LANGUAGE_LABELS(키 → 언어별 라벨)를 import 시 한 번 언어별 평면 dict(키 → 라벨)로 펼친다.
+# 번역이 없는 키는 영어, 영어도 없으면 키 자체로 미리 채워 두므로 get_label은 dict 조회 두 번이다.
+# 정의되지 않은 키 조회만 조회 실패 경로에서 집계한다 (정상 조회에는 집계 비용 없음).
+
+DEFAULT_LANGUAGE = 'EN'
+
+
+def _compile_label_tables(labels, languages):
+    """언어 코드 → {키: 라벨} (영어/키 폴백 반영)"""
+    tables = {}
+    for language in languages:
+        tables[language] = {
+            key: translations[language] if language in translations else translations.get(DEFAULT_LANGUAGE, key)
+            for key, translations in labels.items()
+        }
+    return tables
+
+
+def _missing_translations(labels, languages):
+    """언어 코드 → 번역이 없어 폴백되는 키 목록"""
+    return {
+        language: sorted(key for key, translations in labels.items() if language not in translations)
+        for language in languages
+    }
+
+
+_LABEL_TABLES = _compile_label_tables(LANGUAGE_LABELS, SUPPORTED_LANGUAGES)
+
+# 언어 인자 → 라벨 테이블 ('KO', 'ko' 등 실제로 들어온 값을 그대로 키로 사용)
+_TABLES_BY_CODE = dict(_LABEL_TABLES)
+_TABLES_BY_CODE.update({code.lower(): table for code, table in _LABEL_TABLES.items()})
+
+# get_all_labels 반환용 읽기 전용 뷰
+_LABEL_VIEWS = {code: MappingProxyType(table) for code, table in _LABEL_TABLES.items()}
+
+# 정의되지 않은 키 → 조회 횟수
+_missing_keys = Counter()
+
+
+def _normalize_language(language):
+    """언어 인자 → 지원 언어 코드 (지원하지 않는 언어는 영어)"""
+    code = str(language or DEFAULT_LANGUAGE).strip().upper()
+    return code if code in _LABEL_TABLES else DEFAULT_LANGUAGE
+
+
+def _table_for(language):
+    """처음 보는 언어 인자의 라벨 테이블 (결과를 캐시해 다음부터는 dict 조회 한 번)"""
+    table = _LABEL_TABLES[_normalize_language(language)]
+    if isinstance(language, str):
+        _TABLES_BY_CODE[language] = table
+    return table
+
+
 def get_label(key, language='EN'):
     """
     언어별 라벨 반환
     
     Args:
         key (str): 라벨 키
-        language (str): 언어 코드 ('KO', 'EN', 'VN', 'TH')
+        language (str): 언어 코드 ('KO', 'EN', 'VN', 'TH', 대소문자 무관)
     
     Returns:
-        str: 해당 언어의 라벨 (없으면 키 그대로 반환)
+        str: 해당 언어의 라벨 (번역이 없으면 영어, 키가 없으면 키 그대로 반환)
     """
-    # 언어 코드 정규화 (대문자로 변환)
-    language = language.upper()
-    
-    # 지원하지 않는 언어면 영어로 기본 설정
-    if language not in SUPPORTED_LANGUAGES:
-        language = 'EN'
-    
-    if key in LANGUAGE_LABELS:
-        return LANGUAGE_LABELS[key].get(language, LANGUAGE_LABELS[key].get('EN', key))
-    
-    return key
+    table = _TABLES_BY_CODE.get(language) or _table_for(language)
+    label = table.get(key)
+    if label is None:
+        _missing_keys[key] += 1
+        return key
+    return label
 
 
 def get_all_labels(language='EN'):
@@ -807,17 +861,9 @@ def get_all_labels(language='EN'):
         language (str): 언어 코드 ('KO', 'EN', 'VN', 'TH')
     
     Returns:
-        dict: {key: label} 형태의 딕셔너리
+        Mapping: {key: label} 형태의 읽기 전용 매핑 (언어별로 한 번 만든 것을 재사용)
     """
-    language = language.upper()
-    
-    if language not in SUPPORTED_LANGUAGES:
-        language = 'EN'
-    
-    return {
-        key: labels.get(language, labels.get('EN', key))
-        for key, labels in LANGUAGE_LABELS.items()
-    }
+    return _LABEL_VIEWS[_normalize_language(language)]
 
 
 def get_supported_languages():
@@ -825,5 +871,25 @@ def get_supported_languages():
     return SUPPORTED_LANGUAGES
 
 
+def get_label_coverage():
+    """
+    번역 누락 현황 (import 시 계산된 값 기준)
+    
+    Returns:
+        dict: {'total_keys', 'missing_translations': {언어: [폴백되는 키]}, 'unknown_keys': {키: 조회 횟수}}
+    """
+    return {
+        'total_keys': len(LANGUAGE_LABELS),
+        'missing_translations': _missing_translations(LANGUAGE_LABELS, SUPPORTED_LANGUAGES),
+        'unknown_keys': dict(_missing_keys.most_common()),
+    }
+
+
+def reset_label_telemetry():
+    """정의되지 않은 키 조회 집계 초기화"""
+    _missing_keys.clear()
+
+
 # 하위 호환성을 위한 별칭
-get_input_label = get_label
\ No newline at end of file
+get_input_label = get_label
+
@@ -0,0 +1,732 @@
+"""
+YMV ERP 시스템 로컬 DB 백엔드
+Drop-in local backend for the db_operations facade (no network)
+
+create_database_operations()가 만드는 파사드와 같은 메서드
+(load_data / save_data / update_data / bulk_save_data / bulk_update / delete_data /
+ invalidate_cache / get_cache_stats / get_pool_metrics)를 제공하며
+shared.local_storage 엔진 위에서 동작한다. 컴포넌트는 load_func/save_func/... 를
+그대로 받으므로 코드 변경 없이 원격 Supabase 대신 로컬 데이터로 페이지를 실행할 수 있다.
+
+- filters: dict(리스트 값은 IN) 또는 QueryFilter (eq/neq/gt/gte/lt/lte/ilike/in/is/not.is, or/and 묶음)
+  (utils.filter_engine의 컴파일 필터로 평가)
+  동등 조건은 로컬 저장소의 보조 인덱스 조회로 먼저 좁힌다.
+- columns: 문자열/리스트/Projection ("alias:column" 지원, embedded select "x(...)"는 무시)
+- 페이지네이션: limit/offset/order_by/desc/after_id/after_created_at/count → PageResult
+  (정렬은 PostgREST와 같이 오름차순 NULL 마지막, 내림차순 NULL 처음, id 보조 정렬)
+- update_data: resolve_update_args와 같은 호출 패턴 (record_id, data) / (data,) / (data, "id"),
+  match={컬럼: 값}이면 조건부 수정
+- 읽기 캐시(TableReadCache)도 원격 파사드와 같은 키/TTL로 사용
+
+설정 (config.config_settings.Settings):
+    YMV_DB_BACKEND=local          로컬 백엔드 사용 (기본 supabase)
+    YMV_LOCAL_DB_DIR=data/local   파일 기반 저장 (비우면 메모리 전용)
+    YMV_LOCAL_DB_SEED_ROWS=1000   시작 시 테이블별 합성 데이터 행 수 (0이면 생성 안 함)
+
+합성 직원 계정은 사번 E00001.. / 비밀번호 LOCAL_SEED_PASSWORD('ymv-local-dev')로 로그인한다
+(E00001, E00051 ... 은 Admin). 개발용 로컬 데이터 전용이다.
+
+embedded select나 get_connection()을 직접 쓰는 함수(물류 RPC 등)는 대상이 아니다.
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from shared.local_storage import LocalStorageEngine
+from utils.database import (
+    ALL_COMPANY_CODES, BULK_UPDATE_BATCH, PAGINATION_KEYS, build_page_result,
+    build_select_clause, resolve_update_args,
+)
+from utils.filter_engine import compile_filter, plain_value, row_sort_key
+from utils.query_builder import Condition, QueryFilter, and_, as_query_filter
+from utils.query_cache import TableReadCache, make_cache_key
+
+# 로컬 저장소 보조 인덱스 (법인 접미사가 붙은 테이블에도 같은 컬럼 적용)
+LOCAL_BACKEND_INDEXES = {
+    'customers': ['status'],
+    'products': ['product_code'],
+    'quotations': ['customer_id', 'status'],
+    'quotation_items': ['quotation_id'],
+    'sales_activities': ['customer_id'],
+    'sales_process': ['status'],
+    'process_item_breakdown': ['sales_process_id'],
+    'purchase_orders_to_supplier': ['sales_process_id'],
+    'internal_processing': ['sales_process_id'],
+    'hot_runner_orders': ['status'],
+    'purchases': ['status'],
+    'employees': ['username', 'employee_id'],
+    'expenses': ['employee_id', 'status'],
+}
+
+_COMPANY_SUFFIX = re.compile(r'_(ymv|ymk|ymth|ymc)$', re.IGNORECASE)
+
+_NUMERIC = re.compile(r'-?\d+(\.\d+)?')
+
+
+# ============================================
+# 인덱스 조회 조건 (조건 평가는 utils.filter_engine)
+# ============================================
+
+def _index_where(query_filter: Optional[QueryFilter]) -> Dict[str, Any]:
+    """인덱스 조회에 쓸 수 있는 최상위 동등 조건 (값 그대로 비교 가능한 것만)"""
+    where = {}
+    if query_filter is None:
+        return where
+    for condition in query_filter.conditions:
+        if not isinstance(condition, Condition) or condition.operator != 'eq':
+            continue
+        value = condition.value
+        if not isinstance(value, (int, str, date)) or condition.column in where:
+            continue
+        # 숫자 문자열('5')은 숫자 컬럼과 타입이 달라 해시 조회로 찾을 수 없으므로 제외
+        if isinstance(value, str) and _NUMERIC.fullmatch(value):
+            continue
+        where[condition.column] = plain_value(value)
+    return where
+
+
+# ============================================
+# 프로젝션 / 정렬
+# ============================================
+
+@lru_cache(maxsize=256)
+def _parse_select(select_clause: str) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """select 절 → ((출력 키, 원본 컬럼), ...) / '*'면 None"""
+    if select_clause == '*':
+        return None
+    fields = []
+    for part in select_clause.split(','):
+        part = part.strip()
+        if not part or '(' in part or ')' in part:
+            continue
+        alias, _, column = part.partition(':')
+        fields.append((alias, column or alias) if column else (part, part))
+    return tuple(fields)
+
+
+def project(rows: Iterable[Dict[str, Any]], columns: Any) -> List[Dict[str, Any]]:
+    """행 복사 + 컬럼 선택 (행에 없는 컬럼은 제외)"""
+    fields = _parse_select(build_select_clause(columns))
+    if fields is None:
+        return [dict(row) for row in rows]
+    return [{key: row[column] for key, column in fields if column in row} for row in rows]
+
+
+def select_rows(rows: Sequence[Dict[str, Any]], query_filter: Optional[QueryFilter] = None,
+                limit: Optional[int] = None, offset: Optional[int] = None,
+                order_by: Optional[str] = None, desc: bool = False,
+                after_id: Optional[Any] = None, after_created_at: Optional[str] = None,
+                count: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+    """
+    필터 + 정렬 + keyset/offset 페이지 적용 (apply_pagination과 같은 규칙)
+    Returns: (행 목록, 전체 건수 또는 None, 커서 계산용 정렬 컬럼)
+    """
+    if order_by is None and query_filter is not None and query_filter.order_by:
+        order_by, desc = query_filter.order_by, query_filter.desc
+    if after_created_at is not None:
+        order_by = 'created_at'
+    elif after_id is not None:
+        order_by = 'id'
+
+    # keyset 커서도 조건으로 붙여 한 번에 컴파일
+    conditions = list(query_filter.conditions) if query_filter is not None else []
+    op = 'lt' if desc else 'gt'
+    if after_created_at is not None:
+        if after_id is not None:
+            conditions.append((Condition('created_at', op, after_created_at),
+                               and_(Condition('created_at', 'eq', after_created_at),
+                                    Condition('id', op, after_id))))
+        else:
+            conditions.append(Condition('created_at', op, after_created_at))
+    elif after_id is not None:
+        conditions.append(Condition('id', op, after_id))
+    keyset_filter = QueryFilter()
+    keyset_filter.conditions = conditions
+
+    predicate = compile_filter(keyset_filter)
+    result = [row for row in rows if predicate(row)]
+
+    paged = limit is not None or offset
+    if order_by or paged:
+        result.sort(key=row_sort_key(order_by or 'id'), reverse=desc)
+
+    total = len(result) if count else None
+    start = offset or 0
+    if limit is not None:
+        result = result[start:start + limit]
+    elif start:
+        result = result[start:]
+    return result, total, order_by
+
+
+# ============================================
+# 로컬 db_operations 파사드
+# ============================================
+
+class LocalDBOperations:
+    """
+    create_database_operations()와 같은 호출 규약의 로컬 구현
+    Same load/save/update/delete contract as the Supabase facade, backed by LocalStorageEngine
+    """
+
+    def __init__(self, data_dir: Any = None, cache_ttls: Optional[Dict[str, float]] = None,
+                 cache_max_entries: Optional[int] = None, use_read_cache: bool = True,
+                 measure_bytes: bool = True):
+        self.engine = LocalStorageEngine(data_dir)
+        self.cache = TableReadCache()
+        if cache_ttls:
+            self.cache.table_ttls.update(cache_ttls)
+        if cache_max_entries:
+            self.cache.max_entries = cache_max_entries
+        self.use_read_cache = use_read_cache
+        self.measure_bytes = measure_bytes
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    # ---------- 지표 ----------
+
+    def reset_metrics(self):
+        """호출 수/읽은 행/바이트 지표 초기화"""
+        with self._metrics_lock:
+            self.metrics = {'calls': {}, 'rows_read': 0, 'bytes_read': 0, 'db_ms': 0.0,
+                            'measure_ms': 0.0}
+            self.table_metrics: Dict[str, Dict[str, int]] = {}
+
+    def _record(self, operation: str, table_name: str, started: float,
+                rows: Optional[List[Dict[str, Any]]] = None):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        size = 0
+        measure_ms = 0.0
+        if rows and self.measure_bytes:
+            measure_started = time.perf_counter()
+            size = len(json.dumps(rows, ensure_ascii=False, default=str).encode('utf-8'))
+            measure_ms = (time.perf_counter() - measure_started) * 1000
+        with self._metrics_lock:
+            self.metrics['measure_ms'] += measure_ms
+            calls = self.metrics['calls']
+            calls[operation] = calls.get(operation, 0) + 1
+            self.metrics['db_ms'] += elapsed_ms
+            stats = self.table_metrics.setdefault(table_name, {'calls': 0, 'rows_read': 0, 'bytes_read': 0})
+            stats['calls'] += 1
+            if rows is not None:
+                self.metrics['rows_read'] += len(rows)
+                self.metrics['bytes_read'] += size
+                stats['rows_read'] += len(rows)
+                stats['bytes_read'] += size
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """누적 지표 (calls: 연산별 호출 수, tables: 테이블별 호출/행/바이트, measure_ms: 바이트 계산 시간)"""
+        with self._metrics_lock:
+            return {**self.metrics, 'calls': dict(self.metrics['calls']),
+                    'db_calls': sum(self.metrics['calls'].values()),
+                    'tables': {k: dict(v) for k, v in self.table_metrics.items()}}
+
+    # ---------- 저장소 ----------
+
+    def _store(self, table_name: str):
+        store = self.engine.store(table_name)
+        if not store.indexes:
+            for column in LOCAL_BACKEND_INDEXES.get(_COMPANY_SUFFIX.sub('', table_name), ()):
+                store.add_index(column)
+        return store
+
+    def _select(self, table_name, columns, filters, page_args):
+        query_filter = as_query_filter(filters)
+        paged = any(page_args.get(k) is not None for k in ('limit', 'offset', 'after_id',
+                                                            'after_created_at', 'count'))
+        with self._store(table_name).locked() as store:
+            candidates = store.find(_index_where(query_filter))
+            rows, total, order_by = select_rows(candidates, query_filter, **page_args)
+            rows = project(rows, columns)
+        if paged:
+            response = SimpleNamespace(data=rows, count=total)
+            return build_page_result(response, page_args.get('limit'), page_args.get('offset'), order_by)
+        return rows
+
+    # ---------- 파사드 메서드 ----------
+
+    def load_data(self, table_name, columns="*", filters=None, *args, **kwargs):
+        """데이터 로드 (SimpleDBOperations.load_data와 같은 인자)"""
+        page_args = {k: kwargs[k] for k in PAGINATION_KEYS if kwargs.get(k) is not None}
+        use_cache = self.use_read_cache and kwargs.get('use_cache', True)
+        key = None
+        if use_cache:
+            key = make_cache_key(table_name, filters, build_select_clause(columns), page_args)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        started = time.perf_counter()
+        try:
+            rows = self._select(table_name, columns, filters, page_args)
+        except Exception as e:
+            logging.error(f"로컬 데이터 로드 오류 ({table_name}): {str(e)}")
+            rows = []
+        self._record('load', table_name, started, rows)
+        if key is not None and rows:
+            self.cache.put(key, rows)
+        return rows
+
+    def save_data(self, table_name, data, *args, **kwargs):
+        """데이터 저장 (저장된 행 반환, created_at 기본값 부여)"""
+        started = time.perf_counter()
+        try:
+            row = dict(data)
+            row.setdefault('created_at', datetime.now().isoformat())
+            with self._store(table_name).locked() as store:
+                return dict(store.insert(row))
+        except Exception as e:
+            logging.error(f"로컬 데이터 저장 오류 ({table_name}): {str(e)}")
+            return None
+        finally:
+            self.cache.invalidate(table_name)
+            self._record('save', table_name, started)
+
+    def update_data(self, table_name, *args, **kwargs):
+        """데이터 수정 (resolve_update_args의 호출 패턴, match={컬럼: 값}이면 조건부 수정)"""
+        self.cache.invalidate(table_name)
+        resolved = resolve_update_args(args)
+        if resolved is None:
+            logging.error(f"update_data: invalid arguments ({table_name}, {len(args)} args)")
+            return False
+        record_id, data = resolved
+        started = time.perf_counter()
+        try:
+            with self._store(table_name).locked() as store:
+                return store.update(data, {**(kwargs.get('match') or {}), 'id': record_id}) > 0
+        except Exception as e:
+            logging.error(f"로컬 데이터 수정 오류 ({table_name}): {str(e)}")
+            return False
+        finally:
+            self._record('update', table_name, started)
+
+    def bulk_save_data(self, table_name, rows, upsert=False, on_conflict=None,
+                       chunk_size=None, row_labels=None):
+        """여러 행 일괄 insert/upsert (bulk_write와 같은 결과 형식)"""
+        rows = list(rows)
+        labels = list(row_labels) if row_labels is not None else list(range(len(rows)))
+        keys = [c.strip() for c in (on_conflict or 'id').split(',') if c.strip()]
+        started = time.perf_counter()
+        saved, failed = [], []
+        try:
+            with self._store(table_name).locked() as store:
+                for row, label in zip(rows, labels):
+                    try:
+                        row = dict(row)
+                        existing = []
+                        if upsert and all(row.get(k) is not None for k in keys):
+                            existing = store.find({k: row[k] for k in keys})
+                        if existing:
+                            store.update(row, {'id': existing[0]['id']})
+                            saved.append(dict(store.rows[row.get('id', existing[0]['id'])]))
+                        else:
+                            row.setdefault('created_at', datetime.now().isoformat())
+                            saved.append(dict(store.insert(row)))
+                    except Exception as e:
+                        failed.append((label, str(e)))
+        finally:
+            self.cache.invalidate(table_name)
+            self._record('bulk_save', table_name, started)
+        chunk_size = chunk_size or max(len(rows), 1)
+        return {
+            'written': len(rows) - len(failed),
+            'saved': saved,
+            'failed': failed,
+            'chunks': -(-len(rows) // chunk_size),
+            'chunk_size': chunk_size,
+            'elapsed_ms': (time.perf_counter() - started) * 1000,
+        }
+
+    def bulk_update(self, table_name, ids, patch, batch_size=BULK_UPDATE_BATCH):
+        """여러 행에 같은 변경 적용 → {id: 성공 여부} (배치마다 호출 1회로 집계)"""
+        ids = list(dict.fromkeys(ids))
+        results = {record_id: False for record_id in ids}
+        patch = {k: v for k, v in patch.items() if k != 'id'}
+        try:
+            for start in range(0, len(ids), batch_size):
+                started = time.perf_counter()
+                with self._store(table_name).locked() as store:
+                    for record_id in ids[start:start + batch_size]:
+                        results[record_id] = store.update(patch, {'id': record_id}) > 0
+                self._record('bulk_update', table_name, started)
+        except Exception as e:
+            logging.error(f"로컬 일괄 수정 오류 ({table_name}): {str(e)}")
+        finally:
+            self.cache.invalidate(table_name)
+        return results
+
+    def delete_data(self, table_name, record_id, *args, **kwargs):
+        """데이터 삭제"""
+        started = time.perf_counter()
+        try:
+            with self._store(table_name).locked() as store:
+                store.delete({'id': record_id})
+            return True
+        except Exception as e:
+            logging.error(f"로컬 데이터 삭제 오류 ({table_name}, id={record_id}): {str(e)}")
+            return False
+        finally:
+            self.cache.invalidate(table_name)
+            self._record('delete', table_name, started)
+
+    def invalidate_cache(self, table_name=None):
+        """읽기 캐시 무효화 (table_name 없으면 전체)"""
+        self.cache.invalidate(table_name)
+
+    def get_cache_stats(self):
+        """읽기 캐시 히트/미스 통계"""
+        return self.cache.get_stats()
+
+    def get_pool_metrics(self):
+        """원격 풀 지표와 같은 키 (로컬이므로 연결 없음) + 로컬 백엔드 지표"""
+        metrics = self.get_metrics()
+        return {
+            'backend': 'local',
+            'open_clients': 0,
+            'open_http_connections': 0,
+            'clients_created': 0,
+            'acquisitions': metrics['db_calls'],
+            'reused': metrics['db_calls'],
+            'reuse_ratio': 1.0 if metrics['db_calls'] else 0.0,
+            'avg_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'total_create_ms': 0.0,
+            'db_ms': metrics['db_ms'],
+        }
+
+
+# ============================================
+# 합성 데이터
+# ============================================
+
+# 법인별 테이블 (생성 순서 = 참조 순서)
+COMPANY_SEED_TABLES = (
+    'customers', 'products', 'quotations', 'quotation_items', 'sales_activities',
+    'sales_process', 'process_item_breakdown', 'purchase_orders_to_supplier',
+    'purchase_orders_inventory', 'internal_processing', 'hot_runner_orders', 'purchases',
+)
+
+# 법인 구분 없는 공용 테이블
+SHARED_SEED_TABLES = ('employees', 'expenses')
+
+_SEED_BASE_DATE = datetime(2025, 1, 1, 9, 0, 0)
+_CITIES = [('Hanoi', 'Vietnam'), ('Ho Chi Minh', 'Vietnam'), ('Bangkok', 'Thailand'),
+           ('Seoul', 'Korea'), ('Incheon', 'Korea'), ('Shanghai', 'China'), ('Suzhou', 'China')]
+_CURRENCIES = ['USD', 'VND', 'KRW', 'CNY', 'THB']
+_DEPARTMENTS = ['영업', '구매', '재무', '생산', '물류', '기술']
+_EXPENSE_TYPES = ['교통비', '식비', '숙박비', '사무용품', '통신비', '접대비', '기타']
+_WORKFLOW = ['pending', 'approved', 'rejected', 'ordered', 'completed']
+
+# 합성 직원 공통 개발용 비밀번호와 그 해시 (utils.auth 형식, 고정 salt라 seed 결과가 항상 같음)
+LOCAL_SEED_PASSWORD = 'ymv-local-dev'
+LOCAL_SEED_PASSWORD_HASH = (
+    'pbkdf2_sha256$260000$eW12LWxvY2FsLXNlZWQhIQ$6r6u19GJT9Clf5s4881s6woTX2lfv2OIL9aITIway5U'
+)
+
+
+def _stamp(rng: random.Random, days: int = 365) -> str:
+    return (_SEED_BASE_DATE + timedelta(days=rng.randrange(days),
+                                        seconds=rng.randrange(86400))).isoformat()
+
+
+def _day(rng: random.Random, days: int = 365) -> str:
+    return (_SEED_BASE_DATE.date() + timedelta(days=rng.randrange(days))).isoformat()
+
+
+def _pick(rng: random.Random, ids: List[int]) -> Optional[int]:
+    return rng.choice(ids) if ids else None
+
+
+def _customer(rng, i, ctx):
+    city, country = rng.choice(_CITIES)
+    return {
+        'company_name_short': f"{ctx['company']} Customer {i}",
+        'company_name_original': f"{ctx['company']} 고객사 {i}",
+        'company_name_english': f"{ctx['company']} Customer {i} Co., Ltd.",
+        'status': rng.choice(['active', 'active', 'active', 'potential', 'inactive']),
+        'city': city, 'country': country,
+        'business_type': rng.choice(['사출', '금형', '자동차', '가전']),
+        'contact_person': f'담당자 {i}', 'email': f'contact{i}@customer.example',
+        'phone': f'+84-{rng.randrange(10 ** 8, 10 ** 9)}', 'address': f'{i} Industrial Road, {city}',
+        'payment_terms': rng.choice(['T/T 30', 'T/T 60', 'L/C']),
+        'kam_name': f'KAM {i % 20}', 'created_at': _stamp(rng),
+    }
+
+
+def _product(rng, i, ctx):
+    price = round(rng.uniform(10, 5000), 2)
+    return {
+        'product_code': f"{ctx['company']}-HR-{i:06d}",
+        'product_name': f'핫런너 부품 {i}', 'product_name_en': f'Hot runner part {i}',
+        'product_name_vn': f'Linh kiện {i}',
+        'category': rng.choice(['Nozzle', 'Manifold', 'Controller', 'Heater', 'Valve Gate']),
+        'unit': 'EA', 'currency': 'USD', 'unit_price': price,
+        'cost_price_usd': round(price * rng.uniform(0.5, 0.8), 2), 'selling_price_usd': price,
+        'unit_price_vnd': round(price * 24000), 'stock_quantity': rng.randrange(0, 500),
+        'is_active': rng.random() > 0.1, 'created_at': _stamp(rng),
+    }
+
+
+def _quotation(rng, i, ctx):
+    total = round(rng.uniform(500, 200000), 2)
+    return {
+        'quote_number': f"{ctx['company']}{2025}{i:06d}", 'revision_number': 'Rv00',
+        'customer_id': _pick(rng, ctx['customers']), 'customer_name': f"{ctx['company']} Customer",
+        'quote_date': _day(rng), 'valid_until': _day(rng, 400), 'currency': rng.choice(_CURRENCIES),
+        'status': rng.choice(['draft', 'sent', 'approved', 'rejected', 'completed']),
+        'sales_rep_id': _pick(rng, ctx['employees']), 'project_name': f'Project {i % 500}',
+        'part_name': f'Part {i}', 'total_amount': total, 'discount_rate': rng.choice([0, 5, 10]),
+        'vat_rate': 10, 'final_amount': round(total * 1.1, 2), 'exchange_rate': 24000,
+        'created_at': _stamp(rng),
+    }
+
+
+def _quotation_item(rng, i, ctx):
+    quantity = rng.randrange(1, 50)
+    price = round(rng.uniform(10, 3000), 2)
+    return {
+        'quotation_id': _pick(rng, ctx['quotations']), 'product_id': _pick(rng, ctx['products']),
+        'item_description': f'Item {i}', 'quantity': quantity, 'unit_price': price,
+        'line_total': round(quantity * price, 2), 'created_at': _stamp(rng),
+    }
+
+
+def _sales_activity(rng, i, ctx):
+    return {
+        'customer_id': _pick(rng, ctx['customers']),
+        'activity_type': rng.choice(['visit', 'call', 'email', 'meeting']),
+        'activity_date': _day(rng), 'primary_contact': f'Contact {i % 300}',
+        'subject': f'Follow-up {i}', 'description': 'synthetic',
+        'status': rng.choice(['planned', 'completed', 'cancelled']),
+        'importance': rng.choice(['high', 'medium', 'low']), 'next_action_date': _day(rng, 400),
+        'created_at': _stamp(rng),
+    }
+
+
+def _sales_process(rng, i, ctx):
+    return {
+        'process_number': f"SP-{ctx['company']}-{i:06d}",
+        'quotation_id': _pick(rng, ctx['quotations']), 'customer_name': f'Customer {i % 400}',
+        'status': rng.choice(['pending', 'confirmed', 'ordered', 'shipped', 'completed']),
+        'total_amount': round(rng.uniform(500, 200000), 2), 'currency': rng.choice(_CURRENCIES),
+        'created_by': _pick(rng, ctx['employees']), 'created_at': _stamp(rng),
+    }
+
+
+def _process_item(rng, i, ctx):
+    quantity = rng.randrange(1, 30)
+    return {
+        'sales_process_id': _pick(rng, ctx['sales_process']), 'item_code': f'IC-{i:06d}',
+        'item_description': f'Breakdown item {i}', 'quantity': quantity,
+        'unit_price': round(rng.uniform(10, 2000), 2),
+        'processing_type': rng.choice(['external', 'internal', 'inventory']),
+        'item_status': rng.choice(['pending', 'ordered', 'received', 'completed']),
+        'created_at': _stamp(rng),
+    }
+
+
+def _supplier_order(rng, i, ctx):
+    quantity = rng.randrange(1, 100)
+    return {
+        'sales_process_id': _pick(rng, ctx['sales_process']), 'po_number': f'PO-{i:06d}',
+        'supplier_name': f'Supplier {i % 80}', 'item_name': f'Supply item {i}',
+        'quantity': quantity, 'unit_cost': round(rng.uniform(5, 1500), 2),
+        'currency': rng.choice(_CURRENCIES), 'status': rng.choice(_WORKFLOW),
+        'order_date': _day(rng), 'created_at': _stamp(rng),
+    }
+
+
+def _inventory_order(rng, i, ctx):
+    return {
+        'po_number': f'INV-{i:06d}', 'item_name': f'Stock item {i}',
+        'quantity': rng.randrange(1, 300), 'unit_cost': round(rng.uniform(5, 800), 2),
+        'currency': rng.choice(_CURRENCIES), 'status': rng.choice(_WORKFLOW),
+        'order_date': _day(rng), 'created_at': _stamp(rng),
+    }
+
+
+def _internal_processing(rng, i, ctx):
+    return {
+        'sales_process_id': _pick(rng, ctx['sales_process']), 'item_name': f'Internal {i}',
+        'quantity': rng.randrange(1, 50),
+        'status': rng.choice(['pending', 'processing', 'completed']),
+        'created_at': _stamp(rng),
+    }
+
+
+def _hot_runner_order(rng, i, ctx):
+    return {
+        'order_number': f"HR-{ctx['company']}-{i:06d}", 'customer_id': _pick(rng, ctx['customers']),
+        'customer_name': f'Customer {i % 400}', 'project_name': f'Project {i % 500}',
+        'part_name': f'Part {i}', 'mold_no': f'M{i:05d}',
+        'status': rng.choice(['draft', 'submitted', 'approved', 'rejected', 'completed']),
+        'created_by': _pick(rng, ctx['employees']), 'created_at': _stamp(rng),
+    }
+
+
+def _purchase(rng, i, ctx):
+    quantity = rng.randrange(1, 100)
+    return {
+        'item_name': f'Purchase item {i}', 'quantity': quantity,
+        'unit_price': round(rng.uniform(1, 500), 2), 'currency': rng.choice(_CURRENCIES),
+        'status': rng.choice(_WORKFLOW), 'requester': _pick(rng, ctx['employees']),
+        'request_date': _day(rng), 'supplier_name': f'Supplier {i % 80}',
+        'category': rng.choice(['사무용품', '부품', '공구', '소모품']), 'created_at': _stamp(rng),
+    }
+
+
+def _employee(rng, i, ctx):
+    return {
+        'employee_id': f'E{i:05d}', 'username': f'user{i}', 'name': f'직원 {i}',
+        'email': f'user{i}@ymv.example', 'department': rng.choice(_DEPARTMENTS),
+        'position': rng.choice(['사원', '대리', '과장', '차장', '부장']),
+        'role': 'Admin' if i % 50 == 1 else 'Staff', 'is_active': True,
+        'employment_status': 'active', 'company': rng.choice(ALL_COMPANY_CODES),
+        'password': LOCAL_SEED_PASSWORD_HASH, 'created_at': _stamp(rng),
+    }
+
+
+def _expense(rng, i, ctx):
+    status = rng.choice(['pending', 'approved', 'rejected'])
+    return {
+        'employee_id': _pick(rng, ctx['employees']), 'requester': _pick(rng, ctx['employees']),
+        'department': rng.choice(_DEPARTMENTS), 'expense_date': _day(rng),
+        'expense_type': rng.choice(_EXPENSE_TYPES), 'amount': round(rng.uniform(5, 3000), 2),
+        'currency': rng.choice(['USD', 'VND', 'KRW']), 'payment_method': rng.choice(['카드', '현금']),
+        'description': f'Expense {i}', 'status': status,
+        'approval_status': {'pending': '승인대기', 'approved': '승인완료', 'rejected': '반려'}[status],
+        'reimbursement_status': rng.choice(['pending', 'printed', 'completed']),
+        'document_number': f'EXP{i:07d}', 'accounting_confirmed': rng.random() > 0.5,
+        'created_at': _stamp(rng),
+    }
+
+
+# 기본 테이블명 → (행 생성 함수, 생성된 ID를 담을 컨텍스트 키)
+SEED_GENERATORS: Dict[str, Tuple[Callable, Optional[str]]] = {
+    'employees': (_employee, 'employees'),
+    'customers': (_customer, 'customers'),
+    'products': (_product, 'products'),
+    'quotations': (_quotation, 'quotations'),
+    'quotation_items': (_quotation_item, None),
+    'sales_activities': (_sales_activity, None),
+    'sales_process': (_sales_process, 'sales_process'),
+    'process_item_breakdown': (_process_item, None),
+    'purchase_orders_to_supplier': (_supplier_order, None),
+    'purchase_orders_inventory': (_inventory_order, None),
+    'internal_processing': (_internal_processing, None),
+    'hot_runner_orders': (_hot_runner_order, None),
+    'purchases': (_purchase, None),
+    'expenses': (_expense, None),
+}
+
+
+def _seed_table(ops: LocalDBOperations, table_name: str, base_table: str, rows: int,
+                rng: random.Random, ctx: Dict[str, Any]) -> int:
+    generator, id_key = SEED_GENERATORS[base_table]
+    data = []
+    for i in range(1, rows + 1):
+        row = generator(rng, i, ctx)
+        row['id'] = i
+        row.setdefault('updated_at', row.get('created_at'))
+        data.append(row)
+    with ops._store(table_name).locked() as store:
+        store.reset(data)
+        store.compact()
+    ops.invalidate_cache(table_name)
+    if id_key:
+        ctx[id_key] = [row['id'] for row in data]
+    return len(data)
+
+
+def seed_tables(ops: LocalDBOperations, table_names: Iterable[str], rows: int = 1000,
+                seed: int = 0, table_rows: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    지정한 테이블에만 합성 데이터 생성
+    테이블마다 (seed, 테이블명)으로 난수를 만들므로 다른 테이블을 함께 생성하는지와 관계없이 같은 데이터가 나온다.
+    Args:
+        table_names: 테이블명 (customers_ymv, quotations, employees ...)
+        rows: 테이블별 행 수
+        table_rows: 기본 테이블명 → 행 수 (예: 참조 테이블 employees는 작게)
+    Returns:
+        {테이블명: 행 수}
+    """
+    table_rows = table_rows or {}
+    order = {name: i for i, name in enumerate(SHARED_SEED_TABLES + COMPANY_SEED_TABLES)}
+    targets = []
+    for table_name in dict.fromkeys(table_names):
+        base_table = _COMPANY_SUFFIX.sub('', table_name)
+        if base_table not in SEED_GENERATORS:
+            logging.warning(f"합성 데이터 생성기 없음: {table_name}")
+            continue
+        suffix = table_name[len(base_table):]
+        targets.append((order.get(base_table, len(order)), table_name, base_table, suffix))
+
+    # 참조되는 테이블(직원, 고객, 제품, 견적)부터 생성
+    shared_ctx: Dict[str, Any] = {'employees': []}
+    company_ctx: Dict[str, Dict[str, Any]] = {}
+    counts = {}
+    for _, table_name, base_table, suffix in sorted(targets):
+        if base_table in SHARED_SEED_TABLES:
+            ctx = shared_ctx
+            ctx.setdefault('company', 'YMV')
+        else:
+            ctx = company_ctx.setdefault(suffix, {
+                'company': suffix[1:].upper() or 'YMV', 'customers': [], 'products': [],
+                'quotations': [], 'sales_process': []})
+            ctx['employees'] = shared_ctx['employees']
+        rng = random.Random(f'{seed}:{table_name}')
+        counts[table_name] = _seed_table(ops, table_name, base_table,
+                                         table_rows.get(base_table, rows), rng, ctx)
+    return counts
+
+
+def seed_synthetic_data(ops: LocalDBOperations, rows: int = 1000,
+                        companies: Sequence[str] = ALL_COMPANY_CODES,
+                        tables: Optional[Iterable[str]] = None, seed: int = 0,
+                        include_unsuffixed: bool = True,
+                        table_rows: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    합성 데이터 생성 (같은 seed면 항상 같은 데이터)
+    Args:
+        ops: LocalDBOperations
+        rows: 테이블별 행 수
+        companies: 법인 코드 (각 *_ymv/_ymk/_ymth/_ymc 테이블 생성)
+        tables: 생성할 기본 테이블 (None이면 전체)
+        include_unsuffixed: 접미사 없는 공용 테이블(customers, quotations 등)도 생성
+        table_rows: 기본 테이블명 → 행 수
+    Returns:
+        {테이블명: 행 수}
+    """
+    wanted = set(tables) if tables is not None else None
+    suffixes = [f'_{code.lower()}' for code in companies] + ([''] if include_unsuffixed else [])
+    names = [name for name in SHARED_SEED_TABLES if wanted is None or name in wanted]
+    names += [f'{base_table}{suffix}' for suffix in suffixes for base_table in COMPANY_SEED_TABLES
+              if wanted is None or base_table in wanted]
+    return seed_tables(ops, names, rows, seed=seed, table_rows=table_rows)
+
+
+def create_local_database_operations(data_dir: Any = None, seed_rows: int = 0, seed: int = 0,
+                                     cache_ttls: Optional[Dict[str, float]] = None,
+                                     cache_max_entries: Optional[int] = None,
+                                     use_read_cache: bool = True) -> LocalDBOperations:
+    """
+    로컬 db_operations 생성 (create_database_operations 대체)
+    Args:
+        data_dir: 파일 저장 폴더 (None이면 메모리 전용)
+        seed_rows: 0보다 크면 테이블별 합성 데이터 생성 (파일 기반이고 이미 데이터가 있으면 생략)
+    """
+    ops = LocalDBOperations(data_dir, cache_ttls=cache_ttls, cache_max_entries=cache_max_entries,
+                            use_read_cache=use_read_cache)
+    if seed_rows > 0 and not ops.engine.exists('employees'):
+        counts = seed_synthetic_data(ops, seed_rows, seed=seed)
+        logging.info(f"로컬 DB 합성 데이터 생성: {len(counts)}개 테이블, 테이블당 {seed_rows}행")
+    ops.reset_metrics()
+    return ops
@@ -0,0 +1,367 @@
+"""
+YMV ERP 시스템 물류 납기 통계 집계
+Delivery statistics rollup for logistics_imports
+
+납기 대시보드의 통계(전체/물류사별/지연 원인/구간별)는 모두 아래 한 가지
+요약 결과(rollup)에서 계산한다.
+    (물류사, 지연 등급, 지연 여부, 지연 사유, 책임 주체) 그룹별
+    건수, 지연일 합계/최대, 구간별 소요일 합계/건수
+
+- 기본: Supabase RPC(logistics_delivery_rollup)가 DB에서 GROUP BY 후 작은 결과만 반환
+- RPC가 없으면 필요한 컬럼만 한 번 조회해 같은 집계를 Python으로 계산
+- 기간별 rollup은 짧은 TTL로 공유하므로 대시보드가 연달아 호출해도 한 번만 조회
+- SQLiteLogisticsBackend는 같은 SQL을 메모리 SQLite에서 실행하는 오프라인 대체 구현
+
+DB 측 준비 (Supabase SQL Editor에서 1회 실행):
+    ROLLUP_FUNCTION_SQL (print(ROLLUP_FUNCTION_SQL)로 출력) 과 아래 인덱스
+
+    create index if not exists idx_logistics_imports_shipping_date
+        on logistics_imports (shipping_date);
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+# 집계 RPC 이름
+ROLLUP_RPC = 'logistics_delivery_rollup'
+
+# RPC가 없을 때 조회하는 컬럼
+LOGISTICS_STAT_COLUMNS = (
+    "logistics_provider_name,delay_severity,is_delayed,delay_reason_detail,"
+    "delay_responsible_party,lead_time_difference_days,"
+    "shipping_to_port_days,port_to_arrival_days,customs_clearance_days"
+)
+
+# Postgres 함수와 SQLite 대체 구현이 공유하는 집계 SQL
+ROLLUP_SQL = """
+    select
+        cast(logistics_provider_name as text) as provider,
+        cast(delay_severity as text) as delay_severity,
+        coalesce(is_delayed, false) as is_delayed,
+        cast(coalesce(delay_reason_detail, '미분류') as text) as delay_reason,
+        cast(coalesce(delay_responsible_party, '미정') as text) as responsible,
+        count(*) as row_count,
+        cast(sum(coalesce(lead_time_difference_days, 0)) as numeric) as delay_sum,
+        cast(max(coalesce(lead_time_difference_days, 0)) as numeric) as delay_max,
+        cast(sum(case when shipping_to_port_days <> 0 then shipping_to_port_days end) as numeric) as port_sum,
+        count(case when shipping_to_port_days <> 0 then 1 end) as port_count,
+        cast(sum(case when port_to_arrival_days <> 0 then port_to_arrival_days end) as numeric) as arrival_sum,
+        count(case when port_to_arrival_days <> 0 then 1 end) as arrival_count,
+        cast(sum(case when customs_clearance_days <> 0 then customs_clearance_days end) as numeric) as customs_sum,
+        count(case when customs_clearance_days <> 0 then 1 end) as customs_count
+    from logistics_imports
+    where shipping_date >= {cutoff}
+    group by 1, 2, 3, 4, 5
+"""
+
+# Supabase에 생성할 RPC 함수
+ROLLUP_FUNCTION_SQL = f"""
+create or replace function {ROLLUP_RPC}(p_cutoff timestamptz)
+returns table (
+    provider text, delay_severity text, is_delayed boolean,
+    delay_reason text, responsible text, row_count bigint,
+    delay_sum numeric, delay_max numeric,
+    port_sum numeric, port_count bigint,
+    arrival_sum numeric, arrival_count bigint,
+    customs_sum numeric, customs_count bigint
+) language sql stable as $$
+{ROLLUP_SQL.format(cutoff='p_cutoff')}
+$$;
+"""
+
+# 대시보드 기간 → 일 수
+PERIOD_DAYS = {
+    "이번 달": 30,
+    "최근 1개월": 30,
+    "최근 3개월": 90,
+    "최근 6개월": 180,
+    "올해": 365,
+}
+
+# 기간별 rollup 공유 시간 (초)
+ROLLUP_TTL_SECONDS = 60
+
+# 구간 이름 → (rollup 접두사, 표준 소요일)
+SECTION_STANDARDS = {
+    '출고→항구': ('port', 1.0),
+    '항구→도착': ('arrival', 2.0),
+    '통관 처리': ('customs', 1.0),
+}
+
+RESPONSIBLE_LABELS = {
+    'customs': '세관',
+    'logistics_provider': '물류사',
+    'supplier': '공급업체',
+    'force_majeure': '불가항력'
+}
+
+_SECTION_FIELDS = {
+    'port': 'shipping_to_port_days',
+    'arrival': 'port_to_arrival_days',
+    'customs': 'customs_clearance_days',
+}
+
+
+def period_days(period: str) -> int:
+    return PERIOD_DAYS.get(period, 30)
+
+
+def cutoff_for(days: int, now: Optional[datetime] = None) -> str:
+    return ((now or datetime.now()) - timedelta(days=days)).isoformat()
+
+
+# ==========================================
+# rollup 계산 (Python / SQLite)
+# ==========================================
+
+def _coalesce(value: Any, default: Any) -> Any:
+    return default if value is None else value
+
+
+def python_rollup(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """원본 행 → rollup (ROLLUP_SQL과 같은 결과)"""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for item in rows:
+        key = (
+            item.get('logistics_provider_name'),
+            item.get('delay_severity'),
+            bool(item.get('is_delayed')),
+            _coalesce(item.get('delay_reason_detail'), '미분류'),
+            _coalesce(item.get('delay_responsible_party'), '미정'),
+        )
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                'provider': key[0], 'delay_severity': key[1], 'is_delayed': key[2],
+                'delay_reason': key[3], 'responsible': key[4],
+                'row_count': 0, 'delay_sum': 0.0, 'delay_max': None,
+                'port_sum': 0.0, 'port_count': 0,
+                'arrival_sum': 0.0, 'arrival_count': 0,
+                'customs_sum': 0.0, 'customs_count': 0,
+            }
+        delay = float(item.get('lead_time_difference_days') or 0)
+        group['row_count'] += 1
+        group['delay_sum'] += delay
+        group['delay_max'] = delay if group['delay_max'] is None else max(group['delay_max'], delay)
+        for prefix, field in _SECTION_FIELDS.items():
+            value = item.get(field)
+            if value:
+                group[f'{prefix}_sum'] += float(value)
+                group[f'{prefix}_count'] += 1
+    return list(groups.values())
+
+
+class SQLiteLogisticsBackend:
+    """
+    메모리 SQLite에 logistics_imports 행을 적재하고 ROLLUP_SQL을 실행하는 오프라인 백엔드
+    DB 없이 집계 SQL과 통계 계산을 점검할 때 사용한다.
+    """
+
+    COLUMNS = (
+        'shipping_date', 'logistics_provider_name', 'delay_severity', 'is_delayed',
+        'delay_reason_detail', 'delay_responsible_party', 'lead_time_difference_days',
+        'shipping_to_port_days', 'port_to_arrival_days', 'customs_clearance_days',
+    )
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(f"create table logistics_imports ({', '.join(self.COLUMNS)})")
+        self._conn.executemany(
+            f"insert into logistics_imports values ({', '.join('?' for _ in self.COLUMNS)})",
+            [tuple(row.get(c) for c in self.COLUMNS) for row in rows]
+        )
+
+    def rollup(self, cutoff: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(ROLLUP_SQL.format(cutoff='?'), (cutoff,))
+            names = [d[0] for d in cursor.description]
+            result = [dict(zip(names, row)) for row in cursor.fetchall()]
+        for row in result:
+            row['is_delayed'] = bool(row['is_delayed'])
+        return result
+
+
+class SupabaseLogisticsBackend:
+    """RPC 집계 → 실패 시 프로젝션 조회 + Python 집계"""
+
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None, use_rpc: bool = True):
+        self._client_factory = client_factory
+        self._rpc_available = use_rpc
+
+    def _client(self):
+        if self._client_factory is not None:
+            return self._client_factory()
+        from utils.connection_pool import get_shared_client
+        return get_shared_client()
+
+    def rollup(self, cutoff: str) -> List[Dict[str, Any]]:
+        if self._rpc_available:
+            try:
+                return self._client().rpc(ROLLUP_RPC, {'p_cutoff': cutoff}).execute().data or []
+            except Exception as e:
+                logging.warning(f"물류 통계 RPC 사용 불가, 조회 후 집계로 전환: {str(e)}")
+                self._rpc_available = False
+        response = self._client().table('logistics_imports')\
+            .select(LOGISTICS_STAT_COLUMNS)\
+            .gte('shipping_date', cutoff)\
+            .execute()
+        return python_rollup(response.data or [])
+
+
+class LogisticsStatsService:
+    """기간별 rollup 공유 (짧은 TTL)"""
+
+    def __init__(self, backend=None, ttl: float = ROLLUP_TTL_SECONDS):
+        self.backend = backend or SupabaseLogisticsBackend()
+        self.ttl = ttl
+        self._cache: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def rollup(self, days: int) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(days)
+            if cached and cached[0] > now:
+                return cached[1]
+        rows = self.backend.rollup(cutoff_for(days))
+        with self._lock:
+            self._cache[days] = (now + self.ttl, rows)
+        return rows
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# ==========================================
+# rollup → 통계
+# ==========================================
+
+def _for_provider(rollup: List[Dict[str, Any]], provider: Optional[str]) -> List[Dict[str, Any]]:
+    if provider and provider != "전체":
+        return [g for g in rollup if g['provider'] == provider]
+    return rollup
+
+
+def delivery_statistics(rollup: List[Dict[str, Any]], provider: Optional[str] = None) -> Dict[str, Any]:
+    """전체 납기 통계"""
+    groups = _for_provider(rollup, provider)
+    by_severity = defaultdict(int)
+    delayed_count = 0
+    delayed_sum = 0.0
+    for g in groups:
+        by_severity[g['delay_severity']] += g['row_count']
+        if g['is_delayed']:
+            delayed_count += g['row_count']
+            delayed_sum += float(g['delay_sum'] or 0)
+    return {
+        'total': sum(g['row_count'] for g in groups),
+        'on_time': by_severity['on_time'],
+        'minor': by_severity['minor'],
+        'major': by_severity['major'],
+        'critical': by_severity['critical'],
+        'avg_delay': delayed_sum / delayed_count if delayed_count else 0,
+        'max_delay': max((float(g['delay_max'] or 0) for g in groups), default=0),
+        'rate_change': 0
+    }
+
+
+def provider_delivery_stats(rollup: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """물류사별 정시율/평균 지연"""
+    providers: Dict[str, Dict[str, float]] = {}
+    for g in rollup:
+        if not g['provider']:
+            continue
+        stats = providers.setdefault(g['provider'], {'total': 0, 'on_time': 0, 'delayed': 0, 'delay_sum': 0.0})
+        stats['total'] += g['row_count']
+        if g['delay_severity'] == 'on_time':
+            stats['on_time'] += g['row_count']
+        if g['is_delayed']:
+            stats['delayed'] += g['row_count']
+            stats['delay_sum'] += float(g['delay_sum'] or 0)
+
+    result = []
+    for provider, stats in providers.items():
+        on_time_rate = (stats['on_time'] / stats['total'] * 100) if stats['total'] > 0 else 0
+        avg_delay = stats['delay_sum'] / stats['delayed'] if stats['delayed'] else 0
+
+        if on_time_rate >= 80:
+            reliability = '⭐⭐⭐⭐'
+        elif on_time_rate >= 60:
+            reliability = '⭐⭐⭐'
+        else:
+            reliability = '⭐⭐'
+
+        result.append({
+            'provider': provider,
+            'total': stats['total'],
+            'on_time_rate': round(on_time_rate, 1),
+            'avg_delay': round(avg_delay, 1),
+            'reliability': reliability
+        })
+    return sorted(result, key=lambda x: (-x['on_time_rate'], x['provider']))
+
+
+def top_delay_causes(rollup: List[Dict[str, Any]], provider: Optional[str] = None,
+                     limit: int = 5) -> List[Dict[str, Any]]:
+    """지연 사유별 건수 상위 (책임 주체는 사유 안에서 가장 많은 값)"""
+    causes: Dict[str, Dict[str, Any]] = {}
+    for g in _for_provider(rollup, provider):
+        if not g['is_delayed']:
+            continue
+        cause = causes.setdefault(g['delay_reason'], {'count': 0, 'delay_sum': 0.0, 'responsible': defaultdict(int)})
+        cause['count'] += g['row_count']
+        cause['delay_sum'] += float(g['delay_sum'] or 0)
+        cause['responsible'][g['responsible']] += g['row_count']
+
+    result = []
+    for reason, stats in sorted(causes.items(), key=lambda x: (-x[1]['count'], str(x[0])))[:limit]:
+        responsible = max(stats['responsible'].items(), key=lambda x: (x[1], str(x[0])))[0]
+        result.append({
+            'reason_name': reason,
+            'count': stats['count'],
+            'avg_delay': round(stats['delay_sum'] / stats['count'], 1) if stats['count'] else 0,
+            'responsible': RESPONSIBLE_LABELS.get(responsible, responsible)
+        })
+    return result
+
+
+def section_analysis(rollup: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """구간별 평균 소요일 vs 표준"""
+    result = []
+    for section, (prefix, standard) in SECTION_STANDARDS.items():
+        count = sum(g[f'{prefix}_count'] or 0 for g in rollup)
+        if not count:
+            continue
+        actual = sum(float(g[f'{prefix}_sum'] or 0) for g in rollup) / count
+        diff = actual - standard
+
+        if diff <= 0.2:
+            status = "✅ 정상"
+        elif diff <= 1:
+            status = "⚠️ 주의"
+        else:
+            status = "🔴 병목"
+
+        result.append({
+            'section': section,
+            'standard': standard,
+            'actual': round(actual, 1),
+            'difference': round(diff, 1),
+            'status': status
+        })
+    return result
+
+
+# 프로세스 전역 서비스
+_service = LogisticsStatsService()
+
+
+def get_logistics_stats_service() -> LogisticsStatsService:
+    return _service
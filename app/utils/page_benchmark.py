@@ -0,0 +1,310 @@
+"""
+YMV ERP 시스템 페이지 벤치마크
+Headless page benchmark: AppTest + seeded local backend
+
+각 show_* 페이지를 Streamlit AppTest로 화면 없이 실행하고,
+합성 데이터를 넣은 로컬 백엔드(utils/local_backend.py)로 네트워크 없이 측정한다.
+
+페이지 × 데이터 크기마다 기록:
+    wall_ms         페이지 1회 실행 시간 (읽기 캐시를 비운 상태, 반복 측정의 중앙값,
+                    bytes_read 계산 시간 제외)
+    db_calls        load/save/update 등 DB 호출 수 (연산별 calls 포함)
+    rows_read       읽은 행 수
+    bytes_read      읽은 데이터 크기 (JSON 직렬화 기준)
+    peak_memory_mb  tracemalloc 최대 사용량 (별도 1회 실행)
+    exceptions      페이지에서 발생한 예외 메시지
+
+결과는 JSON 파일로 저장하며 --baseline으로 이전 결과와 비교할 수 있다.
+
+사용:
+    python -m utils.page_benchmark                               # 전체 페이지, 1k/10k/100k
+    python -m utils.page_benchmark --sizes 1000 10000 --pages customers quotations
+    python -m utils.page_benchmark --output bench.json --baseline bench_prev.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from utils.local_backend import LocalDBOperations, create_local_database_operations, seed_tables
+
+# 기본 데이터 크기 (테이블당 행 수)
+BENCHMARK_SIZES = (1_000, 10_000, 100_000)
+
+# 참조 테이블은 데이터 크기와 관계없이 고정 행 수
+REFERENCE_TABLE_ROWS = {'employees': 300, 'products': 2_000}
+
+# 페이지 1회 실행 제한 시간 (초)
+PAGE_TIMEOUT_SECONDS = 600
+
+# 벤치마크 사용자 법인
+BENCHMARK_COMPANY = 'YMV'
+
+# AppTest 스크립트가 실행할 페이지 (같은 프로세스에서 실행되므로 모듈 전역으로 전달)
+_ACTIVE: Dict[str, Any] = {}
+
+
+def _run_customers(ops: LocalDBOperations, user: Dict[str, Any]):
+    from components.sales.customer_management import show_customer_management
+    show_customer_management(ops.load_data, ops.save_data, ops.update_data, ops.delete_data,
+                             user, bulk_save_func=ops.bulk_save_data)
+
+
+def _run_quotations(ops: LocalDBOperations, user: Dict[str, Any]):
+    from components.sales.quotation_management import show_quotation_management
+    show_quotation_management(ops.save_data, ops.load_data, ops.update_data, ops.delete_data, user)
+
+
+def _run_sales_activity(ops: LocalDBOperations, user: Dict[str, Any]):
+    from components.sales.sales_activity import show_sales_activity
+    show_sales_activity(ops.load_data, ops.save_data, ops.update_data, ops.delete_data,
+                        ops.load_data, user)
+
+
+def _run_expenses(ops: LocalDBOperations, user: Dict[str, Any]):
+    from components.finance.expense_management import show_expense_management
+    from utils.helpers import (
+        get_approval_status_info, calculate_expense_statistics, create_csv_download, render_print_form
+    )
+    show_expense_management(ops.load_data, ops.save_data, ops.update_data, ops.delete_data,
+                            lambda: user, get_approval_status_info, calculate_expense_statistics,
+                            create_csv_download, render_print_form, user,
+                            bulk_update_func=ops.bulk_update)
+
+
+def _run_dashboard(ops: LocalDBOperations, user: Dict[str, Any]):
+    from components.dashboard import show_dashboard_main
+    show_dashboard_main(ops.load_data, lambda: user)
+
+
+def _run_hot_runner(ops: LocalDBOperations, user: Dict[str, Any]):
+    from components.specifications.hot_runner_order_sheet import show_hot_runner_order_management
+    show_hot_runner_order_management(ops.load_data, ops.save_data, ops.update_data, user)
+
+
+# 페이지 이름 → (show_* 함수 이름, 실행 함수, 필요한 테이블 ({c}: 법인 접미사))
+PAGES: Dict[str, Dict[str, Any]] = {
+    'customers': {
+        'entry': 'show_customer_management', 'run': _run_customers,
+        'tables': ['customers_{c}', 'quotations'],
+    },
+    'quotations': {
+        'entry': 'show_quotation_management', 'run': _run_quotations,
+        'tables': ['employees', 'customers_{c}', 'products_{c}', 'quotations_{c}', 'quotation_items_{c}'],
+    },
+    'sales_activity': {
+        'entry': 'show_sales_activity', 'run': _run_sales_activity,
+        'tables': ['employees', 'customers_{c}', 'sales_activities_{c}'],
+    },
+    'expenses': {
+        'entry': 'show_expense_management', 'run': _run_expenses,
+        'tables': ['employees', 'expenses', 'purchases_{c}'],
+    },
+    'dashboard': {
+        'entry': 'show_dashboard_main', 'run': _run_dashboard,
+        'tables': ['employees', 'expenses', 'purchases', 'quotations'],
+    },
+    'hot_runner': {
+        'entry': 'show_hot_runner_order_management', 'run': _run_hot_runner,
+        'tables': ['employees', 'customers', 'quotations', 'hot_runner_orders_{c}'],
+    },
+}
+
+
+def benchmark_user(ops: LocalDBOperations, company: str = BENCHMARK_COMPANY) -> Dict[str, Any]:
+    """승인 탭까지 보이도록 CEO 권한의 직원 계정 (합성 직원 1번 기준)"""
+    employees = ops.load_data('employees', filters={'id': 1}, use_cache=False)
+    user = dict(employees[0]) if employees else {'id': 1, 'name': 'benchmark', 'employee_id': 'E00001'}
+    user.update({'role': 'CEO', 'company': company, 'user_type': 'employee',
+                 'is_corporate': False, 'is_super_admin': False})
+    return user
+
+
+def render_benchmark_page():
+    """AppTest 스크립트 본문: 세션에 로그인 사용자를 넣고 지정된 페이지 실행"""
+    import streamlit as st
+
+    ops, user = _ACTIVE['ops'], _ACTIVE['user']
+    st.session_state.current_user = user
+    st.session_state.logged_in = True
+    st.session_state.user_type = 'employee'
+    PAGES[_ACTIVE['page']]['run'](ops, user)
+
+
+def _benchmark_app():
+    from utils.page_benchmark import render_benchmark_page
+    render_benchmark_page()
+
+
+def _run_once(timeout: float):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(_benchmark_app, default_timeout=timeout)
+    started = time.perf_counter()
+    app.run(timeout=timeout)
+    return app, (time.perf_counter() - started) * 1000
+
+
+def _exception_messages(app) -> List[str]:
+    messages = []
+    for element in app.exception:
+        messages.append(str(getattr(element, 'message', element)))
+    return messages
+
+
+def benchmark_page(page: str, ops: LocalDBOperations, user: Dict[str, Any],
+                   repeat: int = 3, timeout: float = PAGE_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """
+    페이지 1개 측정 (매 실행 전 읽기 캐시/지표 초기화 → 콜드 로드 기준)
+    """
+    _ACTIVE.update({'page': page, 'ops': ops, 'user': user})
+    try:
+        timings = []
+        metrics = {}
+        app = None
+        for _ in range(max(repeat, 1)):
+            ops.invalidate_cache()
+            ops.reset_metrics()
+            app, elapsed_ms = _run_once(timeout)
+            metrics = ops.get_metrics()
+            # bytes_read 계산(JSON 직렬화) 시간은 페이지 시간에서 제외
+            timings.append(elapsed_ms - metrics.get('measure_ms', 0.0))
+
+        # 메모리 추적은 실행 시간을 늘리므로 별도 1회 실행
+        ops.invalidate_cache()
+        tracemalloc.start()
+        try:
+            _run_once(timeout)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        _ACTIVE.clear()
+
+    return {
+        'page': page,
+        'entry': PAGES[page]['entry'],
+        'wall_ms': round(statistics.median(timings), 1),
+        'wall_ms_runs': [round(t, 1) for t in timings],
+        'db_calls': metrics.get('db_calls', 0),
+        'calls': metrics.get('calls', {}),
+        'rows_read': metrics.get('rows_read', 0),
+        'bytes_read': metrics.get('bytes_read', 0),
+        'db_ms': round(metrics.get('db_ms', 0.0), 1),
+        'peak_memory_mb': round(peak / (1024 * 1024), 1),
+        'tables': metrics.get('tables', {}),
+        'exceptions': _exception_messages(app) if app is not None else [],
+    }
+
+
+def run_benchmarks(pages: Optional[Sequence[str]] = None, sizes: Sequence[int] = BENCHMARK_SIZES,
+                   repeat: int = 3, seed: int = 0, company: str = BENCHMARK_COMPANY,
+                   timeout: float = PAGE_TIMEOUT_SECONDS,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    페이지 × 데이터 크기 전체 측정
+    페이지마다 필요한 테이블만 새로 생성하므로 100k 행에서도 메모리 사용이 제한된다.
+    Returns:
+        JSON으로 저장할 결과 (환경 정보 + results 목록)
+    """
+    import streamlit
+
+    pages = list(pages or PAGES)
+    unknown = [page for page in pages if page not in PAGES]
+    if unknown:
+        raise ValueError(f"알 수 없는 페이지: {unknown} (사용 가능: {list(PAGES)})")
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = []
+    for size in sizes:
+        for page in pages:
+            ops = create_local_database_operations()
+            tables = [name.format(c=company.lower()) for name in PAGES[page]['tables']]
+            seed_started = time.perf_counter()
+            counts = seed_tables(ops, tables, rows=size, seed=seed, table_rows=REFERENCE_TABLE_ROWS)
+            seed_ms = (time.perf_counter() - seed_started) * 1000
+            result = benchmark_page(page, ops, benchmark_user(ops, company), repeat, timeout)
+            result.update({'rows': size, 'seeded': counts, 'seed_ms': round(seed_ms, 1)})
+            results.append(result)
+            if progress:
+                progress(result)
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'platform': platform.platform(),
+        'sizes': list(sizes),
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    두 결과 파일 비교 (같은 페이지/행 수끼리)
+    Returns: [{page, rows, metric: (이전, 현재, 변화율 %)}]
+    """
+    previous = {(r['page'], r['rows']): r for r in baseline.get('results', [])}
+    diffs = []
+    for result in current.get('results', []):
+        before = previous.get((result['page'], result['rows']))
+        if before is None:
+            continue
+        row = {'page': result['page'], 'rows': result['rows']}
+        for metric in ('wall_ms', 'db_calls', 'bytes_read', 'peak_memory_mb'):
+            old, new = before.get(metric), result.get(metric)
+            change = round((new - old) / old * 100, 1) if old else None
+            row[metric] = (old, new, change)
+        diffs.append(row)
+    return diffs
+
+
+def _print_result(result: Dict[str, Any]):
+    status = f" 예외 {len(result['exceptions'])}건" if result['exceptions'] else ""
+    print(f"{result['page']:<15} {result['rows']:>8,}행  {result['wall_ms']:>9.1f}ms  "
+          f"DB {result['db_calls']:>4}회  {result['bytes_read'] / 1024:>10.1f}KB  "
+          f"peak {result['peak_memory_mb']:>7.1f}MB{status}", flush=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="YMV 페이지 벤치마크 (AppTest + 로컬 백엔드)")
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), help="측정할 페이지 (기본 전체)")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(BENCHMARK_SIZES), help="테이블당 행 수")
+    parser.add_argument('--repeat', type=int, default=3, help="페이지별 반복 측정 횟수")
+    parser.add_argument('--seed', type=int, default=0, help="합성 데이터 seed")
+    parser.add_argument('--output', default='page_benchmark.json', help="결과 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.pages, args.sizes, repeat=args.repeat, seed=args.seed,
+                            progress=_print_result)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        for diff in compare_results(baseline, report):
+            changes = ", ".join(f"{metric} {old}→{new} ({change:+}%)" if change is not None
+                                else f"{metric} {old}→{new}"
+                                for metric, (old, new, change) in
+                                ((k, v) for k, v in diff.items() if isinstance(v, tuple)))
+            print(f"{diff['page']:<15} {diff['rows']:>8,}행  {changes}")
+
+    failed = [r for r in report['results'] if r['exceptions']]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    # AppTest 스크립트가 import하는 utils.page_benchmark 모듈과 같은 _ACTIVE를 쓰도록 모듈 경유로 실행
+    from utils.page_benchmark import main as _main
+    sys.exit(_main())
@@ -0,0 +1,265 @@
+"""
+YMV ERP 시스템 페이지 레지스트리
+Lazy page loading for main.py
+
+메뉴 이름 → (모듈 경로, 함수 이름)을 등록해 두고, current_page가 메뉴를 선택했을 때
+처음으로 모듈을 import한다. 이후에는 가져온 함수를 캐시해 그대로 사용한다.
+로그인 화면과 워커 시작 시에는 페이지 컴포넌트(pandas/plotly 포함)를 import하지 않는다.
+
+import 시간 확인:
+- 앱 안: 페이지를 처음 불러올 때 걸린 시간과 새로 로드된 모듈 수를 기록 (get_page_load_report)
+- 오프라인: python -m utils.page_registry
+  페이지마다 새 인터프리터에서 `python -X importtime -c "import <모듈>"`을 실행해
+  누적 import 시간과 무거운 모듈 상위 N개를 보여준다.
+  시작 경로(STARTUP_MODULES: 로그인 화면까지 필요한 모듈)를 기준선으로 빼서
+  페이지 고유 비용을 따로 표시한다.
+
+    python -m utils.page_registry --pages "대시보드" "지출 요청서" --top 5
+"""
+
+import argparse
+import importlib
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 메뉴 이름 → (모듈 경로, 페이지 함수/클래스 이름)
+PAGE_MODULES: Dict[str, Tuple[str, str]] = {
+    "대시보드": ('components.dashboard.dashboard', 'show_dashboard_main'),
+    "고객 관리": ('components.sales.customer_management', 'show_customer_management'),
+    "영업 활동 관리": ('components.sales.sales_activity', 'show_sales_activity'),
+    "견적서 관리": ('components.sales.quotation_management', 'show_quotation_management'),
+    "규격 결정서": ('components.specifications.hot_runner_order_sheet', 'show_hot_runner_order_management'),
+    "규격결정서 승인": ('components.specifications.spec_decision_approval', 'spec_decision_approval'),
+    "실적 관리": ('components.sales.performance_management', 'show_performance_management'),
+    "영업 프로세스": ('components.sales.sales_process_main', 'show_sales_process_management'),
+    "제품 코드 관리": ('components.product.product_code_management', 'show_product_code_management'),
+    "제품 관리": ('components.product.product_management', 'show_product_management'),
+    "공급업체 관리": ('components.supplier.supplier_management', 'show_supplier_management'),
+    "구매품 관리": ('components.operations.purchase_management', 'show_purchase_management'),
+    "물류사 관리": ('components.logistics.logistics_management', 'show_logistics_management'),
+    "직원 관리": ('components.hr.employee_management', 'show_employee_management'),
+    "법인 계정 관리": ('components.hr.corporate_account_management', 'show_corporate_account_management'),
+    "지출 요청서": ('components.finance.expense_management', 'show_expense_management'),
+    "환급 관리": ('components.finance.reimbursement_management', 'show_reimbursement_management'),
+    "다국어 입력": ('components.system.multilingual_input', 'MultilingualInputComponent'),
+}
+
+# 로그인 화면까지 main.py가 import하는 모듈 (importtime 기준선)
+STARTUP_MODULES = (
+    'streamlit',
+    'config.config_settings',
+    'utils.connection_pool',
+    'utils.database',
+    'utils.local_backend',
+    'utils.auth',
+    'utils.page_registry',
+)
+
+STARTUP_LABEL = '(시작)'
+
+# 앱 루트 (components/, utils/가 있는 디렉터리)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# -X importtime 출력 행: "import time:  self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S.*)$')
+
+
+class PageRegistry:
+    """
+    메뉴별 페이지 함수를 처음 사용할 때 import하고 캐시
+    """
+
+    def __init__(self, pages: Optional[Dict[str, Tuple[str, str]]] = None):
+        self.pages = dict(PAGE_MODULES if pages is None else pages)
+        self._loaded: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.pages
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def get(self, name: str) -> Any:
+        """
+        메뉴 이름 → 페이지 함수 (처음 호출 시 모듈 import)
+        등록되지 않은 메뉴면 KeyError
+        """
+        page = self._loaded.get(name)
+        if page is not None:
+            return page
+
+        module_path, attribute = self.pages[name]
+        with self._lock:
+            page = self._loaded.get(name)
+            if page is not None:
+                return page
+            modules_before = len(sys.modules)
+            started = time.perf_counter()
+            module = importlib.import_module(module_path)
+            import_ms = (time.perf_counter() - started) * 1000
+            page = getattr(module, attribute)
+            self._loaded[name] = page
+            self._stats[name] = {
+                'page': name,
+                'module': module_path,
+                'import_ms': round(import_ms, 1),
+                'new_modules': len(sys.modules) - modules_before,
+            }
+        logging.info(f"페이지 로드: {name} ({module_path}) {import_ms:.1f}ms, "
+                     f"새 모듈 {self._stats[name]['new_modules']}개")
+        return page
+
+    def load_report(self) -> List[Dict[str, Any]]:
+        """이 프로세스에서 불러온 페이지별 import 시간 (불러온 순서)"""
+        return [dict(stats) for stats in self._stats.values()]
+
+
+# 프로세스 전역 레지스트리
+_registry = PageRegistry()
+
+
+def get_page_registry() -> PageRegistry:
+    """전역 페이지 레지스트리 반환"""
+    return _registry
+
+
+def get_page(name: str) -> Any:
+    """메뉴 이름 → 페이지 함수 (PageRegistry.get 참고)"""
+    return _registry.get(name)
+
+
+def get_page_load_report() -> List[Dict[str, Any]]:
+    """전역 레지스트리에서 불러온 페이지별 import 시간"""
+    return _registry.load_report()
+
+
+# ============================================
+# -X importtime 프로파일
+# ============================================
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    -X importtime 출력 → [{'module', 'self_ms', 'cumulative_ms', 'depth'}, ...]
+    """
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            'module': module.strip(),
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'depth': len(indent) // 2,
+        })
+    return entries
+
+
+def profile_imports(modules: Sequence[str], python: str = sys.executable,
+                    cwd: str = APP_DIR, timeout: float = 120) -> Dict[str, Any]:
+    """
+    새 인터프리터에서 modules를 import하며 -X importtime 측정
+    Returns: {'ok', 'total_ms', 'entries', 'error'}
+    """
+    code = '; '.join(f'import {module}' for module in modules)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (cwd, env.get('PYTHONPATH')) if p)
+    try:
+        proc = subprocess.run([python, '-X', 'importtime', '-c', code], cwd=cwd, env=env,
+                              capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'ok': False, 'total_ms': 0.0, 'entries': [], 'error': f'timeout ({timeout}s)'}
+
+    entries = parse_importtime(proc.stderr)
+    error = None
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        error = lines[-1] if lines else f'exit {proc.returncode}'
+    return {
+        'ok': proc.returncode == 0,
+        'total_ms': round(sum(entry['self_ms'] for entry in entries), 1),
+        'entries': entries,
+        'error': error,
+    }
+
+
+def profile_pages(pages: Optional[Sequence[str]] = None, top: int = 10,
+                  python: str = sys.executable) -> List[Dict[str, Any]]:
+    """
+    페이지별 import 시간 보고
+    첫 행은 시작 경로(STARTUP_MODULES), 이후 페이지마다
+    전체 시간 / 시작 경로에 없는 모듈만 합한 페이지 고유 시간 / 고유 모듈 중 누적 시간 상위 top개
+    """
+    startup = profile_imports(STARTUP_MODULES, python=python)
+    startup_modules = {entry['module'] for entry in startup['entries']}
+    report = [{
+        'page': STARTUP_LABEL,
+        'module': ', '.join(STARTUP_MODULES),
+        'ok': startup['ok'],
+        'total_ms': startup['total_ms'],
+        'page_ms': startup['total_ms'],
+        'modules': len(startup['entries']),
+        'top': _top_entries(startup['entries'], top),
+        'error': startup['error'],
+    }]
+
+    for name in pages or list(PAGE_MODULES):
+        module_path, _ = PAGE_MODULES[name]
+        result = profile_imports(STARTUP_MODULES + (module_path,), python=python)
+        own = [entry for entry in result['entries'] if entry['module'] not in startup_modules]
+        report.append({
+            'page': name,
+            'module': module_path,
+            'ok': result['ok'],
+            'total_ms': result['total_ms'],
+            'page_ms': round(sum(entry['self_ms'] for entry in own), 1),
+            'modules': len(own),
+            'top': _top_entries(own, top),
+            'error': result['error'],
+        })
+    return report
+
+
+def _top_entries(entries: List[Dict[str, Any]], top: int) -> List[Tuple[str, float, float]]:
+    ranked = sorted(entries, key=lambda entry: entry['cumulative_ms'], reverse=True)[:top]
+    return [(entry['module'], round(entry['self_ms'], 1), round(entry['cumulative_ms'], 1))
+            for entry in ranked]
+
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    """profile_pages 결과 → 텍스트 표"""
+    lines = [f"{'page':<16} {'total_ms':>9} {'page_ms':>9} {'modules':>8}  module"]
+    for row in report:
+        lines.append(f"{row['page']:<16} {row['total_ms']:>9.1f} {row['page_ms']:>9.1f} "
+                     f"{row['modules']:>8}  {row['module']}")
+        if row['error']:
+            lines.append(f"    ! {row['error']}")
+        for module, self_ms, cumulative_ms in row['top']:
+            lines.append(f"    {cumulative_ms:>9.1f} ms (self {self_ms:.1f})  {module}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="페이지별 import 시간 (-X importtime)")
+    parser.add_argument('--pages', nargs='*', choices=list(PAGE_MODULES),
+                        help="측정할 메뉴 이름 (기본: 전체)")
+    parser.add_argument('--top', type=int, default=10, help="페이지별 표시할 무거운 모듈 수")
+    parser.add_argument('--python', default=sys.executable, help="측정에 사용할 인터프리터")
+    args = parser.parse_args(argv)
+
+    report = profile_pages(args.pages, top=args.top, python=args.python)
+    print(format_report(report))
+    return 0 if all(row['ok'] for row in report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
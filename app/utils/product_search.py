@@ -0,0 +1,461 @@
+"""
+YMV ERP 시스템 제품 검색 인덱스
+In-process product search index (codes + multilingual names)
+
+제품 선택 화면에서 키 입력마다 전체 제품의 코드/이름 문자열을 만들어 부분 문자열을 찾던 방식을
+프로세스 안의 인덱스 조회로 바꾼다.
+
+- 정규화: 소문자화 + 베트남어 성조/악센트 제거 (NFD 후 결합 문자 제거, đ → d).
+  "khuon", "KHUÔN", "Khuôn" 모두 같은 토큰이 되며 한글/태국어는 그대로 유지된다.
+- 토큰: 정규화한 코드/이름을 문자·숫자 단위로 나눈 것
+  (HRS-YMO-ST-1-MCC-01-00 → hrs, ymo, st, 1, mcc, 01, 00)
+- 인덱스
+  * 토큰 → 제품 (정확히 일치)
+  * 정렬된 토큰 목록 (bisect로 접두어 범위 조회, 접두어 트리 대신 사용)
+  * 토큰 trigram → 토큰 (3글자 이상 검색어의 토큰 내부 부분 일치)
+  * 정렬된 제품 코드 목록 (코드 전체 일치 / 코드 접두어)
+  * 코드순으로 이어 붙인 코드 문자열 ('-'를 넘는 코드 부분 일치, str.find로 조회)
+- 검색어의 모든 토큰이 일치해야 결과에 포함 (AND). 코드에 검색어 전체가 들어 있으면 토큰과 관계없이 포함
+  ('O-ST', 'MO-S', '12' → HRS-YMO-ST-1-MCC-01-0012).
+- 순위: 코드 일치 → 코드 접두어 → 토큰 일치 → 토큰 접두어 → 토큰 내부 부분 일치 → 코드 부분 일치,
+  같은 순위는 제품 코드순
+- 토큰 내부 부분 일치는 3글자 이상, 코드 부분 일치는 2글자 이상 검색어만 찾는다.
+- 동기화: sync(products)는 (행 수, 최신 updated_at, 처음/마지막 id)가 같으면 아무 일도 하지 않고,
+  다르면 updated_at이 바뀐 행만 다시 색인한다 (제품 수정 시 updated_at을 항상 갱신하므로 충분).
+- warm(products)는 같은 동기화를 백그라운드 스레드에서 시작한다. 화면은 검색창을 그리기 전에 호출해
+  첫 키 입력이 인덱스 구성(10만 건 수 초)을 기다리지 않게 한다.
+
+예:
+    warm_product_index(products, key='products')
+    results = search_products(products, search_term, key='products', limit=50)
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from itertools import repeat
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# 색인 대상 컬럼 (첫 번째가 제품 코드)
+SEARCH_FIELDS = ('product_code', 'product_name', 'product_name_en', 'product_name_vn')
+
+# 변경 행 비율이 이 값을 넘으면 증분 갱신 대신 전체 재구성
+FULL_REBUILD_RATIO = 0.3
+
+# 토큰별 조회 결과 캐시 크기 (인덱스가 바뀌면 비움)
+TOKEN_CACHE_SIZE = 256
+
+# 프로세스 안에 유지할 인덱스 수
+MAX_INDEXES = 16
+
+# 코드 부분 일치 최소 글자 수 (1글자는 대부분의 코드에 들어 있어 제외)
+MIN_CODE_SUBSTRING = 2
+
+_COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+_TOKEN = re.compile(r'[^\W_]+')
+_FOLD = str.maketrans({'đ': 'd', 'Đ': 'd'})
+_MAX_CHAR = '\U0010ffff'
+
+
+def normalize_text(value: Any) -> str:
+    """검색용 정규화 (소문자, 베트남어 악센트/성조 제거, đ → d)"""
+    if value is None:
+        return ''
+    text = str(value)
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFD', text.translate(_FOLD))
+    # 한글은 NFD에서 자모로 분리되므로 다시 조합
+    return unicodedata.normalize('NFC', _COMBINING_MARKS.sub('', text)).casefold()
+
+
+def tokenize(value: Any) -> List[str]:
+    """정규화 + 문자/숫자 토큰 분리"""
+    return _TOKEN.findall(normalize_text(value))
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class ProductSearchIndex:
+    """
+    제품 목록 검색 인덱스
+    sync()로 목록과 맞추고 search()로 조회한다. 행 dict는 복사하지 않으므로 결과를 수정하지 않는다.
+    """
+
+    def __init__(self, fields: Sequence[str] = SEARCH_FIELDS):
+        self.fields = tuple(fields)
+        self.code_field = self.fields[0]
+        self._lock = threading.RLock()
+        self._warm_lock = threading.Lock()
+        self._warming: Optional[Tuple] = None
+        self._reset()
+        self.stats = {'full_builds': 0, 'incremental_updates': 0, 'rows_indexed': 0, 'last_sync_ms': 0.0}
+
+    def _reset(self):
+        self._docs: List[Optional[Dict[str, Any]]] = []
+        self._doc_tokens: List[Tuple[str, ...]] = []
+        self._doc_code: List[str] = []
+        self._slot_by_key: Dict[Any, int] = {}
+        self._stamps: Dict[Any, Any] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocab: List[str] = []
+        self._vocab_grams: Dict[str, Set[str]] = {}
+        self._codes: List[Tuple[str, int]] = []
+        self._code_text: Optional[Tuple[str, List[int], List[int]]] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._token_cache: 'OrderedDict[str, Tuple[Set[int], Set[int], Set[int]]]' = OrderedDict()
+        self._substring_cache: 'OrderedDict[str, Set[int]]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._slot_by_key)
+
+    # ---------- 동기화 ----------
+
+    @staticmethod
+    def _row_key(row: Dict[str, Any], position: int) -> Any:
+        key = row.get('id')
+        return key if key is not None else ('row', position)
+
+    @staticmethod
+    def _fingerprint_of(products: Sequence[Dict[str, Any]]) -> Tuple:
+        """목록 변경 감지값 (키 입력마다 계산하므로 행 단위 파이썬 루프 없이)"""
+        if not products:
+            return (0,)
+        stamps = filter(None, map(dict.get, products, repeat('updated_at')))
+        return (len(products), max(stamps, default=None),
+                products[0].get('id'), products[-1].get('id'))
+
+    def sync(self, products: Sequence[Dict[str, Any]]) -> bool:
+        """
+        제품 목록과 인덱스 맞추기
+        Returns: 인덱스가 바뀌었으면 True
+        """
+        products = products or []
+        fingerprint = self._fingerprint_of(products)
+        if fingerprint == self._fingerprint:
+            return False
+
+        started = time.perf_counter()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return False
+            current = {self._row_key(row, i): row for i, row in enumerate(products)}
+            changed = [key for key, row in current.items()
+                       if key not in self._stamps or self._stamps[key] != row.get('updated_at')]
+            removed = [key for key in self._slot_by_key if key not in current]
+
+            if not self._slot_by_key or len(changed) + len(removed) > len(current) * FULL_REBUILD_RATIO:
+                self._build(current)
+                self.stats['full_builds'] += 1
+            else:
+                for key in removed:
+                    self._remove(key)
+                for key in changed:
+                    if key in self._slot_by_key:
+                        self._remove(key)
+                    self._add(key, current[key], incremental=True)
+                self._token_cache.clear()
+                self._substring_cache.clear()
+                self._code_text = None
+                self.stats['incremental_updates'] += 1
+                self.stats['rows_indexed'] += len(changed)
+            self._fingerprint = fingerprint
+        self.stats['last_sync_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return True
+
+    def warm(self, products: Sequence[Dict[str, Any]]) -> bool:
+        """
+        백그라운드 스레드에서 sync 시작 (이미 맞춰져 있거나 같은 목록을 구성 중이면 아무 일도 하지 않음)
+        구성 중에 search/sync를 호출하면 구성이 끝날 때까지 기다린다.
+        Returns: 스레드를 시작했으면 True
+        """
+        products = list(products or [])
+        fingerprint = self._fingerprint_of(products)
+        with self._warm_lock:
+            if fingerprint in (self._fingerprint, self._warming):
+                return False
+            self._warming = fingerprint
+
+        def run():
+            try:
+                self.sync(products)
+            finally:
+                with self._warm_lock:
+                    if self._warming == fingerprint:
+                        self._warming = None
+
+        threading.Thread(target=run, name='product-index-warm', daemon=True).start()
+        return True
+
+    def _build(self, rows: Dict[Any, Dict[str, Any]]):
+        self._reset()
+        for key, row in rows.items():
+            self._add(key, row)
+        self.stats['rows_indexed'] += len(rows)
+        self._vocab = sorted(self._postings)
+        self._codes = sorted((self._doc_code[slot], slot) for slot in self._slot_by_key.values())
+        self._code_text = self._join_codes()
+
+    def _join_codes(self) -> Tuple[str, List[int], List[int]]:
+        """코드순으로 줄바꿈으로 이어 붙인 코드 문자열 + 각 코드 시작 위치 + 슬롯"""
+        starts, slots, position = [], [], 0
+        for code, slot in self._codes:
+            starts.append(position)
+            slots.append(slot)
+            position += len(code) + 1
+        return '\n'.join(code for code, _ in self._codes), starts, slots
+
+    def _add(self, key: Any, row: Dict[str, Any], incremental: bool = False):
+        """행 색인 (incremental이면 정렬 목록에도 바로 끼워 넣음)"""
+        slot = len(self._docs)
+        tokens = set()
+        for field in self.fields:
+            tokens.update(tokenize(row.get(field)))
+        code = normalize_text(row.get(self.code_field))
+        self._docs.append(row)
+        self._doc_tokens.append(tuple(tokens))
+        self._doc_code.append(code)
+        self._slot_by_key[key] = slot
+        self._stamps[key] = row.get('updated_at')
+        if incremental:
+            bisect.insort(self._codes, (code, slot))
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {slot}
+                for gram in _trigrams(token):
+                    self._vocab_grams.setdefault(gram, set()).add(token)
+                if incremental:
+                    bisect.insort(self._vocab, token)
+            else:
+                postings.add(slot)
+
+    def _remove(self, key: Any):
+        slot = self._slot_by_key.pop(key)
+        self._stamps.pop(key, None)
+        for token in self._doc_tokens[slot]:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(slot)
+            if not postings:
+                del self._postings[token]
+                position = bisect.bisect_left(self._vocab, token)
+                if position < len(self._vocab) and self._vocab[position] == token:
+                    del self._vocab[position]
+                for gram in _trigrams(token):
+                    tokens = self._vocab_grams.get(gram)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._vocab_grams[gram]
+        entry = (self._doc_code[slot], slot)
+        position = bisect.bisect_left(self._codes, entry)
+        if position < len(self._codes) and self._codes[position] == entry:
+            del self._codes[position]
+        self._docs[slot] = None
+        self._doc_tokens[slot] = ()
+
+    # ---------- 조회 ----------
+
+    def _token_matches(self, token: str) -> Tuple[Set[int], Set[int], Set[int]]:
+        """토큰 → (정확히 일치, 접두어 일치, 내부 부분 일치) 제품 슬롯"""
+        cached = self._token_cache.get(token)
+        if cached is not None:
+            self._token_cache.move_to_end(token)
+            return cached
+
+        exact = self._postings.get(token, set())
+        lo = bisect.bisect_left(self._vocab, token)
+        hi = bisect.bisect_left(self._vocab, token + _MAX_CHAR, lo)
+        prefix = set().union(*(self._postings[t] for t in self._vocab[lo:hi] if t != token))
+
+        substring: Set[int] = set()
+        if len(token) >= 3:
+            gram_sets = sorted((self._vocab_grams.get(g, set()) for g in _trigrams(token)), key=len)
+            if gram_sets and gram_sets[0]:
+                candidates = set(gram_sets[0]).intersection(*gram_sets[1:])
+                substring = set().union(*(self._postings[t] for t in candidates
+                                          if token in t and not t.startswith(token)))
+
+        result = (exact, prefix - exact, substring - exact - prefix)
+        self._token_cache[token] = result
+        while len(self._token_cache) > TOKEN_CACHE_SIZE:
+            self._token_cache.popitem(last=False)
+        return result
+
+    def _code_matches(self, code: str) -> Tuple[Set[int], Set[int]]:
+        """정규화한 검색어 전체 → (코드 일치, 코드 접두어 일치)"""
+        lo = bisect.bisect_left(self._codes, (code,))
+        hi = bisect.bisect_left(self._codes, (code + _MAX_CHAR,), lo)
+        # 정렬 순서상 코드 전체 일치가 범위 맨 앞에 모인다
+        split = bisect.bisect_left(self._codes, (code + '\0',), lo, hi)
+        slot_of = itemgetter(1)
+        return set(map(slot_of, self._codes[lo:split])), set(map(slot_of, self._codes[split:hi]))
+
+    def _code_substring_matches(self, code: str) -> Set[int]:
+        """정규화한 검색어 전체가 코드 중간에 들어 있는 제품 슬롯 ('-'를 넘는 일치 포함, 접두어 일치 제외)"""
+        if len(code) < MIN_CODE_SUBSTRING or '\n' in code:
+            return set()
+        cached = self._substring_cache.get(code)
+        if cached is not None:
+            self._substring_cache.move_to_end(code)
+            return cached
+
+        if self._code_text is None:
+            self._code_text = self._join_codes()
+        text, starts, slots = self._code_text
+        # 접두어로 일치하는 코드는 코드순으로 연속해 있으므로 그 구간은 건너뛴다 (코드 접두어 구간에서 처리)
+        lo = bisect.bisect_left(self._codes, (code,))
+        hi = bisect.bisect_left(self._codes, (code + _MAX_CHAR,), lo)
+        spans = [(0, starts[lo] if lo < len(starts) else len(text))]
+        if hi < len(starts):
+            spans.append((starts[hi], len(text)))
+
+        # 코드마다 첫 일치만 찾고 다음 코드 시작 위치로 건너뜀 (찾기는 str.find가 처리)
+        result, last = set(), len(starts) - 1
+        for begin, end in spans:
+            position = text.find(code, begin, end)
+            while position != -1:
+                entry = bisect.bisect_right(starts, position) - 1
+                result.add(slots[entry])
+                if entry == last:
+                    break
+                position = text.find(code, starts[entry + 1], end)
+
+        self._substring_cache[code] = result
+        while len(self._substring_cache) > TOKEN_CACHE_SIZE:
+            self._substring_cache.popitem(last=False)
+        return result
+
+    def _ranked_groups(self, query: str) -> List[Tuple[Any, Callable[[int], Any]]]:
+        """검색어 → 순위 구간별 (제품 슬롯들, 구간 안 정렬 키), 앞 구간일수록 순위가 높다"""
+        by_code = self._doc_code.__getitem__
+        code = normalize_text(query).strip()
+        if not code:
+            return [(set(self._slot_by_key.values()), by_code)]
+
+        tokens = list(dict.fromkeys(_TOKEN.findall(code)))
+        code_exact, code_prefix = self._code_matches(code)
+        code_substring = self._code_substring_matches(code)
+        per_token = [self._token_matches(token) for token in tokens]
+
+        if len(per_token) <= 1:
+            # 단일 토큰: 코드 일치 → 코드 접두어 → 토큰 일치 → 접두어 → 부분 일치 → 코드 부분 일치 구간을 차례로
+            groups, seen = [], set()
+            token_tiers = list(per_token[0]) if per_token else []
+            for tier in [code_exact, code_prefix] + token_tiers + [code_substring]:
+                fresh = tier - seen
+                if fresh:
+                    groups.append((fresh, by_code))
+                    seen |= fresh
+            return groups
+
+        # 여러 토큰: 코드 일치 → 코드 접두어 → 모든 토큰 일치 → 코드 부분 일치 구간,
+        # 앞의 세 구간 안은 (토큰 순위 합, 코드), 코드 부분 일치 구간 안은 코드순
+        matched = sorted((exact | prefix | substring for exact, prefix, substring in per_token), key=len)
+        token_hits = matched[0].intersection(*matched[1:])
+
+        def score(slot):
+            token_rank = 0
+            for exact, prefix, _ in per_token:
+                token_rank += 0 if slot in exact else (1 if slot in prefix else 2)
+            return token_rank, by_code(slot)
+
+        groups, seen = [], set()
+        for tier, key in ((code_exact, score), (code_prefix, score), (token_hits, score),
+                          (code_substring, by_code)):
+            fresh = tier - seen
+            if fresh:
+                groups.append((fresh, key))
+                seen |= fresh
+        return groups
+
+    def search(self, query: str, limit: Optional[int] = None,
+               where: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """
+        검색어 → 순위순 제품 목록 (빈 검색어면 전체를 코드순으로)
+        limit: 상위 몇 개만 (구간별로 필요한 만큼만 골라 전체 정렬을 피함)
+        where: 추가 조건 (제품 dict → bool), limit 적용 전에 거름
+        """
+        with self._lock:
+            docs = self._docs
+            result = []
+            for slots, key in self._ranked_groups(query):
+                if where is not None:
+                    slots = [slot for slot in slots if where(docs[slot])]
+                needed = None if limit is None else limit - len(result)
+                if needed is not None and needed < len(slots):
+                    ordered = heapq.nsmallest(needed, slots, key=key)
+                else:
+                    ordered = sorted(slots, key=key)
+                result.extend(docs[slot] for slot in ordered)
+                if limit is not None and len(result) >= limit:
+                    break
+            return result
+
+    def count(self, query: str, where: Optional[Callable[[Dict[str, Any]], bool]] = None) -> int:
+        """검색 결과 건수"""
+        with self._lock:
+            docs = self._docs
+            if where is None:
+                return sum(len(slots) for slots, _ in self._ranked_groups(query))
+            return sum(1 for slots, _ in self._ranked_groups(query) for slot in slots if where(docs[slot]))
+
+    def by_codes(self, codes: Iterable[str]) -> List[Dict[str, Any]]:
+        """제품 코드 목록과 정확히 일치하는 제품 (코드순)"""
+        wanted = {normalize_text(code) for code in codes if code}
+        with self._lock:
+            return [self._docs[slot] for value, slot in self._codes if value in wanted]
+
+
+# ============================================
+# 프로세스 전역 인덱스
+# ============================================
+
+_indexes: 'OrderedDict[Any, ProductSearchIndex]' = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_product_index(key: Any = 'products') -> ProductSearchIndex:
+    """키(보통 제품 테이블명)별 인덱스 반환"""
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = ProductSearchIndex()
+            _indexes[key] = index
+            while len(_indexes) > MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
+
+
+def warm_product_index(products: Sequence[Dict[str, Any]], key: Any = 'products') -> bool:
+    """검색 전에 인덱스 구성을 백그라운드에서 시작 (ProductSearchIndex.warm 참고)"""
+    return get_product_index(key).warm(products)
+
+
+def search_products(products: Sequence[Dict[str, Any]], query: str, key: Any = 'products',
+                    limit: Optional[int] = None,
+                    where: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+    """
+    제품 목록 검색 (인덱스를 목록과 맞춘 뒤 조회, ProductSearchIndex.search 참고)
+    같은 key에는 같은 테이블의 목록을 넘긴다.
+    """
+    index = get_product_index(key)
+    index.sync(products)
+    return index.search(query, limit=limit, where=where)
+
+
+def clear_product_indexes():
+    """프로세스 전역 인덱스 비우기"""
+    with _indexes_lock:
+        _indexes.clear()
@@ -0,0 +1,304 @@
+"""
+YMV ERP 시스템 구매요청 승인 서비스
+Purchase approval → expense creation in one round trip
+
+구매요청을 승인하면 지출요청서를 만들고 구매요청에 그 ID를 연결한다.
+결과는 (APPROVED | ALREADY_PROCESSED | FAILED, 생성된 지출요청서)로 돌려준다.
+- 기본: RPC(approve_purchase_with_expense) 한 번으로 문서번호(EXP-YYMMDD-NNN) 발급 + 지출 생성 +
+  구매요청 갱신을 한 트랜잭션에서 처리 (실패하면 번호도 함께 롤백되어 소비되지 않음)
+- RPC 함수가 DB에 없을 때(PGRST202 / 42883)만 개별 저장으로 전환한다.
+  그 외 RPC 오류는 커밋 여부를 알 수 없으므로 폴백하지 않고 FAILED
+- 폴백: 승인대기 상태일 때만 구매요청을 승인 상태로 선점(조건부 수정) → 문서번호 발급 → 지출 저장 →
+  지출 ID 연결. 중간에 실패하면 지출요청서를 삭제하고 구매요청을 승인대기로 되돌린다.
+
+DB 측 준비 (Supabase SQL Editor에서 1회 실행, next_document_sequence는 utils/sequence_service.py 참고):
+
+    create or replace function approve_purchase_with_expense(
+        p_purchase_id bigint, p_expense jsonb, p_approver_id bigint,
+        p_period text, p_floor integer default 0
+    ) returns jsonb language plpgsql as $$
+    declare
+        v_expense expenses;
+        v_number integer;
+    begin
+        -- 승인대기 상태인 구매요청만 잠그고 처리 (동시 승인 시 한 번만 성공)
+        perform 1 from purchases
+         where id = p_purchase_id and approval_status = '승인대기'
+           for update;
+        if not found then
+            raise exception 'purchase % is not pending', p_purchase_id;
+        end if;
+
+        -- 같은 트랜잭션에서 번호 발급 (이후 실패하면 카운터 증가도 롤백)
+        v_number := next_document_sequence('EXP', '', p_period, p_floor);
+
+        insert into expenses (document_number, expense_type, description, amount, currency,
+                              expense_date, payment_method, receipt_required, notes, requester,
+                              approval_status, status)
+        select 'EXP-' || p_period || '-' || lpad(v_number::text, 3, '0'),
+               r.expense_type, r.description, r.amount, r.currency,
+               r.expense_date, r.payment_method, r.receipt_required, r.notes, r.requester,
+               r.approval_status, r.status
+          from jsonb_populate_record(null::expenses, p_expense) r
+        returning * into v_expense;
+
+        update purchases
+           set approval_status = '승인완료', status = '승인완료',
+               approver_id = p_approver_id, approved_at = now(),
+               expense_id = v_expense.id, updated_at = now()
+         where id = p_purchase_id;
+
+        return to_jsonb(v_expense);
+    end;
+    $$;
+
+RPC는 공용 purchases / expenses 테이블을 대상으로 하므로 다른 테이블명이 주어지면 폴백 경로를 사용한다.
+"""
+
+import logging
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.sequence_service import (
+    SequenceUnavailableError, is_missing_rpc_error, load_max_suffix, next_document_number,
+)
+
+APPROVAL_RPC = 'approve_purchase_with_expense'
+
+# RPC가 처리하는 테이블
+RPC_PURCHASE_TABLE = 'purchases'
+RPC_EXPENSE_TABLE = 'expenses'
+
+# 이미 처리된 구매요청 (RPC 예외 메시지)
+_NOT_PENDING = 'is not pending'
+
+PENDING_STATUS = '승인대기'
+APPROVED_STATUS = '승인완료'
+
+# 승인 결과
+APPROVED = 'approved'
+ALREADY_PROCESSED = 'already_processed'   # 다른 사용자가 먼저 승인/반려함
+FAILED = 'failed'
+
+ApprovalResult = Tuple[str, Optional[Dict[str, Any]]]
+
+
+def build_expense_from_purchase(purchase: Dict[str, Any],
+                                document_number: Optional[str] = None) -> Dict[str, Any]:
+    """구매요청 → 지출요청서 데이터 (RPC 경로는 문서번호를 DB에서 발급하므로 None)"""
+    quantity = purchase.get('quantity', 1)
+    now = datetime.now().isoformat()
+    return {
+        'document_number': document_number,
+        'expense_type': purchase.get('category', '기타'),
+        'description': f"{purchase.get('item_name', '')} ({purchase.get('quantity', 0)}{purchase.get('unit', '개')}) - {purchase.get('supplier', '')}",
+        'amount': purchase.get('unit_price', 0) * quantity,
+        'currency': purchase.get('currency', 'KRW'),
+        'expense_date': purchase.get('request_date', date.today().isoformat()),
+        'payment_method': '법인계좌',
+        'receipt_required': True,
+        'notes': f"구매요청서 ID: {purchase.get('id')} | {purchase.get('notes', '')}",
+        'requester': purchase.get('requester'),
+        'approval_status': 'pending',
+        'status': 'pending',
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+def purchase_approval_patch(approver_id: Any, expense_id: Any) -> Dict[str, Any]:
+    """승인된 구매요청 변경 데이터"""
+    now = datetime.now().isoformat()
+    return {
+        'approval_status': APPROVED_STATUS,
+        'approver_id': approver_id,
+        'approved_at': now,
+        'status': APPROVED_STATUS,
+        'expense_id': expense_id,
+        'updated_at': now
+    }
+
+
+def purchase_release_patch(purchase: Dict[str, Any]) -> Dict[str, Any]:
+    """선점한 구매요청을 승인 전 상태로 되돌리는 변경 데이터"""
+    return {
+        'approval_status': PENDING_STATUS,
+        'approver_id': purchase.get('approver_id'),
+        'approved_at': purchase.get('approved_at'),
+        'status': purchase.get('status') or PENDING_STATUS,
+        'expense_id': None,
+        'updated_at': datetime.now().isoformat()
+    }
+
+
+def expense_number_floor(period: str) -> int:
+    """EXP-<period>- 기존 최대 번호 (RPC 카운터가 없을 때 시작값)"""
+    return load_max_suffix(RPC_EXPENSE_TABLE, 'document_number', f"EXP-{period}-")
+
+
+class PurchaseApprovalService:
+    """
+    구매요청 승인 처리
+    RPC 함수가 없다는 것은 프로세스에서 한 번 확인한 뒤 기억한다.
+    """
+
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None, use_rpc: bool = True,
+                 floor_func: Optional[Callable[[str], int]] = None):
+        self._client_factory = client_factory
+        self._rpc_available = use_rpc
+        self._floor_func = floor_func or expense_number_floor
+        self._floored_periods = set()
+        self._lock = threading.Lock()
+
+    def _client(self):
+        if self._client_factory is not None:
+            return self._client_factory()
+        from utils.connection_pool import get_shared_client
+        return get_shared_client()
+
+    def _disable_rpc(self, reason: str):
+        logging.warning(f"구매 승인 RPC 사용 불가, 개별 저장으로 전환: {reason}")
+        with self._lock:
+            self._rpc_available = False
+
+    def _approve_with_rpc(self, purchase_id: Any, expense: Dict[str, Any],
+                          approver_id: Any) -> Optional[ApprovalResult]:
+        """
+        RPC 승인 → 승인 결과
+        RPC를 쓸 수 없으면(클라이언트 없음 / 함수 없음) None으로 폴백 경로를 알린다.
+        """
+        try:
+            client = self._client()
+        except Exception as e:
+            self._disable_rpc(str(e))
+            return None
+
+        period = datetime.now().strftime('%y%m%d')
+        # 기존 최대 번호는 기간별로 처음 한 번만 조회 (DB 카운터가 없을 때만 사용됨)
+        with self._lock:
+            first_use = period not in self._floored_periods
+        floor = self._floor_func(period) if first_use else 0
+        payload = {k: v for k, v in expense.items()
+                   if k not in ('created_at', 'updated_at', 'document_number')}
+        try:
+            result = client.rpc(APPROVAL_RPC, {
+                'p_purchase_id': purchase_id,
+                'p_expense': payload,
+                'p_approver_id': approver_id,
+                'p_period': period,
+                'p_floor': floor,
+            }).execute()
+        except Exception as e:
+            if _NOT_PENDING in str(e):
+                logging.warning(f"이미 처리된 구매요청: id={purchase_id}")
+                return ALREADY_PROCESSED, None
+            if is_missing_rpc_error(e):
+                self._disable_rpc(str(e))
+                return None
+            # 응답을 못 받았을 뿐 커밋됐을 수 있으므로 개별 저장으로 다시 처리하지 않음
+            logging.error(f"구매 승인 RPC 실패 (처리 여부 불명, 재조회 필요): id={purchase_id}, {str(e)}")
+            return FAILED, None
+
+        with self._lock:
+            self._floored_periods.add(period)
+        row = result.data
+        if isinstance(row, list):
+            row = row[0] if row else None
+        return APPROVED, row
+
+    def _release(self, purchase: Dict[str, Any], update_func: Callable, purchase_table: str):
+        """선점한 구매요청을 승인대기로 되돌림"""
+        released = update_func(purchase_table, {**purchase_release_patch(purchase), 'id': purchase.get('id')},
+                               "id", match={'approval_status': APPROVED_STATUS})
+        if not released:
+            logging.error(f"구매요청 선점 해제 실패, 수동 확인 필요: purchase={purchase.get('id')}")
+
+    def _approve_with_writes(self, purchase: Dict[str, Any], approver_id: Any, save_func: Callable,
+                             update_func: Callable, delete_func: Optional[Callable],
+                             load_func: Optional[Callable], purchase_table: str,
+                             expense_table: str) -> ApprovalResult:
+        """개별 저장 승인: 조건부 선점 → 번호 발급 → 지출 저장 → 지출 ID 연결"""
+        purchase_id = purchase.get('id')
+        claimed = update_func(purchase_table, {**purchase_approval_patch(approver_id, None), 'id': purchase_id},
+                              "id", match={'approval_status': PENDING_STATUS})
+        if not claimed:
+            return self._claim_failure(purchase_id, load_func, purchase_table), None
+
+        try:
+            document_number = next_document_number('EXP', table_name=expense_table, column='document_number')
+        except SequenceUnavailableError as e:
+            logging.error(f"지출 문서번호 발급 실패: purchase={purchase_id}, {str(e)}")
+            self._release(purchase, update_func, purchase_table)
+            return FAILED, None
+
+        created = save_func(expense_table, build_expense_from_purchase(purchase, document_number))
+        if not isinstance(created, dict) or created.get('id') is None:
+            self._release(purchase, update_func, purchase_table)
+            return FAILED, None
+
+        linked = update_func(purchase_table, {'id': purchase_id, 'expense_id': created['id']}, "id",
+                             match={'approval_status': APPROVED_STATUS})
+        if linked:
+            return APPROVED, created
+
+        # 구매요청 연결에 실패하면 방금 만든 지출요청서를 되돌림
+        logging.error(f"구매요청 연결 실패, 지출요청서 삭제: purchase={purchase_id}, expense={created['id']}")
+        if delete_func is not None:
+            delete_func(expense_table, created['id'])
+        self._release(purchase, update_func, purchase_table)
+        return FAILED, None
+
+    @staticmethod
+    def _claim_failure(purchase_id: Any, load_func: Optional[Callable], purchase_table: str) -> str:
+        """선점 실패 원인: 이미 승인대기가 아니면 ALREADY_PROCESSED, 그 외(DB 오류 등) FAILED"""
+        if load_func is None:
+            return FAILED
+        rows = load_func(purchase_table, columns="id,approval_status",
+                         filters={'id': purchase_id}, use_cache=False) or []
+        if rows and rows[0].get('approval_status') != PENDING_STATUS:
+            logging.warning(f"이미 처리된 구매요청: id={purchase_id}")
+            return ALREADY_PROCESSED
+        return FAILED
+
+    def approve(self, purchase: Dict[str, Any], approver_id: Any, save_func: Callable,
+                update_func: Callable, delete_func: Optional[Callable] = None,
+                purchase_table: str = RPC_PURCHASE_TABLE,
+                expense_table: str = RPC_EXPENSE_TABLE,
+                load_func: Optional[Callable] = None) -> ApprovalResult:
+        """
+        구매요청 승인 + 지출요청서 생성
+        Args:
+            update_func: match={컬럼: 값} 조건부 수정을 지원하는 update_data
+            load_func: 폴백 선점 실패 시 이미 처리됐는지 다시 조회 (없으면 FAILED로 처리)
+        Returns:
+            (APPROVED, 생성된 지출요청서) / (ALREADY_PROCESSED, None) / (FAILED, None)
+        """
+        if (self._rpc_available and purchase_table == RPC_PURCHASE_TABLE
+                and expense_table == RPC_EXPENSE_TABLE):
+            outcome = self._approve_with_rpc(purchase.get('id'), build_expense_from_purchase(purchase),
+                                             approver_id)
+            if outcome is not None:
+                return outcome
+
+        return self._approve_with_writes(purchase, approver_id, save_func, update_func, delete_func,
+                                         load_func, purchase_table, expense_table)
+
+
+# 프로세스 전역 서비스
+_service = PurchaseApprovalService()
+
+
+def get_purchase_approval_service() -> PurchaseApprovalService:
+    """전역 구매 승인 서비스 반환"""
+    return _service
+
+
+def approve_purchase_with_expense(purchase: Dict[str, Any], approver_id: Any, save_func: Callable,
+                                  update_func: Callable, delete_func: Optional[Callable] = None,
+                                  purchase_table: str = RPC_PURCHASE_TABLE,
+                                  expense_table: str = RPC_EXPENSE_TABLE,
+                                  load_func: Optional[Callable] = None) -> ApprovalResult:
+    """구매요청 승인 + 지출요청서 생성 (PurchaseApprovalService.approve 참고)"""
+    return _service.approve(purchase, approver_id, save_func, update_func, delete_func,
+                            purchase_table, expense_table, load_func)
@@ -0,0 +1,260 @@
+"""
+YMV ERP 시스템 조회 조건 빌더
+Small query-builder that pushes filters down to PostgREST
+
+pandas로 전체 데이터를 받아 걸러내던 검색 조건을 DB 쿼리로 옮기기 위해 사용한다.
+
+예:
+    query = (QueryFilter()
+             .eq('status', 'active')
+             .search(term, 'company_name_short', 'company_name_original')
+             .date_range('created_at', date_from, date_to)
+             .order('created_at', desc=True))
+    rows = load_func(customer_table, filters=query)
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# 단일 비교 연산자 → PostgREST 연산자
+COMPARISON_OPERATORS = ('eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'ilike')
+
+# or_ 문자열 안에서 따옴표가 필요한 문자
+_RESERVED_CHARS = set(',.:()"\\ ')
+
+
+def escape_like(term: str) -> str:
+    """LIKE 패턴 특수문자 이스케이프 (사용자 입력을 문자 그대로 검색)"""
+    return str(term).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _like_to_or_pattern(pattern: str) -> str:
+    """이스케이프되지 않은 % 와일드카드를 or_ 문법의 * 로 변환"""
+    chars = []
+    escaped = False
+    for ch in str(pattern):
+        if escaped:
+            chars.append(ch)
+            escaped = False
+        elif ch == '\\':
+            chars.append(ch)
+            escaped = True
+        else:
+            chars.append('*' if ch == '%' else ch)
+    return ''.join(chars)
+
+
+def _to_param(value: Any) -> str:
+    """필터 값을 PostgREST 파라미터 문자열로 변환"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if value is None:
+        return 'null'
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _quote(value: str) -> str:
+    """or_/in 목록 안의 값 인용 처리"""
+    if value and not any(ch in _RESERVED_CHARS for ch in value):
+        return value
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class Condition:
+    """단일 조건 (column, operator, value)"""
+
+    __slots__ = ('column', 'operator', 'value')
+
+    def __init__(self, column: str, operator: str, value: Any = None):
+        self.column = column
+        self.operator = operator
+        self.value = value
+
+    def to_or_clause(self) -> str:
+        """or_() 안에서 사용할 'column.op.value' 문자열"""
+        if self.operator == 'and':
+            return f"and({','.join(c.to_or_clause() for c in self.value)})"
+        if self.operator == 'in':
+            values = ','.join(_quote(_to_param(v)) for v in self.value)
+            return f"{self.column}.in.({values})"
+        if self.operator in ('is', 'not.is'):
+            return f"{self.column}.{self.operator}.{_to_param(self.value)}"
+        if self.operator == 'ilike':
+            # or_ 문자열에서는 와일드카드로 '*'를 사용
+            return f"{self.column}.ilike.{_quote(_like_to_or_pattern(self.value))}"
+        return f"{self.column}.{self.operator}.{_quote(_to_param(self.value))}"
+
+    def apply(self, query):
+        """supabase 쿼리에 조건 적용"""
+        if self.operator == 'in':
+            return query.in_(self.column, list(self.value))
+        if self.operator in COMPARISON_OPERATORS:
+            value = self.value
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            return getattr(query, self.operator)(self.column, value)
+        return query.filter(self.column, self.operator, _to_param(self.value))
+
+    def key(self) -> Tuple:
+        if self.operator == 'and':
+            return ('and',) + tuple(c.key() for c in self.value)
+        return (self.column, self.operator, _freeze(self.value))
+
+    def __repr__(self):
+        return f"Condition({self.column!r}, {self.operator!r}, {self.value!r})"
+
+
+def and_(*conditions: Condition) -> Condition:
+    """or_() 안에서 사용하는 AND 묶음 조건"""
+    return Condition('', 'and', tuple(conditions))
+
+
+class QueryFilter:
+    """
+    조회 조건 빌더
+    load_data(..., filters=QueryFilter()...) 형태로 전달하면 모든 조건이 DB에서 처리된다.
+    메서드는 self를 반환하므로 체이닝할 수 있다.
+    """
+
+    def __init__(self):
+        self.conditions: List[Any] = []
+        self.order_by: Optional[str] = None
+        self.desc = False
+
+    # ---------- 단일 조건 ----------
+
+    def _add(self, column: str, operator: str, value: Any) -> 'QueryFilter':
+        self.conditions.append(Condition(column, operator, value))
+        return self
+
+    def eq(self, column: str, value: Any) -> 'QueryFilter':
+        return self._add(column, 'eq', value)
+
+    def neq(self, column: str, value: Any) -> 'QueryFilter':
+        return self._add(column, 'neq', value)
+
+    def gt(self, column: str, value: Any) -> 'QueryFilter':
+        return self._add(column, 'gt', value)
+
+    def gte(self, column: str, value: Any) -> 'QueryFilter':
+        return self._add(column, 'gte', value)
+
+    def lt(self, column: str, value: Any) -> 'QueryFilter':
+        return self._add(column, 'lt', value)
+
+    def lte(self, column: str, value: Any) -> 'QueryFilter':
+        return self._add(column, 'lte', value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> 'QueryFilter':
+        return self._add(column, 'in', tuple(values))
+
+    def ilike(self, column: str, pattern: str) -> 'QueryFilter':
+        """대소문자 무시 패턴 검색 (와일드카드 %)"""
+        return self._add(column, 'ilike', pattern)
+
+    def contains(self, column: str, term: str) -> 'QueryFilter':
+        """부분 문자열 검색 (대소문자 무시)"""
+        return self.ilike(column, f"%{escape_like(term)}%")
+
+    def is_null(self, column: str) -> 'QueryFilter':
+        return self._add(column, 'is', None)
+
+    def not_null(self, column: str) -> 'QueryFilter':
+        return self._add(column, 'not.is', None)
+
+    # ---------- 복합 조건 ----------
+
+    def or_(self, *conditions: Condition) -> 'QueryFilter':
+        """조건들 중 하나라도 만족 (Condition 목록)"""
+        conditions = tuple(c for c in conditions if c is not None)
+        if conditions:
+            self.conditions.append(conditions)
+        return self
+
+    def search(self, term: Optional[str], *columns: str) -> 'QueryFilter':
+        """여러 컬럼 중 하나라도 term을 포함 (빈 검색어는 무시)"""
+        term = (term or '').strip()
+        if not term or not columns:
+            return self
+        pattern = f"%{escape_like(term)}%"
+        if len(columns) == 1:
+            return self.ilike(columns[0], pattern)
+        return self.or_(*(Condition(column, 'ilike', pattern) for column in columns))
+
+    def date_range(self, column: str, date_from: Optional[date] = None,
+                   date_to: Optional[date] = None) -> 'QueryFilter':
+        """
+        날짜 범위 (양 끝 포함)
+        timestamp 컬럼에서도 종료일 하루 전체가 포함되도록 종료일 다음날 미만으로 비교
+        """
+        if date_from:
+            self.gte(column, date_from)
+        if date_to:
+            if isinstance(date_to, datetime):
+                self.lte(column, date_to)
+            else:
+                self.lt(column, date_to + timedelta(days=1))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> 'QueryFilter':
+        """정렬 (load_data에 order_by를 따로 주지 않았을 때 사용)"""
+        self.order_by = column
+        self.desc = desc
+        return self
+
+    # ---------- 적용 ----------
+
+    def apply(self, query):
+        """supabase 쿼리에 조건 적용 (정렬은 load_data에서 처리)"""
+        for condition in self.conditions:
+            if isinstance(condition, tuple):
+                query = query.or_(','.join(c.to_or_clause() for c in condition))
+            else:
+                query = condition.apply(query)
+        return query
+
+    def cache_key(self) -> Tuple:
+        """읽기 캐시 키"""
+        parts = []
+        for condition in self.conditions:
+            if isinstance(condition, tuple):
+                parts.append(('or',) + tuple(c.key() for c in condition))
+            else:
+                parts.append(condition.key())
+        return (tuple(parts), self.order_by, self.desc)
+
+    def __bool__(self):
+        return bool(self.conditions) or self.order_by is not None
+
+    def __repr__(self):
+        return f"QueryFilter({self.conditions!r}, order_by={self.order_by!r}, desc={self.desc})"
+
+    @classmethod
+    def from_dict(cls, filters: Optional[Dict[str, Any]]) -> 'QueryFilter':
+        """기존 필터 딕셔너리 변환 (리스트/튜플/셋 값은 IN 조건)"""
+        query = cls()
+        for column, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                query.in_(column, value)
+            else:
+                query.eq(column, value)
+        return query
+
+
+def as_query_filter(filters: Any) -> Optional[QueryFilter]:
+    """load_data 필터 인자(dict 또는 QueryFilter)를 QueryFilter로 변환"""
+    if isinstance(filters, QueryFilter):
+        return filters
+    if isinstance(filters, dict):
+        return QueryFilter.from_dict(filters)
+    return None
@@ -0,0 +1,196 @@
+"""
+YMV ERP 시스템 테이블 읽기 캐시
+Per-table TTL read cache with write-through invalidation
+
+create_database_operations()가 만드는 db_operations 파사드 안에서 사용된다.
+- 키: (테이블, 필터, 컬럼)
+- 테이블별 TTL + 전체 LRU 크기 제한
+- save/update/delete 시 해당 테이블 항목 즉시 무효화
+- 파사드를 거치지 않는 쓰기 경로(bulk_write, 물류 함수, 직접 client 호출)는
+  invalidate_table()로 프로세스의 모든 캐시에서 해당 테이블을 무효화
+"""
+
+import copy
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# 기본 TTL (초)
+DEFAULT_TTL_SECONDS = 30
+
+# 참조 테이블은 자주 바뀌지 않으므로 TTL을 길게 유지
+TABLE_TTL_SECONDS = {
+    'employees': 300,
+    'corporate_accounts': 300,
+    'suppliers': 300,
+    'product_codes': 300,
+    'departments': 600,
+    'products': 120,
+    'transport_modes': 600,
+}
+
+# 캐시 최대 항목 수 (LRU)
+DEFAULT_MAX_ENTRIES = 256
+
+# 법인별 테이블 접미사 (customers_ymv → customers)
+_COMPANY_SUFFIX = re.compile(r'_(ymv|ymk|ymth|ymc)$', re.IGNORECASE)
+
+
+def base_table_name(table_name: str) -> str:
+    """법인 접미사를 제거한 기본 테이블명"""
+    return _COMPANY_SUFFIX.sub('', table_name)
+
+
+def _copy_rows(rows: List[Dict]) -> List[Dict]:
+    """행 복사 (PageResult 같은 list 하위 클래스는 메타데이터 유지)"""
+    copied = [dict(row) for row in rows]
+    if type(rows) is list:
+        return copied
+    clone = copy.copy(rows)
+    clone[:] = copied
+    return clone
+
+
+def _freeze(value: Any) -> Hashable:
+    """필터 값을 해시 가능한 형태로 변환"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def make_cache_key(table_name: str, filters: Optional[Dict[str, Any]] = None,
+                   columns: Any = "*", extra: Optional[Dict[str, Any]] = None) -> Tuple:
+    """(테이블, 필터, 컬럼[, 기타 옵션]) 캐시 키 생성"""
+    if columns is None or isinstance(columns, str):
+        column_key = columns or "*"
+    else:
+        column_key = ",".join(columns)
+    if isinstance(filters, dict):
+        filter_key = _freeze(filters)
+    elif hasattr(filters, 'cache_key'):
+        # QueryFilter (utils.query_builder)
+        filter_key = ('query',) + filters.cache_key()
+    else:
+        filter_key = None
+    extra_key = _freeze(extra) if extra else None
+    return (table_name, filter_key, column_key, extra_key)
+
+
+class TableReadCache:
+    """
+    테이블 단위 TTL + LRU 읽기 캐시
+    Thread-safe: Streamlit 세션 스레드들이 하나의 인스턴스를 공유한다.
+    """
+
+    def __init__(self, default_ttl: float = DEFAULT_TTL_SECONDS,
+                 table_ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.default_ttl = default_ttl
+        self.table_ttls = dict(TABLE_TTL_SECONDS if table_ttls is None else table_ttls)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._table_stats: Dict[str, Dict[str, int]] = {}
+        _register(self)
+
+    def get_ttl(self, table_name: str) -> float:
+        """테이블 TTL (법인 테이블은 기본 테이블명 기준)"""
+        if table_name in self.table_ttls:
+            return self.table_ttls[table_name]
+        return self.table_ttls.get(base_table_name(table_name), self.default_ttl)
+
+    def _count(self, table_name: str, field: str):
+        stats = self._table_stats.setdefault(table_name, {'hits': 0, 'misses': 0})
+        stats[field] += 1
+
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        """캐시 조회 (만료/미존재 시 None)"""
+        table_name = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, rows = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    self._count(table_name, 'hits')
+                    # 호출 측에서 행을 수정해도 캐시가 오염되지 않도록 복사본 반환
+                    return _copy_rows(rows)
+                del self._entries[key]
+            self._misses += 1
+            self._count(table_name, 'misses')
+            return None
+
+    def put(self, key: Tuple, rows: List[Dict]):
+        """캐시 저장"""
+        ttl = self.get_ttl(key[0])
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, _copy_rows(rows))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, table_name: Optional[str] = None):
+        """테이블 항목 무효화 (table_name 없으면 전체)"""
+        with self._lock:
+            if table_name is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [k for k in self._entries if k[0] == table_name]
+                for k in keys:
+                    del self._entries[k]
+                removed = len(keys)
+            self._invalidations += removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """히트/미스 카운터"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': (self._hits / lookups) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'tables': {t: dict(s) for t, s in self._table_stats.items()},
+            }
+
+
+# 프로세스의 모든 읽기 캐시 (invalidate_table 대상)
+_caches: "weakref.WeakSet[TableReadCache]" = weakref.WeakSet()
+_caches_lock = threading.Lock()
+
+
+def _register(cache: TableReadCache):
+    with _caches_lock:
+        _caches.add(cache)
+
+
+def invalidate_table(table_name: Optional[str] = None):
+    """
+    모든 읽기 캐시에서 테이블 항목 무효화 (table_name 없으면 전체)
+    파사드 밖에서 테이블을 변경하는 쓰기 함수가 호출한다.
+    """
+    with _caches_lock:
+        caches = list(_caches)
+    for cache in caches:
+        cache.invalidate(table_name)
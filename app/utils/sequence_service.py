@@ -0,0 +1,337 @@
+"""
+YMV ERP 시스템 문서번호 시퀀스 서비스
+Atomic document-number sequence service for YMV ERP System
+
+(doc_type, company, period) 단위 카운터에서 다음 번호를 O(1)로 발급한다.
+- 기본: Supabase RPC(next_document_sequence)로 DB에서 원자적으로 증가
+- RPC 함수가 DB에 없거나(PGRST202 / 42883) 연결 설정이 없을 때만 프로세스 내 잠금 카운터로 전환
+- 네트워크 오류 등 일시적 실패는 제한 시간 안에서 재시도하고, 그래도 실패하면
+  SequenceUnavailableError (비원자적 카운터로 번호를 내주지 않음)
+- 화면 미리보기는 peek_document_number로 번호를 소비하지 않고 다음 번호를 조회
+- 카운터가 처음 사용될 때만 기존 문서의 최대 번호를 인덱스 조회(ORDER BY ... LIMIT 1)로 한 번 읽는다
+
+DB 측 준비 (Supabase SQL Editor에서 1회 실행):
+
+    create table if not exists document_sequences_counter (
+        doc_type    text not null,
+        company     text not null default '',
+        period      text not null,
+        last_number integer not null default 0,
+        updated_at  timestamptz not null default now(),
+        primary key (doc_type, company, period)
+    );
+
+    create or replace function next_document_sequence(
+        p_doc_type text, p_company text, p_period text, p_floor integer default 0
+    ) returns integer language sql as $$
+        insert into document_sequences_counter as c (doc_type, company, period, last_number)
+        values (p_doc_type, p_company, p_period, p_floor + 1)
+        on conflict (doc_type, company, period)
+        do update set last_number = c.last_number + 1, updated_at = now()
+        returning c.last_number;
+    $$;
+
+문서번호 컬럼에는 접두사 조회용 인덱스를 권장한다.
+    create index if not exists idx_quotations_ymv_quote_number
+        on quotations_ymv (quote_number text_pattern_ops);
+"""
+
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 원자적 증가 RPC 이름 / 카운터 테이블
+SEQUENCE_RPC = 'next_document_sequence'
+SEQUENCE_TABLE = 'document_sequences_counter'
+
+# RPC 함수가 없을 때의 오류 (PostgREST PGRST202, Postgres 42883 undefined_function)
+_MISSING_RPC_MARKERS = ('PGRST202', '42883', 'Could not find the function')
+
+# 일시적 RPC 실패 재시도 (횟수 / 첫 대기 시간 / 전체 제한 시간, 초)
+RPC_ATTEMPTS = 3
+RPC_RETRY_DELAY = 0.2
+RPC_DEADLINE_SECONDS = 3.0
+
+# 법인별 테이블 접미사 (quotations_ymv → YMV)
+_COMPANY_SUFFIX = re.compile(r'_(ymv|ymk|ymth|ymc)$', re.IGNORECASE)
+
+SequenceKey = Tuple[str, str, str]
+
+
+class SequenceUnavailableError(RuntimeError):
+    """시퀀스 RPC가 일시적으로 응답하지 않아 번호를 발급할 수 없음"""
+
+
+def is_missing_rpc_error(error: Exception) -> bool:
+    """RPC 함수가 DB에 없다는 오류인지 (그 외 오류는 일시적 실패로 본다)"""
+    message = str(error)
+    return any(marker in message for marker in _MISSING_RPC_MARKERS)
+
+
+def company_from_table(table_name: Optional[str]) -> str:
+    """테이블명 접미사에서 법인 코드 추출 (없으면 빈 문자열)"""
+    if not table_name:
+        return ''
+    match = _COMPANY_SUFFIX.search(table_name)
+    return match.group(1).upper() if match else ''
+
+
+def parse_suffix(document_number: Optional[str], prefix: str) -> int:
+    """'PREFIX-NNN' 형식 문서번호에서 숫자 부분 추출 (해석 불가 시 0)"""
+    if not document_number or not document_number.startswith(prefix):
+        return 0
+    try:
+        return int(document_number[len(prefix):].split('-')[0])
+    except ValueError:
+        return 0
+
+
+def load_max_suffix(table_name: str, column: str, prefix: str) -> int:
+    """
+    기존 문서 중 prefix로 시작하는 최대 번호 조회
+    전체 테이블을 읽지 않고 ORDER BY column DESC LIMIT 1 한 건만 조회한다.
+    """
+    from utils.database import get_connection
+    from utils.query_builder import escape_like
+
+    try:
+        result = get_connection().table(table_name)\
+            .select(column)\
+            .like(column, f"{escape_like(prefix)}%")\
+            .order(column, desc=True)\
+            .limit(1)\
+            .execute()
+        if result.data:
+            return parse_suffix(result.data[0].get(column), prefix)
+        return 0
+    except Exception as e:
+        logging.warning(f"문서번호 최대값 조회 실패 ({table_name}.{column}): {str(e)}")
+        return 0
+
+
+class LocalSequenceBackend:
+    """
+    프로세스 내 잠금 카운터
+    키마다 잠금을 따로 두어 서로 다른 문서 유형은 대기하지 않는다.
+    """
+
+    def __init__(self):
+        self._counters: Dict[SequenceKey, int] = {}
+        self._key_locks: Dict[SequenceKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key: SequenceKey) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def next_value(self, key: SequenceKey, seed_func: Optional[Callable[[], int]] = None) -> int:
+        """다음 번호 (처음 사용하는 키는 seed_func 결과에서 시작)"""
+        with self._key_lock(key):
+            current = self._counters.get(key)
+            if current is None:
+                current = seed_func() if seed_func else 0
+            current += 1
+            self._counters[key] = current
+            return current
+
+    def peek_value(self, key: SequenceKey, seed_func: Optional[Callable[[], int]] = None) -> int:
+        """다음에 발급될 번호 (카운터는 바꾸지 않음)"""
+        current = self._counters.get(key)
+        if current is None:
+            current = seed_func() if seed_func else 0
+        return current + 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._key_locks.clear()
+
+
+class SequenceService:
+    """
+    문서번호 시퀀스 서비스
+    (doc_type, company, period) 키별로 중복 없는 연속 번호를 발급한다.
+    """
+
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None, use_rpc: bool = True):
+        self._client_factory = client_factory
+        self._rpc_available = use_rpc
+        self._seeded = set()
+        self._seed_lock = threading.Lock()
+        self.local = LocalSequenceBackend()
+
+    def _client(self):
+        if self._client_factory is not None:
+            return self._client_factory()
+        from utils.connection_pool import get_shared_client
+        return get_shared_client()
+
+    def _next_from_rpc(self, key: SequenceKey, seed_func: Optional[Callable[[], int]]) -> Optional[int]:
+        """RPC로 원자적 증가 (사용 불가 시 None)"""
+        # 기존 문서 최대값은 이 프로세스에서 키를 처음 쓸 때만 전달 (DB 카운터가 없을 때만 사용됨)
+        with self._seed_lock:
+            first_use = key not in self._seeded
+        floor = seed_func() if (first_use and seed_func) else 0
+        params = {
+            'p_doc_type': key[0],
+            'p_company': key[1],
+            'p_period': key[2],
+            'p_floor': floor,
+        }
+        try:
+            client = self._client()
+        except Exception as e:
+            # 연결 설정이 없는 환경 (로컬 백엔드 등)
+            logging.warning(f"시퀀스 RPC 클라이언트 없음, 로컬 카운터로 전환: {str(e)}")
+            self._rpc_available = False
+            return None
+
+        deadline = time.monotonic() + RPC_DEADLINE_SECONDS
+        delay = RPC_RETRY_DELAY
+        for attempt in range(1, RPC_ATTEMPTS + 1):
+            try:
+                result = client.rpc(SEQUENCE_RPC, params).execute()
+                break
+            except Exception as e:
+                if is_missing_rpc_error(e):
+                    logging.warning(f"시퀀스 RPC 없음, 로컬 카운터로 전환: {str(e)}")
+                    self._rpc_available = False
+                    return None
+                if attempt == RPC_ATTEMPTS or time.monotonic() + delay > deadline:
+                    logging.error(f"시퀀스 RPC 실패 ({key}, {attempt}회 시도): {str(e)}")
+                    raise SequenceUnavailableError(f"문서번호 발급 실패: {str(e)}") from e
+                logging.warning(f"시퀀스 RPC 일시 실패, 재시도 ({attempt}/{RPC_ATTEMPTS}): {str(e)}")
+                time.sleep(delay)
+                delay *= 2
+
+        value = result.data
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = next(iter(value.values()), None)
+        if value is None:
+            return None
+        with self._seed_lock:
+            self._seeded.add(key)
+        return int(value)
+
+    def next_value(self, doc_type: str, company: str = '', period: str = '',
+                   seed_func: Optional[Callable[[], int]] = None) -> int:
+        """
+        다음 번호 발급
+        Args:
+            doc_type: 문서 유형 (예: 'QUO', 'EXP')
+            company: 법인 코드
+            period: 기간 키 (예: '250131', '2025')
+            seed_func: 카운터가 없을 때 기존 최대 번호를 돌려주는 함수
+        Raises:
+            SequenceUnavailableError: RPC가 일시적으로 실패한 경우
+        """
+        key = (doc_type, company or '', period or '')
+        if self._rpc_available:
+            value = self._next_from_rpc(key, seed_func)
+            if value is not None:
+                return value
+        return self.local.next_value(key, seed_func)
+
+    def _peek_from_table(self, key: SequenceKey) -> Optional[int]:
+        """DB 카운터의 현재 값 (행이 없으면 None)"""
+        result = self._client().table(SEQUENCE_TABLE)\
+            .select('last_number')\
+            .eq('doc_type', key[0])\
+            .eq('company', key[1])\
+            .eq('period', key[2])\
+            .limit(1)\
+            .execute()
+        if result.data:
+            return int(result.data[0]['last_number'])
+        return None
+
+    def peek_value(self, doc_type: str, company: str = '', period: str = '',
+                   seed_func: Optional[Callable[[], int]] = None) -> int:
+        """
+        다음에 발급될 번호 (미리보기용, 번호를 소비하지 않음)
+        다른 사용자가 먼저 발급하면 실제 번호는 달라질 수 있다.
+        """
+        key = (doc_type, company or '', period or '')
+        if self._rpc_available:
+            try:
+                current = self._peek_from_table(key)
+                if current is not None:
+                    return current + 1
+            except Exception as e:
+                logging.warning(f"시퀀스 카운터 조회 실패 ({key}): {str(e)}")
+        return self.local.peek_value(key, seed_func)
+
+    def next_number(self, doc_type: str, prefix: str, width: int = 3, company: str = '',
+                    period: str = '', table_name: Optional[str] = None,
+                    column: Optional[str] = None) -> str:
+        """
+        prefix + 0 채움 번호 형식의 문서번호 발급
+        table_name/column을 주면 카운터 시작값을 기존 문서의 최대 번호로 맞춘다.
+        """
+        if not company:
+            company = company_from_table(table_name)
+        seed_func = None
+        if table_name and column:
+            seed_func = lambda: load_max_suffix(table_name, column, prefix)
+        value = self.next_value(doc_type, company, period, seed_func)
+        return f"{prefix}{value:0{width}d}"
+
+    def peek_number(self, doc_type: str, prefix: str, width: int = 3, company: str = '',
+                    period: str = '', table_name: Optional[str] = None,
+                    column: Optional[str] = None) -> str:
+        """next_number와 같은 형식의 다음 문서번호 미리보기 (번호를 소비하지 않음)"""
+        if not company:
+            company = company_from_table(table_name)
+        seed_func = None
+        if table_name and column:
+            seed_func = lambda: load_max_suffix(table_name, column, prefix)
+        value = self.peek_value(doc_type, company, period, seed_func)
+        return f"{prefix}{value:0{width}d}"
+
+
+# 프로세스 전역 시퀀스 서비스
+_service = SequenceService()
+
+
+def get_sequence_service() -> SequenceService:
+    """전역 시퀀스 서비스 반환"""
+    return _service
+
+
+def next_document_number(doc_type: str, prefix: Optional[str] = None, width: int = 3,
+                         company: str = '', period: Optional[str] = None,
+                         table_name: Optional[str] = None, column: Optional[str] = None) -> str:
+    """
+    문서번호 발급 (기본 형식: DOC-YYMMDD-001)
+    Args:
+        doc_type: 문서 유형
+        prefix: 번호 앞부분 (기본 f"{doc_type}-{period}-")
+        width: 번호 자릿수
+        company: 법인 코드 (없으면 table_name 접미사에서 추출)
+        period: 기간 키 (기본 오늘 YYMMDD)
+        table_name / column: 기존 문서 최대 번호 조회 대상
+    """
+    if period is None:
+        period = datetime.now().strftime('%y%m%d')
+    if prefix is None:
+        prefix = f"{doc_type}-{period}-"
+    return _service.next_number(doc_type, prefix, width, company, period, table_name, column)
+
+
+def peek_document_number(doc_type: str, prefix: Optional[str] = None, width: int = 3,
+                         company: str = '', period: Optional[str] = None,
+                         table_name: Optional[str] = None, column: Optional[str] = None) -> str:
+    """다음 문서번호 미리보기 (인자는 next_document_number와 동일, 번호를 소비하지 않음)"""
+    if period is None:
+        period = datetime.now().strftime('%y%m%d')
+    if prefix is None:
+        prefix = f"{doc_type}-{period}-"
+    return _service.peek_number(doc_type, prefix, width, company, period, table_name, column)